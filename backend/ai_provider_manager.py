@@ -4,18 +4,33 @@ Manages multiple AI providers and handles switching between them.
 """
 
 import os
+import json
+import time
+import hashlib
 import logging
-from typing import List, Dict, Optional
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Dict, Optional, Tuple
 from enum import Enum
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Import AI clients
-from granite_client import granite_chat, validate_config as validate_granite_config
-from gemini_client import gemini_generate_response, validate_gemini_config, test_gemini_connection
-from huggingface_client import huggingface_generate_response, validate_huggingface_config, test_huggingface_connectivity
+# AI clients are imported lazily through the registry
+from provider_registry import get_provider_registry
+from provider_metrics import LatencyTracker, ProviderHealthTracker
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderUnavailableError, ProviderQueueTimeoutError, DeadlineExceededError
+)
+from circuit_breaker import CircuitBreaker
+from rate_limiter import get_all_rate_limit_status, get_rate_limit_status
+from gemini_key_pool import get_gemini_key_pool
+from llm_scheduler import PRIORITY_INTERACTIVE, get_llm_scheduler, get_provider_concurrency
+from request_deadline import (
+    REQUEST_DEADLINE_SECONDS, AI_FALLBACK_RESERVE_SECONDS, MIN_ATTEMPT_SECONDS, deadline_scope, remaining_time
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,94 +41,199 @@ class AIProvider(Enum):
     GRANITE = "granite"
     GEMINI = "gemini"
     HUGGINGFACE = "huggingface"
+    CLAUDE = "claude"
+    CHATGPT = "chatgpt"
+    OPENROUTER = "openrouter"
+    GROK = "grok"
+    PERPLEXITY = "perplexity"
+    WATSONX = "watsonx"
 
 # Configuration
 DEFAULT_AI_PROVIDER = os.getenv("DEFAULT_AI_PROVIDER", "granite")
 ALLOW_AI_SWITCHING = os.getenv("ALLOW_AI_SWITCHING", "true").lower() == "true"
+AI_FALLBACK_ORDER = [p.strip() for p in os.getenv("AI_FALLBACK_ORDER", "granite,gemini,huggingface").split(",") if p.strip()]
+
+# Hedged requests: start a second provider if the primary is slower than its usual p95
+AI_HEDGING_ENABLED = os.getenv("AI_HEDGING_ENABLED", "false").lower() == "true"
+AI_HEDGE_PROVIDER = os.getenv("AI_HEDGE_PROVIDER", "granite")
+AI_HEDGE_PERCENTILE = float(os.getenv("AI_HEDGE_PERCENTILE", "95"))
+AI_HEDGE_DEFAULT_DELAY = float(os.getenv("AI_HEDGE_DEFAULT_DELAY", "3.0"))
+AI_HEDGE_MIN_DELAY = float(os.getenv("AI_HEDGE_MIN_DELAY", "0.5"))
+AI_HEDGE_MIN_SAMPLES = int(os.getenv("AI_HEDGE_MIN_SAMPLES", "20"))
+
+# Adaptive routing: provider "auto" picks the fastest provider that meets the success-rate floor
+AUTO_PROVIDER = "auto"
+AI_ROUTING_EWMA_ALPHA = float(os.getenv("AI_ROUTING_EWMA_ALPHA", "0.2"))
+AI_ROUTING_MIN_SUCCESS_RATE = float(os.getenv("AI_ROUTING_MIN_SUCCESS_RATE", "0.8"))
+AI_ROUTING_DEFAULT_LATENCY = float(os.getenv("AI_ROUTING_DEFAULT_LATENCY", "2.0"))
+
+# Single-flight: identical in-flight requests wait on the first one instead of calling the provider again
+AI_COALESCE_ENABLED = os.getenv("AI_COALESCE_ENABLED", "true").lower() == "true"
 
 class AIProviderManager:
     """Manages AI provider selection and routing."""
     
     def __init__(self):
         self.current_provider = DEFAULT_AI_PROVIDER
+        self.registry = get_provider_registry()
         self.available_providers = self._get_available_providers()
+        self.latency_tracker = LatencyTracker()
+        self.health_tracker = ProviderHealthTracker(alpha=AI_ROUTING_EWMA_ALPHA)
+        self.scheduler = get_llm_scheduler()
+        self.coalescing_enabled = AI_COALESCE_ENABLED
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesce_stats = {"leaders": 0, "coalesced": 0}
+        self.circuit_breakers = {name: CircuitBreaker(name) for name in self.available_providers}
+        self.hedging_enabled = AI_HEDGING_ENABLED
+        self.hedge_provider = AI_HEDGE_PROVIDER
+        # One pool thread per provider slot the scheduler can grant; a call that finds no free
+        # thread runs unhedged instead of queueing, so pool waits never count toward the hedge delay
+        hedge_workers = sum(get_provider_concurrency(name) for name in self.available_providers)
+        self._hedge_executor = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="ai-hedge")
+        self._hedge_threads = threading.BoundedSemaphore(hedge_workers)
+        self._hedge_lock = threading.Lock()
+        self.hedge_stats = {
+            "requests": 0,
+            "hedged_requests": 0,
+            "primary_wins": 0,
+            "hedge_wins": 0,
+            "cancelled_before_start": 0,
+            "unhedged_pool_full": 0
+        }
         logger.info(f"AI Provider Manager initialized with default: {self.current_provider}")
         logger.info(f"Available providers: {list(self.available_providers.keys())}")
     
     def _get_available_providers(self) -> Dict[str, Dict]:
-        """Get list of available and configured AI providers."""
+        """Get list of registered AI providers, judged configured from the environment only.
+
+        Client modules are not imported here; each provider's own validation runs when it is
+        first selected or health-checked.
+        """
         providers = {}
-        
-        # Check IBM Granite
-        try:
-            granite_status = validate_granite_config()
-            providers["granite"] = {
-                "name": "IBM Granite",
-                "description": "Lightweight local AI model (fast, free, offline)",
-                "status": "available" if granite_status else "error",
-                "features": ["Local processing", "No API costs", "Fast responses"],
-                "requires_api_key": False
-            }
-        except Exception as e:
-            providers["granite"] = {
-                "name": "IBM Granite",
-                "description": "Lightweight local AI model",
-                "status": "error",
-                "error": str(e),
-                "requires_api_key": False
-            }
-        
-        # Check Google Gemini
-        try:
-            gemini_status = validate_gemini_config()
-            providers["gemini"] = {
-                "name": "Google Gemini",
-                "description": "Google's advanced Gemini AI with generous free quota",
-                "status": "available" if gemini_status else "not_configured",
-                "features": ["Advanced reasoning", "Multimodal capabilities", "High quality responses", "Free quota"],
-                "requires_api_key": True
-            }
-        except Exception as e:
-            providers["gemini"] = {
-                "name": "Google Gemini",
-                "description": "Google's advanced Gemini AI with generous free quota",
-                "status": "error",
-                "error": str(e),
-                "requires_api_key": True
+
+        for name in self.registry.names():
+            spec = self.registry.specs[name]
+            providers[name] = {
+                "name": spec.display_name,
+                "description": spec.description,
+                "status": "available" if self.registry.is_configured(name) else "not_configured",
+                "features": spec.features,
+                "requires_api_key": spec.requires_api_key
             }
 
-        # Check Hugging Face
+        return providers
+
+    def _validate_provider(self, provider: str) -> bool:
+        """Load the provider's client and run its own config check, updating its status."""
+        provider_info = self.available_providers[provider]
         try:
-            huggingface_status = validate_huggingface_config()
-            providers["huggingface"] = {
-                "name": "Hugging Face (Multiple Models)",
-                "description": "Access to multiple AI models through Hugging Face Inference API",
-                "status": "available" if huggingface_status else "not_configured",
-                "features": ["Multiple models", "DialoGPT", "BlenderBot", "Free tier available", "Open source models"],
-                "requires_api_key": True
-            }
+            valid = self.registry.validate(provider)
         except Exception as e:
-            providers["huggingface"] = {
-                "name": "Hugging Face (Multiple Models)",
-                "description": "Access to multiple AI models through Hugging Face Inference API",
-                "status": "error",
-                "error": str(e),
-                "requires_api_key": True
-            }
+            logger.error(f"Could not load {provider} provider: {e}")
+            provider_info["status"] = "error"
+            provider_info["error"] = str(e)
+            return False
 
+        if not valid:
+            provider_info["status"] = "not_configured"
+        return valid
 
-
-        return providers
-    
     def get_provider_status(self) -> Dict:
         """Get current provider status and available options."""
         return {
             "current_provider": self.current_provider,
             "allow_switching": ALLOW_AI_SWITCHING,
             "available_providers": self.available_providers,
-            "provider_count": len([p for p in self.available_providers.values() if p["status"] == "available"])
+            "provider_count": len([p for p in self.available_providers.values() if p["status"] == "available"]),
+            "circuit_breakers": {name: breaker.get_status() for name, breaker in self.circuit_breakers.items()},
+            "rate_limits": get_all_rate_limit_status(),
+            "routing": self.get_routing_scores(),
+            "scheduler": self.scheduler.get_stats(),
+            "coalescing": self.get_coalescing_stats(),
+            "local_inference": self.registry.call_if_loaded("granite", "get_local_inference_stats"),
+            "registry": self.registry.get_status(),
+            "hedging": self.get_hedging_stats(),
+            "latency": self.latency_tracker.get_summary()
+        }
+
+    @staticmethod
+    def _get_quota_status(name: str) -> Optional[Dict]:
+        """Remaining quota for a provider; Gemini's is the key pool total, not a single limiter."""
+        if name == "gemini":
+            status = get_gemini_key_pool().get_status()
+            return status if status["key_count"] else None  # no keys: availability check covers it
+        return get_rate_limit_status(name)
+
+    def get_routing_scores(self) -> Dict:
+        """Live per-provider scores used by auto routing."""
+        scores = {}
+        for name, info in self.available_providers.items():
+            if info["status"] != "available":
+                continue
+
+            health = self.health_tracker.get(name)
+            quota = self._get_quota_status(name)
+            quota_remaining = None
+            if quota:
+                remaining = [value for value in (quota["minute_remaining"], quota["daily_remaining"]) if value is not None]
+                quota_remaining = min(remaining)
+
+            success_rate = 1.0 - health["ewma_error_rate"]
+            scores[name] = {
+                "ewma_latency_seconds": round(health["ewma_latency"], 3) if health["ewma_latency"] is not None else None,
+                "ewma_error_rate": round(health["ewma_error_rate"], 3),
+                "success_rate": round(success_rate, 3),
+                "samples": health["samples"],
+                "quota_remaining": quota_remaining,
+                "circuit_state": self.circuit_breakers[name].state.value,
+                "eligible": (success_rate >= AI_ROUTING_MIN_SUCCESS_RATE
+                             and quota_remaining != 0
+                             and self.circuit_breakers[name].is_available())
+            }
+
+        return {
+            "mode": AUTO_PROVIDER if self.current_provider == AUTO_PROVIDER else "manual",
+            "min_success_rate": AI_ROUTING_MIN_SUCCESS_RATE,
+            "auto_choice": self.select_auto_provider(scores),
+            "scores": scores
         }
 
+    def select_auto_provider(self, scores: Optional[Dict] = None) -> str:
+        """Pick the eligible provider with the lowest expected latency.
+
+        Providers without latency samples are assumed to take AI_ROUTING_DEFAULT_LATENCY so they
+        still get tried. If none meets the success-rate floor, the most reliable one is used.
+        """
+        if scores is None:
+            scores = self.get_routing_scores()["scores"]
+
+        if not scores:
+            return DEFAULT_AI_PROVIDER if DEFAULT_AI_PROVIDER != AUTO_PROVIDER else "granite"
+
+        def expected_latency(name: str) -> float:
+            latency = scores[name]["ewma_latency_seconds"]
+            return latency if latency is not None else AI_ROUTING_DEFAULT_LATENCY
+
+        eligible = [name for name, score in scores.items() if score["eligible"]]
+        if eligible:
+            return min(eligible, key=expected_latency)
+
+        return max(scores, key=lambda name: (scores[name]["success_rate"], -expected_latency(name)))
+
+    def get_hedging_stats(self) -> Dict:
+        """Get hedged request statistics (hedge rate and which side won)."""
+        with self._hedge_lock:
+            stats = dict(self.hedge_stats)
+
+        requests = stats["requests"]
+        hedged = stats["hedged_requests"]
+        stats["enabled"] = self.hedging_enabled
+        stats["hedge_provider"] = self.hedge_provider
+        stats["hedge_rate"] = round(hedged / requests, 3) if requests else 0.0
+        stats["hedge_win_rate"] = round(stats["hedge_wins"] / hedged, 3) if hedged else 0.0
+        return stats
+
     def get_available_providers(self) -> Dict:
         """Get available providers in the expected format."""
         return {
@@ -133,6 +253,17 @@ class AIProviderManager:
                 "current_provider": self.current_provider
             }
         
+        if provider == AUTO_PROVIDER:
+            old_provider = self.current_provider
+            self.current_provider = AUTO_PROVIDER
+            logger.info(f"AI provider switched from {old_provider} to automatic routing")
+            return {
+                "success": True,
+                "message": "Switched to automatic provider routing",
+                "previous_provider": old_provider,
+                "current_provider": self.current_provider
+            }
+
         if provider not in self.available_providers:
             return {
                 "success": False,
@@ -141,7 +272,7 @@ class AIProviderManager:
             }
         
         provider_info = self.available_providers[provider]
-        if provider_info["status"] != "available":
+        if provider_info["status"] != "available" or not self._validate_provider(provider):
             return {
                 "success": False,
                 "message": f"AI provider {provider} is not available: {provider_info.get('error', 'Not configured')}",
@@ -160,10 +291,25 @@ class AIProviderManager:
             "current_provider": self.current_provider
         }
     
-    def generate_response(self, messages: List[Dict], provider: Optional[str] = None, auto_fallback: bool = True) -> Dict:
-        """Generate response using the specified or current AI provider with automatic fallback."""
+    def generate_response(self, messages: List[Dict], provider: Optional[str] = None, auto_fallback: bool = True,
+                          priority: str = PRIORITY_INTERACTIVE) -> Dict:
+        """Generate response using the specified or current AI provider with automatic fallback.
+
+        priority is the scheduler class (interactive, background or batch) used to queue for provider slots.
+        The whole call, fallbacks included, finishes within the caller's request deadline, or
+        REQUEST_DEADLINE_SECONDS when the caller did not set one.
+        """
+        with deadline_scope(REQUEST_DEADLINE_SECONDS):
+            return self._generate_response(messages, provider, auto_fallback, priority)
+
+    def _generate_response(self, messages: List[Dict], provider: Optional[str], auto_fallback: bool, priority: str) -> Dict:
+        """Resolve the provider and run the request, sharing in-flight results for identical requests."""
         # Use specified provider or current default
         active_provider = provider if provider else self.current_provider
+        auto_routed = active_provider == AUTO_PROVIDER
+        if auto_routed:
+            active_provider = self.select_auto_provider()
+            logger.info(f"Auto routing selected {active_provider}")
 
         if active_provider not in self.available_providers:
             return {
@@ -182,160 +328,352 @@ class AIProviderManager:
                 "error": "provider_unavailable"
             }
 
-        try:
-            logger.info(f"Generating response using {provider_info['name']}")
-
-            # Route to appropriate AI provider
-            if active_provider == "granite":
-                response = granite_chat(messages)
-            elif active_provider == "gemini":
-                response = gemini_generate_response(messages)
-            elif active_provider == "huggingface":
-                response = huggingface_generate_response(messages)
+        if not self.coalescing_enabled:
+            return self._generate_with_fallback(messages, active_provider, auto_fallback, priority, auto_routed)
+
+        # Single-flight: identical concurrent requests of the same priority share one provider call
+        key = self._request_key(active_provider, messages, auto_fallback, priority)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+                self.coalesce_stats["leaders"] += 1
             else:
-                return {
-                    "success": False,
-                    "response": f"Provider {active_provider} not implemented yet",
-                    "provider": active_provider,
-                    "error": "not_implemented"
-                }
+                self.coalesce_stats["coalesced"] += 1
+
+        if not is_leader:
+            logger.info(f"Identical {active_provider} request already in flight, waiting for its result")
+            try:
+                result = dict(future.result(timeout=max(remaining_time(), 0)))
+            except FutureTimeoutError:
+                return self._build_failure_result(active_provider, DeadlineExceededError(active_provider, "Request deadline exceeded"))
+            result["coalesced"] = True
+            return result
 
-            # Check if response indicates actual API errors (not content about rate limits)
-            # Only trigger fallback for actual API error responses, not content that mentions rate limits
-            api_quota_exceeded = (
-                "quota exceeded" in response.lower() and len(response) < 200 and
-                ("check your plan" in response.lower() or "billing" in response.lower())
-            )
-            api_rate_limited = (
-                "temporarily unavailable" in response.lower() and len(response) < 200 and
-                "gemini" in response.lower()
-            )
-
-            if api_quota_exceeded or api_rate_limited:
-                if auto_fallback and active_provider == "gemini" and "granite" in self.available_providers:
-                    if api_quota_exceeded:
-                        logger.warning("Gemini API quota exceeded, falling back to IBM Granite")
-                        fallback_message = "[Gemini quota exceeded - check quota at https://aistudio.google.com/app/apikey]"
+        try:
+            result = self._generate_with_fallback(messages, active_provider, auto_fallback, priority, auto_routed)
+            future.set_result(result)
+            return dict(result)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _request_key(self, provider: str, messages: List[Dict], auto_fallback: bool, priority: str) -> str:
+        """Cache key for single-flight deduplication: provider, priority and the exact conversation.
+
+        Priority is part of the key so an interactive request never waits behind a queued background leader.
+        """
+        payload = json.dumps({"provider": provider, "auto_fallback": auto_fallback, "priority": priority,
+                              "messages": messages}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_coalescing_stats(self) -> Dict:
+        """Get single-flight statistics."""
+        with self._inflight_lock:
+            stats = dict(self.coalesce_stats)
+            stats["in_flight"] = len(self._inflight)
+        stats["enabled"] = self.coalescing_enabled
+        return stats
+
+    def _generate_with_fallback(self, messages: List[Dict], active_provider: str, auto_fallback: bool,
+                                priority: str, auto_routed: bool) -> Dict:
+        """Walk the active provider and its fallback chain until one answers."""
+        chain = [active_provider]
+        if auto_fallback:
+            chain.extend(self._get_fallback_chain(active_provider))
+
+        first_error = None
+        tried = set()
+
+        for index, candidate in enumerate(chain):
+            if candidate in tried:
+                continue
+            tried.add(candidate)
+
+            if remaining_time() <= 0:
+                logger.warning(f"Request deadline exceeded before trying {candidate}")
+                first_error = DeadlineExceededError(candidate, "Request deadline exceeded")
+                break
+
+            breaker = self.circuit_breakers[candidate]
+            if not breaker.allow_request():
+                # Open circuit: skip straight to the next healthy provider instead of waiting on timeouts
+                logger.info(f"Circuit for {candidate} is open, routing to next provider")
+                if first_error is None:
+                    first_error = ProviderUnavailableError(candidate, "Circuit breaker is open")
+                continue
+
+            try:
+                logger.info(f"Generating response using {self.available_providers[candidate]['name']}")
+
+                with deadline_scope(self._attempt_budget(chain[index + 1:])):
+                    if index == 0 and self._should_hedge(candidate):
+                        tried.add(self.hedge_provider)
+                        response_provider, response = self._generate_hedged(candidate, messages, priority)
                     else:
-                        logger.info("Gemini API temporarily unavailable, falling back to IBM Granite")
-                        fallback_message = "[Switched to IBM Granite due to Gemini API unavailability]"
-
-                    fallback_response = granite_chat(messages)
-                    return {
-                        "success": True,
-                        "response": f"{fallback_message}\n\n{fallback_response}",
-                        "provider": "granite",
-                        "provider_name": "IBM Granite (Fallback)",
-                        "fallback_used": True,
-                        "original_provider": active_provider,
-                        "fallback_reason": "quota_exceeded" if api_quota_exceeded else "api_unavailable"
-                    }
+                        response_provider, response = candidate, self._call_provider(candidate, messages, priority)
+
+                result = self._build_success_result(active_provider, response_provider, response, first_error)
+                if auto_routed:
+                    result["auto_routed"] = True
+                return result
+
+            except Exception as e:
+                logger.error(f"Error generating response with {candidate}: {e}")
+                if first_error is None:
+                    first_error = e
+
+        return self._build_failure_result(active_provider, first_error)
+
+    def _attempt_budget(self, remaining_chain: List[str]) -> float:
+        """Time one provider may use: everything left, minus a reserve when a fallback still follows.
+
+        The reserve makes a slow provider give up early enough for the next one to answer
+        within the request deadline.
+        """
+        remaining = remaining_time()
+        has_fallback = any(self.circuit_breakers[name].is_available() for name in remaining_chain)
+        if has_fallback and remaining - AI_FALLBACK_RESERVE_SECONDS >= MIN_ATTEMPT_SECONDS:
+            return remaining - AI_FALLBACK_RESERVE_SECONDS
+        return remaining
+
+    def _get_fallback_chain(self, active_provider: str) -> List[str]:
+        """Providers to try after the active one, in configured order, skipping unavailable ones."""
+        return [
+            name for name in AI_FALLBACK_ORDER
+            if name != active_provider
+            and name in self.available_providers
+            and self.available_providers[name]["status"] == "available"
+        ]
+
+    def _build_success_result(self, active_provider: str, response_provider: str, response: str, error: Optional[Exception]) -> Dict:
+        """Build the response dict, marking fallback or hedged answers."""
+        provider_name = self.available_providers[response_provider]["name"]
+
+        if response_provider == active_provider:
+            return {
+                "success": True,
+                "response": response,
+                "provider": response_provider,
+                "provider_name": provider_name
+            }
 
+        if error is None:
+            # The hedge request won the race against a healthy primary
             return {
                 "success": True,
                 "response": response,
-                "provider": active_provider,
-                "provider_name": provider_info["name"]
+                "provider": response_provider,
+                "provider_name": f"{provider_name} (Hedged)",
+                "hedged": True,
+                "original_provider": active_provider
             }
 
-        except Exception as e:
-            error_str = str(e)
-            logger.error(f"Error generating response with {active_provider}: {e}")
+        failed_name = active_provider.title()
+        if isinstance(error, ProviderRateLimitError):
+            fallback_message = f"[Switched to {provider_name} due to {failed_name} rate limits]"
+        else:
+            fallback_message = f"[Switched to {provider_name} due to {failed_name} unavailability]"
 
-            # Handle specific provider errors with intelligent fallback
-            provider_errors = {
-                "GEMINI": ["GEMINI_RATE_LIMITED", "GEMINI_API_ERROR", "GEMINI_CONNECTION_ERROR", "GEMINI_TIMEOUT"],
-                "HUGGINGFACE": ["HUGGINGFACE_RATE_LIMITED", "HUGGINGFACE_API_ERROR", "HUGGINGFACE_CONNECTION_ERROR", "HUGGINGFACE_TIMEOUT"]
-            }
+        logger.info(f"{failed_name} failed ({type(error).__name__}), answered by {provider_name}")
 
-            # Check if this is a known provider error
-            failed_provider = None
-            for provider, error_types in provider_errors.items():
-                if any(error_type in error_str for error_type in error_types):
-                    failed_provider = provider.lower()
-                    break
+        return {
+            "success": True,
+            "response": f"{fallback_message}\n\n{response}",
+            "provider": response_provider,
+            "provider_name": f"{provider_name} (Fallback)",
+            "fallback_used": True,
+            "original_provider": active_provider,
+            "fallback_reason": error.fallback_reason if isinstance(error, ProviderError) else "error"
+        }
 
-            if failed_provider and auto_fallback and "granite" in self.available_providers and self.available_providers["granite"]["status"] == "available":
-                try:
-                    if "RATE_LIMITED" in error_str:
-                        logger.info(f"{failed_provider.title()} rate limited, falling back to IBM Granite")
-                        fallback_message = f"[Switched to IBM Granite due to {failed_provider.title()} rate limits]"
-                    else:
-                        logger.info(f"{failed_provider.title()} error, falling back to IBM Granite")
-                        fallback_message = f"[Switched to IBM Granite due to {failed_provider.title()} unavailability]"
-
-                    fallback_response = granite_chat(messages)
-                    return {
-                        "success": True,
-                        "response": f"{fallback_message}\n\n{fallback_response}",
-                        "provider": "granite",
-                        "provider_name": "IBM Granite (Fallback)",
-                        "fallback_used": True,
-                        "original_provider": active_provider,
-                        "fallback_reason": f"{failed_provider}_error"
-                    }
-                except Exception as fallback_error:
-                    logger.error(f"Fallback also failed: {fallback_error}")
-
-                # If no fallback available, return appropriate message
-                if "RATE_LIMITED" in error_str:
-                    return {
-                        "success": False,
-                        "response": f"{failed_provider.title()} is temporarily rate limited. Please try again later or switch to IBM Granite.",
-                        "provider": active_provider,
-                        "error": "rate_limited"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "response": f"{failed_provider.title()} is temporarily unavailable. Please try again later or switch to IBM Granite.",
-                        "provider": active_provider,
-                        "error": "gemini_unavailable"
-                    }
+    def _build_failure_result(self, active_provider: str, error: Optional[Exception]) -> Dict:
+        """Build the error dict when every provider in the chain failed or was skipped."""
+        failed_name = active_provider.title()
 
-            # Try fallback if enabled and other error occurred with Gemini
-            if auto_fallback and active_provider == "gemini" and "granite" in self.available_providers:
-                try:
-                    logger.info("Gemini failed, falling back to IBM Granite")
-                    fallback_response = granite_chat(messages)
-                    return {
-                        "success": True,
-                        "response": f"[Switched to IBM Granite due to Gemini error]\n\n{fallback_response}",
-                        "provider": "granite",
-                        "provider_name": "IBM Granite (Fallback)",
-                        "fallback_used": True,
-                        "original_provider": active_provider,
-                        "fallback_reason": "error"
-                    }
-                except Exception as fallback_error:
-                    logger.error(f"Fallback also failed: {fallback_error}")
+        if isinstance(error, ProviderRateLimitError):
+            return {
+                "success": False,
+                "response": f"{failed_name} is temporarily rate limited. Please try again later or switch to IBM Granite.",
+                "provider": active_provider,
+                "error": "rate_limited"
+            }
 
+        if isinstance(error, DeadlineExceededError):
             return {
                 "success": False,
-                "response": f"Error generating response: {str(e)}",
+                "response": "This is taking longer than expected. Please try again in a moment.",
                 "provider": active_provider,
-                "error": "generation_error"
+                "error": "deadline_exceeded"
             }
-    
+
+        if isinstance(error, ProviderUnavailableError):
+            return {
+                "success": False,
+                "response": f"{failed_name} is temporarily unavailable. Please try again later or switch to IBM Granite.",
+                "provider": active_provider,
+                "error": "circuit_open"
+            }
+
+        return {
+            "success": False,
+            "response": f"Error generating response: {str(error)}",
+            "provider": active_provider,
+            "error": "generation_error"
+        }
+
+    def _call_provider(self, provider: str, messages: List[Dict], priority: str = PRIORITY_INTERACTIVE,
+                       on_slot: Optional[Callable[[], None]] = None) -> str:
+        """Route a request to the provider's client, recording latency and circuit breaker outcome.
+
+        on_slot is called once the provider's scheduler slot is held, before the client is called.
+        """
+        breaker = self.circuit_breakers[provider]
+
+        # Queue time is excluded from latency; a queue timeout is saturation, not provider failure,
+        # and an exhausted request budget is the caller's deadline, as on the hedging path
+        try:
+            with self.scheduler.slot(provider, priority):
+                if on_slot is not None:
+                    on_slot()
+                start_time = time.time()
+                try:
+                    response = self.registry.generate(provider, messages)
+                except DeadlineExceededError:
+                    raise
+                except Exception as e:
+                    breaker.record_failure(e)
+                    self.health_tracker.record_failure(provider)
+                    raise
+        except (ProviderQueueTimeoutError, DeadlineExceededError):
+            breaker.release_request()
+            raise
+
+        latency = time.time() - start_time
+        breaker.record_success()
+        self.latency_tracker.record(provider, latency)
+        self.health_tracker.record_success(provider, latency)
+        return response
+
+    def _should_hedge(self, provider: str) -> bool:
+        """Hedge only when enabled and a different, available hedge provider exists."""
+        if not self.hedging_enabled or provider == self.hedge_provider:
+            return False
+
+        hedge_info = self.available_providers.get(self.hedge_provider)
+        return bool(hedge_info) and hedge_info["status"] == "available" and self.circuit_breakers[self.hedge_provider].is_available()
+
+    def get_hedge_delay(self, provider: str) -> float:
+        """Delay before hedging: the provider's observed latency percentile once enough samples exist."""
+        if self.latency_tracker.sample_count(provider) < AI_HEDGE_MIN_SAMPLES:
+            return AI_HEDGE_DEFAULT_DELAY
+
+        observed = self.latency_tracker.percentile(provider, AI_HEDGE_PERCENTILE)
+        if observed is None:
+            return AI_HEDGE_DEFAULT_DELAY
+        return max(AI_HEDGE_MIN_DELAY, observed)
+
+    def _generate_hedged(self, primary: str, messages: List[Dict], priority: str = PRIORITY_INTERACTIVE) -> Tuple[str, str]:
+        """Run the primary provider and, if it is slow or fails, race the hedge provider against it.
+
+        Returns (provider, response) for the first successful answer. Re-raises the primary's
+        error when both sides fail so the normal fallback handling applies.
+        """
+        with self._hedge_lock:
+            self.hedge_stats["requests"] += 1
+
+        if not self._hedge_threads.acquire(blocking=False):
+            # Every pool thread is busy, so the service is saturated: don't add a second request
+            with self._hedge_lock:
+                self.hedge_stats["unhedged_pool_full"] += 1
+            return primary, self._call_provider(primary, messages, priority)
+
+        # The hedge delay starts once the primary holds its provider slot; scheduler queueing is not provider slowness
+        slot_held = threading.Event()
+        primary_future = self._submit_hedge_task(primary, messages, priority, on_slot=slot_held.set)
+        primary_future.add_done_callback(lambda _: slot_held.set())
+        slot_held.wait(remaining_time())
+        done, _ = wait([primary_future], timeout=self.get_hedge_delay(primary))
+
+        if primary_future in done and primary_future.exception() is None:
+            with self._hedge_lock:
+                self.hedge_stats["primary_wins"] += 1
+            return primary, primary_future.result()
+
+        if not self._hedge_threads.acquire(blocking=False):
+            return primary, self._wait_for_primary(primary, primary_future)
+        if not self.circuit_breakers[self.hedge_provider].allow_request():
+            # Hedge provider tripped meanwhile; just wait for the primary
+            self._hedge_threads.release()
+            return primary, self._wait_for_primary(primary, primary_future)
+
+        logger.info(f"{primary} slower than hedge delay or failed, starting hedge request to {self.hedge_provider}")
+        with self._hedge_lock:
+            self.hedge_stats["hedged_requests"] += 1
+
+        hedge_future = self._submit_hedge_task(self.hedge_provider, messages, priority)
+        futures = {primary_future: primary, hedge_future: self.hedge_provider}
+        pending = set(futures)
+
+        while pending:
+            done, pending = wait(pending, timeout=max(remaining_time(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                self._cancel_hedge_losers(pending, futures)
+                raise DeadlineExceededError(primary, "Request deadline exceeded while hedging")
+            for future in done:
+                if future.exception() is not None:
+                    logger.warning(f"Hedged request to {futures[future]} failed: {future.exception()}")
+                    continue
+
+                winner = futures[future]
+                self._cancel_hedge_losers(pending, futures)
+                with self._hedge_lock:
+                    self.hedge_stats["primary_wins" if winner == primary else "hedge_wins"] += 1
+                return winner, future.result()
+
+        raise primary_future.exception()
+
+    def _submit_hedge_task(self, provider: str, messages: List[Dict], priority: str,
+                           on_slot: Optional[Callable[[], None]] = None) -> Future:
+        """Run a provider call on a pool thread reserved from _hedge_threads; the thread is returned when it finishes."""
+        # Worker threads run in a copy of this context so they see the request deadline
+        future = self._hedge_executor.submit(contextvars.copy_context().run, self._call_provider, provider, messages, priority, on_slot)
+        future.add_done_callback(lambda _: self._hedge_threads.release())
+        return future
+
+    def _wait_for_primary(self, primary: str, primary_future: Future) -> str:
+        """Wait out the primary without hedging, bounded by the request deadline."""
+        try:
+            return primary_future.result(timeout=max(remaining_time(), 0))
+        except FutureTimeoutError:
+            raise DeadlineExceededError(primary, "Request deadline exceeded")
+
+    def _cancel_hedge_losers(self, pending: set, futures: Dict[Future, str]):
+        """Drop the requests that lost the race.
+
+        Python threads cannot be interrupted: a loser that has not started yet is cancelled
+        outright and the half-open trial slot its breaker reserved is given back; one already
+        in flight finishes and its result is dropped.
+        """
+        for loser in pending:
+            if loser.cancel():
+                self.circuit_breakers[futures[loser]].release_request()
+                with self._hedge_lock:
+                    self.hedge_stats["cancelled_before_start"] += 1
+
     def test_all_providers(self) -> Dict:
-        """Test all available AI providers."""
+        """Test all available AI providers (loads each configured client)."""
         results = {}
         
         for provider_id, provider_info in self.available_providers.items():
             if provider_info["status"] == "available":
                 try:
-                    if provider_id == "granite":
-                        test_messages = [{"role": "user", "content": "Hello, test message"}]
-                        response = granite_chat(test_messages)
-                        results[provider_id] = {
-                            "status": "success",
-                            "response_length": len(response),
-                            "working": True
-                        }
-                    elif provider_id == "gemini":
-                        test_result = test_gemini_connection()
-                        results[provider_id] = test_result
-                    
+                    results[provider_id] = self.registry.test_connection(provider_id)
                 except Exception as e:
                     results[provider_id] = {
                         "status": "error",
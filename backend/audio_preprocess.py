@@ -0,0 +1,142 @@
+"""
+Audio Preprocessing for Taxora
+Shrinks PCM WAV voice input before speech-to-text: trims silence, downmixes to mono and resamples to 16 kHz.
+"""
+
+import io
+import os
+import math
+import wave
+import logging
+from array import array
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: the pure-Python path gives the same result, just slower
+    np = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Preprocessing configuration
+AUDIO_PREPROCESS_ENABLED = os.getenv("AUDIO_PREPROCESS_ENABLED", "true").lower() == "true"
+AUDIO_TARGET_SAMPLE_RATE = int(os.getenv("AUDIO_TARGET_SAMPLE_RATE", "16000"))
+AUDIO_TRIM_SILENCE = os.getenv("AUDIO_TRIM_SILENCE", "true").lower() == "true"
+AUDIO_SILENCE_THRESHOLD = int(os.getenv("AUDIO_SILENCE_THRESHOLD", "500"))   # RMS of 16-bit samples
+AUDIO_SILENCE_PADDING_MS = int(os.getenv("AUDIO_SILENCE_PADDING_MS", "150"))
+
+FRAME_MS = 20
+
+def detect_audio_format(data: bytes) -> Optional[str]:
+    """Container format from the file's magic bytes (as used in audio/<format> MIME types)."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if data[:4] == b"OggS":
+        return "ogg"
+    if data[:4] == b"fLaC":
+        return "flac"
+    if data[4:8] == b"ftyp":
+        return "mp4"
+    if data[:3] == b"ID3" or (len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+def _downmix(samples: array, channels: int) -> array:
+    if channels == 1:
+        return samples
+    if np is not None:
+        mixed = np.frombuffer(samples, dtype=np.int16).reshape(-1, channels).mean(axis=1)
+        return array("h", mixed.astype(np.int16).tobytes())
+    tracks = [samples[channel::channels] for channel in range(channels)]
+    return array("h", (sum(frame) // channels for frame in zip(*tracks)))
+
+def _resample(samples: array, rate: int, target_rate: int) -> array:
+    """Linear-interpolation resampling."""
+    if rate == target_rate or not samples:
+        return samples
+    count = max(1, int(len(samples) * target_rate / rate))
+    step = (len(samples) - 1) / max(1, count - 1)
+    if np is not None:
+        source = np.frombuffer(samples, dtype=np.int16).astype(np.float64)
+        resampled = np.interp(np.arange(count) * step, np.arange(len(samples)), source)
+        return array("h", resampled.astype(np.int16).tobytes())
+
+    last = len(samples) - 1
+    result = array("h", bytes(2 * count))
+    for i in range(count):
+        position = i * step
+        index = int(position)
+        fraction = position - index
+        following = samples[index + 1] if index < last else samples[index]
+        result[i] = int(samples[index] + (following - samples[index]) * fraction)
+    return result
+
+def _trim_silence(samples: array, rate: int) -> array:
+    """Drop leading and trailing frames quieter than the threshold, keeping a little padding."""
+    frame = max(1, rate * FRAME_MS // 1000)
+    loud = []
+    for start in range(0, len(samples), frame):
+        chunk = samples[start:start + frame]
+        rms = math.sqrt(sum(sample * sample for sample in chunk) / len(chunk))
+        loud.append(rms >= AUDIO_SILENCE_THRESHOLD)
+
+    if not any(loud):
+        return samples  # all quiet: leave it for the recognizer to decide
+
+    padding = rate * AUDIO_SILENCE_PADDING_MS // 1000
+    first = loud.index(True) * frame
+    end = (len(loud) - loud[::-1].index(True)) * frame
+    return samples[max(0, first - padding):min(len(samples), end + padding)]
+
+def preprocess_audio(data: bytes) -> Tuple[bytes, Optional[str], Dict]:
+    """Return (audio, format, info). 16-bit PCM WAV is trimmed, downmixed and resampled;
+    compressed formats (webm/opus from browsers, mp3, ...) pass through unchanged because
+    decoding them would need ffmpeg.
+    """
+    audio_format = detect_audio_format(data)
+    info = {"format": audio_format, "original_bytes": len(data), "processed": False}
+    if not AUDIO_PREPROCESS_ENABLED or audio_format != "wav":
+        return data, audio_format, info
+
+    try:
+        with wave.open(io.BytesIO(data), "rb") as reader:
+            channels, width, rate = reader.getnchannels(), reader.getsampwidth(), reader.getframerate()
+            frames = reader.readframes(reader.getnframes())
+    except (wave.Error, EOFError) as e:
+        logger.warning(f"Could not read WAV audio, sending it unchanged: {e}")
+        return data, audio_format, info
+
+    if width != 2:
+        info["skipped"] = f"{8 * width}-bit samples"
+        return data, audio_format, info
+
+    samples = array("h", frames)
+    samples = _downmix(samples, channels)
+    target_rate = min(rate, AUDIO_TARGET_SAMPLE_RATE)  # never upsample
+    samples = _resample(samples, rate, target_rate)
+    if AUDIO_TRIM_SILENCE:
+        samples = _trim_silence(samples, target_rate)
+
+    output = io.BytesIO()
+    with wave.open(output, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(target_rate)
+        writer.writeframes(samples.tobytes())
+    processed = output.getvalue()
+
+    info.update({
+        "processed": True,
+        "processed_bytes": len(processed),
+        "original_rate": rate,
+        "original_channels": channels,
+        "sample_rate": target_rate,
+        "duration_seconds": round(len(samples) / target_rate, 2)
+    })
+    logger.info(f"Preprocessed WAV audio {len(data)} -> {len(processed)} bytes "
+                f"({channels}ch {rate}Hz -> mono {target_rate}Hz)")
+    return processed, audio_format, info
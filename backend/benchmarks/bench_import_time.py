@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark API startup import cost with lazy provider loading vs importing every client eagerly.
+
+Uses `python -X importtime` in fresh interpreters. "lazy" imports main.py as it ships; "eager"
+imports every registered provider client first, which is what main.py paid before the registry.
+
+Usage (from backend/):
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --rounds 5 --top 15 --json results.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from provider_registry import PROVIDER_SPECS
+
+CLIENT_MODULES = sorted({spec.module for spec in PROVIDER_SPECS})
+
+def import_statement(mode: str) -> str:
+    """Python code each mode imports."""
+    if mode == "eager":
+        return f"import {', '.join(CLIENT_MODULES)}; import main"
+    return "import main"
+
+def measure(mode: str) -> dict:
+    """Run one fresh interpreter and parse its -X importtime report (microseconds)."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", import_statement(mode)],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nesting is shown by indentation; top-level entries' cumulative times add up to the total
+        modules[name.strip()] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                                 "top_level": not name[1:].startswith(" ")}
+
+    total_us = sum(entry["cumulative_us"] for entry in modules.values() if entry["top_level"])
+    return {"total_ms": total_us / 1000, "modules": modules}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare startup import time, lazy vs eager provider clients")
+    parser.add_argument("--rounds", type=int, default=3, help="fresh interpreters per mode")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    print("⏱️ Measuring startup import time")
+    print("=" * 50)
+
+    results = {}
+    for mode in ("eager", "lazy"):
+        runs = [measure(mode) for _ in range(args.rounds)]
+        totals = [run["total_ms"] for run in runs]
+        loaded_clients = [module for module in CLIENT_MODULES if module in runs[-1]["modules"]]
+        slowest = sorted(runs[-1]["modules"].items(), key=lambda item: item[1]["self_us"], reverse=True)[:args.top]
+
+        results[mode] = {
+            "median_total_ms": round(statistics.median(totals), 1),
+            "runs_ms": [round(total, 1) for total in totals],
+            "client_modules_imported": loaded_clients,
+            "slowest_self_ms": {name: round(entry["self_us"] / 1000, 1) for name, entry in slowest}
+        }
+
+        print(f"\n{mode}: median {results[mode]['median_total_ms']} ms over {args.rounds} runs")
+        print(f"  client modules imported: {', '.join(loaded_clients) or 'none'}")
+        for name, ms in results[mode]["slowest_self_ms"].items():
+            print(f"  {ms:>8} ms  {name}")
+
+    saved = results["eager"]["median_total_ms"] - results["lazy"]["median_total_ms"]
+    results["saved_ms"] = round(saved, 1)
+    print(f"\n🚀 Lazy provider loading saves {saved:.1f} ms at startup")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark local generation backends: PyTorch vs ONNX Runtime vs ONNX Runtime int8.
+
+Each backend runs in its own subprocess so peak memory (max RSS) is measured in isolation.
+Prompts and generation settings are the ones granite_chat_local uses.
+
+Usage (from backend/):
+    python benchmarks/bench_local_backends.py
+    python benchmarks/bench_local_backends.py --backends pytorch onnx-int8 --rounds 5 --json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+BACKENDS = ["pytorch", "onnx", "onnx-int8"]
+
+QUESTIONS = [
+    "How should I budget a monthly salary of 50000 rupees?",
+    "What is the GST rate on restaurant services?",
+    "How can I save tax under section 80C?",
+    "Should I invest in mutual funds or fixed deposits?",
+    "How much emergency fund should I keep?",
+    "What documents do I need to file GST returns?",
+    "How do I plan for retirement in my thirties?",
+    "What is the difference between old and new tax regime?"
+]
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_backend(backend: str, rounds: int, batch_size: int) -> dict:
+    """Load one backend and time generation over the prompt set (runs inside the child process)."""
+    from granite_client import create_local_pipeline, LOCAL_GENERATION_KWARGS
+
+    baseline_mb = peak_rss_mb()
+    load_start = time.time()
+    local_pipeline = create_local_pipeline(backend)
+    load_seconds = time.time() - load_start
+
+    tokenizer = local_pipeline.tokenizer
+    prompts = [f"Financial Question: {question}\n\nProfessional Financial Advice:" for question in QUESTIONS]
+
+    # Warm-up pass so lazy initialisation is not counted
+    local_pipeline(prompts[:1], batch_size=1, **LOCAL_GENERATION_KWARGS)
+
+    generated_tokens = 0
+    latencies = []
+    start = time.time()
+
+    for _ in range(rounds):
+        for offset in range(0, len(prompts), batch_size):
+            batch = prompts[offset:offset + batch_size]
+            batch_start = time.time()
+            outputs = local_pipeline(batch, batch_size=len(batch), **LOCAL_GENERATION_KWARGS)
+            latencies.append(time.time() - batch_start)
+
+            for prompt, output in zip(batch, outputs):
+                text = output[0]["generated_text"]
+                generated_tokens += len(tokenizer.encode(text)) - len(tokenizer.encode(prompt))
+
+    elapsed = time.time() - start
+    latencies.sort()
+
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 2),
+        "prompts": len(prompts) * rounds,
+        "batch_size": batch_size,
+        "generated_tokens": generated_tokens,
+        "elapsed_seconds": round(elapsed, 2),
+        "tokens_per_second": round(generated_tokens / elapsed, 1) if elapsed else None,
+        "p50_batch_seconds": round(latencies[len(latencies) // 2], 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "model_rss_mb": round(peak_rss_mb() - baseline_mb, 1)
+    }
+
+def run_in_subprocess(backend: str, rounds: int, batch_size: int) -> dict:
+    """Run one backend in a fresh interpreter and parse its JSON result."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", backend,
+               "--rounds", str(rounds), "--batch-size", str(batch_size)]
+    completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+        return {"backend": backend, "error": error}
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def print_table(results: list):
+    """Print a comparison table."""
+    print(f"\n{'Backend':<12} {'Load s':>8} {'Tokens/s':>10} {'p50 batch s':>12} {'Peak MB':>9} {'Model MB':>9}")
+    print("-" * 64)
+    for result in results:
+        if "error" in result:
+            print(f"{result['backend']:<12} ❌ {result['error']}")
+            continue
+        print(f"{result['backend']:<12} {result['load_seconds']:>8} {result['tokens_per_second']:>10} "
+              f"{result['p50_batch_seconds']:>12} {result['peak_rss_mb']:>9} {result['model_rss_mb']:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare local generation backends")
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the prompt set")
+    parser.add_argument("--batch-size", type=int, default=1, help="prompts per pipeline call")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, args.rounds, args.batch_size)))
+        return
+
+    print("🏁 Benchmarking local generation backends")
+    print("=" * 50)
+
+    results = []
+    for backend in args.backends:
+        print(f"Running {backend}...")
+        results.append(run_in_subprocess(backend, args.rounds, args.batch_size))
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the storage and analytics hot paths of BusinessTracker and SavingsPlanner.
+
+Runs offline against synthetic ledgers in a scratch directory, with every AI helper stubbed, so
+only file I/O, JSON and the pure-Python aggregation are timed. For each dataset size it records
+the best and median wall time and the peak traced memory (tracemalloc, measured in a separate
+run so tracing does not skew the timings).
+
+Savings goals live one per file, so the goal directory holds size/100 goals (at least 10)
+rather than `size` files; every other dataset has `size` rows.
+
+Usage (from backend/):
+    python benchmarks/bench_storage.py
+    python benchmarks/bench_storage.py --sizes 1000,10000,100000,1000000 --json results.json
+    python benchmarks/bench_storage.py --baseline before.json --max-regression 0.25
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from dataclasses import asdict
+from typing import Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from business_tracker import BusinessTracker, BusinessTransaction
+from savings_planner import SavingsPlanner, SavingsGoal, SavingsEntry
+
+BUSINESS_ID = "biz_bench"
+USER_ID = "bench_user"
+GOAL_ID = f"goal_{USER_ID}_1"
+CATEGORIES = ["sales", "purchases", "rent", "salaries", "utilities", "marketing"]
+
+def synthetic_transaction(rng: random.Random, index: int, now: datetime) -> BusinessTransaction:
+    """One ledger row dated within the last year, shaped like _record_transaction's output."""
+    amount = round(rng.uniform(500, 50000), 2)
+    gst_rate = rng.choice([0.0, 5.0, 12.0, 18.0])
+    day = now - timedelta(days=rng.randint(0, 364))
+    return BusinessTransaction(
+        transaction_id=f"txn_{BUSINESS_ID}_{index}", business_id=BUSINESS_ID,
+        transaction_type=rng.choice(["credit", "debit"]), amount=amount,
+        description="Synthetic row", category=rng.choice(CATEGORIES), date=day.strftime("%Y-%m-%d"),
+        gst_applicable=gst_rate > 0, gst_rate=gst_rate, gst_amount=round(amount * gst_rate / 100, 2),
+        party_name=f"Party {rng.randint(1, 500)}", party_gst_number="", invoice_number=f"INV-{index}",
+        created_at=day.isoformat()
+    )
+
+def synthetic_entry(rng: random.Random, goal_id: str, index: int, now: datetime) -> SavingsEntry:
+    day = now - timedelta(days=rng.randint(0, 364))
+    return SavingsEntry(
+        entry_id=f"entry_{goal_id}_{index}", goal_id=goal_id, amount=round(rng.uniform(100, 5000), 2),
+        saving_method=rng.choice(["gpay", "cash", "bank_account"]), date=day.strftime("%Y-%m-%d"),
+        description="Synthetic saving", created_at=day.isoformat()
+    )
+
+def synthetic_goal(goal_id: str, user_id: str, now: datetime) -> SavingsGoal:
+    return SavingsGoal(
+        goal_id=goal_id, user_id=user_id, goal_name="Synthetic goal", target_amount=1000000,
+        monthly_salary=80000, monthly_saving_target=20000, saving_method="bank_account",
+        start_date=(now - timedelta(days=365)).strftime("%Y-%m-%d"),
+        target_date=(now + timedelta(days=365)).strftime("%Y-%m-%d"),
+        description="Synthetic goal", created_at=(now - timedelta(days=365)).isoformat()
+    )
+
+def write_json(path: str, rows: List):
+    with open(path, "w") as f:
+        json.dump(rows, f)
+
+def build_dataset(root: str, size: int, seed: int):
+    """Write a business ledger, a savings goal with entries and a directory of other users' goals."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    business_dir = os.path.join(root, "data", "business")
+    savings_dir = os.path.join(root, "data", "savings")
+    os.makedirs(business_dir, exist_ok=True)
+    os.makedirs(savings_dir, exist_ok=True)
+
+    write_json(os.path.join(business_dir, f"transactions_{BUSINESS_ID}.json"),
+               [asdict(synthetic_transaction(rng, i, now)) for i in range(size)])
+    write_json(os.path.join(savings_dir, f"entries_{GOAL_ID}.json"),
+               [asdict(synthetic_entry(rng, GOAL_ID, i, now)) for i in range(size)])
+
+    goal_count = max(10, size // 100)
+    for i in range(goal_count):
+        goal_id = GOAL_ID if i == 0 else f"goal_user{i}_{i}"
+        user_id = USER_ID if i == 0 else f"user{i}"
+        with open(os.path.join(savings_dir, f"goal_{goal_id}.json"), "w") as f:
+            json.dump(asdict(synthetic_goal(goal_id, user_id, now)), f)
+
+def stub_ai(tracker: BusinessTracker, planner: SavingsPlanner):
+    """Replace AI helpers on the instances so benchmarks never reach a provider."""
+    tracker._get_ai_gst_analysis = lambda *args: {"analysis": "stub"}
+    tracker._get_ai_business_insights = lambda *args: {"insights": "stub"}
+    planner._get_ai_progress_analysis = lambda *args: {"suggestions": [], "reduce_areas": [], "increase_areas": []}
+    planner._get_ai_motivation = lambda *args: "stub"
+
+def benchmark_cases(tracker: BusinessTracker, planner: SavingsPlanner, seed: int) -> Dict[str, Callable]:
+    """name -> zero-argument callable exercising one hot path."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    counter = iter(range(10 ** 9))
+
+    return {
+        "save_transaction": lambda: tracker._save_transaction(synthetic_transaction(rng, -1 - next(counter), now)),
+        "load_business_transactions": lambda: tracker._load_business_transactions(BUSINESS_ID),
+        "get_gst_summary": lambda: tracker.get_gst_summary(BUSINESS_ID, str(now.month), str(now.year)),
+        "get_business_analytics": lambda: tracker.get_business_analytics(BUSINESS_ID, "year"),
+        "save_entry": lambda: planner._save_entry(synthetic_entry(rng, GOAL_ID, -1 - next(counter), now)),
+        "load_entries": lambda: planner._load_entries(GOAL_ID),
+        "load_user_goals": lambda: planner._load_user_goals(USER_ID),
+        "check_savings_notifications": lambda: planner.check_savings_notifications(USER_ID)
+    }
+
+def measure(func: Callable, repeat: int) -> Dict:
+    """Best/median seconds over `repeat` calls, then one traced call for peak memory."""
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "best_ms": round(min(timings) * 1000, 2),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "peak_mb": round(peak / (1024 * 1024), 2)
+    }
+
+def run_size(size: int, repeat: int, seed: int, only: List[str]) -> Dict:
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="taxora_bench_") as root:
+        build_dataset(root, size, seed)
+        # Both classes use data paths relative to the working directory
+        os.chdir(root)
+        try:
+            tracker, planner = BusinessTracker(), SavingsPlanner()
+            stub_ai(tracker, planner)
+            cases = benchmark_cases(tracker, planner, seed)
+            return {name: measure(func, repeat) for name, func in cases.items() if not only or name in only}
+        finally:
+            os.chdir(original_cwd)
+
+def find_regressions(baseline: Dict, results: Dict, max_regression: float) -> List[str]:
+    """Cases whose median time or peak memory grew by more than max_regression (a fraction)."""
+    regressions = []
+    for size, cases in results["sizes"].items():
+        for name, stats in cases.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            for metric in ("median_ms", "peak_mb"):
+                if before[metric] > 0 and stats[metric] > before[metric] * (1 + max_regression):
+                    regressions.append(f"{name} @ {size} rows: {metric} {before[metric]} -> {stats[metric]}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark storage and analytics hot paths on synthetic data")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated row counts (up to 1000000)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per case")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default="", help="comma-separated case names to run")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="earlier --json results to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed growth before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+
+    print("💾 Benchmarking storage hot paths")
+    print("=" * 50)
+
+    results = {"sizes": {}}
+    for size in sizes:
+        print(f"\n{size:,} rows")
+        results["sizes"][str(size)] = run_size(size, args.repeat, args.seed, only)
+        for name, stats in results["sizes"][str(size)].items():
+            print(f"  {name:<30} best {stats['best_ms']:>10} ms  median {stats['median_ms']:>10} ms  peak {stats['peak_mb']:>8} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(json.load(f), results, args.max_regression)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions over {args.max_regression:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {args.max_regression:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
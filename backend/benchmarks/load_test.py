@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Load test for the Taxora API: a weighted mix of chat, business, savings and voice requests.
+
+Every AI call goes to the local stub provider server, so runs cost no quota and are repeatable.
+By default the script starts the stub and a uvicorn instance of main.py in a scratch data
+directory; pass --base-url to drive an app you started yourself (point its provider URLs at a
+stub first, see stub_provider_server.py).
+
+Before the timed run it seeds one business ledger and one savings goal of --ledger-size rows, so
+analytics and savings timings reflect realistic data volumes. Results (throughput, p50/p95/p99
+per endpoint, plus git commit and config) go to --json for comparison between commits.
+
+Usage (from backend/):
+    python benchmarks/load_test.py --duration 30 --concurrency 16 --json before.json
+    python benchmarks/load_test.py --ledger-size 5000 --mix chat=1,analytics=3 --json after.json
+    python benchmarks/load_test.py --compare before.json after.json
+"""
+
+import os
+import io
+import sys
+import json
+import math
+import time
+import wave
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from stub_provider_server import create_server
+
+DEFAULT_MIX = "chat=40,transaction=20,analytics=20,savings_entry=15,voice=5"
+SEED_BATCH_SIZE = 500
+
+CHAT_MESSAGES = [
+    "How can I save tax under section 80C?",
+    "Should I pick the old or the new tax regime?",
+    "How much emergency fund do I need?",
+    "Is ELSS better than PPF for me?",
+    "How do I budget a 50,000 rupee salary?",
+    "What GST rate applies to restaurant services?"
+]
+CATEGORIES = ["sales", "purchases", "rent", "salaries", "utilities", "marketing"]
+GST_SECTORS = ["goods_5", "goods_12", "goods_18", "services_18"]
+
+def free_port() -> int:
+    """An unused localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'chat=40,voice=5' -> {'chat': 40.0, 'voice': 5.0}."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name.strip()} (choose from {', '.join(ENDPOINTS)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def sample_audio(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    """A short mono WAV tone; the stub transcribes anything, so content does not matter."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        frames = bytearray()
+        for i in range(int(seconds * rate)):
+            sample = int(8000 * math.sin(2 * math.pi * 440 * i / rate))
+            frames += sample.to_bytes(2, "little", signed=True)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+def transaction_data(rng: random.Random, day: date) -> Dict:
+    """One random ledger row in the shape /business/transaction expects."""
+    credit = rng.random() < 0.5
+    return {
+        "transaction_type": "credit" if credit else "debit",
+        "amount": round(rng.uniform(500, 50000), 2),
+        "description": "Load test sale" if credit else "Load test expense",
+        "category": rng.choice(CATEGORIES),
+        "date": day.isoformat(),
+        "gst_applicable": rng.random() < 0.7,
+        "gst_sector": rng.choice(GST_SECTORS),
+        "party_name": f"Party {rng.randint(1, 50)}",
+        "invoice_number": f"INV-{rng.randint(1000, 99999)}"
+    }
+
+class LoadTest:
+    """Shared state for one run: seeded ids, the request mix and recorded latencies."""
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random, mix: Dict[str, float]):
+        self.client = client
+        self.rng = rng
+        self.mix = mix
+        self.audio = sample_audio()
+        self.session_ids: List[str] = []
+        self.business_id: Optional[str] = None
+        self.goal_id: Optional[str] = None
+        self.latencies: Dict[str, List[float]] = {name: [] for name in mix}
+        self.errors: Dict[str, int] = {name: 0 for name in mix}
+
+    async def post(self, path: str, **kwargs) -> Dict:
+        response = await self.client.post(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def seed(self, ledger_size: int, sessions: int):
+        """Create chat sessions, one business with a ledger and one savings goal with entries."""
+        for i in range(sessions):
+            data = await self.post("/start", json={"name": f"Load User {i}", "role": self.rng.choice(["student", "professional", "general"])})
+            self.session_ids.append(data["session_id"])
+
+        data = await self.post("/business/profile", json={
+            "business_name": "Load Test Traders", "owner_name": "Load Tester", "gst_number": "33ABCDE1234F1Z5",
+            "business_type": "retail", "sector": "goods"
+        })
+        self.business_id = data["business_id"]
+
+        data = await self.post("/savings/goal", json={"user_id": "load_test", "goal_data": {
+            "goal_name": "Load test goal", "target_amount": 10000000, "monthly_salary": 80000,
+            "monthly_saving_target": 20000, "saving_method": "bank_account",
+            "target_date": (date.today() + timedelta(days=365 * 5)).isoformat(), "description": "Seeded by load_test.py"
+        }})
+        self.goal_id = data["goal_id"]
+
+        today = date.today()
+        for start in range(0, ledger_size, SEED_BATCH_SIZE):
+            count = min(SEED_BATCH_SIZE, ledger_size - start)
+            rows = [transaction_data(self.rng, today - timedelta(days=self.rng.randint(0, 365))) for _ in range(count)]
+            await self.post("/business/transactions", json={"business_id": self.business_id, "transactions": rows}, timeout=300)
+
+        # /savings/entry has no batch form, so entries are added one at a time
+        for i in range(ledger_size):
+            await self.post("/savings/entry", json={"goal_id": self.goal_id, "entry_data": self.savings_entry(today - timedelta(days=i % 365))})
+
+    def savings_entry(self, day: date) -> Dict:
+        return {"amount": round(self.rng.uniform(100, 5000), 2), "saving_method": self.rng.choice(["gpay", "cash", "bank_account"]),
+                "date": day.isoformat(), "description": "Load test saving"}
+
+    async def chat(self) -> httpx.Response:
+        return await self.client.post("/chat", json={"session_id": self.rng.choice(self.session_ids), "message": self.rng.choice(CHAT_MESSAGES)})
+
+    async def transaction(self) -> httpx.Response:
+        return await self.client.post("/business/transaction", json={"business_id": self.business_id, "transaction_data": transaction_data(self.rng, date.today())})
+
+    async def analytics(self) -> httpx.Response:
+        return await self.client.get(f"/business/analytics/{self.business_id}", params={"period": self.rng.choice(["month", "quarter", "year"])})
+
+    async def savings_entry_request(self) -> httpx.Response:
+        return await self.client.post("/savings/entry", json={"goal_id": self.goal_id, "entry_data": self.savings_entry(date.today())})
+
+    async def voice(self) -> httpx.Response:
+        return await self.client.post("/voice/chat", params={"session_id": self.rng.choice(self.session_ids), "include_tamil": "true"},
+                                      files={"file": ("question.wav", self.audio, "audio/wav")})
+
+    async def worker(self, stop_at: float, remaining: List[int]):
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.monotonic() < stop_at:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+
+            name = self.rng.choices(names, weights)[0]
+            start_time = time.monotonic()
+            try:
+                response = await ENDPOINTS[name](self)
+                ok = response.status_code < 400 and response.json().get("success", True) is not False
+            except (httpx.HTTPError, ValueError):
+                ok = False
+            self.latencies[name].append(time.monotonic() - start_time)
+            if not ok:
+                self.errors[name] += 1
+
+    async def run(self, concurrency: int, duration: float, total_requests: Optional[int]) -> float:
+        """Run the mix with `concurrency` workers; returns elapsed seconds."""
+        stop_at = time.monotonic() + (duration if total_requests is None else float("inf"))
+        remaining = [total_requests] if total_requests is not None else None
+        start_time = time.monotonic()
+        await asyncio.gather(*(self.worker(stop_at, remaining) for _ in range(concurrency)))
+        return time.monotonic() - start_time
+
+    def summary(self, elapsed: float) -> Dict:
+        endpoints = {}
+        for name, values in self.latencies.items():
+            if not values:
+                continue
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1)
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {"elapsed_seconds": round(elapsed, 2), "total_requests": total,
+                "total_throughput_rps": round(total / elapsed, 2) if elapsed else 0.0, "endpoints": endpoints}
+
+ENDPOINTS = {
+    "chat": LoadTest.chat,
+    "transaction": LoadTest.transaction,
+    "analytics": LoadTest.analytics,
+    "savings_entry": LoadTest.savings_entry_request,
+    "voice": LoadTest.voice
+}
+
+def start_stub(args) -> str:
+    """Start the stub provider server on a background thread; returns its base URL."""
+    port = free_port()
+    server = create_server("127.0.0.1", port, latency_distribution="lognormal", latency_ms=args.stub_latency_ms,
+                           jitter_ms=args.stub_latency_ms / 3, rate_429=args.stub_rate_429)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}"
+
+def start_app(stub_url: str, data_dir: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    """Run main.py under uvicorn with every provider pointed at the stub; returns (process, base URL)."""
+    port = free_port()
+    env = dict(os.environ,
+               DEFAULT_AI_PROVIDER="gemini", AI_FALLBACK_ORDER="gemini,granite",
+               GEMINI_API_KEY="AIzaLoadTestStubKey", GEMINI_API_URL=f"{stub_url}/v1beta/models",
+               GEMINI_RATE_LIMIT_RPM="100000", GEMINI_RATE_LIMIT_RPD="10000000",
+               HUGGINGFACE_API_KEY="stub", HUGGINGFACE_API_URL=f"{stub_url}/models",
+               OLLAMA_BASE_URL=stub_url)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=data_dir, env=env
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/status")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"API did not become ready within {timeout:.0f}s")
+
+def git_commit() -> Optional[str]:
+    completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True)
+    return completed.stdout.strip() or None
+
+def compare(old_path: str, new_path: str):
+    """Print per-endpoint p50/p95/p99 and throughput changes between two result files."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    width = max([len(name) for name in new["endpoints"]] + [8]) + 2
+    print(f"📊 {old.get('commit')} -> {new.get('commit')}")
+    print(f"{'endpoint':<{width}}{'metric':<16}{'old':>10}{'new':>10}{'change':>10}")
+    for name in new["endpoints"]:
+        if name not in old["endpoints"]:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = old["endpoints"][name][metric], new["endpoints"][name][metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{name:<{width}}{metric:<16}{before:>10}{after:>10}{change:>10}")
+
+async def run(args) -> Dict:
+    mix = parse_mix(args.mix)
+    process = None
+    data_dir = None
+    base_url = args.base_url
+
+    if base_url is None:
+        stub_url = start_stub(args)
+        data_dir = tempfile.TemporaryDirectory(prefix="taxora_load_")
+        process, base_url = start_app(stub_url, data_dir.name, args.workers)
+        print(f"🧪 Stub providers on {stub_url}, API on {base_url} (data in {data_dir.name})")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_ready(client)
+            test = LoadTest(client, random.Random(args.seed), mix)
+
+            print(f"🌱 Seeding {args.ledger_size} ledger rows and savings entries...")
+            seed_start = time.monotonic()
+            await test.seed(args.ledger_size, args.sessions)
+            print(f"   done in {time.monotonic() - seed_start:.1f}s")
+
+            target = f"{args.requests} requests" if args.requests else f"{args.duration:.0f}s"
+            print(f"🚀 Running {target} at concurrency {args.concurrency}, mix {args.mix}")
+            elapsed = await test.run(args.concurrency, args.duration, args.requests)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        if data_dir:
+            data_dir.cleanup()
+
+    results = {
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+        **test.summary(elapsed)
+    }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Taxora API against stub AI providers")
+    parser.add_argument("--base-url", help="drive an already running API instead of starting one")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run (ignored with --requests)")
+    parser.add_argument("--requests", type=int, help="stop after this many requests instead of a duration")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--ledger-size", type=int, default=200, help="transactions and savings entries to seed")
+    parser.add_argument("--sessions", type=int, default=20, help="chat sessions to create")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the request mix and data")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request client timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting the API")
+    parser.add_argument("--stub-latency-ms", type=float, default=300, help="mean stub provider latency")
+    parser.add_argument("--stub-rate-429", type=float, default=0.0, help="share of stub calls answered with 429")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = asyncio.run(run(args))
+
+    print(f"\n📈 {results['total_requests']} requests in {results['elapsed_seconds']}s "
+          f"({results['total_throughput_rps']} req/s)")
+    print(f"{'endpoint':<15}{'reqs':>7}{'errors':>8}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, stats in results["endpoints"].items():
+        print(f"{name:<15}{stats['requests']:>7}{stats['errors']:>8}{stats['throughput_rps']:>8}"
+              f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded request trace (see request_recorder.py) against a local API backed by stub providers.
+
+Requests are re-issued at their recorded inter-arrival times divided by --speed (--speed 0 sends
+them back to back, at most --concurrency in flight). Ids created during the recording (session,
+business, goal and tax record ids) are mapped to the ids the replayed instance hands out, and a
+request that uses such an id waits for the request that created it. Requests that reference ids
+created before the recording started will fail against a fresh instance; they are counted as errors.
+
+Results use the same format as load_test.py, so builds can be compared with --compare.
+
+Usage (from backend/):
+    python benchmarks/replay_trace.py data/traces/requests.jsonl --speed 2 --json build_a.json
+    python benchmarks/replay_trace.py data/traces/requests.jsonl --speed 0 --concurrency 16 --json build_b.json
+    python benchmarks/replay_trace.py --compare build_a.json build_b.json
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import start_stub, start_app, wait_until_ready, percentile, git_commit, compare
+
+def load_trace(path: str, limit: Optional[int]) -> List[Dict]:
+    """Replayable records in start-time order (records whose body was too large are skipped)."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if not record.get("body_truncated"):
+                    records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    return records[:limit] if limit else records
+
+class Replayer:
+    """Re-issues trace records, remapping recorded ids and collecting per-endpoint latencies."""
+
+    def __init__(self, client: httpx.AsyncClient, records: List[Dict]):
+        self.client = client
+        self.records = records
+        self.id_map: Dict[str, str] = {}
+        # Recorded id -> future resolved once the request that created it has been replayed
+        self.creators: Dict[str, asyncio.Future] = {}
+        self.created_by: Dict[str, int] = {}
+        for index, record in enumerate(records):
+            for old_id in record.get("response_ids", {}).values():
+                if old_id not in self.created_by:
+                    self.created_by[old_id] = index
+                    self.creators[old_id] = asyncio.get_running_loop().create_future()
+
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.status_changes: Dict[str, int] = {}
+
+    def endpoint_name(self, record: Dict) -> str:
+        """'POST /business/analytics/{id}' style key, with recorded ids collapsed."""
+        segments = ["{id}" if segment in self.created_by else segment for segment in record["path"].split("/")]
+        return f"{record['method']} {'/'.join(segments)}"
+
+    def remap(self, text: str) -> str:
+        for old_id, new_id in self.id_map.items():
+            if old_id in text:
+                text = text.replace(old_id, new_id)
+        return text
+
+    async def wait_for_dependencies(self, index: int, record: Dict):
+        """Wait until every recorded id this request uses has been created by the replay."""
+        text = record["path"] + record.get("query", "") + json.dumps(record.get("json", ""))
+        for old_id, creator_index in self.created_by.items():
+            if creator_index < index and old_id in text:
+                await self.creators[old_id]
+
+    async def send(self, record: Dict) -> httpx.Response:
+        url = self.remap(record["path"])
+        if record.get("query"):
+            url += "?" + self.remap(record["query"])
+
+        if "json" in record:
+            body = self.remap(json.dumps(record["json"])).encode("utf-8")
+        elif "body_b64" in record:
+            body = base64.b64decode(record["body_b64"])
+        else:
+            body = None
+
+        headers = {"content-type": record["content_type"]} if record.get("content_type") else {}
+        return await self.client.request(record["method"], url, content=body, headers=headers)
+
+    async def replay_one(self, index: int, record: Dict):
+        name = self.endpoint_name(record)
+        ok = False
+        try:
+            await self.wait_for_dependencies(index, record)
+            start_time = time.monotonic()
+            try:
+                response = await self.send(record)
+            finally:
+                self.latencies.setdefault(name, []).append(time.monotonic() - start_time)
+
+            ok = response.status_code < 400
+            if response.status_code != record.get("status"):
+                self.status_changes[name] = self.status_changes.get(name, 0) + 1
+
+            if record.get("response_ids") and response.headers.get("content-type", "").startswith("application/json"):
+                data = response.json()
+                sources = [data, data.get("data") if isinstance(data.get("data"), dict) else {}]
+                for field, old_id in record["response_ids"].items():
+                    new_id = next((source[field] for source in sources if isinstance(source.get(field), str)), None)
+                    if new_id:
+                        self.id_map[old_id] = new_id
+        except (httpx.HTTPError, ValueError):
+            pass
+        finally:
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            # Release dependants even on failure; they will fail on the unmapped id instead of hanging
+            for old_id in record.get("response_ids", {}).values():
+                if self.created_by.get(old_id) == index and not self.creators[old_id].done():
+                    self.creators[old_id].set_result(None)
+
+    async def run(self, speed: float, concurrency: int) -> float:
+        """Replay every record; returns elapsed seconds."""
+        semaphore = asyncio.Semaphore(concurrency)
+        first_ts = self.records[0]["ts"]
+        start_time = time.monotonic()
+
+        async def scheduled(index: int, record: Dict):
+            if speed > 0:
+                delay = (record["ts"] - first_ts) / speed - (time.monotonic() - start_time)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.replay_one(index, record)
+            else:
+                async with semaphore:
+                    await self.replay_one(index, record)
+
+        await asyncio.gather(*(scheduled(index, record) for index, record in enumerate(self.records)))
+        return time.monotonic() - start_time
+
+    def summary(self, elapsed: float) -> Dict:
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors.get(name, 0),
+                "status_changed": self.status_changes.get(name, 0),
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1)
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {"elapsed_seconds": round(elapsed, 2), "total_requests": total,
+                "total_throughput_rps": round(total / elapsed, 2) if elapsed else 0.0, "endpoints": endpoints}
+
+async def run(args) -> Dict:
+    records = load_trace(args.trace, args.limit)
+    if not records:
+        raise SystemExit(f"No replayable records in {args.trace}")
+
+    process = None
+    data_dir = None
+    base_url = args.base_url
+    if base_url is None:
+        stub_url = start_stub(args)
+        data_dir = tempfile.TemporaryDirectory(prefix="taxora_replay_")
+        process, base_url = start_app(stub_url, data_dir.name, args.workers)
+        print(f"🧪 Stub providers on {stub_url}, API on {base_url} (data in {data_dir.name})")
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+            await wait_until_ready(client)
+            replayer = Replayer(client, records)
+            recorded_span = records[-1]["ts"] - records[0]["ts"]
+            pace = f"{args.speed}x recorded pace" if args.speed > 0 else f"back to back, concurrency {args.concurrency}"
+            print(f"🔁 Replaying {len(records)} requests ({recorded_span:.0f}s recorded) {pace}")
+            elapsed = await replayer.run(args.speed, args.concurrency)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        if data_dir:
+            data_dir.cleanup()
+
+    return {
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+        **replayer.summary(elapsed)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded request trace against stub AI providers")
+    parser.add_argument("trace", nargs="?", help="JSONL trace written by request_recorder.py")
+    parser.add_argument("--base-url", help="replay against an already running API instead of starting one")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression (2 = twice as fast, 0 = no gaps)")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight when --speed 0")
+    parser.add_argument("--limit", type=int, help="replay only the first N requests")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request client timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting the API")
+    parser.add_argument("--stub-latency-ms", type=float, default=300, help="mean stub provider latency")
+    parser.add_argument("--stub-rate-429", type=float, default=0.0, help="share of stub calls answered with 429")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if not args.trace:
+        parser.error("a trace file is required unless --compare is given")
+
+    results = asyncio.run(run(args))
+
+    print(f"\n📈 {results['total_requests']} requests in {results['elapsed_seconds']}s "
+          f"({results['total_throughput_rps']} req/s)")
+    print(f"{'endpoint':<40}{'reqs':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, stats in results["endpoints"].items():
+        print(f"{name:<40}{stats['requests']:>7}{stats['errors']:>8}{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -206,50 +206,14 @@ class BusinessTracker:
     def add_transaction(self, business_id: str, transaction_data: Dict) -> Dict:
         """Add a business transaction with GST calculation."""
         try:
-            # Generate unique transaction ID
-            transaction_id = f"txn_{business_id}_{int(datetime.now().timestamp())}"
-            
-            # Calculate GST if applicable
-            gst_applicable = transaction_data.get("gst_applicable", False)
-            gst_rate = 0.0
-            gst_amount = 0.0
-            
-            if gst_applicable and "gst_sector" in transaction_data:
-                gst_rate = self.gst_rates.get(transaction_data["gst_sector"], 0.0)
-                base_amount = float(transaction_data["amount"])
-                gst_amount = (base_amount * gst_rate) / 100
-            
-            # Create transaction
-            transaction = BusinessTransaction(
-                transaction_id=transaction_id,
-                business_id=business_id,
-                transaction_type=transaction_data["transaction_type"],
-                amount=float(transaction_data["amount"]),
-                description=transaction_data["description"],
-                category=transaction_data.get("category", "General"),
-                date=transaction_data.get("date", datetime.now().strftime("%Y-%m-%d")),
-                gst_applicable=gst_applicable,
-                gst_rate=gst_rate,
-                gst_amount=gst_amount,
-                party_name=transaction_data.get("party_name", ""),
-                party_gst_number=transaction_data.get("party_gst_number", ""),
-                invoice_number=transaction_data.get("invoice_number", ""),
-                created_at=datetime.now().isoformat()
-            )
-            
-            # Save transaction
-            self._save_transaction(transaction)
-            
-            # Update GST records if applicable
-            if gst_applicable:
-                self._update_gst_records(transaction)
+            transaction = self._record_transaction(business_id, transaction_data)
             
             # Get AI insights
             ai_insights = self._get_ai_transaction_insights(business_id, transaction)
             
             return {
                 "success": True,
-                "transaction_id": transaction_id,
+                "transaction_id": transaction.transaction_id,
                 "transaction": asdict(transaction),
                 "ai_insights": ai_insights,
                 "message": "Transaction added successfully!"
@@ -258,6 +222,110 @@ class BusinessTracker:
         except Exception as e:
             logger.error(f"Error adding transaction: {e}")
             return {"success": False, "error": str(e)}
+
+    def add_transactions(self, business_id: str, transactions_data: List[Dict], index_offset: int = 0,
+                         id_prefix: Optional[str] = None) -> Dict:
+        """Add many business transactions at once, sharing batched AI insight calls.
+
+        index_offset numbers this batch after earlier ones from the same import, keeping IDs unique.
+        With id_prefix the IDs are fixed (txn_<business>_<prefix>_<index>) and rows already saved
+        under them are skipped and listed in existing_ids, so retrying a batch adds no duplicates.
+        """
+        try:
+            if not transactions_data:
+                return {"success": False, "error": "No transactions provided"}
+
+            saved_ids = set()
+            if id_prefix:
+                saved_ids = {t.transaction_id for t in self._load_business_transactions(business_id)}
+
+            transactions = []
+            existing_ids = []
+            errors = []
+            for index, transaction_data in enumerate(transactions_data, start=index_offset):
+                transaction_id = f"txn_{business_id}_{id_prefix}_{index}" if id_prefix else None
+                if transaction_id in saved_ids:
+                    existing_ids.append(transaction_id)
+                    continue
+                try:
+                    transactions.append(self._record_transaction(business_id, transaction_data, suffix=f"_{index}",
+                                                                 transaction_id=transaction_id))
+                except Exception as e:
+                    errors.append({"index": index, "error": str(e)})
+
+            if not transactions and not existing_ids:
+                return {
+                    "success": False,
+                    "error": f"None of the {len(errors)} transactions could be added",
+                    "errors": errors
+                }
+
+            # One AI call per batch instead of one per transaction
+            from insight_batcher import get_insight_batcher
+            insights = get_insight_batcher().get_insights_bulk(business_id, transactions) if transactions else []
+
+            return {
+                "success": True,
+                "added_count": len(transactions),
+                "transactions": [
+                    {
+                        "transaction_id": transaction.transaction_id,
+                        "transaction": asdict(transaction),
+                        "ai_insights": ai_insights
+                    }
+                    for transaction, ai_insights in zip(transactions, insights)
+                ],
+                "existing_ids": existing_ids,
+                "errors": errors,
+                "message": f"{len(transactions)} transactions added successfully!"
+            }
+
+        except Exception as e:
+            logger.error(f"Error adding transactions: {e}")
+            return {"success": False, "error": str(e)}
+
+    def _record_transaction(self, business_id: str, transaction_data: Dict, suffix: str = "",
+                            transaction_id: Optional[str] = None) -> BusinessTransaction:
+        """Build, save and GST-track a transaction without AI insights."""
+        # Generate unique transaction ID
+        transaction_id = transaction_id or f"txn_{business_id}_{int(datetime.now().timestamp())}{suffix}"
+        
+        # Calculate GST if applicable
+        gst_applicable = transaction_data.get("gst_applicable", False)
+        gst_rate = 0.0
+        gst_amount = 0.0
+        
+        if gst_applicable and "gst_sector" in transaction_data:
+            gst_rate = self.gst_rates.get(transaction_data["gst_sector"], 0.0)
+            base_amount = float(transaction_data["amount"])
+            gst_amount = (base_amount * gst_rate) / 100
+        
+        # Create transaction
+        transaction = BusinessTransaction(
+            transaction_id=transaction_id,
+            business_id=business_id,
+            transaction_type=transaction_data["transaction_type"],
+            amount=float(transaction_data["amount"]),
+            description=transaction_data["description"],
+            category=transaction_data.get("category", "General"),
+            date=transaction_data.get("date", datetime.now().strftime("%Y-%m-%d")),
+            gst_applicable=gst_applicable,
+            gst_rate=gst_rate,
+            gst_amount=gst_amount,
+            party_name=transaction_data.get("party_name", ""),
+            party_gst_number=transaction_data.get("party_gst_number", ""),
+            invoice_number=transaction_data.get("invoice_number", ""),
+            created_at=datetime.now().isoformat()
+        )
+        
+        # Save transaction
+        self._save_transaction(transaction)
+        
+        # Update GST records if applicable
+        if gst_applicable:
+            self._update_gst_records(transaction)
+
+        return transaction
     
     def get_gst_summary(self, business_id: str, month: str, year: str) -> Dict:
         """Get GST summary for a specific month."""
@@ -615,46 +683,11 @@ class BusinessTracker:
             return {"success": False, "error": str(e)}
 
     def _get_ai_transaction_insights(self, business_id: str, transaction: BusinessTransaction) -> Dict:
-        """Get AI insights for a transaction."""
+        """Get AI insights for a transaction (coalesced with other pending transactions of the business)."""
         try:
-            from ai_provider_manager import get_ai_manager
-
-            ai_manager = get_ai_manager()
-
-            prompt = f"""
-            Analyze this business transaction and provide insights:
-
-            Type: {transaction.transaction_type}
-            Amount: ₹{transaction.amount:,.2f}
-            Category: {transaction.category}
-            GST: {transaction.gst_rate}% (₹{transaction.gst_amount:,.2f})
-            Description: {transaction.description}
-
-            Provide:
-            1. Transaction categorization suggestions
-            2. Tax optimization tips
-            3. Cash flow impact analysis
-
-            Format as JSON with keys: categorization, tax_tips, cash_flow_impact
-            """
+            from insight_batcher import get_insight_batcher
 
-            messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
-
-            if response["success"]:
-                try:
-                    import re
-                    json_match = re.search(r'\{.*\}', response["response"], re.DOTALL)
-                    if json_match:
-                        return json.loads(json_match.group())
-                except:
-                    pass
-
-            return {
-                "categorization": "Transaction recorded successfully",
-                "tax_tips": "Ensure proper documentation for tax purposes",
-                "cash_flow_impact": "Monitor overall cash flow trends"
-            }
+            return get_insight_batcher().get_insights(business_id, transaction)
 
         except Exception as e:
             logger.error(f"Error getting AI transaction insights: {e}")
@@ -668,6 +701,7 @@ class BusinessTracker:
         """Get AI analysis of GST situation."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -689,7 +723,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -718,6 +752,7 @@ class BusinessTracker:
         """Get AI advice for GST return."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -738,7 +773,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -767,6 +802,7 @@ class BusinessTracker:
         """Get AI insights for business performance."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -788,7 +824,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -944,6 +980,7 @@ class BusinessTracker:
         """Get AI recommendations for tax setup."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -965,7 +1002,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -996,6 +1033,7 @@ class BusinessTracker:
         """Get AI insights for tax record."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -1018,7 +1056,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -1047,6 +1085,7 @@ class BusinessTracker:
         """Get AI analysis of comprehensive tax situation."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -1071,7 +1110,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -1102,6 +1141,7 @@ class BusinessTracker:
         """Get AI recommendations for tax planning."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -1121,7 +1161,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -1152,6 +1192,7 @@ class BusinessTracker:
         """Get AI insights for tax payment."""
         try:
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
 
             ai_manager = get_ai_manager()
 
@@ -1169,7 +1210,7 @@ class BusinessTracker:
             """
 
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
 
             if response["success"]:
                 try:
@@ -1,6 +1,8 @@
 from typing import Dict, Tuple, List
 from granite_client import granite_chat, simple_nlu_analysis
 from ai_provider_manager import get_ai_manager
+from prompt_assembler import get_prompt_assembler
+from request_deadline import with_deadline
 from advanced_ai_system import get_advanced_ai_system, UserExpertiseLevel, EmotionalState
 import logging
 import time
@@ -94,6 +96,7 @@ def start_session(name: str, role: str) -> str:
 	SESSIONS[sid]["history"].append({"role": "system", "content": system_msg})
 	return sid
 
+@with_deadline()
 def handle_turn(session_id: str, user_text: str) -> Tuple[str, dict]:
 	"""
 	🚀 ADVANCED AI CONVERSATION HANDLER WITH UNIQUE INNOVATIONS:
@@ -166,19 +169,12 @@ def handle_turn(session_id: str, user_text: str) -> Tuple[str, dict]:
 		else:
 			logger.warning("⚠️ Watson NLU analysis failed or returned empty results")
 
-		# Build enhanced conversation with innovative system prompt
-		enhanced_history = [
-			{"role": "system", "content": enhanced_system_prompt}
-		]
-
-		# Add recent conversation history for context (last 10 messages)
-		recent_history = session["history"][-10:] if len(session["history"]) > 10 else session["history"]
-		enhanced_history.extend(recent_history)
-		enhanced_history.append({"role": "user", "content": user_text})
-
 		# Generate response using AI provider with enhanced context
 		ai_manager = get_ai_manager()
 		current_provider = ai_manager.current_provider
+
+		# Build enhanced conversation: recent turns within the token budget, older ones summarized
+		enhanced_history = get_prompt_assembler().assemble(session, enhanced_system_prompt, user_text, current_provider)
 		logger.info(f"🤖 Calling {current_provider} with advanced AI enhancements")
 
 		ai_result = ai_manager.generate_response(enhanced_history)
@@ -244,6 +240,7 @@ def handle_turn(session_id: str, user_text: str) -> Tuple[str, dict]:
 					"fallback_used": ai_result.get("fallback_used", False)
 				},
 				"conversation_length": len(session["history"]),
+				"prompt_info": session.get("last_prompt_stats", {}),
 				"session_info": {
 					"name": session["name"],
 					"role": session["role"],
@@ -9,6 +9,12 @@ import time
 from typing import List, Dict, Optional
 import requests
 import json
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderQuotaExceededError, ProviderTimeoutError,
+    ProviderConnectionError, ProviderAuthError, ProviderAPIError
+)
+from rate_limiter import get_rate_limiter
+from request_deadline import request_timeout, backoff_sleep
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -27,6 +33,9 @@ OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
 # OpenAI API endpoint
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 
+# Client-side rate limiting (shared across workers when RATE_LIMIT_DB_PATH is set)
+chatgpt_rate_limiter = get_rate_limiter("chatgpt", requests_per_minute=60)
+
 def validate_chatgpt_config() -> bool:
     """Validate ChatGPT configuration."""
     if not OPENAI_API_KEY or OPENAI_API_KEY == "your_openai_api_key_here":
@@ -68,9 +77,17 @@ def format_messages_for_chatgpt(messages: List[Dict]) -> List[Dict]:
     return formatted_messages
 
 def chatgpt_generate_response(messages: List[Dict], max_retries: int = 1) -> str:
-    """Generate response using OpenAI ChatGPT API with retry logic."""
+    """Generate response using OpenAI ChatGPT API with retry logic.
+
+    Failures raise ProviderError subclasses so the manager can fall back to another provider.
+    """
     if not validate_chatgpt_config():
-        return "ChatGPT is not configured. Please add your OpenAI API key to use this feature."
+        raise ProviderAuthError("chatgpt", "ChatGPT is not configured. Please add your OpenAI API key to use this feature.")
+
+    allowed, rate_message, retry_after = chatgpt_rate_limiter.try_acquire()
+    if not allowed:
+        logger.warning(f"ChatGPT client rate limit reached: {rate_message}")
+        raise ProviderRateLimitError("chatgpt", rate_message, retry_after=retry_after or None)
 
     for attempt in range(max_retries + 1):
         try:
@@ -104,7 +121,7 @@ def chatgpt_generate_response(messages: List[Dict], max_retries: int = 1) -> str
                 OPENAI_API_URL,
                 headers=headers,
                 json=payload,
-                timeout=90  # Longer timeout for free tier
+                timeout=request_timeout(90, "chatgpt")  # Longer timeout for free tier
             )
 
             response_time = time.time() - start_time
@@ -123,11 +140,11 @@ def chatgpt_generate_response(messages: List[Dict], max_retries: int = 1) -> str
                     return ai_response
                 else:
                     logger.error("No choices in ChatGPT response")
-                    return "I couldn't generate a response. Please try again."
+                    raise ProviderAPIError("chatgpt", "ChatGPT returned no choices.")
 
             elif response.status_code == 401:
                 logger.error("Invalid OpenAI API key")
-                return "Invalid API key. Please check your OpenAI configuration."
+                raise ProviderAuthError("chatgpt", "Invalid API key. Please check your OpenAI configuration.", status_code=401)
 
             elif response.status_code == 429:
                 error_data = response.json() if response.content else {}
@@ -135,66 +152,63 @@ def chatgpt_generate_response(messages: List[Dict], max_retries: int = 1) -> str
 
                 if 'quota' in error_message.lower() or 'exceeded' in error_message.lower():
                     logger.error(f"OpenAI API quota exceeded: {error_message}")
-                    return "ChatGPT quota exceeded. Please check your OpenAI billing at https://platform.openai.com/account/billing. Using IBM Granite for now."
+                    raise ProviderQuotaExceededError("chatgpt", "ChatGPT quota exceeded. Please check your OpenAI billing.", status_code=429)
                 else:
                     retry_after = int(response.headers.get('retry-after', '20'))
                     logger.warning(f"Rate limit hit, attempt {attempt + 1}/{max_retries + 1}")
 
-                    if attempt < max_retries:
-                        logger.info(f"Waiting {retry_after} seconds before retry...")
-                        time.sleep(min(retry_after, 10))  # Reduced wait time
+                    if attempt < max_retries and backoff_sleep(attempt, "chatgpt", retry_after=retry_after):
                         continue
                     else:
                         logger.error("Max retries exceeded for rate limit")
-                        return f"ChatGPT is experiencing high demand. Please try again in {retry_after} seconds, or switch to IBM Granite for immediate responses."
+                        raise ProviderRateLimitError("chatgpt", f"ChatGPT is experiencing high demand. Retry in {retry_after} seconds.", retry_after=retry_after, status_code=429)
 
             elif response.status_code == 400:
                 logger.error(f"Bad request to OpenAI API: {response.text}")
-                return "There was an issue with your request. Please try rephrasing your question."
-            
+                raise ProviderAPIError("chatgpt", "ChatGPT rejected the request.", status_code=400)
+
             else:
                 logger.error(f"OpenAI API error {response.status_code}: {response.text}")
-                if attempt < max_retries:
+                if attempt < max_retries and backoff_sleep(attempt, "chatgpt"):
                     logger.info("Retrying after API error...")
-                    time.sleep(5)  # Wait 5 seconds before retry
                     continue
                 else:
-                    return "I'm having trouble connecting to ChatGPT. Please try again later or switch to IBM Granite."
+                    raise ProviderAPIError("chatgpt", "I'm having trouble connecting to ChatGPT.", status_code=response.status_code)
 
         except requests.exceptions.Timeout:
             logger.warning(f"ChatGPT API timeout, attempt {attempt + 1}/{max_retries + 1}")
-            if attempt < max_retries:
-                time.sleep(5)
+            if attempt < max_retries and backoff_sleep(attempt, "chatgpt"):
                 continue
             else:
-                return "The request took too long. Please try again with a shorter question or switch to IBM Granite."
+                raise ProviderTimeoutError("chatgpt", "The request took too long.")
 
         except requests.exceptions.ConnectionError:
             logger.warning(f"Connection error, attempt {attempt + 1}/{max_retries + 1}")
-            if attempt < max_retries:
-                time.sleep(5)
+            if attempt < max_retries and backoff_sleep(attempt, "chatgpt"):
                 continue
             else:
-                return "I can't connect to ChatGPT right now. Please check your internet connection or switch to IBM Granite."
+                raise ProviderConnectionError("chatgpt", "I can't connect to ChatGPT right now.")
 
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from OpenAI API")
-            if attempt < max_retries:
-                time.sleep(2)
+            if attempt < max_retries and backoff_sleep(attempt, "chatgpt"):
                 continue
             else:
-                return "I received an unexpected response. Please try again or switch to IBM Granite."
+                raise ProviderAPIError("chatgpt", "I received an unexpected response.")
+
+        except ProviderError:
+            # Re-raise typed provider errors to trigger fallback
+            raise
 
         except Exception as e:
             logger.error(f"Unexpected error with ChatGPT API: {e}")
-            if attempt < max_retries:
-                time.sleep(5)
+            if attempt < max_retries and backoff_sleep(attempt, "chatgpt"):
                 continue
             else:
-                return "I encountered an unexpected error. Please try again or switch to IBM Granite."
+                raise ProviderAPIError("chatgpt", f"I encountered an unexpected error: {str(e)}")
 
     # If we get here, all retries failed
-    return "ChatGPT is currently unavailable. Please try again later or switch to IBM Granite for immediate responses."
+    raise ProviderAPIError("chatgpt", "ChatGPT is currently unavailable after all retries.")
 
 def test_chatgpt_connection() -> Dict:
     """Test ChatGPT API connection and return status."""
@@ -223,6 +237,12 @@ def test_chatgpt_connection() -> Dict:
                 "configured": True
             }
             
+    except ProviderError as e:
+        return {
+            "status": "error",
+            "message": e.message,
+            "configured": True
+        }
     except Exception as e:
         return {
             "status": "error",
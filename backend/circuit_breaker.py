@@ -0,0 +1,163 @@
+"""
+Circuit Breaker for Taxora
+Per-provider circuit breaker with closed, open and half-open states.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from enum import Enum
+from typing import Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Circuit breaker configuration
+CIRCUIT_FAILURE_RATE_THRESHOLD = float(os.getenv("CIRCUIT_FAILURE_RATE_THRESHOLD", "0.5"))
+CIRCUIT_MINIMUM_REQUESTS = int(os.getenv("CIRCUIT_MINIMUM_REQUESTS", "4"))
+CIRCUIT_WINDOW_SIZE = int(os.getenv("CIRCUIT_WINDOW_SIZE", "20"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "30"))
+CIRCUIT_MAX_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_MAX_COOLDOWN_SECONDS", "300"))
+CIRCUIT_HALF_OPEN_MAX_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_CALLS", "1"))
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Tracks recent outcomes for one provider and stops calling it while it is failing."""
+
+    def __init__(self, name: str,
+                 failure_rate_threshold: float = CIRCUIT_FAILURE_RATE_THRESHOLD,
+                 minimum_requests: int = CIRCUIT_MINIMUM_REQUESTS,
+                 window_size: int = CIRCUIT_WINDOW_SIZE,
+                 cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS,
+                 half_open_max_calls: int = CIRCUIT_HALF_OPEN_MAX_CALLS):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_requests = minimum_requests
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.outcomes = deque(maxlen=window_size)  # True = success, False = failure
+        self._state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.open_duration = cooldown_seconds
+        self.half_open_in_flight = 0
+        self.last_error: Optional[str] = None
+        self.times_opened = 0
+        self.rejected_requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the cooldown has elapsed."""
+        with self.lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        """Resolve the current state. Caller must hold the lock."""
+        if self._state == CircuitState.OPEN and time.time() - self.opened_at >= self.open_duration:
+            self._state = CircuitState.HALF_OPEN
+            self.half_open_in_flight = 0
+            logger.info(f"Circuit for {self.name} is half-open, allowing trial requests")
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, reserving a trial slot when half-open."""
+        with self.lock:
+            state = self._current_state()
+
+            if state == CircuitState.CLOSED:
+                return True
+
+            if state == CircuitState.HALF_OPEN and self.half_open_in_flight < self.half_open_max_calls:
+                self.half_open_in_flight += 1
+                return True
+
+            self.rejected_requests += 1
+            return False
+
+    def is_available(self) -> bool:
+        """Non-reserving check used for routing decisions."""
+        return self.state != CircuitState.OPEN
+
+    def release_request(self):
+        """Give back a reserved half-open trial slot when the request was never sent."""
+        with self.lock:
+            if self._state == CircuitState.HALF_OPEN and self.half_open_in_flight > 0:
+                self.half_open_in_flight -= 1
+
+    def record_success(self):
+        """Record a successful call; a successful trial closes the circuit."""
+        with self.lock:
+            state = self._current_state()
+            self.outcomes.append(True)
+
+            if state == CircuitState.HALF_OPEN:
+                logger.info(f"Circuit for {self.name} closed after successful trial request")
+                self._state = CircuitState.CLOSED
+                self.outcomes.clear()
+                self.half_open_in_flight = 0
+                self.open_duration = self.cooldown_seconds
+
+    def record_failure(self, error: Optional[Exception] = None):
+        """Record a failed call and open the circuit if the error rate crosses the threshold."""
+        retry_after = getattr(error, "retry_after", None) if error else None
+
+        with self.lock:
+            state = self._current_state()
+            self.outcomes.append(False)
+            self.last_error = str(error) if error else None
+
+            if state == CircuitState.HALF_OPEN:
+                # Failed trial: back off longer before the next one
+                self._open(min(self.open_duration * 2, CIRCUIT_MAX_COOLDOWN_SECONDS), retry_after)
+                return
+
+            if state == CircuitState.CLOSED and len(self.outcomes) >= self.minimum_requests:
+                failure_rate = self.outcomes.count(False) / len(self.outcomes)
+                if failure_rate >= self.failure_rate_threshold:
+                    self._open(self.cooldown_seconds, retry_after)
+
+    def _open(self, duration: float, retry_after: Optional[float] = None):
+        """Open the circuit. Caller must hold the lock."""
+        if retry_after:
+            duration = max(duration, min(float(retry_after), CIRCUIT_MAX_COOLDOWN_SECONDS))
+
+        self._state = CircuitState.OPEN
+        self.opened_at = time.time()
+        self.open_duration = duration
+        self.half_open_in_flight = 0
+        self.times_opened += 1
+        logger.warning(f"Circuit for {self.name} opened for {duration:.0f}s: {self.last_error}")
+
+    def reset(self):
+        """Force the circuit back to closed."""
+        with self.lock:
+            self._state = CircuitState.CLOSED
+            self.outcomes.clear()
+            self.half_open_in_flight = 0
+            self.open_duration = self.cooldown_seconds
+
+    def get_status(self) -> Dict:
+        """Get circuit breaker status for monitoring."""
+        with self.lock:
+            state = self._current_state()
+            total = len(self.outcomes)
+            failures = self.outcomes.count(False)
+            retry_in = max(0.0, self.opened_at + self.open_duration - time.time()) if state == CircuitState.OPEN else 0.0
+
+            return {
+                "state": state.value,
+                "error_rate": round(failures / total, 3) if total else 0.0,
+                "recent_requests": total,
+                "times_opened": self.times_opened,
+                "rejected_requests": self.rejected_requests,
+                "retry_in_seconds": round(retry_in, 1),
+                "last_error": self.last_error
+            }
@@ -9,6 +9,11 @@ import time
 import json
 import requests
 from typing import List, Dict, Optional
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderTimeoutError,
+    ProviderConnectionError, ProviderAPIError
+)
+from rate_limiter import get_rate_limiter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -27,6 +32,9 @@ CLAUDE_TEMPERATURE = float(os.getenv("CLAUDE_TEMPERATURE", "0.7"))
 # API URLs
 CLAUDE_API_URL = "https://api.anthropic.com/v1/messages"
 
+# Client-side rate limiting (shared across workers when RATE_LIMIT_DB_PATH is set)
+claude_rate_limiter = get_rate_limiter("claude", requests_per_minute=60)
+
 def validate_claude_config() -> bool:
     """Validate Claude API configuration."""
     if not CLAUDE_API_KEY:
@@ -68,6 +76,10 @@ def claude_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
     """Generate response using Claude AI API."""
     if not validate_claude_config():
         return "Claude is not configured. Please add your Anthropic API key to use this feature."
+
+    allowed, rate_message, retry_after = claude_rate_limiter.try_acquire()
+    if not allowed:
+        raise ProviderRateLimitError("claude", rate_message, retry_after=retry_after or None)
     
     for attempt in range(max_retries + 1):
         try:
@@ -137,7 +149,7 @@ def claude_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     continue
                 else:
                     logger.error("Max retries exceeded for Claude rate limit")
-                    raise Exception(f"CLAUDE_RATE_LIMITED: Claude is experiencing high demand. Retry in {retry_after} seconds.")
+                    raise ProviderRateLimitError("claude", f"Claude is experiencing high demand. Retry in {retry_after} seconds.", retry_after=retry_after, status_code=429)
                 
             elif response.status_code == 400:
                 logger.error(f"Bad request to Claude API: {response.text}")
@@ -150,7 +162,7 @@ def claude_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     time.sleep(5)
                     continue
                 else:
-                    raise Exception("CLAUDE_API_ERROR: I'm having trouble connecting to Claude.")
+                    raise ProviderAPIError("claude", "I'm having trouble connecting to Claude.")
                     
         except requests.exceptions.Timeout:
             logger.warning(f"Claude API timeout, attempt {attempt + 1}/{max_retries + 1}")
@@ -158,7 +170,7 @@ def claude_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 time.sleep(5)
                 continue
             else:
-                raise Exception("CLAUDE_TIMEOUT: The request took too long.")
+                raise ProviderTimeoutError("claude", "The request took too long.")
                 
         except requests.exceptions.ConnectionError:
             logger.warning(f"Claude connection error, attempt {attempt + 1}/{max_retries + 1}")
@@ -166,7 +178,7 @@ def claude_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 time.sleep(5)
                 continue
             else:
-                raise Exception("CLAUDE_CONNECTION_ERROR: I can't connect to Claude right now.")
+                raise ProviderConnectionError("claude", "I can't connect to Claude right now.")
                 
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from Claude API")
@@ -174,24 +186,23 @@ def claude_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 time.sleep(2)
                 continue
             else:
-                raise Exception("CLAUDE_API_ERROR: I received an unexpected response.")
+                raise ProviderAPIError("claude", "I received an unexpected response.")
                 
+        except ProviderError:
+            # Re-raise typed provider errors to trigger fallback
+            raise
+
         except Exception as e:
-            error_str = str(e)
             logger.error(f"Unexpected error with Claude API: {e}")
             
-            # Re-raise specific Claude errors to trigger fallback
-            if any(error_type in error_str for error_type in ["CLAUDE_RATE_LIMITED", "CLAUDE_API_ERROR", "CLAUDE_CONNECTION_ERROR", "CLAUDE_TIMEOUT"]):
-                raise e
-            
             if attempt < max_retries:
                 time.sleep(2)
                 continue
             else:
-                raise Exception(f"CLAUDE_API_ERROR: I encountered an unexpected error: {str(e)}")
+                raise ProviderAPIError("claude", f"I encountered an unexpected error: {str(e)}")
     
     # If we get here, all retries failed
-    raise Exception("CLAUDE_API_ERROR: Claude is currently unavailable after all retries.")
+    raise ProviderAPIError("claude", "Claude is currently unavailable after all retries.")
 
 def test_claude_connection() -> Dict:
     """Test Claude API connection."""
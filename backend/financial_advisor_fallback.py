@@ -40,6 +40,7 @@ class FinancialAdvisorFallback:
                 'response': "Build good credit by paying bills on time, keeping credit utilization below 30%, and maintaining old accounts. Check your credit report annually for errors. Consider a secured credit card if you're building credit from scratch."
             }
         }
+        self.default_advice = "Here are some fundamental financial principles: 1) Create and stick to a budget, 2) Build an emergency fund, 3) Pay off high-interest debt, 4) Start investing early, 5) Save for retirement. Would you like me to elaborate on any of these areas?"
     
     def get_financial_advice(self, question: str) -> str:
         """Get relevant financial advice based on the question."""
@@ -51,7 +52,11 @@ class FinancialAdvisorFallback:
                 return info['response']
         
         # Default general advice
-        return "Here are some fundamental financial principles: 1) Create and stick to a budget, 2) Build an emergency fund, 3) Pay off high-interest debt, 4) Start investing early, 5) Save for retirement. Would you like me to elaborate on any of these areas?"
+        return self.default_advice
+
+    def get_template_texts(self) -> List[str]:
+        """Every canned answer this advisor can give (used to pre-translate them)."""
+        return [info['response'] for info in self.financial_topics.values()] + [self.default_advice]
     
     def is_response_poor_quality(self, response: str) -> bool:
         """Check if a response is of poor quality and needs fallback."""
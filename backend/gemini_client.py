@@ -4,16 +4,26 @@ Provides integration with Google's Gemini AI for chat responses and voice intera
 """
 
 import os
+import re
+import math
 import logging
 import time
 import json
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import requests
 from dotenv import load_dotenv
 from tamil_voice_enhancer import enhance_tamil_for_voice
-import threading
-from datetime import datetime, timedelta
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderTimeoutError,
+    ProviderConnectionError, ProviderAuthError, ProviderAPIError
+)
+from gemini_key_pool import get_gemini_key_pool
+from request_deadline import request_timeout, backoff_sleep, with_deadline
+from translation_cache import get_translation_cache
+from stage_graph import Stage, run_stage_graph
+from audio_preprocess import preprocess_audio
 
 # Load environment variables
 load_dotenv()
@@ -22,108 +32,52 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Gemini Configuration with backup key support
+# Gemini Configuration; extra keys go in GEMINI_API_KEYS (comma-separated) and share the load
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_API_KEY_BACKUP = os.getenv("GEMINI_API_KEY_BACKUP")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 GEMINI_MAX_TOKENS = int(os.getenv("GEMINI_MAX_TOKENS", "1000"))
 GEMINI_TEMPERATURE = float(os.getenv("GEMINI_TEMPERATURE", "0.7"))
 
+# Threads shared by all voice requests for overlapping pipeline stages
+GEMINI_VOICE_STAGE_WORKERS = int(os.getenv("GEMINI_VOICE_STAGE_WORKERS", "8"))
+_voice_executor = ThreadPoolExecutor(max_workers=GEMINI_VOICE_STAGE_WORKERS, thread_name_prefix="voice-stage")
+
+# Ask for English and Tamil in one JSON generation instead of generate + translate
+GEMINI_BILINGUAL_REPLIES = os.getenv("GEMINI_BILINGUAL_REPLIES", "true").lower() == "true"
+
 # API URLs
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
-
-# Track which API key is currently being used
-current_api_key = GEMINI_API_KEY
-using_backup_key = False
-
-# Rate limiting configuration
-class GeminiRateLimiter:
-    """Rate limiter for Gemini API to prevent quota exceeded errors."""
-
-    def __init__(self):
-        self.requests_per_minute = 50  # Increased limit - Gemini allows 60/min
-        self.requests_per_day = 1500   # Daily limit
-        self.request_times = []
-        self.daily_requests = {}
-        self.lock = threading.Lock()
-
-    def can_make_request(self) -> tuple[bool, str]:
-        """Check if we can make a request without hitting rate limits."""
-        with self.lock:
-            now = datetime.now()
-            today = now.date()
-
-            # Clean old request times (older than 1 minute)
-            minute_ago = now - timedelta(minutes=1)
-            self.request_times = [t for t in self.request_times if t > minute_ago]
-
-            # Check daily limit
-            if today not in self.daily_requests:
-                self.daily_requests[today] = 0
-
-            # Clean old daily counts
-            for date in list(self.daily_requests.keys()):
-                if date < today:
-                    del self.daily_requests[date]
-
-            # Check limits
-            if len(self.request_times) >= self.requests_per_minute:
-                wait_time = 60 - (now - self.request_times[0]).seconds
-                return False, f"Rate limit: {len(self.request_times)} requests in last minute. Wait {wait_time}s"
-
-            if self.daily_requests[today] >= self.requests_per_day:
-                return False, f"Daily quota exceeded: {self.daily_requests[today]} requests today"
-
-            return True, "OK"
-
-    def record_request(self):
-        """Record a successful request."""
-        with self.lock:
-            now = datetime.now()
-            today = now.date()
-
-            self.request_times.append(now)
-            if today not in self.daily_requests:
-                self.daily_requests[today] = 0
-            self.daily_requests[today] += 1
-
-    def get_status(self) -> Dict:
-        """Get current rate limiting status."""
-        with self.lock:
-            now = datetime.now()
-            today = now.date()
-            minute_ago = now - timedelta(minutes=1)
-
-            recent_requests = len([t for t in self.request_times if t > minute_ago])
-            daily_requests = self.daily_requests.get(today, 0)
+GEMINI_API_URL = os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta/models")
 
-            return {
-                "requests_last_minute": recent_requests,
-                "requests_today": daily_requests,
-                "minute_limit": self.requests_per_minute,
-                "daily_limit": self.requests_per_day,
-                "minute_remaining": self.requests_per_minute - recent_requests,
-                "daily_remaining": self.requests_per_day - daily_requests
-            }
+def acquire_gemini_key(call_type: str) -> str:
+    """Reserve one request on the least-loaded pooled key; raises ProviderRateLimitError when all are exhausted."""
+    return get_gemini_key_pool().acquire(call_type)
 
-# Global rate limiter instance
-gemini_rate_limiter = GeminiRateLimiter()
+def _report_gemini_rate_limit(api_key: str, response) -> int:
+    """Cool down a key Google rejected with 429 and return the server's retry-after."""
+    retry_after = int(response.headers.get('retry-after', '10'))
+    get_gemini_key_pool().report_rate_limited(api_key, retry_after)
+    return retry_after
 
 def validate_gemini_config() -> bool:
     """Validate Gemini API configuration."""
-    if not GEMINI_API_KEY:
+    api_keys = get_gemini_key_pool().api_keys
+    if not api_keys:
         logger.warning("Gemini API key not configured")
         return False
     
-    if not GEMINI_API_KEY.startswith('AIza'):
-        logger.warning("Invalid Gemini API key format")
-        return False
-    
     logger.info("Gemini configuration validated successfully")
     return True
 
+GEMINI_DEFAULT_SYSTEM_PROMPT = "You are a professional financial advisor. Provide helpful, accurate, and practical financial advice. Keep responses concise but informative. Focus on actionable guidance for budgeting, saving, investing, and financial planning."
+
+def build_system_instruction(messages: List[Dict]) -> Dict:
+    """Collect system messages into Gemini's systemInstruction field (default advisor prompt if none)."""
+    system_texts = [m.get("content", "") for m in messages if m.get("role") == "system" and m.get("content")]
+    return {"parts": [{"text": "\n\n".join(system_texts) or GEMINI_DEFAULT_SYSTEM_PROMPT}]}
+
 def format_messages_for_gemini(messages: List[Dict]) -> List[Dict]:
-    """Format conversation messages for Gemini API."""
+    """Format conversation messages for Gemini API (system messages go in systemInstruction)."""
     formatted_messages = []
     
     for message in messages:
@@ -131,7 +85,9 @@ def format_messages_for_gemini(messages: List[Dict]) -> List[Dict]:
         content = message.get("content", "")
         
         # Convert roles to Gemini format
-        if role == "user":
+        if role == "system":
+            continue
+        elif role == "user":
             gemini_role = "user"
         elif role == "assistant" or role == "bot":
             gemini_role = "model"
@@ -145,33 +101,25 @@ def format_messages_for_gemini(messages: List[Dict]) -> List[Dict]:
     
     return formatted_messages
 
-def gemini_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
-    """Generate response using Google Gemini API with rate limiting and backup key support."""
-    global current_api_key, using_backup_key
+def gemini_generate_response(messages: List[Dict], max_retries: int = 2, extra_instruction: Optional[str] = None,
+                             response_schema: Optional[Dict] = None, max_output_tokens: Optional[int] = None) -> str:
+    """Generate response using Google Gemini API, spreading requests across the key pool.
 
+    extra_instruction is appended to the system instruction; response_schema switches Gemini to
+    JSON output constrained to that schema.
+    """
     if not validate_gemini_config():
         return "Gemini is not configured. Please add your Google AI API key to use this feature."
 
-    # Check rate limits before making request
-    can_request, rate_message = gemini_rate_limiter.can_make_request()
-    if not can_request:
-        logger.warning(f"Gemini rate limit exceeded: {rate_message}")
-        # Try switching to backup key if available
-        if not using_backup_key and GEMINI_API_KEY_BACKUP:
-            logger.info("Switching to backup Gemini API key")
-            current_api_key = GEMINI_API_KEY_BACKUP
-            using_backup_key = True
-            # Reset rate limiter for new key
-            gemini_rate_limiter.reset()
-        else:
-            raise Exception(f"GEMINI_RATE_LIMITED: {rate_message}")
-
     for attempt in range(max_retries + 1):
         try:
+            # Reserve a request slot on the least-loaded key (a retry may land on a different key)
+            api_key = acquire_gemini_key("generate")
+
             # Format messages for Gemini 2.0 Flash
             formatted_messages = format_messages_for_gemini(messages)
 
-            logger.info(f"Sending request to Gemini API (attempt {attempt + 1}/{max_retries + 1}) using {'backup' if using_backup_key else 'primary'} key...")
+            logger.info(f"Sending request to Gemini API (attempt {attempt + 1}/{max_retries + 1})...")
             start_time = time.time()
 
             # Prepare API request for Gemini 2.0 Flash
@@ -179,22 +127,22 @@ def gemini_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
 
             headers = {
                 "Content-Type": "application/json",
-                "X-goog-api-key": current_api_key
+                "X-goog-api-key": api_key
             }
             
-            # Add system context to the first user message instead of separate instruction
-            if formatted_messages and formatted_messages[0]["role"] == "user":
-                original_text = formatted_messages[0]["parts"][0]["text"]
-                formatted_messages[0]["parts"][0]["text"] = f"You are a professional financial advisor. Provide helpful, accurate, and practical financial advice. Keep responses concise but informative. Focus on actionable guidance for budgeting, saving, investing, and financial planning.\n\nUser question: {original_text}"
+            # Prepare payload for Gemini 2.0 Flash; the system prompt travels once in systemInstruction
+            system_instruction = build_system_instruction(messages)
+            if extra_instruction:
+                system_instruction["parts"].append({"text": extra_instruction})
 
-            # Prepare payload for Gemini 2.0 Flash
             payload = {
+                "systemInstruction": system_instruction,
                 "contents": formatted_messages,
                 "generationConfig": {
                     "temperature": GEMINI_TEMPERATURE,
                     "topK": 40,
                     "topP": 0.95,
-                    "maxOutputTokens": GEMINI_MAX_TOKENS,
+                    "maxOutputTokens": max_output_tokens or GEMINI_MAX_TOKENS,
                     "stopSequences": []
                 },
                 "safetySettings": [
@@ -216,13 +164,16 @@ def gemini_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     }
                 ]
             }
+            if response_schema:
+                payload["generationConfig"]["responseMimeType"] = "application/json"
+                payload["generationConfig"]["responseSchema"] = response_schema
             
             # Make API request with new format
             response = requests.post(
                 url,
                 headers=headers,
                 json=payload,
-                timeout=60
+                timeout=request_timeout(60, "gemini")
             )
             
             response_time = time.time() - start_time
@@ -235,9 +186,6 @@ def gemini_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     if "content" in candidate and "parts" in candidate["content"]:
                         ai_response = candidate["content"]["parts"][0]["text"].strip()
                         
-                        # Record successful request for rate limiting
-                        gemini_rate_limiter.record_request()
-
                         # Log usage statistics
                         usage = data.get("usageMetadata", {})
                         logger.info(f"Gemini response received in {response_time:.2f}s")
@@ -253,20 +201,20 @@ def gemini_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     
             elif response.status_code == 401:
                 logger.error("Invalid Gemini API key")
-                return "Invalid API key. Please check your Google AI configuration."
+                raise ProviderAuthError("gemini", "Invalid API key. Please check your Google AI configuration.", status_code=401)
                 
             elif response.status_code == 429:
-                retry_after = int(response.headers.get('retry-after', '10'))
+                retry_after = _report_gemini_rate_limit(api_key, response)
                 logger.warning(f"Rate limit hit, attempt {attempt + 1}/{max_retries + 1}")
 
-                if attempt < max_retries:
-                    logger.info(f"Waiting {retry_after} seconds before retry...")
-                    time.sleep(min(retry_after, 20))  # Cap wait time at 20 seconds
+                # Retry immediately on another key; only wait when this was the only one
+                if attempt < max_retries and (len(get_gemini_key_pool().api_keys) > 1
+                                              or backoff_sleep(attempt, "gemini", retry_after=retry_after)):
                     continue
                 else:
                     logger.error("Max retries exceeded for rate limit")
                     # Raise exception to trigger automatic fallback
-                    raise Exception(f"GEMINI_RATE_LIMITED: Gemini is experiencing high demand. Retry in {retry_after} seconds.")
+                    raise ProviderRateLimitError("gemini", f"Gemini is experiencing high demand. Retry in {retry_after} seconds.", retry_after=retry_after, status_code=429)
                 
             elif response.status_code == 400:
                 logger.error(f"Bad request to Gemini API: {response.text}")
@@ -274,56 +222,50 @@ def gemini_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 
             else:
                 logger.error(f"Gemini API error {response.status_code}: {response.text}")
-                if attempt < max_retries:
+                if attempt < max_retries and backoff_sleep(attempt, "gemini"):
                     logger.info("Retrying after API error...")
-                    time.sleep(5)  # Wait 5 seconds before retry
                     continue
                 else:
                     # Raise exception to trigger automatic fallback
-                    raise Exception("GEMINI_API_ERROR: I'm having trouble connecting to Gemini.")
+                    raise ProviderAPIError("gemini", "I'm having trouble connecting to Gemini.", status_code=response.status_code)
                     
         except requests.exceptions.Timeout:
             logger.warning(f"Gemini API timeout, attempt {attempt + 1}/{max_retries + 1}")
-            if attempt < max_retries:
-                time.sleep(5)
+            if attempt < max_retries and backoff_sleep(attempt, "gemini"):
                 continue
             else:
                 # Raise exception to trigger automatic fallback
-                raise Exception("GEMINI_TIMEOUT: The request took too long.")
+                raise ProviderTimeoutError("gemini", "The request took too long.")
                 
         except requests.exceptions.ConnectionError:
             logger.warning(f"Connection error, attempt {attempt + 1}/{max_retries + 1}")
-            if attempt < max_retries:
-                time.sleep(5)
+            if attempt < max_retries and backoff_sleep(attempt, "gemini"):
                 continue
             else:
                 # Raise exception to trigger automatic fallback
-                raise Exception("GEMINI_CONNECTION_ERROR: I can't connect to Gemini right now.")
+                raise ProviderConnectionError("gemini", "I can't connect to Gemini right now.")
                 
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from Gemini API")
-            if attempt < max_retries:
-                time.sleep(2)
+            if attempt < max_retries and backoff_sleep(attempt, "gemini"):
                 continue
             else:
-                raise Exception("GEMINI_API_ERROR: I received an unexpected response.")
+                raise ProviderAPIError("gemini", "I received an unexpected response.")
+
+        except ProviderError:
+            # Re-raise typed provider errors to trigger fallback
+            raise
 
         except Exception as e:
-            error_str = str(e)
             logger.error(f"Unexpected error with Gemini API: {e}")
 
-            # Re-raise specific Gemini errors to trigger fallback
-            if "GEMINI_RATE_LIMITED" in error_str or "GEMINI_API_ERROR" in error_str or "GEMINI_CONNECTION_ERROR" in error_str or "GEMINI_TIMEOUT" in error_str:
-                raise e
-
-            if attempt < max_retries:
-                time.sleep(5)
+            if attempt < max_retries and backoff_sleep(attempt, "gemini"):
                 continue
             else:
-                raise Exception(f"GEMINI_API_ERROR: I encountered an unexpected error: {str(e)}")
+                raise ProviderAPIError("gemini", f"I encountered an unexpected error: {str(e)}")
     
     # If we get here, all retries failed
-    raise Exception("GEMINI_API_ERROR: Gemini is currently unavailable after all retries.")
+    raise ProviderAPIError("gemini", "Gemini is currently unavailable after all retries.")
 
 def test_gemini_connection() -> Dict:
     """Test Gemini API connection."""
@@ -357,25 +299,7 @@ def test_gemini_connection() -> Dict:
             "message": f"Connection test failed: {str(e)}"
         }
 
-def gemini_translate_to_tamil(english_text: str) -> Dict:
-    """Translate English financial advice to Tamil using Gemini."""
-    if not validate_gemini_config():
-        return {
-            "success": False,
-            "error": "Gemini not configured",
-            "tamil_text": english_text
-        }
-
-    try:
-        logger.info("Translating to Tamil using Gemini...")
-
-        # Prepare translation request
-        url = f"{GEMINI_API_URL}/{GEMINI_MODEL}:generateContent"
-        params = {"key": GEMINI_API_KEY}
-
-        translation_prompt = f"""
-        Translate the following financial advice from English to Tamil with these requirements:
-
+TAMIL_TRANSLATION_GUIDELINES = """
         1. Use simple, clear Tamil that sounds natural when spoken aloud
         2. Convert numbers to Tamil words (50 = ஐம்பது, 30 = முப்பது, 20 = இருபது)
         3. Use common Tamil financial terms that people understand
@@ -391,43 +315,93 @@ def gemini_translate_to_tamil(english_text: str) -> Dict:
         - Income = வருமானம்
         - Expenses = செலவுகள்
         - Percent = சதவீதம்
+"""
 
-        English text: {english_text}
+# Batch translation: segments per Gemini call and their combined size
+TRANSLATION_BATCH_MAX_SEGMENTS = int(os.getenv("TRANSLATION_BATCH_MAX_SEGMENTS", "40"))
+TRANSLATION_BATCH_MAX_CHARS = int(os.getenv("TRANSLATION_BATCH_MAX_CHARS", "6000"))
+
+SEGMENT_MARKER = "<<<SEG {}>>>"
+SEGMENT_PATTERN = re.compile(r"<<<SEG (\d+)>>>\s*(.*?)(?=<<<SEG \d+>>>|\Z)", re.DOTALL)
+
+def _request_translation(prompt: str, max_output_tokens: int) -> str:
+    """Send one translation prompt to Gemini and return the text; raises ProviderError on failure."""
+    api_key = acquire_gemini_key("translate")
+    url = f"{GEMINI_API_URL}/{GEMINI_MODEL}:generateContent"
+    payload = {
+        "contents": [{
+            "parts": [{"text": prompt}]
+        }],
+        "generationConfig": {
+            "temperature": 0.3,  # Lower temperature for accurate translation
+            "maxOutputTokens": max_output_tokens
+        }
+    }
 
-        Natural Tamil translation for voice:
-        """
+    response = requests.post(url, params={"key": api_key}, json=payload, timeout=request_timeout(30, "gemini"))
 
-        payload = {
-            "contents": [{
-                "parts": [{"text": translation_prompt}]
-            }],
-            "generationConfig": {
-                "temperature": 0.3,  # Lower temperature for accurate translation
-                "maxOutputTokens": 1000
-            }
+    if response.status_code == 200:
+        data = response.json()
+        if "candidates" in data and len(data["candidates"]) > 0:
+            candidate = data["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                return candidate["content"]["parts"][0]["text"].strip()
+        raise ProviderAPIError("gemini", "No translation in response")
+
+    if response.status_code == 429:
+        retry_after = _report_gemini_rate_limit(api_key, response)
+        raise ProviderRateLimitError("gemini", "Translation rate limited", retry_after=retry_after, status_code=429)
+
+    raise ProviderAPIError("gemini", f"API error: {response.status_code}", status_code=response.status_code)
+
+def gemini_translate_to_tamil(english_text: str) -> Dict:
+    """Translate English financial advice to Tamil using Gemini (cached by normalized text)."""
+    cache = get_translation_cache()
+    cached = cache.get(english_text) if cache else None
+    if cached is not None:
+        logger.info("Tamil translation served from cache")
+        return {
+            "success": True,
+            "tamil_text": cached,
+            "english_text": english_text,
+            "cached": True
         }
 
-        response = requests.post(url, params=params, json=payload, timeout=30)
+    if not validate_gemini_config():
+        return {
+            "success": False,
+            "error": "Gemini not configured",
+            "tamil_text": english_text
+        }
 
-        if response.status_code == 200:
-            data = response.json()
-            if "candidates" in data and len(data["candidates"]) > 0:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    tamil_text = candidate["content"]["parts"][0]["text"].strip()
+    try:
+        logger.info("Translating to Tamil using Gemini...")
 
-                    logger.info(f"Translation completed: {tamil_text[:50]}...")
+        translation_prompt = f"""
+        Translate the following financial advice from English to Tamil with these requirements:
+{TAMIL_TRANSLATION_GUIDELINES}
+        English text: {english_text}
 
-                    return {
-                        "success": True,
-                        "tamil_text": tamil_text,
-                        "english_text": english_text
-                    }
+        Natural Tamil translation for voice:
+        """
+
+        tamil_text = _request_translation(translation_prompt, 1000)
+        logger.info(f"Translation completed: {tamil_text[:50]}...")
+        if cache:
+            cache.put(english_text, tamil_text)
 
-        logger.error(f"Translation failed: {response.status_code}")
+        return {
+            "success": True,
+            "tamil_text": tamil_text,
+            "english_text": english_text,
+            "cached": False
+        }
+
+    except ProviderError as e:
+        logger.error(f"Translation failed: {e.message}")
         return {
             "success": False,
-            "error": f"API error: {response.status_code}",
+            "error": e.message,
             "tamil_text": english_text
         }
 
@@ -439,16 +413,195 @@ def gemini_translate_to_tamil(english_text: str) -> Dict:
             "tamil_text": english_text
         }
 
+def _split_translation_batches(texts: List[str]) -> List[List[str]]:
+    """Group texts into batches within the segment and character limits."""
+    batches, current, size = [], [], 0
+    for text in texts:
+        if current and (len(current) >= TRANSLATION_BATCH_MAX_SEGMENTS or size + len(text) > TRANSLATION_BATCH_MAX_CHARS):
+            batches.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+def _translate_batch(texts: List[str]) -> Dict[str, str]:
+    """One Gemini call for several segments using numbered markers; returns the segments it got back."""
+    segments = "\n".join(f"{SEGMENT_MARKER.format(index)}\n{text}" for index, text in enumerate(texts, 1))
+    prompt = f"""
+        Translate each numbered segment of financial text below from English to Tamil with these requirements:
+{TAMIL_TRANSLATION_GUIDELINES}
+        Every segment starts with a marker line like {SEGMENT_MARKER.format(1)}. Reply with exactly one
+        translation per segment, each preceded by the same marker line and number, in the same order.
+        Do not merge, skip or add segments and write nothing outside the segments.
+
+{segments}
+        """
+
+    # Tamil output runs to several tokens per English word
+    output = _request_translation(prompt, min(8192, 200 + sum(len(text) for text in texts)))
+
+    translations = {}
+    for number, translated in SEGMENT_PATTERN.findall(output):
+        index = int(number) - 1
+        if 0 <= index < len(texts) and translated.strip():
+            translations[texts[index]] = translated.strip()
+    return translations
+
+def gemini_translate_batch_to_tamil(english_texts: List[str]) -> Dict:
+    """Translate many texts with as few Gemini calls as possible.
+
+    Cached and repeated texts are translated once; the rest go out in delimited batches. Segments
+    a batch reply drops are retried one at a time. Untranslated texts come back in English, as
+    gemini_translate_to_tamil does.
+    """
+    cache = get_translation_cache()
+    unique_texts = list(dict.fromkeys(text for text in english_texts if text and text.strip()))
+    translations = cache.get_many(unique_texts) if cache else {}
+    cached_count = len(translations)
+    missing = [text for text in unique_texts if text not in translations]
+
+    api_calls = 0
+    errors = []
+    if missing and not validate_gemini_config():
+        errors.append("Gemini not configured")
+        missing = []
+
+    for batch in _split_translation_batches(missing):
+        try:
+            api_calls += 1
+            translated = _translate_batch(batch) if len(batch) > 1 else {}
+            if len(batch) > 1 and len(translated) < len(batch):
+                logger.warning(f"Batch translation returned {len(translated)} of {len(batch)} segments, retrying the rest singly")
+            for text in batch:
+                if text not in translated:
+                    if len(batch) > 1:
+                        api_calls += 1
+                    single = gemini_translate_to_tamil(text)
+                    if single["success"]:
+                        translated[text] = single["tamil_text"]
+                    else:
+                        errors.append(single["error"])
+            if cache:
+                cache.put_many(translated)
+            translations.update(translated)
+        except ProviderError as e:
+            logger.error(f"Batch translation failed: {e.message}")
+            errors.append(e.message)
+            if isinstance(e, ProviderRateLimitError):
+                break
+
+    tamil_texts = [translations.get(text, text) for text in english_texts]
+    failed = [index for index, text in enumerate(english_texts) if text and text.strip() and text not in translations]
+    logger.info(f"Batch translated {len(unique_texts)} unique texts: {cached_count} cached, {api_calls} Gemini calls")
+
+    return {
+        "success": not failed,
+        "tamil_texts": tamil_texts,
+        "failed_indices": failed,
+        "cached_count": cached_count,
+        "api_calls": api_calls,
+        "errors": errors
+    }
+
+BILINGUAL_INSTRUCTION = f"""Reply with a JSON object with two fields:
+"english": your answer in English.
+"tamil": the same answer in Tamil for a voice assistant, following these guidelines:
+{TAMIL_TRANSLATION_GUIDELINES}
+Both fields must carry the same advice. Output only the JSON object."""
+
+BILINGUAL_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "english": {"type": "STRING"},
+        "tamil": {"type": "STRING"}
+    },
+    "required": ["english", "tamil"]
+}
+
+TAMIL_CHARACTERS = re.compile(r"[\u0B80-\u0BFF]")
+
+def parse_bilingual_reply(text: str) -> Optional[Dict[str, str]]:
+    """Validate a bilingual JSON reply; None unless both fields are non-empty and "tamil" is Tamil script."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", cleaned)
+    try:
+        data = json.loads(cleaned)
+    except ValueError:
+        return None
+
+    if not isinstance(data, dict):
+        return None
+    english, tamil = data.get("english"), data.get("tamil")
+    if not isinstance(english, str) or not english.strip() or not isinstance(tamil, str) or not TAMIL_CHARACTERS.search(tamil):
+        return None
+    return {"english": english.strip(), "tamil": tamil.strip()}
+
+def gemini_generate_bilingual_response(messages: List[Dict]) -> Dict:
+    """English and Tamil replies from a single JSON-mode generation.
+
+    Returns {"english", "tamil", "single_call"}. When the reply does not validate, "tamil" is None
+    and the caller translates "english" separately: plain text is kept as the English answer,
+    while malformed JSON is discarded and regenerated in English only.
+    """
+    # Tamil takes several tokens per English word
+    raw = gemini_generate_response(messages, extra_instruction=BILINGUAL_INSTRUCTION,
+                                   response_schema=BILINGUAL_SCHEMA, max_output_tokens=GEMINI_MAX_TOKENS * 3)
+    parsed = parse_bilingual_reply(raw)
+    if parsed:
+        cache = get_translation_cache()
+        if cache:
+            cache.put(parsed["english"], parsed["tamil"])
+        return dict(parsed, single_call=True)
+
+    logger.warning("Bilingual reply did not validate, falling back to generate + translate")
+    if raw.lstrip().startswith(("{", "```")):
+        raw = gemini_generate_response(messages)
+    return {"english": raw, "tamil": None, "single_call": False}
+
 def validate_gemini_api_key(api_key: str) -> bool:
     """Validate Gemini API key format."""
     return api_key and api_key.startswith('AIza') and len(api_key) > 20
 
 def get_gemini_rate_limit_status() -> Dict:
-    """Get current Gemini rate limit status."""
-    return gemini_rate_limiter.get_status()
+    """Get current Gemini rate limit status, totalled across the key pool."""
+    return get_gemini_key_pool().get_status()
+
+INLINE_DATA_PLACEHOLDER = "__INLINE_DATA_BASE64__"
+
+class _InlineDataBody:
+    """JSON request body whose one large base64 field is encoded chunk by chunk while it is sent.
+
+    The payload is serialized once with a placeholder; requests streams the JSON around it and
+    the base64 of `data` (3-byte aligned chunks, read through a memoryview) with an exact
+    Content-Length, so no full-size base64 string or JSON document is ever built.
+    """
 
-def gemini_speech_to_text(audio_data: bytes, audio_format: str = "webm") -> Dict:
-    """Convert speech to text using Gemini's multimodal capabilities."""
+    CHUNK_SIZE = 48 * 1024  # multiple of 3, so chunks encode without padding
+
+    def __init__(self, payload: Dict, data: bytes):
+        prefix, suffix = json.dumps(payload).split(json.dumps(INLINE_DATA_PLACEHOLDER))
+        self.prefix = (prefix + '"').encode("utf-8")
+        self.suffix = ('"' + suffix).encode("utf-8")
+        self.data = memoryview(data)
+
+    def __len__(self) -> int:
+        return len(self.prefix) + 4 * math.ceil(len(self.data) / 3) + len(self.suffix)
+
+    def __iter__(self):
+        yield self.prefix
+        for start in range(0, len(self.data), self.CHUNK_SIZE):
+            yield base64.b64encode(self.data[start:start + self.CHUNK_SIZE])
+        yield self.suffix
+
+def gemini_speech_to_text(audio_data: bytes, audio_format: Optional[str] = None) -> Dict:
+    """Convert speech to text using Gemini's multimodal capabilities.
+
+    WAV input is trimmed and downsampled first (see audio_preprocess); the format is detected
+    from the audio itself when not given, defaulting to webm as recorded by the browser.
+    """
     if not validate_gemini_config():
         return {
             "success": False,
@@ -459,12 +612,14 @@ def gemini_speech_to_text(audio_data: bytes, audio_format: str = "webm") -> Dict
     try:
         logger.info("Converting speech to text using Gemini...")
 
-        # Encode audio data to base64
-        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+        audio_data, detected_format, audio_info = preprocess_audio(audio_data)
+        audio_format = audio_format or detected_format or "webm"
+
+        api_key = acquire_gemini_key("stt")
 
         # Prepare API request for speech recognition
         url = f"{GEMINI_API_URL}/{GEMINI_MODEL}:generateContent"
-        params = {"key": GEMINI_API_KEY}
+        params = {"key": api_key}
 
         payload = {
             "contents": [{
@@ -475,7 +630,7 @@ def gemini_speech_to_text(audio_data: bytes, audio_format: str = "webm") -> Dict
                     {
                         "inline_data": {
                             "mime_type": f"audio/{audio_format}",
-                            "data": audio_base64
+                            "data": INLINE_DATA_PLACEHOLDER
                         }
                     }
                 ]
@@ -486,7 +641,9 @@ def gemini_speech_to_text(audio_data: bytes, audio_format: str = "webm") -> Dict
             }
         }
 
-        response = requests.post(url, params=params, json=payload, timeout=30)
+        # Audio is base64-encoded while it streams out instead of being copied into the JSON
+        response = requests.post(url, params=params, data=_InlineDataBody(payload, audio_data),
+                                 headers={"Content-Type": "application/json"}, timeout=request_timeout(30, "gemini"))
 
         if response.status_code == 200:
             data = response.json()
@@ -500,9 +657,13 @@ def gemini_speech_to_text(audio_data: bytes, audio_format: str = "webm") -> Dict
                     return {
                         "success": True,
                         "text": transcribed_text,
-                        "confidence": 0.95  # Gemini typically has high confidence
+                        "confidence": 0.95,  # Gemini typically has high confidence
+                        "audio": audio_info
                     }
 
+        if response.status_code == 429:
+            _report_gemini_rate_limit(api_key, response)
+
         logger.error(f"Speech to text failed: {response.status_code}")
         return {
             "success": False,
@@ -612,43 +773,47 @@ def gemini_text_to_speech(text: str, language: str = "en") -> Dict:
             "text": text
         }
 
-def gemini_voice_chat(audio_data: bytes, conversation_history: List[Dict] = None, include_tamil: bool = True) -> Dict:
-    """Complete voice chat pipeline with Tamil support and rate limit handling."""
-    try:
-        logger.info("Starting Gemini voice chat pipeline with Tamil support...")
+class _VoicePipelineStop(Exception):
+    """Raised by a voice stage to end the pipeline early with a ready-made response."""
 
-        # Check rate limits before starting
-        can_request, rate_message = gemini_rate_limiter.can_make_request()
-        if not can_request:
-            logger.warning(f"Gemini voice chat blocked by rate limits: {rate_message}")
-            # Raise exception to trigger proper fallback handling
-            raise Exception(f"GEMINI_RATE_LIMITED: {rate_message}")
+    def __init__(self, response: Dict):
+        super().__init__(response.get("error", "Voice pipeline stopped"))
+        self.response = response
 
-        # Step 1: Convert speech to text
-        stt_result = gemini_speech_to_text(audio_data)
+def _voice_stages(audio_data: bytes, conversation_history: List[Dict], include_tamil: bool) -> List[Stage]:
+    """STT -> generate, then English TTS prep alongside translation -> Tamil TTS prep.
 
+    With GEMINI_BILINGUAL_REPLIES the generate stage already returns the Tamil reply and the
+    translate stage only makes a call when that reply failed validation.
+    """
+    def speech_to_text(_):
+        stt_result = gemini_speech_to_text(audio_data)
         if not stt_result["success"]:
-            return {
+            raise _VoicePipelineStop({
                 "success": False,
                 "error": "Speech recognition failed",
                 "user_text": "",
                 "ai_response": "",
                 "tamil_response": "",
                 "speech_config": None
-            }
-
-        user_text = stt_result["text"]
-        logger.info(f"User said: {user_text}")
+            })
+        logger.info(f"User said: {stt_result['text']}")
+        return stt_result["text"]
 
-        # Step 2: Generate Gemini response in English with rate limit handling
+    def generate(results):
+        user_text = results["stt"]
         messages = conversation_history or []
         messages.append({"role": "user", "content": user_text})
 
-        ai_response = gemini_generate_response(messages)
+        if include_tamil and GEMINI_BILINGUAL_REPLIES:
+            reply = gemini_generate_bilingual_response(messages)
+        else:
+            reply = {"english": gemini_generate_response(messages), "tamil": None, "single_call": False}
+        ai_response = reply["english"]
 
         # Check if response indicates rate limiting
         if "rate limit" in ai_response.lower() or "temporarily unavailable" in ai_response.lower():
-            return {
+            raise _VoicePipelineStop({
                 "success": False,
                 "error": "Gemini rate limit exceeded during voice chat",
                 "user_text": user_text,
@@ -656,37 +821,81 @@ def gemini_voice_chat(audio_data: bytes, conversation_history: List[Dict] = None
                 "tamil_response": "",
                 "speech_config": None,
                 "fallback_recommended": True
-            }
+            })
+        return reply
+
+    def translate(results):
+        if results["generate"]["tamil"]:
+            return results["generate"]["tamil"]
+        translation_result = gemini_translate_to_tamil(results["generate"]["english"])
+        if translation_result["success"]:
+            logger.info("Tamil translation completed")
+            return translation_result["tamil_text"]
+        logger.warning("Tamil translation failed, using English only")
+        return ""
+
+    def tts_tamil(results):
+        return gemini_text_to_speech(results["translate"], "ta") if results["translate"] else None
+
+    stages = [
+        Stage("stt", speech_to_text),
+        Stage("generate", generate, ("stt",)),
+        Stage("tts_english", lambda results: gemini_text_to_speech(results["generate"]["english"], "en"), ("generate",))
+    ]
+    if include_tamil:
+        stages += [
+            Stage("translate", translate, ("generate",)),
+            Stage("tts_tamil", tts_tamil, ("translate",))
+        ]
+    return stages
 
-        # Step 3: Translate to Tamil if requested
-        tamil_response = ""
-        if include_tamil:
-            translation_result = gemini_translate_to_tamil(ai_response)
-            if translation_result["success"]:
-                tamil_response = translation_result["tamil_text"]
-                logger.info("Tamil translation completed")
-            else:
-                logger.warning("Tamil translation failed, using English only")
+@with_deadline()
+def gemini_voice_chat(audio_data: bytes, conversation_history: List[Dict] = None, include_tamil: bool = True) -> Dict:
+    """Complete voice chat pipeline with Tamil support and rate limit handling.
+
+    Stages run as a dependency graph: English speech prep overlaps the Tamil translation.
+    Per-stage timings are returned under "stage_timings".
+    """
+    try:
+        logger.info("Starting Gemini voice chat pipeline with Tamil support...")
+
+        # Check rate limits before starting
+        can_request, rate_message = get_gemini_key_pool().can_make_request()
+        if not can_request:
+            logger.warning(f"Gemini voice chat blocked by rate limits: {rate_message}")
+            # Raise exception to trigger proper fallback handling
+            raise ProviderRateLimitError("gemini", rate_message)
 
-        # Step 4: Prepare for text-to-speech (English)
-        tts_english = gemini_text_to_speech(ai_response, "en")
+        try:
+            results, stage_timings = run_stage_graph(
+                _voice_stages(audio_data, conversation_history, include_tamil), _voice_executor
+            )
+        except _VoicePipelineStop as stop:
+            return dict(stop.response, stage_timings=stop.stage_timings)
 
-        # Step 5: Prepare for text-to-speech (Tamil)
-        tts_tamil = None
-        if tamil_response:
-            tts_tamil = gemini_text_to_speech(tamil_response, "ta")
+        ai_response = results["generate"]["english"]
+        tamil_response = results.get("translate", "")
+        tts_english = results["tts_english"]
+        tts_tamil = results.get("tts_tamil")
+        logger.info(f"Voice pipeline stages: { {name: timing['duration_ms'] for name, timing in stage_timings['stages'].items()} }")
 
         return {
             "success": True,
-            "user_text": user_text,
+            "user_text": results["stt"],
             "ai_response": ai_response,
             "tamil_response": tamil_response,
             "speech_config_english": tts_english.get("voice_config"),
             "speech_config_tamil": tts_tamil.get("voice_config") if tts_tamil else None,
             "optimized_speech_text_english": tts_english.get("text", ai_response),
-            "optimized_speech_text_tamil": tts_tamil.get("text", tamil_response) if tts_tamil else ""
+            "optimized_speech_text_tamil": tts_tamil.get("text", tamil_response) if tts_tamil else "",
+            "bilingual_single_call": results["generate"]["single_call"],
+            "stage_timings": stage_timings
         }
 
+    except ProviderRateLimitError:
+        # Let the caller fall back to another provider
+        raise
+
     except Exception as e:
         logger.error(f"Voice chat pipeline error: {e}")
         return {
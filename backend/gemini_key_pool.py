@@ -0,0 +1,169 @@
+"""
+Gemini Key Pool for Taxora
+Spreads Gemini calls (chat, translation, speech-to-text) across several API keys, each with its own quota.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from provider_errors import ProviderRateLimitError
+from rate_limiter import RateLimiter, get_rate_limiter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Per-key quota (the free tier limits each key separately)
+GEMINI_KEY_RPM = int(os.getenv("GEMINI_RATE_LIMIT_RPM", "50"))
+GEMINI_KEY_RPD = int(os.getenv("GEMINI_RATE_LIMIT_RPD", "1500"))
+
+def load_gemini_keys() -> List[str]:
+    """Keys from GEMINI_API_KEYS (comma-separated) plus the legacy GEMINI_API_KEY / GEMINI_API_KEY_BACKUP.
+
+    Entries that are not Gemini keys (no "AIza" prefix) are logged by key id and dropped.
+    """
+    candidates = os.getenv("GEMINI_API_KEYS", "").split(",")
+    candidates += [os.getenv("GEMINI_API_KEY", ""), os.getenv("GEMINI_API_KEY_BACKUP", "")]
+
+    keys = []
+    for key in (candidate.strip() for candidate in candidates):
+        if not key or key in keys:
+            continue
+        if not key.startswith("AIza"):
+            # One malformed entry must not take the rest of the pool down with it
+            logger.warning(f"Ignoring malformed Gemini API key {_key_id(key)}")
+            continue
+        keys.append(key)
+    return keys
+
+def _key_id(api_key: str) -> str:
+    """Stable, non-secret identifier for a key (same in every worker, independent of key order)."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+class GeminiKeyPool:
+    """Least-loaded selection over N keys, each backed by its own rate limiter.
+
+    A key that gets a 429 from Google is cooled down for the server's retry-after and picked
+    again automatically once that passes; daily quotas recover when the limiter's day rolls over.
+    """
+
+    def __init__(self, api_keys: List[str], requests_per_minute: int = GEMINI_KEY_RPM,
+                 requests_per_day: Optional[int] = GEMINI_KEY_RPD):
+        self.api_keys = list(api_keys)
+        self.limiters: Dict[str, RateLimiter] = {}
+        for api_key in self.api_keys:
+            key_id = _key_id(api_key)
+            self.limiters[api_key] = get_rate_limiter(f"gemini_{key_id}", requests_per_minute, requests_per_day)
+
+        self.cooldown_until: Dict[str, float] = {}
+        self.usage: Dict[str, Dict[str, int]] = {api_key: {} for api_key in self.api_keys}
+        self.lock = threading.Lock()
+
+    def _load_order(self) -> List[str]:
+        """Keys sorted from least to most loaded (most daily, then per-minute, budget left first).
+
+        Runs on every acquire, so it only reads limiter state; the write happens in try_acquire.
+        """
+        def remaining(api_key: str) -> Tuple[int, int]:
+            status = self.limiters[api_key].get_status()
+            daily = status["daily_remaining"] if status["daily_remaining"] is not None else float("inf")
+            return daily, status["minute_remaining"]
+
+        return sorted(self.api_keys, key=remaining, reverse=True)
+
+    def acquire(self, call_type: str = "generate") -> str:
+        """Reserve one request on the least-loaded key and return that key.
+
+        Raises ProviderRateLimitError (with the shortest wait) when every key is exhausted.
+        """
+        if not self.api_keys:
+            raise ProviderRateLimitError("gemini", "No Gemini API keys configured")
+
+        now = time.time()
+        retry_after = None
+        last_message = "All Gemini API keys are cooling down"
+
+        for api_key in self._load_order():
+            with self.lock:
+                cooldown = self.cooldown_until.get(api_key, 0.0) - now
+            if cooldown > 0:
+                retry_after = cooldown if retry_after is None else min(retry_after, cooldown)
+                continue
+
+            allowed, message, wait = self.limiters[api_key].try_acquire()
+            if allowed:
+                with self.lock:
+                    self.usage[api_key][call_type] = self.usage[api_key].get(call_type, 0) + 1
+                return api_key
+
+            last_message = message
+            if wait:
+                retry_after = wait if retry_after is None else min(retry_after, wait)
+
+        logger.warning(f"All {len(self.api_keys)} Gemini keys exhausted for {call_type}: {last_message}")
+        raise ProviderRateLimitError("gemini", f"All Gemini API keys are at their limit. {last_message}",
+                                     retry_after=retry_after)
+
+    def can_make_request(self) -> Tuple[bool, str]:
+        """Check whether any key has budget left, without consuming it."""
+        now = time.time()
+        message = "No Gemini API keys configured"
+        for api_key in self.api_keys:
+            with self.lock:
+                if self.cooldown_until.get(api_key, 0.0) > now:
+                    message = "All Gemini API keys are cooling down"
+                    continue
+            allowed, message = self.limiters[api_key].can_make_request()
+            if allowed:
+                return True, "OK"
+        return False, message
+
+    def report_rate_limited(self, api_key: str, retry_after: float):
+        """Take a key out of rotation after Google answered 429 for it."""
+        with self.lock:
+            self.cooldown_until[api_key] = time.time() + retry_after
+        logger.info(f"Gemini key {_key_id(api_key)} cooling down for {retry_after:.0f}s")
+
+    def get_status(self) -> Dict:
+        """Pool-wide totals (N x per-key quota) plus a per-key breakdown."""
+        now = time.time()
+        keys = []
+        for api_key in self.api_keys:
+            status = self.limiters[api_key].get_status()
+            with self.lock:
+                cooldown = max(0.0, self.cooldown_until.get(api_key, 0.0) - now)
+                usage = dict(self.usage[api_key])
+            status.update({"key_id": _key_id(api_key), "cooldown_seconds": round(cooldown, 1), "usage": usage})
+            keys.append(status)
+
+        def total(field: str):
+            values = [key[field] for key in keys]
+            return sum(values) if values and None not in values else None
+
+        return {
+            "key_count": len(keys),
+            "requests_last_minute": total("requests_last_minute"),
+            "requests_today": total("requests_today"),
+            "minute_limit": total("minute_limit"),
+            "daily_limit": total("daily_limit"),
+            "minute_remaining": sum(key["minute_remaining"] for key in keys if not key["cooldown_seconds"]),
+            "daily_remaining": total("daily_remaining"),
+            "keys": keys
+        }
+
+# Global pool instance, built lazily from the environment
+_key_pool: Optional[GeminiKeyPool] = None
+_key_pool_lock = threading.Lock()
+
+def get_gemini_key_pool() -> GeminiKeyPool:
+    """Get the global Gemini key pool."""
+    global _key_pool
+    with _key_pool_lock:
+        if _key_pool is None:
+            _key_pool = GeminiKeyPool(load_gemini_keys())
+            logger.info(f"Gemini key pool ready with {len(_key_pool.api_keys)} key(s)")
+        return _key_pool
@@ -2,8 +2,15 @@ import os
 import logging
 import time
 import re
+import threading
 from typing import List, Dict, Optional, Any
 from dotenv import load_dotenv
+from local_inference_worker import LocalInferenceWorker, GRANITE_BATCH_TIMEOUT
+from inference_daemon import GRANITE_INFERENCE_DAEMON, GRANITE_DAEMON_TIMEOUT, InferenceDaemonClient, request_daemon_restart
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from provider_errors import ProviderError, ProviderTimeoutError, DeadlineExceededError
+from request_deadline import request_timeout
+from prompt_assembler import register_token_counter
 # from financial_advisor_fallback import improve_financial_response
 
 # Configure logging
@@ -22,11 +29,45 @@ GRANITE_MAX_LENGTH = int(os.getenv("GRANITE_MAX_LENGTH", "1024"))
 GRANITE_TEMPERATURE = float(os.getenv("GRANITE_TEMPERATURE", "0.7"))
 HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+HUGGINGFACE_API_URL = os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models")
+
+# Local model runtime: PyTorch by default, ONNX Runtime (optionally int8) when GRANITE_USE_ONNX is set
+GRANITE_LOCAL_MODEL = os.getenv("GRANITE_LOCAL_MODEL", "distilgpt2")
+GRANITE_USE_ONNX = os.getenv("GRANITE_USE_ONNX", "false").lower() == "true"
+GRANITE_ONNX_QUANTIZE = os.getenv("GRANITE_ONNX_QUANTIZE", "false").lower() == "true"
+GRANITE_ONNX_DIR = os.getenv("GRANITE_ONNX_DIR", "models/onnx")
+
+# Generation settings for the local model (shared by the request path and the benchmarks)
+LOCAL_GENERATION_KWARGS = {
+    "max_length": 150,          # Shorter for more focused responses
+    "num_return_sequences": 1,
+    "do_sample": True,
+    "temperature": 0.3,         # Lower temperature for more coherent responses
+    "top_p": 0.8,               # More focused sampling
+    "repetition_penalty": 1.5,  # Reduce repetition
+    "pad_token_id": 50256,
+    "truncation": True
+}
 
 # Global variables for model caching
 _model = None
 _tokenizer = None
 _pipeline = None
+_local_worker = None
+_local_worker_lock = threading.Lock()
+
+# Model lifecycle: not_loaded -> loading -> ready | failed
+MODEL_NOT_LOADED = "not_loaded"
+MODEL_LOADING = "loading"
+MODEL_READY = "ready"
+MODEL_FAILED = "failed"
+_model_state = MODEL_NOT_LOADED
+_model_load_seconds = None
+_model_load_error = None
+_model_load_lock = threading.Lock()
+
+# Client for the shared out-of-process model when GRANITE_INFERENCE_DAEMON is set
+_daemon_client = InferenceDaemonClient()
 
 def validate_config():
     """Validate Granite configuration."""
@@ -50,61 +91,151 @@ def validate_config():
 
 def initialize_local_model():
     """Initialize lightweight local AI model using Transformers."""
-    global _model, _tokenizer, _pipeline
+    global _model, _tokenizer, _pipeline, _model_state, _model_load_seconds, _model_load_error
 
     if _pipeline is not None:
         return True
 
-    try:
-        logger.info(f"Loading lightweight AI model: distilgpt2")
-        start_time = time.time()
+    # Only one thread loads the model; others wait for it instead of loading a second copy
+    with _model_load_lock:
+        if _pipeline is not None:
+            return True
+
+        _model_state = MODEL_LOADING
 
         try:
-            from transformers import pipeline
-            import torch
+            runtime = get_local_runtime()
+            logger.info(f"Loading lightweight AI model: {GRANITE_LOCAL_MODEL} ({runtime})")
+            start_time = time.time()
+
+            _pipeline = create_local_pipeline(runtime)
+
+            # Budget prompts with the model's own tokenizer rather than the character estimate
+            tokenizer = _pipeline.tokenizer
+            register_token_counter("granite", lambda text: len(tokenizer.encode(text)))
+
+            load_time = time.time() - start_time
+            _model_state, _model_load_seconds, _model_load_error = MODEL_READY, load_time, None
+            logger.info(f"Granite model loaded successfully in {load_time:.2f}s")
+            return True
+
         except ImportError as e:
             logger.error(f"Missing dependencies for local model: {e}")
-            logger.info("Please install: pip install transformers torch")
+            if GRANITE_USE_ONNX:
+                logger.info("Please install: pip install transformers optimum[onnxruntime]")
+            else:
+                logger.info("Please install: pip install transformers torch accelerate")
+            _model_state, _model_load_error = MODEL_FAILED, str(e)
             return False
-        
+        except Exception as e:
+            logger.error(f"Failed to load Granite model: {e}")
+            _model_state, _model_load_error = MODEL_FAILED, str(e)
+            return False
+
+def get_local_runtime() -> str:
+    """Configured local runtime: pytorch, onnx or onnx-int8."""
+    if GRANITE_USE_ONNX:
+        return "onnx-int8" if GRANITE_ONNX_QUANTIZE else "onnx"
+    return "pytorch"
+
+def create_local_pipeline(runtime: str = "pytorch", model_name: str = GRANITE_LOCAL_MODEL):
+    """Build a text-generation pipeline for the given runtime, ready for left-padded batches."""
+    if runtime in ("onnx", "onnx-int8"):
+        from onnx_backend import load_onnx_pipeline
+        local_pipeline = load_onnx_pipeline(model_name, GRANITE_ONNX_DIR, quantize=runtime == "onnx-int8")
+    else:
+        from transformers import pipeline
+        import torch
+
         # Create lightweight text generation pipeline (much faster!)
         logger.info("Creating lightweight AI pipeline...")
-        _pipeline = pipeline(
+        local_pipeline = pipeline(
             "text-generation",
-            model="distilgpt2",  # Lightweight, fast model (~350MB)
+            model=model_name,  # distilgpt2 by default: lightweight, fast model (~350MB)
             device=-1,  # Use CPU for compatibility
             max_length=200,
             do_sample=True,
             temperature=0.7,
             pad_token_id=50256  # Set pad token to avoid warnings
         )
-        
-        load_time = time.time() - start_time
-        logger.info(f"Granite model loaded successfully in {load_time:.2f}s")
-        return True
-        
-    except ImportError as e:
-        logger.error(f"Missing dependencies for local model: {e}")
-        logger.info("Please install: pip install transformers torch accelerate")
-        return False
-    except Exception as e:
-        logger.error(f"Failed to load Granite model: {e}")
-        return False
+
+    # Batched generation needs padding; GPT-2 has no pad token and must be padded on the left
+    local_pipeline.tokenizer.pad_token = local_pipeline.tokenizer.eos_token
+    local_pipeline.tokenizer.padding_side = "left"
+    return local_pipeline
+
+def start_model_warmup() -> Optional[threading.Thread]:
+    """Load the local model on a background thread so startup does not wait for it."""
+    if not GRANITE_USE_LOCAL or GRANITE_INFERENCE_DAEMON or _pipeline is not None:
+        return None
+
+    thread = threading.Thread(target=initialize_local_model, name="granite-warmup", daemon=True)
+    thread.start()
+    logger.info("Granite model warm-up started in background")
+    return thread
+
+def get_model_state() -> Dict[str, Any]:
+    """Current model lifecycle state, used for readiness checks."""
+    if not GRANITE_USE_LOCAL:
+        # API/Ollama/mock backends have nothing to load
+        return {"state": MODEL_READY, "backend": "remote", "ready": True}
+
+    if GRANITE_INFERENCE_DAEMON:
+        daemon_state = _daemon_client.ping()
+        if daemon_state is None:
+            # The daemon died or was never started: bring it back for the next requests
+            request_daemon_restart(_daemon_client.socket_path)
+            return {"state": "unavailable", "backend": "daemon", "ready": False}
+        return dict(daemon_state, backend="daemon")
+
+    return {
+        "state": _model_state,
+        "backend": "local",
+        "runtime": get_local_runtime(),
+        "model": GRANITE_LOCAL_MODEL,
+        "ready": _model_state == MODEL_READY,
+        "load_seconds": round(_model_load_seconds, 2) if _model_load_seconds is not None else None,
+        "error": _model_load_error
+    }
+
+def _generate_local_batch(prompts: List[str]) -> List[str]:
+    """Run several prompts through the local pipeline as one padded batch (worker thread only)."""
+    outputs = _pipeline(prompts, batch_size=len(prompts), **LOCAL_GENERATION_KWARGS)
+
+    # A list input gives one list of sequences per prompt
+    return [output[0]['generated_text'] if output else "" for output in outputs]
+
+def get_local_inference_worker() -> LocalInferenceWorker:
+    """Get the micro-batching worker for the local model, starting it on first use."""
+    global _local_worker
+    with _local_worker_lock:
+        if _local_worker is None:
+            _local_worker = LocalInferenceWorker(_generate_local_batch)
+        return _local_worker
+
+def get_local_inference_stats() -> Optional[Dict]:
+    """Batch-size and queue-latency histograms for the local worker, if it has started."""
+    return _local_worker.get_stats() if _local_worker is not None else None
 
 def granite_chat_local(messages: List[Dict]) -> str:
     """Generate response using local Granite model."""
-    global _pipeline
-    
-    if not initialize_local_model():
-        return "Local Granite model not available. Please check your setup."
+    # Get the last user message
+    user_message = ""
+    for msg in reversed(messages):
+        if msg["role"] == "user":
+            user_message = msg["content"]
+            break
+
+    if not GRANITE_INFERENCE_DAEMON:
+        if _model_state == MODEL_LOADING:
+            # Don't hold the request for the whole warm-up
+            logger.info("Local model still warming up, using fallback financial advice")
+            return generate_fallback_financial_advice(user_message)
+
+        if not initialize_local_model():
+            return "Local Granite model not available. Please check your setup."
     
     try:
-        # Get the last user message
-        user_message = ""
-        for msg in reversed(messages):
-            if msg["role"] == "user":
-                user_message = msg["content"]
-                break
 
         # Create a simple, focused prompt that works better with DistilGPT-2
         prompt = f"Financial Question: {user_message}\n\nProfessional Financial Advice:"
@@ -112,24 +243,32 @@ def granite_chat_local(messages: List[Dict]) -> str:
         logger.info(f"Generating response with lightweight AI model...")
         start_time = time.time()
 
-        # Generate response with conservative parameters for better quality
-        outputs = _pipeline(
-            prompt,
-            max_length=150,  # Shorter for more focused responses
-            num_return_sequences=1,
-            do_sample=True,
-            temperature=0.3,  # Lower temperature for more coherent responses
-            top_p=0.8,        # More focused sampling
-            repetition_penalty=1.5,  # Reduce repetition
-            pad_token_id=50256,
-            truncation=True
-        )
+        if GRANITE_INFERENCE_DAEMON:
+            # One shared model in the daemon process serves every API worker
+            try:
+                full_text = _daemon_client.generate(prompt, timeout=request_timeout(GRANITE_DAEMON_TIMEOUT, "granite"))
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                logger.warning(f"Inference daemon unavailable ({e}), using fallback financial advice")
+                if isinstance(e, OSError) and _daemon_client.ping() is None:
+                    request_daemon_restart(_daemon_client.socket_path)
+                return generate_fallback_financial_advice(user_message)
+        else:
+            # Concurrent requests are micro-batched into one forward pass by the worker
+            timeout = request_timeout(GRANITE_BATCH_TIMEOUT, "granite")
+            try:
+                full_text = get_local_inference_worker().generate(prompt, timeout=timeout)
+            except (TimeoutError, FutureTimeoutError):
+                # A wait cut short by the request budget is the caller's deadline, not a slow model
+                if timeout < GRANITE_BATCH_TIMEOUT:
+                    raise DeadlineExceededError("granite", f"Request deadline reached waiting {timeout:.1f}s for the local model")
+                raise ProviderTimeoutError("granite", f"Local model did not answer within {timeout:.0f}s")
 
         response_time = time.time() - start_time
 
-        if outputs and len(outputs) > 0:
+        if full_text:
             # Extract only the generated part (remove the prompt)
-            full_text = outputs[0]['generated_text']
             response = full_text[len(prompt):].strip()
 
             logger.info(f"Raw AI output: '{full_text[:200]}...'")
@@ -148,7 +287,10 @@ def granite_chat_local(messages: List[Dict]) -> str:
         else:
             logger.error("No outputs generated from AI model")
             return "I couldn't generate a response. Please try again."
-            
+
+    except ProviderError:
+        # Timeouts and deadlines must reach the manager's fallback and breaker, not look like a reply
+        raise
     except Exception as e:
         logger.error(f"Error generating local Granite response: {e}")
         return "I encountered an error while generating a response. Please try again."
@@ -160,7 +302,7 @@ def granite_chat_api(messages: List[Dict]) -> str:
         
         prompt = format_messages_for_granite(messages)
         
-        url = f"https://api-inference.huggingface.co/models/{GRANITE_MODEL_NAME}"
+        url = f"{HUGGINGFACE_API_URL}/{GRANITE_MODEL_NAME}"
         headers = {
             "Authorization": f"Bearer {HUGGINGFACE_TOKEN}",
             "Content-Type": "application/json"
@@ -180,7 +322,7 @@ def granite_chat_api(messages: List[Dict]) -> str:
         logger.info("Calling Hugging Face Inference API...")
         start_time = time.time()
         
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = requests.post(url, headers=headers, json=payload, timeout=request_timeout(60, "granite"))
         response.raise_for_status()
         
         response_time = time.time() - start_time
@@ -227,7 +369,7 @@ def granite_chat_ollama(messages: List[Dict]) -> str:
         logger.info("Calling Ollama API...")
         start_time = time.time()
         
-        response = requests.post(url, json=payload, timeout=60)
+        response = requests.post(url, json=payload, timeout=request_timeout(60, "granite"))
         response.raise_for_status()
         
         response_time = time.time() - start_time
@@ -602,6 +744,8 @@ def granite_chat(messages: List[Dict]) -> str:
         # Return the response (already improved by our enhancement functions)
         return response
     
+    except ProviderError:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in granite_chat: {e}")
         return "I encountered an unexpected error. Please try again."
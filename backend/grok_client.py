@@ -9,6 +9,11 @@ import time
 import json
 import requests
 from typing import List, Dict, Optional
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderTimeoutError,
+    ProviderConnectionError, ProviderAPIError
+)
+from rate_limiter import get_rate_limiter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -27,6 +32,9 @@ GROK_TEMPERATURE = float(os.getenv("GROK_TEMPERATURE", "0.7"))
 # API URLs
 GROK_API_URL = "https://api.x.ai/v1/chat/completions"
 
+# Client-side rate limiting (shared across workers when RATE_LIMIT_DB_PATH is set)
+grok_rate_limiter = get_rate_limiter("grok", requests_per_minute=60)
+
 def validate_grok_config() -> bool:
     """Validate Grok API configuration."""
     if not GROK_API_KEY:
@@ -72,6 +80,10 @@ def grok_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
     """Generate response using Grok AI API."""
     if not validate_grok_config():
         return "Grok is not configured. Please add your xAI API key to use this feature."
+
+    allowed, rate_message, retry_after = grok_rate_limiter.try_acquire()
+    if not allowed:
+        raise ProviderRateLimitError("grok", rate_message, retry_after=retry_after or None)
     
     for attempt in range(max_retries + 1):
         try:
@@ -140,7 +152,7 @@ def grok_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     continue
                 else:
                     logger.error("Max retries exceeded for Grok rate limit")
-                    raise Exception(f"GROK_RATE_LIMITED: Grok is experiencing high demand. Retry in {retry_after} seconds.")
+                    raise ProviderRateLimitError("grok", f"Grok is experiencing high demand. Retry in {retry_after} seconds.", retry_after=retry_after, status_code=429)
                 
             elif response.status_code == 400:
                 logger.error(f"Bad request to Grok API: {response.text}")
@@ -153,7 +165,7 @@ def grok_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                     time.sleep(5)
                     continue
                 else:
-                    raise Exception("GROK_API_ERROR: I'm having trouble connecting to Grok.")
+                    raise ProviderAPIError("grok", "I'm having trouble connecting to Grok.")
                     
         except requests.exceptions.Timeout:
             logger.warning(f"Grok API timeout, attempt {attempt + 1}/{max_retries + 1}")
@@ -161,7 +173,7 @@ def grok_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 time.sleep(5)
                 continue
             else:
-                raise Exception("GROK_TIMEOUT: The request took too long.")
+                raise ProviderTimeoutError("grok", "The request took too long.")
                 
         except requests.exceptions.ConnectionError:
             logger.warning(f"Grok connection error, attempt {attempt + 1}/{max_retries + 1}")
@@ -169,7 +181,7 @@ def grok_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 time.sleep(5)
                 continue
             else:
-                raise Exception("GROK_CONNECTION_ERROR: I can't connect to Grok right now.")
+                raise ProviderConnectionError("grok", "I can't connect to Grok right now.")
                 
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from Grok API")
@@ -177,24 +189,23 @@ def grok_generate_response(messages: List[Dict], max_retries: int = 2) -> str:
                 time.sleep(2)
                 continue
             else:
-                raise Exception("GROK_API_ERROR: I received an unexpected response.")
+                raise ProviderAPIError("grok", "I received an unexpected response.")
                 
+        except ProviderError:
+            # Re-raise typed provider errors to trigger fallback
+            raise
+
         except Exception as e:
-            error_str = str(e)
             logger.error(f"Unexpected error with Grok API: {e}")
             
-            # Re-raise specific Grok errors to trigger fallback
-            if any(error_type in error_str for error_type in ["GROK_RATE_LIMITED", "GROK_API_ERROR", "GROK_CONNECTION_ERROR", "GROK_TIMEOUT"]):
-                raise e
-            
             if attempt < max_retries:
                 time.sleep(2)
                 continue
             else:
-                raise Exception(f"GROK_API_ERROR: I encountered an unexpected error: {str(e)}")
+                raise ProviderAPIError("grok", f"I encountered an unexpected error: {str(e)}")
     
     # If we get here, all retries failed
-    raise Exception("GROK_API_ERROR: Grok is currently unavailable after all retries.")
+    raise ProviderAPIError("grok", "Grok is currently unavailable after all retries.")
 
 def test_grok_connection() -> Dict:
     """Test Grok API connection."""
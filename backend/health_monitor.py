@@ -0,0 +1,79 @@
+"""
+Health Monitor for Taxora
+Runs the AI connectivity probe in the background and serves cached results to status endpoints.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Probe configuration
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "300"))
+
+class ConnectivityMonitor:
+    """Refreshes a connectivity probe periodically so status requests never run it inline.
+
+    The first probe waits until is_ready() reports true, so it does not race the model warm-up.
+    """
+
+    def __init__(self, probe: Callable[[], Dict], is_ready: Callable[[], bool],
+                 interval: float = HEALTH_PROBE_INTERVAL):
+        self.probe = probe
+        self.is_ready = is_ready
+        self.interval = interval
+        self.results: Optional[Dict] = None
+        self.checked_at: Optional[float] = None
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background refresh thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="connectivity-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+
+    def refresh(self) -> Dict:
+        """Run the probe now and cache its results."""
+        try:
+            results = self.probe()
+        except Exception as e:
+            logger.error(f"Connectivity probe failed: {e}")
+            results = {"error": str(e)}
+
+        with self.lock:
+            self.results = results
+            self.checked_at = time.time()
+        return results
+
+    def _run(self):
+        """Wait for readiness, then probe every interval until stopped."""
+        while not self._stop.is_set() and not self.is_ready():
+            self._stop.wait(1.0)
+
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def get_results(self) -> Dict:
+        """Latest cached probe results; "pending" is true until the first probe completes."""
+        with self.lock:
+            if self.results is None:
+                return {"pending": True, "checked_at": None}
+
+            results = dict(self.results)
+            results["pending"] = False
+            results["checked_at"] = self.checked_at
+            results["age_seconds"] = round(time.time() - self.checked_at, 1)
+            return results
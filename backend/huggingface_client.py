@@ -9,6 +9,9 @@ import json
 import logging
 import time
 from typing import List, Dict
+from provider_errors import ProviderError, ProviderAuthError, ProviderRateLimitError
+from rate_limiter import get_rate_limiter
+from request_deadline import request_timeout, backoff_sleep
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,7 +24,7 @@ HUGGINGFACE_MAX_TOKENS = int(os.getenv("HUGGINGFACE_MAX_TOKENS", "200"))
 HUGGINGFACE_TEMPERATURE = float(os.getenv("HUGGINGFACE_TEMPERATURE", "0.7"))
 
 # API URL
-HUGGINGFACE_API_URL = "https://api-inference.huggingface.co/models"
+HUGGINGFACE_API_URL = os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models")
 
 # Available models for financial advice
 FINANCIAL_MODELS = {
@@ -32,6 +35,9 @@ FINANCIAL_MODELS = {
     "microsoft/DialoGPT-medium": "Medium conversational model"
 }
 
+# Client-side rate limiting (shared across workers when RATE_LIMIT_DB_PATH is set)
+huggingface_rate_limiter = get_rate_limiter("huggingface", requests_per_minute=60)
+
 def validate_huggingface_config() -> bool:
     """Validate Hugging Face configuration."""
     if not HUGGINGFACE_API_KEY:
@@ -50,6 +56,10 @@ def huggingface_generate_response(messages: List[Dict], max_retries: int = 2) ->
     if not validate_huggingface_config():
         return "Hugging Face is not configured. Please add your Hugging Face API key to use this feature."
 
+    allowed, rate_message, retry_after = huggingface_rate_limiter.try_acquire()
+    if not allowed:
+        raise ProviderRateLimitError("huggingface", rate_message, retry_after=retry_after or None)
+
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"Sending request to Hugging Face API (attempt {attempt + 1}/{max_retries + 1})...")
@@ -108,7 +118,7 @@ def huggingface_generate_response(messages: List[Dict], max_retries: int = 2) ->
                         url,
                         headers=headers,
                         json=payload,
-                        timeout=60
+                        timeout=request_timeout(60, "huggingface")
                     )
                     
                     response_time = time.time() - start_time
@@ -142,17 +152,14 @@ def huggingface_generate_response(messages: List[Dict], max_retries: int = 2) ->
                     
                     elif response.status_code == 429:
                         logger.warning(f"Rate limit exceeded for {model}")
-                        if attempt < max_retries:
-                            wait_time = 2 ** attempt
-                            logger.info(f"Waiting {wait_time} seconds before retry...")
-                            time.sleep(wait_time)
+                        if attempt < max_retries and backoff_sleep(attempt, "huggingface"):
                             break
                         else:
                             continue
                     
                     elif response.status_code == 401:
                         logger.error("Hugging Face authentication failed - invalid API key")
-                        raise Exception("HUGGINGFACE_API_ERROR: Invalid API key")
+                        raise ProviderAuthError("huggingface", "Invalid API key", status_code=401)
                     
                     else:
                         logger.warning(f"Hugging Face API error for {model}: {response.status_code} - {response.text}")
@@ -167,24 +174,22 @@ def huggingface_generate_response(messages: List[Dict], max_retries: int = 2) ->
                     continue
             
             # If we get here, all models failed for this attempt
-            if attempt < max_retries:
-                wait_time = 2 ** attempt
-                logger.info(f"All models failed, waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
+            if attempt < max_retries and backoff_sleep(attempt, "huggingface"):
+                logger.info("All models failed, retrying...")
                 continue
             else:
                 # Generate a fallback response
                 return generate_fallback_financial_response(messages)
         
+        except ProviderError:
+            raise
+
         except Exception as e:
-            if "HUGGINGFACE_" in str(e):
-                raise e
+            logger.error(f"Unexpected error in Hugging Face client: {e}")
+            if attempt < max_retries:
+                continue
             else:
-                logger.error(f"Unexpected error in Hugging Face client: {e}")
-                if attempt < max_retries:
-                    continue
-                else:
-                    return generate_fallback_financial_response(messages)
+                return generate_fallback_financial_response(messages)
     
     return "I apologize, but I'm having trouble connecting to the AI service. Please try again later."
 
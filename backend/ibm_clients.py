@@ -5,6 +5,11 @@ import logging
 import time
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
+from provider_errors import (
+	ProviderError, ProviderRateLimitError, ProviderTimeoutError,
+	ProviderConnectionError, ProviderAuthError, ProviderAPIError
+)
+from request_deadline import request_timeout, backoff_sleep
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +23,7 @@ WATSONX_URL = os.getenv("WATSONX_URL")
 WATSONX_PROJECT_ID = os.getenv("WATSONX_PROJECT_ID")
 WATSONX_MODEL_ID = os.getenv("WATSONX_MODEL_ID", "ibm/granite-3-3-8b-instruct")
 WATSONX_API_VERSION = os.getenv("WATSONX_API_VERSION", "2024-10-10")
+WATSONX_IAM_URL = os.getenv("WATSONX_IAM_URL", "https://iam.cloud.ibm.com/identity/token")
 
 # Watson NLU Configuration
 NLU_APIKEY = os.getenv("NLU_APIKEY")
@@ -56,7 +62,7 @@ def get_iam_token() -> Optional[str]:
 		logger.error("WATSONX_APIKEY not configured")
 		return None
 	
-	url = "https://iam.cloud.ibm.com/identity/token"
+	url = WATSONX_IAM_URL
 	headers = {"Content-Type": "application/x-www-form-urlencoded"}
 	data = {
 		"grant_type": "urn:ibm:params:oauth:grant-type:apikey",
@@ -91,17 +97,23 @@ def watsonx_chat(messages: List[Dict]) -> str:
 		messages: List of message dictionaries with 'role' and 'content' keys
 		
 	Returns:
-		Assistant reply string or error message
+		Assistant reply string
+
+	Raises:
+		ProviderError subclasses on failure, so the manager can fall back to another provider
 	"""
 	if not messages:
 		logger.error("Empty messages list provided to watsonx_chat")
-		return "I need a message to respond to. Please try again."
+		raise ProviderAPIError("watsonx", "No messages to respond to.")
+
+	if not (WATSONX_APIKEY and WATSONX_URL and WATSONX_PROJECT_ID):
+		raise ProviderAuthError("watsonx", "watsonx.ai is not configured. Please set WATSONX_APIKEY, WATSONX_URL and WATSONX_PROJECT_ID.")
 	
 	try:
 		# Get authentication token
 		token = get_iam_token()
 		if not token:
-			return "I'm having trouble connecting to IBM Watson services. Please try again later."
+			raise ProviderAuthError("watsonx", "Could not obtain an IBM Cloud IAM token.")
 		
 		# Prepare API request
 		url = f"{WATSONX_URL}/ml/v1/chat/completions?version={WATSONX_API_VERSION}"
@@ -131,21 +143,36 @@ def watsonx_chat(messages: List[Dict]) -> str:
 		max_retries = 2
 		for attempt in range(max_retries):
 			try:
-				r = requests.post(url, headers=headers, json=payload, timeout=90)
-				r.raise_for_status()
-				break
+				r = requests.post(url, headers=headers, json=payload, timeout=request_timeout(90, "watsonx"))
 			except requests.exceptions.Timeout:
 				logger.warning(f"watsonx.ai request timeout (attempt {attempt + 1})")
-				if attempt < max_retries - 1:
-					time.sleep(1)
-				else:
-					return "I'm taking longer than usual to respond. Please try a shorter message."
+				if attempt < max_retries - 1 and backoff_sleep(attempt, "watsonx"):
+					continue
+				raise ProviderTimeoutError("watsonx", "watsonx.ai took too long to respond.")
 			except requests.exceptions.RequestException as e:
 				logger.error(f"watsonx.ai request failed (attempt {attempt + 1}): {e}")
-				if attempt < max_retries - 1:
-					time.sleep(2)
-				else:
-					return "I'm having trouble generating a response right now. Please try again."
+				if attempt < max_retries - 1 and backoff_sleep(attempt, "watsonx"):
+					continue
+				raise ProviderConnectionError("watsonx", "I can't connect to watsonx.ai right now.")
+
+			if r.status_code in (401, 403):
+				logger.error(f"watsonx.ai rejected the credentials ({r.status_code})")
+				raise ProviderAuthError("watsonx", "watsonx.ai rejected the IAM token.", status_code=r.status_code)
+			if r.status_code == 429:
+				retry_after = float(r.headers.get("retry-after", "10"))
+				if attempt < max_retries - 1 and backoff_sleep(attempt, "watsonx", retry_after=retry_after):
+					continue
+				raise ProviderRateLimitError("watsonx", f"watsonx.ai is rate limiting requests. Retry in {retry_after:.0f} seconds.",
+				                             retry_after=retry_after, status_code=429)
+			if r.status_code >= 500:
+				logger.error(f"watsonx.ai error {r.status_code} (attempt {attempt + 1}): {r.text}")
+				if attempt < max_retries - 1 and backoff_sleep(attempt, "watsonx"):
+					continue
+				raise ProviderAPIError("watsonx", "I'm having trouble connecting to watsonx.ai.", status_code=r.status_code)
+			if r.status_code != 200:
+				logger.error(f"watsonx.ai request rejected ({r.status_code}): {r.text}")
+				raise ProviderAPIError("watsonx", "watsonx.ai rejected the request.", status_code=r.status_code)
+			break
 		
 		# Process response
 		response_time = time.time() - start_time
@@ -154,39 +181,38 @@ def watsonx_chat(messages: List[Dict]) -> str:
 		data = r.json()
 		
 		# Enhanced response extraction with multiple fallback strategies
-		try:
-			# Primary: Standard chat completion format
-			if "choices" in data and len(data["choices"]) > 0:
-				choice = data["choices"][0]
-				if "message" in choice and "content" in choice["message"]:
-					content = choice["message"]["content"].strip()
-					if content:
-						logger.info(f"Successfully extracted response ({len(content)} chars)")
-						return content
-			
-			# Fallback: Direct content field
-			if "content" in data:
-				content = data["content"].strip()
-				if content:
-					return content
-			
-			# Fallback: Text field
-			if "text" in data:
-				content = data["text"].strip()
+		# Primary: Standard chat completion format
+		if "choices" in data and len(data["choices"]) > 0:
+			choice = data["choices"][0]
+			if "message" in choice and "content" in choice["message"]:
+				content = choice["message"]["content"].strip()
 				if content:
+					logger.info(f"Successfully extracted response ({len(content)} chars)")
 					return content
-			
-			# If no content found, log the structure for debugging
-			logger.error(f"Unexpected watsonx.ai response structure: {list(data.keys())}")
-			return "I received an unexpected response format. Please try rephrasing your question."
-			
-		except Exception as e:
-			logger.error(f"Error extracting watsonx.ai response: {e}")
-			return "I had trouble processing the response. Please try again."
+		
+		# Fallback: Direct content field
+		if "content" in data:
+			content = data["content"].strip()
+			if content:
+				return content
+		
+		# Fallback: Text field
+		if "text" in data:
+			content = data["text"].strip()
+			if content:
+				return content
+		
+		# If no content found, log the structure for debugging
+		logger.error(f"Unexpected watsonx.ai response structure: {list(data.keys())}")
+		raise ProviderAPIError("watsonx", "I received an unexpected response format.")
+
+	except ProviderError:
+		# Re-raise typed provider errors to trigger fallback
+		raise
 	
 	except Exception as e:
 		logger.error(f"Unexpected error in watsonx_chat: {e}")
-		return "I encountered an unexpected error. Please try again."
+		raise ProviderAPIError("watsonx", f"I encountered an unexpected error: {str(e)}")
 
 def nlu_analyze(text: str) -> Optional[Dict]:
 	"""
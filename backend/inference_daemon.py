@@ -0,0 +1,287 @@
+"""
+Inference Daemon for Taxora
+Loads the local model once and serves every API worker over a Unix socket (JSON lines).
+
+Run standalone with:  python inference_daemon.py --socket /tmp/taxora-inference.sock
+or set GRANITE_INFERENCE_DAEMON=true and the API's lifespan hook starts it automatically.
+The daemon runs detached from the worker that spawned it and is stopped by the last worker to shut down.
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import signal
+import socket
+import logging
+import argparse
+import threading
+import subprocess
+import socketserver
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Daemon configuration
+GRANITE_INFERENCE_DAEMON = os.getenv("GRANITE_INFERENCE_DAEMON", "false").lower() == "true"
+GRANITE_DAEMON_SOCKET = os.getenv("GRANITE_DAEMON_SOCKET", "/tmp/taxora-inference.sock")
+GRANITE_DAEMON_TIMEOUT = float(os.getenv("GRANITE_DAEMON_TIMEOUT", "60"))
+GRANITE_DAEMON_START_TIMEOUT = float(os.getenv("GRANITE_DAEMON_START_TIMEOUT", "10"))
+
+# =============================================================================
+# CLIENT (used by API workers)
+# =============================================================================
+
+class InferenceDaemonClient:
+    """Sends prompts to the daemon; one short-lived connection per request."""
+
+    def __init__(self, socket_path: str = GRANITE_DAEMON_SOCKET, timeout: float = GRANITE_DAEMON_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, payload: Dict, timeout: float) -> Dict:
+        """Send one JSON line and read one JSON line back."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(self.socket_path)
+            sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+
+            buffer = b""
+            while not buffer.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    raise ConnectionError("Inference daemon closed the connection")
+                buffer += chunk
+
+        response = json.loads(buffer.decode("utf-8"))
+        if "error" in response:
+            raise RuntimeError(f"Inference daemon error: {response['error']}")
+        return response
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Generate text for a prompt. Raises on timeout, connection failure or daemon error."""
+        return self._request({"op": "generate", "prompt": prompt}, timeout or self.timeout)["text"]
+
+    def ping(self, timeout: float = 1.0) -> Optional[Dict]:
+        """Get the daemon's model state, or None if it is not reachable."""
+        try:
+            return self._request({"op": "ping"}, timeout)["model"]
+        except (OSError, ValueError, RuntimeError):
+            return None
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class _InferenceRequestHandler(socketserver.StreamRequestHandler):
+    """Handles JSON-line requests on one connection; concurrent connections batch together."""
+
+    def handle(self):
+        from granite_client import initialize_local_model, get_local_inference_worker, get_model_state
+
+        for line in self.rfile:
+            try:
+                request = json.loads(line.decode("utf-8"))
+                if request.get("op") == "ping":
+                    response = {"model": get_model_state()}
+                elif get_model_state()["state"] == "loading":
+                    response = {"error": "Model still loading"}
+                elif not initialize_local_model():
+                    response = {"error": "Local model not available"}
+                else:
+                    response = {"text": get_local_inference_worker().generate(request["prompt"])}
+            except Exception as e:
+                response = {"error": str(e)}
+
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+class InferenceDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server; each request thread submits to the shared batching worker."""
+
+    daemon_threads = True
+
+def serve(socket_path: str = GRANITE_DAEMON_SOCKET):
+    """Load the model and serve until interrupted."""
+    from granite_client import initialize_local_model
+
+    if os.path.exists(socket_path):
+        if InferenceDaemonClient(socket_path).ping() is not None:
+            logger.error(f"An inference daemon is already serving {socket_path}, exiting")
+            return
+        os.unlink(socket_path)  # left behind by a daemon that crashed
+
+    server = InferenceDaemonServer(socket_path, _InferenceRequestHandler)
+    socket_inode = os.stat(socket_path).st_ino
+    with open(_pid_path(socket_path), "w") as pid_file:
+        pid_file.write(str(os.getpid()))
+    logger.info(f"Inference daemon listening on {socket_path}, loading model...")
+
+    # SIGTERM from the last API worker shuts the server down cleanly
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+
+    # Accept pings while the model loads so workers can report "loading" readiness
+    threading.Thread(target=initialize_local_model, name="granite-warmup", daemon=True).start()
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # Only remove what is still ours; a replacement daemon may own the path by now
+        if os.path.exists(socket_path) and os.stat(socket_path).st_ino == socket_inode:
+            os.unlink(socket_path)
+        if _read_pid(socket_path) == os.getpid():
+            os.unlink(_pid_path(socket_path))
+
+# =============================================================================
+# PROCESS MANAGEMENT (called from the API lifespan hook)
+# =============================================================================
+
+# Every API worker using the daemon has a file named after its pid in <socket>.users;
+# the daemon writes its own pid to <socket>.pid so whichever worker stops last can end it.
+_registered_socket: Optional[str] = None
+_restart_lock = threading.Lock()
+_restart_thread: Optional[threading.Thread] = None
+
+def _pid_path(socket_path: str) -> str:
+    return f"{socket_path}.pid"
+
+def _users_dir(socket_path: str) -> str:
+    return f"{socket_path}.users"
+
+def _read_pid(socket_path: str) -> Optional[int]:
+    try:
+        with open(_pid_path(socket_path)) as pid_file:
+            return int(pid_file.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _wait_for_exit(pid: int, timeout: float) -> bool:
+    """Wait for a process to exit, reaping it if it is our own child."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                return True
+        except ChildProcessError:
+            # Not our child (another worker spawned it): poll until it is gone
+            if not _pid_alive(pid):
+                return True
+        time.sleep(0.1)
+    return False
+
+@contextmanager
+def _daemon_lock(socket_path: str):
+    """Serialize daemon start/stop across API worker processes."""
+    with open(f"{socket_path}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _live_users(socket_path: str) -> List[int]:
+    """Pids of workers still using the daemon; entries of workers that died are removed."""
+    users_dir = _users_dir(socket_path)
+    if not os.path.isdir(users_dir):
+        return []
+
+    users = []
+    for name in os.listdir(users_dir):
+        if name.isdigit() and _pid_alive(int(name)):
+            users.append(int(name))
+        else:
+            os.unlink(os.path.join(users_dir, name))
+    return users
+
+def start_daemon(socket_path: str = GRANITE_DAEMON_SOCKET) -> bool:
+    """Register this worker as a daemon user and make sure one daemon is running.
+
+    Returns True once it answers pings. With several uvicorn workers every lifespan calls this;
+    a file lock makes sure only the first one spawns the process and the rest just wait for it.
+    The daemon gets its own session so it outlives the worker that spawned it.
+    """
+    global _registered_socket
+
+    client = InferenceDaemonClient(socket_path)
+    with _daemon_lock(socket_path):
+        os.makedirs(_users_dir(socket_path), exist_ok=True)
+        open(os.path.join(_users_dir(socket_path), str(os.getpid())), "w").close()
+        _registered_socket = socket_path
+
+        if client.ping() is None:
+            logger.info("Starting local inference daemon...")
+            env = dict(os.environ, GRANITE_INFERENCE_DAEMON="false")
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--socket", socket_path],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                env=env,
+                start_new_session=True
+            )
+
+        deadline = time.time() + GRANITE_DAEMON_START_TIMEOUT
+        while time.time() < deadline:
+            if client.ping() is not None:
+                return True
+            time.sleep(0.2)
+
+    logger.warning("Inference daemon did not come up in time; requests will use fallback responses")
+    return False
+
+def request_daemon_restart(socket_path: str = GRANITE_DAEMON_SOCKET) -> bool:
+    """Start the daemon again in the background after a failed ping. Returns False if a restart is already running."""
+    global _restart_thread
+
+    with _restart_lock:
+        if _restart_thread is not None and _restart_thread.is_alive():
+            return False
+        logger.warning("Inference daemon not reachable, restarting it")
+        _restart_thread = threading.Thread(target=start_daemon, args=(socket_path,), name="inference-daemon-restart", daemon=True)
+        _restart_thread.start()
+        return True
+
+def stop_daemon():
+    """Unregister this worker; the last worker to stop terminates the daemon."""
+    global _registered_socket
+    if _registered_socket is None:
+        return
+
+    socket_path, _registered_socket = _registered_socket, None
+    with _daemon_lock(socket_path):
+        user_file = os.path.join(_users_dir(socket_path), str(os.getpid()))
+        if os.path.exists(user_file):
+            os.unlink(user_file)
+
+        users = _live_users(socket_path)
+        if users:
+            logger.info(f"Inference daemon still used by {len(users)} other worker(s), leaving it running")
+            return
+
+        pid = _read_pid(socket_path)
+        if pid is None or not _pid_alive(pid):
+            return
+
+        logger.info("Stopping local inference daemon...")
+        os.kill(pid, signal.SIGTERM)
+        if not _wait_for_exit(pid, 10):
+            os.kill(pid, signal.SIGKILL)
+            _wait_for_exit(pid, 5)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Taxora local inference daemon")
+    parser.add_argument("--socket", default=GRANITE_DAEMON_SOCKET, help="Unix socket path")
+    args = parser.parse_args()
+    serve(args.socket)
@@ -0,0 +1,253 @@
+"""
+Transaction Insight Batcher for Taxora
+Coalesces per-transaction AI insight requests into a single batched prompt.
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Batching configuration
+INSIGHT_BATCH_WINDOW_MS = int(os.getenv("INSIGHT_BATCH_WINDOW_MS", "50"))
+INSIGHT_BATCH_MAX_SIZE = int(os.getenv("INSIGHT_BATCH_MAX_SIZE", "20"))
+INSIGHT_BATCH_TIMEOUT = float(os.getenv("INSIGHT_BATCH_TIMEOUT", "120"))
+
+INSIGHT_KEYS = ["categorization", "tax_tips", "cash_flow_impact"]
+
+def default_transaction_insights() -> Dict:
+    """Default insights used when the AI response is missing or unparseable."""
+    return {
+        "categorization": "Transaction recorded successfully",
+        "tax_tips": "Ensure proper documentation for tax purposes",
+        "cash_flow_impact": "Monitor overall cash flow trends"
+    }
+
+def parse_json_array(text: str) -> Optional[List]:
+    """Extract the first JSON array from an AI response."""
+    if not text:
+        return None
+
+    # Strip markdown code fences the models like to add
+    cleaned = re.sub(r'```(?:json)?', '', text).strip()
+
+    try:
+        data = json.loads(cleaned)
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            # Some models wrap the array in an object, e.g. {"insights": [...]}
+            for value in data.values():
+                if isinstance(value, list):
+                    return value
+    except json.JSONDecodeError:
+        pass
+
+    start = cleaned.find('[')
+    end = cleaned.rfind(']')
+    if start == -1 or end <= start:
+        return None
+
+    try:
+        data = json.loads(cleaned[start:end + 1])
+        return data if isinstance(data, list) else None
+    except json.JSONDecodeError:
+        return None
+
+class TransactionInsightBatcher:
+    """Collects pending insight requests per business and sends them as one prompt."""
+
+    def __init__(self, generate_fn: Optional[Callable[[List[Dict]], Dict]] = None,
+                 window_ms: int = INSIGHT_BATCH_WINDOW_MS, max_batch_size: int = INSIGHT_BATCH_MAX_SIZE):
+        self._generate_fn = generate_fn
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: Dict[str, List[Tuple[object, Future]]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "batches_sent": 0,
+            "provider_calls_saved": 0,
+            "parse_failures": 0
+        }
+
+    def _generate(self, messages: List[Dict]) -> Dict:
+        """Send a prompt through the configured generator (AI provider manager by default)."""
+        if self._generate_fn is not None:
+            return self._generate_fn(messages)
+
+        from ai_provider_manager import get_ai_manager
+        from llm_scheduler import PRIORITY_BATCH
+        return get_ai_manager().generate_response(messages, priority=PRIORITY_BATCH)
+
+    def submit(self, business_id: str, transaction) -> Future:
+        """Queue a transaction for insight generation and return a future for its result."""
+        future = Future()
+        flush_now = None
+
+        with self.lock:
+            self.stats["requests"] += 1
+            pending = self._pending.setdefault(business_id, [])
+            pending.append((transaction, future))
+
+            if len(pending) >= self.max_batch_size:
+                flush_now = self._take_pending(business_id)
+            elif business_id not in self._timers:
+                timer = threading.Timer(self.window_seconds, self._flush_business, args=(business_id,))
+                timer.daemon = True
+                self._timers[business_id] = timer
+                timer.start()
+
+        if flush_now:
+            self._run_batch(business_id, flush_now)
+
+        return future
+
+    def get_insights(self, business_id: str, transaction, timeout: float = INSIGHT_BATCH_TIMEOUT) -> Dict:
+        """Blocking helper: submit a single transaction and wait for its insights."""
+        try:
+            return self.submit(business_id, transaction).result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Batched transaction insight failed: {e}")
+            return default_transaction_insights()
+
+    def get_insights_bulk(self, business_id: str, transactions: List, timeout: float = INSIGHT_BATCH_TIMEOUT) -> List[Dict]:
+        """Submit many transactions at once; they are flushed together in max-size batches."""
+        futures = [self.submit(business_id, transaction) for transaction in transactions]
+        self.flush(business_id)
+
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=timeout))
+            except Exception as e:
+                logger.error(f"Batched transaction insight failed: {e}")
+                results.append(default_transaction_insights())
+        return results
+
+    def flush(self, business_id: Optional[str] = None):
+        """Immediately send pending requests for one business (or all businesses)."""
+        if business_id:
+            business_ids = [business_id]
+        else:
+            with self.lock:
+                business_ids = list(self._pending.keys())
+
+        for bid in business_ids:
+            self._flush_business(bid)
+
+    def get_stats(self) -> Dict:
+        """Get batching statistics."""
+        with self.lock:
+            stats = dict(self.stats)
+            stats["pending"] = sum(len(p) for p in self._pending.values())
+            stats["window_ms"] = int(self.window_seconds * 1000)
+            stats["max_batch_size"] = self.max_batch_size
+            return stats
+
+    def _take_pending(self, business_id: str) -> List[Tuple[object, Future]]:
+        """Remove and return the pending batch for a business. Caller must hold the lock."""
+        timer = self._timers.pop(business_id, None)
+        if timer:
+            timer.cancel()
+        return self._pending.pop(business_id, [])
+
+    def _flush_business(self, business_id: str):
+        """Timer callback: send everything collected for the business so far."""
+        with self.lock:
+            batch = self._take_pending(business_id)
+        if batch:
+            self._run_batch(business_id, batch)
+
+    def _run_batch(self, business_id: str, batch: List[Tuple[object, Future]]):
+        """Send one prompt for the whole batch and resolve every caller's future."""
+        transactions = [transaction for transaction, _ in batch]
+
+        try:
+            results = self._request_batch_insights(transactions)
+        except Exception as e:
+            logger.error(f"Error getting batched transaction insights for {business_id}: {e}")
+            results = [default_transaction_insights() for _ in transactions]
+
+        with self.lock:
+            self.stats["batches_sent"] += 1
+            self.stats["provider_calls_saved"] += len(transactions) - 1
+
+        logger.info(f"Resolved {len(transactions)} transaction insights for {business_id} with one AI call")
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _build_batch_prompt(self, transactions: List) -> str:
+        """Build a single prompt asking for a JSON array of per-transaction insights."""
+        lines = []
+        for index, transaction in enumerate(transactions):
+            lines.append(
+                f"{index}. Type: {transaction.transaction_type} | "
+                f"Amount: ₹{transaction.amount:,.2f} | "
+                f"Category: {transaction.category} | "
+                f"GST: {transaction.gst_rate}% (₹{transaction.gst_amount:,.2f}) | "
+                f"Description: {transaction.description}"
+            )
+
+        return f"""
+            Analyze these {len(transactions)} business transactions and provide insights for each one:
+
+            {chr(10).join(lines)}
+
+            For every transaction provide:
+            1. Transaction categorization suggestions
+            2. Tax optimization tips
+            3. Cash flow impact analysis
+
+            Respond ONLY with a JSON array containing exactly {len(transactions)} objects, in the same order.
+            Each object must have keys: index, categorization, tax_tips, cash_flow_impact
+            """
+
+    def _request_batch_insights(self, transactions: List) -> List[Dict]:
+        """Call the AI provider once and split the JSON array back into per-transaction insights."""
+        results = [default_transaction_insights() for _ in transactions]
+
+        messages = [{"role": "user", "content": self._build_batch_prompt(transactions)}]
+        response = self._generate(messages)
+
+        if not response.get("success"):
+            return results
+
+        items = parse_json_array(response.get("response", ""))
+        if items is None:
+            with self.lock:
+                self.stats["parse_failures"] += 1
+            logger.warning("Could not parse batched insight response as a JSON array")
+            return results
+
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+
+            index = item.get("index", position)
+            try:
+                index = int(index)
+            except (TypeError, ValueError):
+                index = position
+
+            if 0 <= index < len(results):
+                results[index] = {key: item.get(key, results[index][key]) for key in INSIGHT_KEYS}
+
+        return results
+
+# Global batcher instance
+insight_batcher = TransactionInsightBatcher()
+
+def get_insight_batcher() -> TransactionInsightBatcher:
+    """Get the global transaction insight batcher instance."""
+    return insight_batcher
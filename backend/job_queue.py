@@ -0,0 +1,363 @@
+"""
+Job Queue for Taxora
+Durable in-process background jobs: a SQLite queue worked by a thread pool, with progress, results and cancellation.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Queue configuration
+JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "true").lower() == "true"
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "data/jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job has been cancelled."""
+
+class JobQueueDisabledError(Exception):
+    """Raised by submit() when JOB_QUEUE_ENABLED is off and no worker would ever run the job."""
+
+class JobContext:
+    """Handed to job handlers to report progress and notice cancellation.
+
+    A job whose worker died is run again from the start; `checkpoint` holds whatever the
+    handler last saved through update_progress, so it can skip work that already committed.
+    """
+
+    def __init__(self, queue: "JobQueue", job_id: str, checkpoint: Optional[Dict] = None):
+        self.queue = queue
+        self.job_id = job_id
+        self.checkpoint = checkpoint
+
+    def check_cancelled(self):
+        """Raise JobCancelled if a cancel was requested for this job."""
+        if self.queue.is_cancel_requested(self.job_id):
+            raise JobCancelled(self.job_id)
+
+    def update_progress(self, progress: float, message: Optional[str] = None, checkpoint: Optional[Dict] = None):
+        """Record progress (0.0 - 1.0) and, optionally, a checkpoint to resume from.
+
+        Raises JobCancelled if the job was cancelled meanwhile.
+        """
+        self.queue.update_progress(self.job_id, progress, message, checkpoint)
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+        self.check_cancelled()
+
+# Job type -> handler(params, context) returning a JSON-serializable result
+_job_handlers: Dict[str, Callable[[Dict, JobContext], Any]] = {}
+
+def register_job_handler(job_type: str):
+    """Decorator registering the function that runs jobs of job_type."""
+    def decorator(func):
+        _job_handlers[job_type] = func
+        return func
+    return decorator
+
+def get_job_types() -> List[str]:
+    """Names of all registered job types."""
+    return sorted(_job_handlers)
+
+class JobQueue:
+    """Jobs are rows in one SQLite file, so they outlive the process and are shared by all
+    uvicorn workers. A running job holds a lease renewed by its worker; when a worker dies
+    (restart, crash) the lease expires and another worker picks the job up again.
+    """
+
+    def __init__(self, db_path: str = JOB_QUEUE_PATH, workers: int = JOB_WORKERS,
+                 lease_seconds: float = JOB_LEASE_SECONDS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 enabled: bool = JOB_QUEUE_ENABLED):
+        self.db_path = db_path
+        self.enabled = enabled
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, type TEXT NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL, "
+            "progress REAL NOT NULL DEFAULT 0, message TEXT, result TEXT, error TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, cancel_requested INTEGER NOT NULL DEFAULT 0, "
+            "worker_id TEXT, lease_expires REAL, created_at REAL NOT NULL, started_at REAL, "
+            "finished_at REAL, updated_at REAL NOT NULL, checkpoint TEXT)"
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")]
+        if "checkpoint" not in columns:  # queue files created before checkpoints existed
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN checkpoint TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.threads: List[threading.Thread] = []
+        self.active: Dict[str, float] = {}  # job id -> start time, for this process
+
+    # ------------------------------------------------------------------ API
+
+    def submit(self, job_type: str, params: Optional[Dict] = None) -> Dict:
+        """Queue a job and return it.
+
+        Raises ValueError for an unknown job type and JobQueueDisabledError when the queue is off.
+        """
+        if not self.enabled:
+            raise JobQueueDisabledError("Background jobs are disabled (JOB_QUEUE_ENABLED=false)")
+        if job_type not in _job_handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO jobs (id, type, params, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, json.dumps(params or {}), QUEUED, now, now)
+            )
+        self.wakeup.set()
+        logger.info(f"Queued {job_type} job {job_id}")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """A job's status, progress and result, or None if there is no such job."""
+        with self.lock:
+            self.conn.row_factory = sqlite3.Row
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            self.conn.row_factory = None
+        return self._to_dict(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Most recent jobs first, optionally only those with the given status."""
+        query, args = "SELECT * FROM jobs", []
+        if status:
+            query, args = query + " WHERE status = ?", [status]
+        with self.lock:
+            self.conn.row_factory = sqlite3.Row
+            rows = self.conn.execute(query + " ORDER BY created_at DESC LIMIT ?", [*args, limit]).fetchall()
+            self.conn.row_factory = None
+        return [self._to_dict(row) for row in rows]
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job at once; a running job stops at its next progress update."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, updated_at = ?, cancel_requested = 1 "
+                "WHERE id = ? AND status = ?", (CANCELLED, now, now, job_id, QUEUED)
+            )
+            self.conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status = ?",
+                (now, job_id, RUNNING)
+            )
+        return self.get(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """Whether cancel() was called for the job."""
+        with self.lock:
+            row = self.conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None,
+                        checkpoint: Optional[Dict] = None):
+        """Store progress (and checkpoint) for a job this worker holds, renewing its lease."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET progress = ?, message = COALESCE(?, message), checkpoint = COALESCE(?, checkpoint), "
+                "lease_expires = ?, updated_at = ? WHERE id = ? AND worker_id = ?",
+                (max(0.0, min(1.0, progress)), message, json.dumps(checkpoint) if checkpoint is not None else None,
+                 now + self.lease_seconds, now, job_id, self.worker_id)
+            )
+
+    def get_stats(self) -> Dict:
+        """Job counts by status plus worker configuration."""
+        with self.lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "running": bool(self.threads),
+            "active_jobs": len(self.active),
+            "job_types": get_job_types(),
+            "counts": counts
+        }
+
+    # ------------------------------------------------------------ workers
+
+    def start(self):
+        """Start the worker threads and the lease renewal thread."""
+        if self.threads:
+            return
+        self.stopping.clear()
+        self.prune()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        thread = threading.Thread(target=self._renew_leases, name="job-lease-renewal", daemon=True)
+        thread.start()
+        self.threads.append(thread)
+        logger.info(f"Job queue started with {self.workers} workers ({self.db_path})")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop taking jobs. Jobs still running are picked up again after their lease expires."""
+        self.stopping.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def prune(self):
+        """Delete finished jobs older than the retention period."""
+        with self.lock:
+            self.conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({','.join('?' * len(FINISHED_STATUSES))}) AND finished_at < ?",
+                (*FINISHED_STATUSES, time.time() - JOB_RETENTION_SECONDS)
+            )
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Take the oldest queued job, or one whose worker's lease ran out.
+
+        Jobs that already used up their attempts are failed instead of being taken again.
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, f"Abandoned after {self.max_attempts} attempts", now, now, RUNNING, now, self.max_attempts)
+                )
+                self.conn.row_factory = sqlite3.Row
+                row = self.conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY created_at LIMIT 1", (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, worker_id = ?, lease_expires = ?, "
+                        "started_at = COALESCE(started_at, ?), updated_at = ? WHERE id = ?",
+                        (RUNNING, self.worker_id, now + self.lease_seconds, now, now, row["id"])
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            finally:
+                self.conn.row_factory = None
+        if row is not None and row["status"] == RUNNING:
+            logger.warning(f"Resuming {row['type']} job {row['id']} after its worker stopped")
+        return row
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        """Record the outcome, unless another worker has taken the job over meanwhile."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, progress = CASE WHEN ? = ? THEN 1 ELSE progress END, "
+                "finished_at = ?, updated_at = ?, lease_expires = NULL WHERE id = ? AND worker_id = ?",
+                (status, json.dumps(result) if result is not None else None, error, status, SUCCEEDED,
+                 now, now, job_id, self.worker_id)
+            )
+
+    def _run(self, row: sqlite3.Row):
+        """Run a claimed job's handler and record its result, error or cancellation."""
+        job_id, job_type = row["id"], row["type"]
+        handler = _job_handlers.get(job_type)
+        if handler is None:
+            self._finish(job_id, FAILED, error=f"No handler for job type {job_type}")
+            return
+
+        self.active[job_id] = time.time()
+        try:
+            checkpoint = json.loads(row["checkpoint"]) if row["checkpoint"] is not None else None
+            context = JobContext(self, job_id, checkpoint)
+            context.check_cancelled()
+            result = handler(json.loads(row["params"]), context)
+            self._finish(job_id, SUCCEEDED, result=result)
+            logger.info(f"{job_type} job {job_id} finished in {time.time() - self.active[job_id]:.1f}s")
+        except JobCancelled:
+            self._finish(job_id, CANCELLED)
+            logger.info(f"{job_type} job {job_id} cancelled")
+        except Exception as e:
+            logger.error(f"{job_type} job {job_id} failed: {e}")
+            self._finish(job_id, FAILED, error=str(e))
+        finally:
+            self.active.pop(job_id, None)
+
+    def _work(self):
+        """Worker loop: claim and run jobs, sleeping until woken or the poll interval passes."""
+        while not self.stopping.is_set():
+            try:
+                row = self._claim()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not claim a job: {e}")
+                row = None
+            if row is None:
+                self.wakeup.wait(JOB_POLL_INTERVAL)
+                self.wakeup.clear()
+                continue
+            self._run(row)
+
+    def _renew_leases(self):
+        """Keep leases alive for handlers that run long between progress updates."""
+        while not self.stopping.wait(self.lease_seconds / 3):
+            job_ids = list(self.active)
+            if not job_ids:
+                continue
+            with self.lock:
+                self.conn.execute(
+                    f"UPDATE jobs SET lease_expires = ? WHERE worker_id = ? AND id IN ({','.join('?' * len(job_ids))})",
+                    (time.time() + self.lease_seconds, self.worker_id, *job_ids)
+                )
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        """API view of a job row (params and checkpoint stay internal)."""
+        return {
+            "job_id": row["id"],
+            "type": row["type"],
+            "status": row["status"],
+            "progress": round(row["progress"], 4),
+            "message": row["message"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "cancel_requested": bool(row["cancel_requested"]),
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"]
+        }
+
+# Global job queue instance
+_job_queue = None
+
+def get_job_queue() -> JobQueue:
+    """Get or create the global job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
@@ -0,0 +1,184 @@
+"""
+LLM Request Scheduler for Taxora
+Priority queueing and per-provider concurrency bulkheads in front of the AI provider clients.
+"""
+
+import os
+import time
+import heapq
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+from provider_metrics import LatencyTracker
+from local_inference_worker import GRANITE_BATCH_MAX_SIZE
+from provider_errors import ProviderQueueTimeoutError
+from request_deadline import remaining_time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Priority classes, highest first
+PRIORITY_INTERACTIVE = "interactive"   # chat turns a user is waiting on
+PRIORITY_BACKGROUND = "background"     # user-visible analysis (GST, tax planning, savings)
+PRIORITY_BATCH = "batch"               # bulk work nobody is watching (transaction insights)
+PRIORITIES = [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BATCH]
+
+# Scheduler configuration
+LLM_RESERVED_INTERACTIVE = int(os.getenv("LLM_RESERVED_INTERACTIVE", "1"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+
+# Local Granite prompts are micro-batched, so its bulkhead must admit a full batch even for
+# non-interactive work (which cannot use the interactive reserve)
+GRANITE_MIN_CONCURRENCY = GRANITE_BATCH_MAX_SIZE + LLM_RESERVED_INTERACTIVE
+LLM_DEFAULT_CONCURRENCY = {"granite": GRANITE_MIN_CONCURRENCY, "gemini": 8, "huggingface": 4}
+
+def get_provider_concurrency(provider: str) -> int:
+    """Concurrency limit for a provider: LLM_CONCURRENCY_{PROVIDER} or the built-in default.
+
+    Granite is never limited below one full micro-batch.
+    """
+    default = LLM_DEFAULT_CONCURRENCY.get(provider, 4)
+    concurrency = max(1, int(os.getenv(f"LLM_CONCURRENCY_{provider.upper()}", default)))
+    if provider == "granite":
+        concurrency = max(concurrency, GRANITE_MIN_CONCURRENCY)
+    return concurrency
+
+class ProviderBulkhead:
+    """Bounded slots for one provider, granted strictly in priority order.
+
+    Some slots are reserved for interactive requests so a burst of background or batch
+    work can never occupy the whole provider.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, reserved_interactive: int = LLM_RESERVED_INTERACTIVE):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.reserved_interactive = reserved_interactive
+        self.in_flight = 0
+        self.waiting: List = []  # heap of (rank, sequence)
+        self._sequence = itertools.count()
+        self.cond = threading.Condition()
+
+    def _limit(self, rank: int) -> int:
+        """Slots usable by a priority rank; non-interactive work leaves the reserve free."""
+        if rank == 0:
+            return self.max_concurrency
+        return max(1, self.max_concurrency - self.reserved_interactive)
+
+    def acquire(self, rank: int, timeout: float) -> bool:
+        """Wait for a slot. Returns False if none was granted within the timeout."""
+        deadline = time.monotonic() + timeout
+
+        with self.cond:
+            ticket = (rank, next(self._sequence))
+            heapq.heappush(self.waiting, ticket)
+
+            try:
+                while not (self.waiting[0] == ticket and self.in_flight < self._limit(rank)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self.cond.wait(remaining)
+
+                heapq.heappop(self.waiting)
+                self.in_flight += 1
+                return True
+            finally:
+                if ticket in self.waiting:
+                    # Timed out: leave the queue so the requests behind us can move up
+                    self.waiting.remove(ticket)
+                    heapq.heapify(self.waiting)
+                self.cond.notify_all()
+
+    def release(self):
+        """Free a slot and wake the queue."""
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def get_status(self) -> Dict:
+        """Get current occupancy and queue depth per priority."""
+        with self.cond:
+            queued = {priority: 0 for priority in PRIORITIES}
+            for rank, _ in self.waiting:
+                queued[PRIORITIES[rank]] += 1
+            return {
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "reserved_interactive": self.reserved_interactive,
+                "queued": queued
+            }
+
+class LLMScheduler:
+    """Routes every provider call through that provider's bulkhead and records queue times."""
+
+    def __init__(self, queue_timeout: float = LLM_QUEUE_TIMEOUT):
+        self.queue_timeout = queue_timeout
+        self.bulkheads: Dict[str, ProviderBulkhead] = {}
+        self.queue_times = LatencyTracker()
+        self.lock = threading.Lock()
+        self.stats = {priority: {"requests": 0, "queue_timeouts": 0} for priority in PRIORITIES}
+
+    def _bulkhead(self, provider: str) -> ProviderBulkhead:
+        """Get or create the bulkhead for a provider."""
+        with self.lock:
+            if provider not in self.bulkheads:
+                self.bulkheads[provider] = ProviderBulkhead(provider, get_provider_concurrency(provider))
+            return self.bulkheads[provider]
+
+    @contextmanager
+    def slot(self, provider: str, priority: str = PRIORITY_INTERACTIVE):
+        """Hold a provider slot for the duration of the block.
+
+        Raises ProviderQueueTimeoutError if no slot frees up within the queue timeout, so the
+        caller's normal fallback handling moves on to another provider.
+        """
+        if priority not in PRIORITIES:
+            priority = PRIORITY_INTERACTIVE
+
+        bulkhead = self._bulkhead(provider)
+        queued_at = time.time()
+        # Never queue past the request deadline
+        remaining = remaining_time()
+        queue_timeout = self.queue_timeout if remaining is None else max(0.0, min(self.queue_timeout, remaining))
+        acquired = bulkhead.acquire(PRIORITIES.index(priority), queue_timeout)
+        queue_time = time.time() - queued_at
+
+        with self.lock:
+            self.stats[priority]["requests"] += 1
+            if not acquired:
+                self.stats[priority]["queue_timeouts"] += 1
+        self.queue_times.record(f"{provider}:{priority}", queue_time)
+
+        if not acquired:
+            logger.warning(f"{priority} request waited {queue_time:.1f}s for a {provider} slot, giving up")
+            raise ProviderQueueTimeoutError(provider, f"No free {provider} slot after {queue_time:.1f}s in the {priority} queue")
+
+        try:
+            yield
+        finally:
+            bulkhead.release()
+
+    def get_stats(self) -> Dict:
+        """Get per-provider occupancy and per-priority queue-time percentiles."""
+        with self.lock:
+            bulkheads = list(self.bulkheads.values())
+            stats = {priority: dict(values) for priority, values in self.stats.items()}
+
+        return {
+            "providers": {bulkhead.name: bulkhead.get_status() for bulkhead in bulkheads},
+            "priorities": stats,
+            "queue_time": self.queue_times.get_summary(),
+            "queue_timeout_seconds": self.queue_timeout
+        }
+
+# Global scheduler instance
+llm_scheduler = LLMScheduler()
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the global LLM scheduler instance."""
+    return llm_scheduler
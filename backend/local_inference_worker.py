@@ -0,0 +1,133 @@
+"""
+Local Inference Worker for Taxora
+Dynamic micro-batching for the local text-generation pipeline.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Tuple
+
+from provider_metrics import Histogram
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Micro-batching configuration
+GRANITE_BATCH_WINDOW_MS = int(os.getenv("GRANITE_BATCH_WINDOW_MS", "10"))
+GRANITE_BATCH_MAX_SIZE = int(os.getenv("GRANITE_BATCH_MAX_SIZE", "8"))
+GRANITE_BATCH_TIMEOUT = float(os.getenv("GRANITE_BATCH_TIMEOUT", "120"))
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32]
+QUEUE_LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+class LocalInferenceWorker:
+    """Single background thread that owns the model and runs queued prompts as padded batches.
+
+    Callers submit prompts from any thread; the worker waits up to window_ms after the first
+    prompt for others to arrive, then runs them through run_batch in one forward pass.
+    Only the worker thread touches the model, so the pipeline needs no extra locking.
+    """
+
+    def __init__(self, run_batch: Callable[[List[str]], List[str]],
+                 window_ms: int = GRANITE_BATCH_WINDOW_MS, max_batch_size: int = GRANITE_BATCH_MAX_SIZE):
+        self.run_batch = run_batch
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue: "queue.Queue[Tuple[str, Future, float]]" = queue.Queue()
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_latency_ms = Histogram(QUEUE_LATENCY_BUCKETS_MS)
+        self.batches_run = 0
+        self.skipped_cancelled = 0
+        self._thread = threading.Thread(target=self._run, name="local-inference", daemon=True)
+        self._thread.start()
+
+    def submit(self, prompt: str) -> Future:
+        """Queue a prompt and return a future for its generated text."""
+        future = Future()
+        self._queue.put((prompt, future, time.time()))
+        return future
+
+    def generate(self, prompt: str, timeout: float = GRANITE_BATCH_TIMEOUT) -> str:
+        """Blocking helper: submit a prompt and wait for its generated text.
+
+        A prompt that times out is cancelled, so the worker drops it unless its batch already started.
+        """
+        future = self.submit(prompt)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def _collect_batch(self) -> List[Tuple[str, Future, float]]:
+        """Block for the first prompt, then gather more until the window closes or the batch is full.
+
+        Prompts whose caller already gave up (cancelled future) are dropped instead of generated.
+        """
+        batch = []
+        deadline = None
+
+        while len(batch) < self.max_batch_size:
+            if deadline is None:
+                item = self._queue.get()
+            else:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            # Marks the future running, so a late cancel() can no longer take it out of this batch
+            if not item[1].set_running_or_notify_cancel():
+                self.skipped_cancelled += 1
+                continue
+            batch.append(item)
+            if deadline is None:
+                deadline = time.time() + self.window_seconds
+
+        return batch
+
+    def _run(self):
+        """Worker loop."""
+        while True:
+            batch = self._collect_batch()
+            started = time.time()
+
+            for _, _, queued_at in batch:
+                self.queue_latency_ms.observe((started - queued_at) * 1000)
+            self.batch_sizes.observe(len(batch))
+            self.batches_run += 1
+
+            prompts = [prompt for prompt, _, _ in batch]
+            try:
+                outputs = self.run_batch(prompts)
+                if len(outputs) != len(prompts):
+                    raise RuntimeError(f"Expected {len(prompts)} outputs, got {len(outputs)}")
+            except Exception as e:
+                logger.error(f"Local inference batch of {len(batch)} failed: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            logger.info(f"Local inference batch of {len(batch)} done in {time.time() - started:.2f}s")
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+
+    def get_stats(self) -> Dict:
+        """Get batch-size and queue-latency histograms."""
+        return {
+            "batches_run": self.batches_run,
+            "skipped_cancelled": self.skipped_cancelled,
+            "queued": self._queue.qsize(),
+            "window_ms": int(self.window_seconds * 1000),
+            "max_batch_size": self.max_batch_size,
+            "batch_size": self.batch_sizes.get_summary(),
+            "queue_latency_ms": self.queue_latency_ms.get_summary()
+        }
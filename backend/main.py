@@ -2,16 +2,24 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from models import StartSessionRequest, ChatTurnRequest, ChatTurnResponse
 from chat_logic import start_session, handle_turn, get_session_info, clear_session, get_active_sessions, get_session
-from granite_client import test_granite_connectivity
+from granite_client import test_granite_connectivity, start_model_warmup, get_model_state, GRANITE_USE_LOCAL, MODEL_READY, MODEL_FAILED
+from health_monitor import ConnectivityMonitor
+from inference_daemon import GRANITE_INFERENCE_DAEMON, start_daemon, stop_daemon
 from ai_provider_manager import get_ai_manager
+from provider_errors import ProviderRateLimitError
 from savings_planner import savings_planner
 from business_tracker import business_tracker
+from request_recorder import REQUEST_RECORDING_ENABLED, RequestRecorderMiddleware
+from upload_ingest import MAX_UPLOAD_FILE_SIZE, MAX_AUDIO_UPLOAD_SIZE, UploadTooLargeError, UploadSizeLimitMiddleware, read_upload_limited
+from upload_store import get_upload_store
+from job_queue import JOB_QUEUE_ENABLED, FINISHED_STATUSES, JobQueueDisabledError, get_job_queue, get_job_types, register_job_handler
 from pydantic import BaseModel
 import logging
+import threading
 import time
-import uuid
 from typing import Dict, Any
 from contextlib import asynccontextmanager
 import os
@@ -20,28 +28,46 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connectivity probe runs in the background; status endpoints read its cached results
+connectivity_monitor = ConnectivityMonitor(
+	probe=test_granite_connectivity,
+	is_ready=lambda: get_model_state()["state"] in (MODEL_READY, MODEL_FAILED)
+)
+
+def get_connectivity() -> Dict[str, Any]:
+	"""Cached connectivity results with the live model state folded in."""
+	connectivity = connectivity_monitor.get_results()
+	connectivity["model_loaded"] = get_model_state()["ready"]
+	connectivity.setdefault("nlu_analysis", True)  # Simple NLU needs no probe
+	return connectivity
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-	"""Initialize application and test Watson connectivity on startup."""
+	"""Initialize application without blocking on model loading or connectivity tests."""
 	logger.info("Starting Taxora Chat API...")
 
-	# Test Granite AI services connectivity
-	connectivity_results = test_granite_connectivity()
-
-	if not connectivity_results.get("granite_ai"):
-		logger.warning("Granite AI connectivity test failed. Using fallback responses.")
-
-	if not connectivity_results.get("model_loaded"):
-		logger.warning("Granite model not loaded locally. Using API or fallback mode.")
+	# Load the model and probe connectivity in the background so we accept traffic immediately
+	use_daemon = GRANITE_USE_LOCAL and GRANITE_INFERENCE_DAEMON
+	if use_daemon:
+		# One shared model process for all workers instead of a copy per worker
+		threading.Thread(target=start_daemon, name="inference-daemon-start", daemon=True).start()
+	else:
+		start_model_warmup()
+	connectivity_monitor.start()
+	if JOB_QUEUE_ENABLED:
+		# Also resumes jobs left running by a previous process once their lease expires
+		get_job_queue().start()
 
-	if connectivity_results.get("nlu_analysis"):
-		logger.info("NLU analysis capabilities available.")
-
-	logger.info("Taxora Chat API startup completed")
+	logger.info("Taxora Chat API startup completed (model warm-up continues in background)")
 
 	yield
 
-	# Cleanup code can go here if needed
+	connectivity_monitor.stop()
+	if JOB_QUEUE_ENABLED:
+		get_job_queue().stop()
+	if use_daemon:
+		# Only the last worker using the daemon actually stops it
+		stop_daemon()
 	logger.info("Taxora Chat API shutting down...")
 
 # Initialize FastAPI app with enhanced configuration
@@ -67,6 +93,13 @@ app.add_middleware(
 	allow_headers=["*"],
 )
 
+# Refuse oversized upload bodies before they are parsed
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# Opt-in traffic recording (REQUEST_RECORDING_ENABLED) for benchmarks/replay_trace.py
+if REQUEST_RECORDING_ENABLED:
+	app.add_middleware(RequestRecorderMiddleware)
+
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -102,9 +135,29 @@ def health_check():
 			"Context-Aware Interactions",
 			"Professional Finance Guidance"
 		],
+		"ready": get_model_state()["ready"],
 		"timestamp": time.time()
 	}
 
+@app.get("/health/live")
+def liveness_check():
+	"""Liveness probe: the process is up and serving requests."""
+	return {"status": "alive", "timestamp": time.time()}
+
+@app.get("/health/ready")
+def readiness_check():
+	"""Readiness probe: 200 once the AI model is loaded, 503 while warming up."""
+	model_state = get_model_state()
+	return JSONResponse(
+		status_code=200 if model_state["ready"] else 503,
+		content={
+			"status": "ready" if model_state["ready"] else model_state["state"],
+			"model": model_state,
+			"connectivity": get_connectivity(),
+			"timestamp": time.time()
+		}
+	)
+
 @app.get("/docs")
 def api_documentation():
 	"""Comprehensive API documentation page."""
@@ -229,7 +282,8 @@ Content-Type: multipart/form-data
   "success": true,
   "data": {
     "current_provider": "gemini",
-    "available_providers": {...}
+    "available_providers": {...},
+    "routing": {"mode": "manual", "auto_choice": "granite", "scores": {...}}
   }
 }
 </div>
@@ -240,7 +294,7 @@ Content-Type: multipart/form-data
                 <p><strong>Switch AI provider</strong></p>
                 <div class="code">
 {
-  "provider": "granite" // "granite" or "gemini"
+  "provider": "granite" // "granite", "gemini", "huggingface" or "auto"
 }
 </div>
             </div>
@@ -303,7 +357,7 @@ Content-Type: multipart/form-data
 def system_status_page():
 	"""Beautiful HTML system status page."""
 	try:
-		connectivity = test_granite_connectivity()
+		connectivity = get_connectivity()
 		active_sessions = len(get_active_sessions())
 
 		# Get AI provider status
@@ -313,8 +367,9 @@ def system_status_page():
 
 		# Get rate limit status
 		try:
-			from gemini_client import get_gemini_rate_limit_status
-			rate_limit_status = get_gemini_rate_limit_status()
+			# Read from the key pool directly so status pages don't import the Gemini client
+			from gemini_key_pool import get_gemini_key_pool
+			rate_limit_status = get_gemini_key_pool().get_status()
 		except:
 			rate_limit_status = {"error": "Unable to get rate limit status"}
 
@@ -494,12 +549,13 @@ def system_status_page():
 def system_status_json():
 	"""JSON system status for API consumers."""
 	try:
-		connectivity = test_granite_connectivity()
+		connectivity = get_connectivity()
 		active_sessions = len(get_active_sessions())
 
 		return {
 			"system": "operational",
 			"ai_services": connectivity,
+			"model": get_model_state(),
 			"active_sessions": active_sessions,
 			"timestamp": time.time(),
 			"services": {
@@ -688,8 +744,9 @@ async def get_ai_providers():
 
 		# Add Gemini rate limit status
 		try:
-			from gemini_client import get_gemini_rate_limit_status
-			rate_limit_status = get_gemini_rate_limit_status()
+			# Read from the key pool directly so status pages don't import the Gemini client
+			from gemini_key_pool import get_gemini_key_pool
+			rate_limit_status = get_gemini_key_pool().get_status()
 
 			# Add rate limit info to response
 			if "available_providers" in status and "gemini" in status["available_providers"]:
@@ -752,9 +809,33 @@ async def set_ai_provider(request: dict):
 			}
 		)
 
+def analyze_upload(sha256: str, content_type: str, size: int):
+	"""AI analysis of a stored upload, cached per content hash. Returns (message, was_cached).
+
+	The prompt describes only the content, never the file name, so the cached answer fits any re-upload.
+	"""
+	store = get_upload_store()
+	metadata = store.get_metadata(sha256) or {}
+	if metadata.get("analysis") is not None:
+		return metadata["analysis"], True
+
+	ai_manager = get_ai_manager()
+	analysis_messages = [
+		{
+			"role": "user",
+			"content": f"I've uploaded a file ({content_type}, {size} bytes). Can you help me understand what I can do with this file for my financial planning?"
+		}
+	]
+
+	ai_result = ai_manager.generate_response(analysis_messages)
+	response_message = ai_result.get("response", "File uploaded successfully! I can help you analyze financial documents, budgets, and investment data.")
+	if ai_result.get("success") and ai_result.get("response"):
+		store.save_analysis(sha256, response_message)
+	return response_message, False
+
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...), session_id: str = None):
-	"""Handle file uploads and provide AI analysis."""
+async def upload_file(file: UploadFile = File(...), session_id: str = None, background: bool = False):
+	"""Handle file uploads and provide AI analysis (background=true answers 202 with a job to poll)."""
 	try:
 		# Validate file
 		if not file.filename:
@@ -767,51 +848,58 @@ async def upload_file(file: UploadFile = File(...), session_id: str = None):
 				}
 			)
 
-		# Check file size (10MB limit)
-		MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-		file_content = await file.read()
-		if len(file_content) > MAX_FILE_SIZE:
+		# Hash while streaming to disk; identical content is stored once
+		try:
+			stored = await get_upload_store().store(file, MAX_UPLOAD_FILE_SIZE)
+		except UploadTooLargeError:
 			return JSONResponse(
 				status_code=400,
 				content={
 					"success": False,
-					"message": "File size exceeds 10MB limit",
+					"message": f"File size exceeds {MAX_UPLOAD_FILE_SIZE // (1024 * 1024)}MB limit",
 					"timestamp": time.time()
 				}
 			)
 
-		# Create uploads directory if it doesn't exist
-		upload_dir = "uploads"
-		os.makedirs(upload_dir, exist_ok=True)
-
-		# Save file
-		file_id = str(uuid.uuid4())
+		file_id = stored.sha256
 		file_extension = os.path.splitext(file.filename)[1]
-		saved_filename = f"{file_id}{file_extension}"
-		file_path = os.path.join(upload_dir, saved_filename)
-
-		with open(file_path, "wb") as f:
-			f.write(file_content)
 
 		# Basic file analysis
 		file_info = {
 			"filename": file.filename,
-			"size": len(file_content),
+			"size": stored.size,
 			"type": file.content_type,
-			"extension": file_extension
+			"extension": file_extension,
+			"sha256": stored.sha256
 		}
 
-		# Generate AI response about the file
-		ai_manager = get_ai_manager()
-		analysis_messages = [
-			{
-				"role": "user",
-				"content": f"I've uploaded a file named '{file.filename}' ({file.content_type}, {len(file_content)} bytes). Can you help me understand what I can do with this file for my financial planning?"
-			}
-		]
+		# Re-uploads of analysed content reuse the cached analysis
+		cached_analysis = stored.analysis is not None
+		if background and JOB_QUEUE_ENABLED and not cached_analysis:
+			job = get_job_queue().submit("upload_analysis", {
+				"sha256": stored.sha256,
+				"filename": file.filename,
+				"content_type": file.content_type,
+				"size": stored.size
+			})
+			return JSONResponse(
+				status_code=202,
+				content={
+					"success": True,
+					"filename": file.filename,
+					"file_id": file_id,
+					"analysis": file_info,
+					"deduplicated": stored.deduplicated,
+					"job": job,
+					"status_url": f"/jobs/{job['job_id']}",
+					"timestamp": time.time()
+				}
+			)
 
-		ai_result = ai_manager.generate_response(analysis_messages)
-		response_message = ai_result.get("response", "File uploaded successfully! I can help you analyze financial documents, budgets, and investment data.")
+		# Provider calls block (HTTP, retries); keep them off the event loop
+		response_message, cached_analysis = await run_in_threadpool(
+			analyze_upload, stored.sha256, file.content_type, stored.size
+		)
 
 		return JSONResponse(
 			status_code=200,
@@ -821,6 +909,8 @@ async def upload_file(file: UploadFile = File(...), session_id: str = None):
 				"file_id": file_id,
 				"message": response_message,
 				"analysis": file_info,
+				"deduplicated": stored.deduplicated,
+				"cached_analysis": cached_analysis,
 				"timestamp": time.time()
 			}
 		)
@@ -852,15 +942,15 @@ async def voice_chat(file: UploadFile = File(...), session_id: str = None, inclu
 				}
 			)
 
-		# Check file size (5MB limit for audio)
-		MAX_AUDIO_SIZE = 5 * 1024 * 1024  # 5MB
-		audio_content = await file.read()
-		if len(audio_content) > MAX_AUDIO_SIZE:
+		# Read in chunks and stop as soon as the audio size limit is crossed
+		try:
+			audio_content = await read_upload_limited(file, MAX_AUDIO_UPLOAD_SIZE)
+		except UploadTooLargeError:
 			return JSONResponse(
 				status_code=400,
 				content={
 					"success": False,
-					"message": "Audio file size exceeds 5MB limit",
+					"message": f"Audio file size exceeds {MAX_AUDIO_UPLOAD_SIZE // (1024 * 1024)}MB limit",
 					"timestamp": time.time()
 				}
 			)
@@ -870,14 +960,14 @@ async def voice_chat(file: UploadFile = File(...), session_id: str = None, inclu
 		conversation_history = session.get("history", []) if session else []
 
 		# Process voice chat using Gemini with Tamil support and fallback
-		from gemini_client import gemini_voice_chat, get_gemini_rate_limit_status
+		from gemini_client import gemini_voice_chat
 		from granite_client import granite_chat
 
 		try:
-			voice_result = gemini_voice_chat(audio_content, conversation_history, include_tamil)
+			voice_result = await run_in_threadpool(gemini_voice_chat, audio_content, conversation_history, include_tamil)
 		except Exception as e:
 			# Handle Gemini rate limiting with fallback to Granite
-			if "GEMINI_RATE_LIMITED" in str(e):
+			if isinstance(e, ProviderRateLimitError):
 				logger.warning("Gemini voice chat rate limited, falling back to Granite")
 
 				# First, try to transcribe audio using a simple approach
@@ -889,7 +979,7 @@ async def voice_chat(file: UploadFile = File(...), session_id: str = None, inclu
 				granite_messages.append({"role": "user", "content": user_text})
 
 				# Get response from Granite
-				granite_response = granite_chat(granite_messages)
+				granite_response = await run_in_threadpool(granite_chat, granite_messages)
 
 				# Create voice result with Granite response
 				voice_result = {
@@ -932,6 +1022,8 @@ async def voice_chat(file: UploadFile = File(...), session_id: str = None, inclu
 					"optimized_speech_text_tamil": voice_result.get("optimized_speech_text_tamil", ""),
 					"speech_config_english": voice_result.get("speech_config_english"),
 					"speech_config_tamil": voice_result.get("speech_config_tamil"),
+					"bilingual_single_call": voice_result.get("bilingual_single_call", False),
+					"stage_timings": voice_result.get("stage_timings"),
 					"timestamp": time.time()
 				}
 			)
@@ -941,6 +1033,7 @@ async def voice_chat(file: UploadFile = File(...), session_id: str = None, inclu
 				content={
 					"success": False,
 					"message": voice_result.get("error", "Voice processing failed"),
+					"stage_timings": voice_result.get("stage_timings"),
 					"timestamp": time.time()
 				}
 			)
@@ -968,7 +1061,7 @@ async def create_savings_goal(request: dict):
 		user_id = request.get("user_id", "default_user")
 		goal_data = request.get("goal_data", {})
 
-		result = savings_planner.create_savings_goal(user_id, goal_data)
+		result = await run_in_threadpool(savings_planner.create_savings_goal, user_id, goal_data)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 400,
@@ -1021,7 +1114,7 @@ async def add_savings_entry(request: dict):
 async def get_savings_analysis(goal_id: str):
 	"""Get comprehensive AI-powered savings analysis."""
 	try:
-		result = savings_planner.get_savings_analysis(goal_id)
+		result = await run_in_threadpool(savings_planner.get_savings_analysis, goal_id)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1043,7 +1136,7 @@ async def get_savings_analysis(goal_id: str):
 async def get_30_day_plan(goal_id: str):
 	"""Generate AI-powered 30-day savings plan."""
 	try:
-		result = savings_planner.get_30_day_savings_plan(goal_id)
+		result = await run_in_threadpool(savings_planner.get_30_day_savings_plan, goal_id)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1062,10 +1155,13 @@ async def get_30_day_plan(goal_id: str):
 		)
 
 @app.get("/savings/notifications/{user_id}")
-async def get_savings_notifications(user_id: str):
+async def get_savings_notifications(user_id: str, background: bool = False):
 	"""Get savings notifications and reminders."""
 	try:
-		notifications = savings_planner.check_savings_notifications(user_id)
+		if background and JOB_QUEUE_ENABLED:
+			return job_accepted(get_job_queue().submit("savings_notifications", {"user_ids": [user_id]}))
+
+		notifications = await run_in_threadpool(savings_planner.check_savings_notifications, user_id)
 
 		return JSONResponse(
 			status_code=200,
@@ -1087,6 +1183,78 @@ async def get_savings_notifications(user_id: str):
 			}
 		)
 
+# =============================================================================
+# TRANSLATION ENDPOINTS
+# =============================================================================
+
+MAX_BATCH_TRANSLATION_TEXTS = 500
+
+@app.post("/translate/tamil/batch")
+def translate_tamil_batch(request: dict):
+	"""Translate many texts to Tamil in as few Gemini calls as possible (cached texts cost none)."""
+	try:
+		texts = request.get("texts", [])
+		if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+			return JSONResponse(
+				status_code=400,
+				content={"success": False, "error": "texts must be a non-empty list of strings"}
+			)
+		if len(texts) > MAX_BATCH_TRANSLATION_TEXTS:
+			return JSONResponse(
+				status_code=400,
+				content={"success": False, "error": f"At most {MAX_BATCH_TRANSLATION_TEXTS} texts per request"}
+			)
+
+		from gemini_client import gemini_translate_batch_to_tamil
+		return JSONResponse(status_code=200, content=gemini_translate_batch_to_tamil(texts))
+
+	except Exception as e:
+		logger.error(f"Error in batch translation: {e}")
+		return JSONResponse(
+			status_code=500,
+			content={
+				"success": False,
+				"error": str(e),
+				"message": "Failed to translate texts"
+			}
+		)
+
+@app.post("/translate/tamil/warm")
+def warm_translation_cache(request: dict = None):
+	"""Pre-translate the canned fallback advice (plus any extra texts) so voice replies hit the cache."""
+	try:
+		from financial_advisor_fallback import FinancialAdvisorFallback
+		from gemini_client import gemini_translate_batch_to_tamil
+		from translation_cache import get_translation_cache
+
+		texts = FinancialAdvisorFallback().get_template_texts()
+		texts += [text for text in (request or {}).get("texts", []) if isinstance(text, str)]
+		result = gemini_translate_batch_to_tamil(texts[:MAX_BATCH_TRANSLATION_TEXTS])
+
+		cache = get_translation_cache()
+		return JSONResponse(
+			status_code=200,
+			content={
+				"success": result["success"],
+				"warmed_count": len(texts) - len(result["failed_indices"]),
+				"cached_count": result["cached_count"],
+				"api_calls": result["api_calls"],
+				"errors": result["errors"],
+				"cache": cache.get_stats() if cache else None
+			}
+		)
+
+	except Exception as e:
+		logger.error(f"Error warming translation cache: {e}")
+		return JSONResponse(
+			status_code=500,
+			content={
+				"success": False,
+				"error": str(e),
+				"message": "Failed to warm translation cache"
+			}
+		)
+
 # =============================================================================
 # BUSINESS TRACKER ENDPOINTS
 # =============================================================================
@@ -1095,7 +1263,7 @@ async def get_savings_notifications(user_id: str):
 async def create_business_profile(request: dict):
 	"""Create a new business profile."""
 	try:
-		result = business_tracker.create_business_profile(request)
+		result = await run_in_threadpool(business_tracker.create_business_profile, request)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 400,
@@ -1114,8 +1282,12 @@ async def create_business_profile(request: dict):
 		)
 
 @app.post("/business/transaction")
-async def add_business_transaction(request: dict):
-	"""Add a business transaction with GST calculation."""
+def add_business_transaction(request: dict):
+	"""Add a business transaction with GST calculation.
+
+	Declared sync so FastAPI runs it in the threadpool: concurrent requests for the
+	same business can then share one batched AI insight call.
+	"""
 	try:
 		business_id = request.get("business_id")
 		transaction_data = request.get("transaction_data", {})
@@ -1144,11 +1316,54 @@ async def add_business_transaction(request: dict):
 			}
 		)
 
+@app.post("/business/transactions")
+def add_business_transactions(request: dict, background: bool = False):
+	"""Add multiple business transactions with batched AI insights (background=true for big imports)."""
+	try:
+		business_id = request.get("business_id")
+		transactions = request.get("transactions", [])
+
+		if not business_id:
+			return JSONResponse(
+				status_code=400,
+				content={"success": False, "error": "business_id is required"}
+			)
+
+		if not isinstance(transactions, list) or not transactions:
+			return JSONResponse(
+				status_code=400,
+				content={"success": False, "error": "transactions must be a non-empty list"}
+			)
+
+		if background and JOB_QUEUE_ENABLED:
+			return job_accepted(get_job_queue().submit("business_transactions", {
+				"business_id": business_id,
+				"transactions": transactions
+			}))
+
+		result = business_tracker.add_transactions(business_id, transactions)
+
+		return JSONResponse(
+			status_code=200 if result["success"] else 400,
+			content=result
+		)
+
+	except Exception as e:
+		logger.error(f"Error adding business transactions: {e}")
+		return JSONResponse(
+			status_code=500,
+			content={
+				"success": False,
+				"error": str(e),
+				"message": "Failed to add business transactions"
+			}
+		)
+
 @app.get("/business/gst/{business_id}/{month}/{year}")
 async def get_gst_summary(business_id: str, month: str, year: str):
 	"""Get GST summary for a specific month."""
 	try:
-		result = business_tracker.get_gst_summary(business_id, month, year)
+		result = await run_in_threadpool(business_tracker.get_gst_summary, business_id, month, year)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1170,7 +1385,7 @@ async def get_gst_summary(business_id: str, month: str, year: str):
 async def calculate_gst_return(business_id: str, month: str, year: str):
 	"""Calculate GST return amount."""
 	try:
-		result = business_tracker.calculate_gst_return(business_id, month, year)
+		result = await run_in_threadpool(business_tracker.calculate_gst_return, business_id, month, year)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1214,7 +1429,7 @@ async def get_monthly_reminder(business_id: str):
 async def get_business_analytics(business_id: str, period: str = "month"):
 	"""Get comprehensive business analytics with AI insights."""
 	try:
-		result = business_tracker.get_business_analytics(business_id, period)
+		result = await run_in_threadpool(business_tracker.get_business_analytics, business_id, period)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1245,7 +1460,7 @@ async def add_tax_record(request: dict):
 				content={"success": False, "error": "business_id is required"}
 			)
 
-		result = business_tracker.add_tax_record(business_id, tax_data)
+		result = await run_in_threadpool(business_tracker.add_tax_record, business_id, tax_data)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 400,
@@ -1267,7 +1482,7 @@ async def add_tax_record(request: dict):
 async def get_comprehensive_tax_summary(business_id: str, period: str = "month"):
 	"""Get comprehensive tax summary for all tax types."""
 	try:
-		result = business_tracker.get_comprehensive_tax_summary(business_id, period)
+		result = await run_in_threadpool(business_tracker.get_comprehensive_tax_summary, business_id, period)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1289,7 +1504,7 @@ async def get_comprehensive_tax_summary(business_id: str, period: str = "month")
 async def get_tax_reminders(business_id: str):
 	"""Get upcoming tax reminders and overdue notifications."""
 	try:
-		result = business_tracker.get_tax_reminders(business_id)
+		result = await run_in_threadpool(business_tracker.get_tax_reminders, business_id)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 404,
@@ -1311,7 +1526,7 @@ async def get_tax_reminders(business_id: str):
 async def update_tax_payment(tax_record_id: str, request: dict):
 	"""Update tax payment with transaction details."""
 	try:
-		result = business_tracker.update_tax_payment(tax_record_id, request)
+		result = await run_in_threadpool(business_tracker.update_tax_payment, tax_record_id, request)
 
 		return JSONResponse(
 			status_code=200 if result["success"] else 400,
@@ -1328,3 +1543,156 @@ async def update_tax_payment(tax_record_id: str, request: dict):
 				"message": "Failed to update tax payment"
 			}
 		)
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+
+JOB_TRANSACTION_BATCH_SIZE = 100
+
+def job_accepted(job: Dict) -> JSONResponse:
+	"""202 response for work handed to the job queue."""
+	return JSONResponse(
+		status_code=202,
+		content={
+			"success": True,
+			"job": job,
+			"status_url": f"/jobs/{job['job_id']}"
+		}
+	)
+
+@register_job_handler("upload_analysis")
+def run_upload_analysis(params: Dict, job) -> Dict:
+	"""AI analysis of a stored upload (cached per content hash)."""
+	job.update_progress(0.1, "Analyzing file")
+	message, cached = analyze_upload(params["sha256"], params.get("content_type"), params["size"])
+	return {"file_id": params["sha256"], "message": message, "cached_analysis": cached}
+
+@register_job_handler("business_transactions")
+def run_business_transactions(params: Dict, job) -> Dict:
+	"""Bulk transaction import in batches, checkpointed so a resumed job skips committed batches.
+
+	Transaction IDs are derived from the job ID and row index, so rows of a half-saved batch
+	that a dead worker already wrote are recognized and not added twice.
+	"""
+	business_id, transactions = params["business_id"], params["transactions"]
+	checkpoint = job.checkpoint or {"next_offset": 0, "added": [], "errors": []}
+	added, errors = checkpoint["added"], checkpoint["errors"]
+	for start in range(checkpoint["next_offset"], len(transactions), JOB_TRANSACTION_BATCH_SIZE):
+		batch = transactions[start:start + JOB_TRANSACTION_BATCH_SIZE]
+		result = business_tracker.add_transactions(business_id, batch, index_offset=start, id_prefix=job.job_id)
+		added.extend(result.get("existing_ids", []))
+		added.extend(item["transaction_id"] for item in result.get("transactions", []))
+		errors.extend(result.get("errors", []))
+		if "error" in result and not result.get("errors"):
+			errors.append({"index": start, "error": result["error"]})
+		done = start + len(batch)
+		job.update_progress(done / len(transactions), f"{done} of {len(transactions)} transactions processed",
+		                    checkpoint={"next_offset": done, "added": added, "errors": errors})
+	return {"business_id": business_id, "added_count": len(added), "transaction_ids": added, "errors": errors}
+
+@register_job_handler("gst_yearly_report")
+def run_gst_yearly_report(params: Dict, job) -> Dict:
+	"""Twelve monthly GST summaries for a year plus yearly totals."""
+	business_id, year = params["business_id"], str(params["year"])
+	months = []
+	for month in range(1, 13):
+		summary = business_tracker.get_gst_summary(business_id, str(month), year)
+		if not summary.get("success"):
+			raise RuntimeError(summary.get("error", f"GST summary failed for {month}/{year}"))
+		months.append(summary)
+		job.update_progress(month / 12, f"Month {month} of 12 summarized")
+
+	totals = {
+		key: round(sum(month_summary["summary"][key] for month_summary in months), 2)
+		for key in ("total_taxable_amount", "total_gst_collected", "total_gst_paid", "net_gst_liability", "transaction_count")
+	}
+	return {"business_id": business_id, "year": year, "months": months, "totals": totals}
+
+@register_job_handler("savings_notifications")
+def run_savings_notifications(params: Dict, job) -> Dict:
+	"""Savings notification sweep for the given users, or every user with goals."""
+	user_ids = params.get("user_ids") or savings_planner.get_user_ids()
+	notifications = {}
+	for index, user_id in enumerate(user_ids, 1):
+		notifications[user_id] = savings_planner.check_savings_notifications(user_id)
+		job.update_progress(index / len(user_ids), f"{index} of {len(user_ids)} users checked")
+	return {
+		"users_checked": len(user_ids),
+		"notifications": notifications,
+		"count": sum(len(items) for items in notifications.values())
+	}
+
+@app.post("/jobs")
+def create_job(request: dict):
+	"""Queue a background job: {"type": "...", "params": {...}}."""
+	try:
+		job_type = request.get("type")
+		if job_type not in get_job_types():
+			return JSONResponse(
+				status_code=400,
+				content={
+					"success": False,
+					"error": f"type must be one of: {', '.join(get_job_types())}"
+				}
+			)
+
+		return job_accepted(get_job_queue().submit(job_type, request.get("params") or {}))
+
+	except JobQueueDisabledError as e:
+		return JSONResponse(
+			status_code=503,
+			content={"success": False, "error": str(e)}
+		)
+
+	except Exception as e:
+		logger.error(f"Error creating job: {e}")
+		return JSONResponse(
+			status_code=500,
+			content={
+				"success": False,
+				"error": str(e),
+				"message": "Failed to create job"
+			}
+		)
+
+@app.get("/jobs")
+def list_jobs(status: str = None, limit: int = 50):
+	"""Recent jobs, newest first, with queue statistics."""
+	queue = get_job_queue()
+	return JSONResponse(
+		status_code=200,
+		content={
+			"success": True,
+			"jobs": queue.list_jobs(status, min(max(limit, 1), 500)),
+			"stats": queue.get_stats()
+		}
+	)
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+	"""Job status, progress and (once finished) result."""
+	job = get_job_queue().get(job_id)
+	if job is None:
+		return JSONResponse(
+			status_code=404,
+			content={"success": False, "error": "Job not found"}
+		)
+	return JSONResponse(status_code=200, content={"success": True, "job": job})
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+	"""Cancel a queued job, or ask a running one to stop at its next progress update."""
+	queue = get_job_queue()
+	job = queue.get(job_id)
+	if job is None:
+		return JSONResponse(
+			status_code=404,
+			content={"success": False, "error": "Job not found"}
+		)
+	if job["status"] in FINISHED_STATUSES:
+		return JSONResponse(
+			status_code=409,
+			content={"success": False, "error": f"Job already {job['status']}", "job": job}
+		)
+	return JSONResponse(status_code=200, content={"success": True, "job": queue.cancel(job_id)})
@@ -0,0 +1,72 @@
+"""
+ONNX Runtime Backend for Taxora
+Exports the local text-generation model to ONNX (optionally int8-quantized) and serves it through
+a transformers pipeline, so the rest of the local Granite path is unchanged.
+"""
+
+import os
+import shutil
+import logging
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _export_dir(onnx_dir: str, model_name: str) -> str:
+    """Directory holding the exported model (model names may contain slashes)."""
+    return os.path.join(onnx_dir, model_name.replace("/", "--"))
+
+def export_onnx_model(model_name: str, onnx_dir: str) -> str:
+    """Export the model to ONNX once and reuse the export afterwards. Returns the export directory."""
+    from optimum.onnxruntime import ORTModelForCausalLM
+    from transformers import AutoTokenizer
+
+    target = _export_dir(onnx_dir, model_name)
+    if os.path.exists(os.path.join(target, "config.json")):
+        return target
+
+    logger.info(f"Exporting {model_name} to ONNX in {target}...")
+    start_time = time.time()
+
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+    model.save_pretrained(target)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(target)
+
+    logger.info(f"ONNX export finished in {time.time() - start_time:.2f}s")
+    return target
+
+def quantize_onnx_model(export_dir: str) -> str:
+    """Apply dynamic int8 weight quantization to every ONNX graph in the export. Returns the new directory."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    target = f"{export_dir}-int8"
+    if os.path.exists(os.path.join(target, "config.json")):
+        return target
+
+    logger.info(f"Quantizing ONNX model to int8 in {target}...")
+    os.makedirs(target, exist_ok=True)
+
+    for filename in os.listdir(export_dir):
+        source = os.path.join(export_dir, filename)
+        destination = os.path.join(target, filename)
+        if filename.endswith(".onnx"):
+            quantize_dynamic(source, destination, weight_type=QuantType.QInt8)
+        elif os.path.isfile(source) and not filename.endswith(".onnx_data"):
+            # Config and tokenizer files are needed unchanged alongside the graphs
+            shutil.copy2(source, destination)
+
+    return target
+
+def load_onnx_pipeline(model_name: str, onnx_dir: str, quantize: bool = False):
+    """Build a text-generation pipeline backed by ONNX Runtime on CPU."""
+    from optimum.onnxruntime import ORTModelForCausalLM
+    from transformers import AutoTokenizer, pipeline
+
+    model_dir = export_onnx_model(model_name, onnx_dir)
+    if quantize:
+        model_dir = quantize_onnx_model(model_dir)
+
+    model = ORTModelForCausalLM.from_pretrained(model_dir)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline("text-generation", model=model, tokenizer=tokenizer)
@@ -9,6 +9,11 @@ import json
 import logging
 import time
 from typing import List, Dict
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderQuotaExceededError, ProviderTimeoutError,
+    ProviderConnectionError, ProviderAuthError, ProviderAPIError
+)
+from rate_limiter import get_rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +28,9 @@ OPENROUTER_TEMPERATURE = float(os.getenv("OPENROUTER_TEMPERATURE", "0.7"))
 # API URL
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Client-side rate limiting (shared across workers when RATE_LIMIT_DB_PATH is set)
+openrouter_rate_limiter = get_rate_limiter("openrouter", requests_per_minute=60)
+
 def validate_openrouter_config() -> bool:
     """Validate OpenRouter configuration."""
     if not OPENROUTER_API_KEY:
@@ -41,6 +49,10 @@ def openrouter_generate_response(messages: List[Dict], max_retries: int = 2) ->
     if not validate_openrouter_config():
         return "OpenRouter is not configured. Please add your OpenRouter API key to use this feature."
 
+    allowed, rate_message, retry_after = openrouter_rate_limiter.try_acquire()
+    if not allowed:
+        raise ProviderRateLimitError("openrouter", rate_message, retry_after=retry_after or None)
+
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"Sending request to OpenRouter API (attempt {attempt + 1}/{max_retries + 1})...")
@@ -111,19 +123,19 @@ def openrouter_generate_response(messages: List[Dict], max_retries: int = 2) ->
                     time.sleep(wait_time)
                     continue
                 else:
-                    raise Exception("OPENROUTER_RATE_LIMITED: Rate limit exceeded. Please try again later.")
+                    raise ProviderRateLimitError("openrouter", "Rate limit exceeded. Please try again later.", status_code=429)
             
             elif response.status_code == 401:
                 logger.error("OpenRouter authentication failed - invalid API key")
-                raise Exception("OPENROUTER_API_ERROR: Invalid API key")
+                raise ProviderAuthError("openrouter", "Invalid API key", status_code=401)
 
             elif response.status_code == 402:
                 logger.error("OpenRouter insufficient credits")
-                raise Exception("OPENROUTER_INSUFFICIENT_CREDITS: Please add credits at https://openrouter.ai/settings/credits")
+                raise ProviderQuotaExceededError("openrouter", "Insufficient credits. Please add credits at https://openrouter.ai/settings/credits", status_code=402)
 
             elif response.status_code == 400:
                 logger.error(f"OpenRouter bad request: {response.text}")
-                raise Exception("OPENROUTER_API_ERROR: Bad request")
+                raise ProviderAPIError("openrouter", "Bad request", status_code=400)
             
             else:
                 logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
@@ -133,14 +145,14 @@ def openrouter_generate_response(messages: List[Dict], max_retries: int = 2) ->
                     time.sleep(wait_time)
                     continue
                 else:
-                    raise Exception(f"OPENROUTER_API_ERROR: HTTP {response.status_code}")
+                    raise ProviderAPIError("openrouter", f"HTTP {response.status_code}", status_code=response.status_code)
         
         except requests.exceptions.Timeout:
             logger.error(f"OpenRouter request timeout (attempt {attempt + 1})")
             if attempt < max_retries:
                 continue
             else:
-                raise Exception("OPENROUTER_TIMEOUT: Request timed out")
+                raise ProviderTimeoutError("openrouter", "Request timed out")
         
         except requests.exceptions.ConnectionError:
             logger.error(f"OpenRouter connection error (attempt {attempt + 1})")
@@ -148,17 +160,17 @@ def openrouter_generate_response(messages: List[Dict], max_retries: int = 2) ->
                 time.sleep(2)
                 continue
             else:
-                raise Exception("OPENROUTER_CONNECTION_ERROR: Could not connect to OpenRouter")
+                raise ProviderConnectionError("openrouter", "Could not connect to OpenRouter")
         
+        except ProviderError:
+            raise
+
         except Exception as e:
-            if "OPENROUTER_" in str(e):
-                raise e
+            logger.error(f"Unexpected error in OpenRouter client: {e}")
+            if attempt < max_retries:
+                continue
             else:
-                logger.error(f"Unexpected error in OpenRouter client: {e}")
-                if attempt < max_retries:
-                    continue
-                else:
-                    raise Exception(f"OPENROUTER_API_ERROR: {str(e)}")
+                raise ProviderAPIError("openrouter", str(e))
     
     return "I apologize, but I'm having trouble connecting to the AI service. Please try again later."
 
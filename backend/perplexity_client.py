@@ -9,6 +9,11 @@ import time
 import json
 import requests
 from typing import List, Dict, Optional
+from provider_errors import (
+    ProviderError, ProviderRateLimitError, ProviderTimeoutError,
+    ProviderConnectionError, ProviderAPIError
+)
+from rate_limiter import get_rate_limiter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -27,6 +32,9 @@ PERPLEXITY_TEMPERATURE = float(os.getenv("PERPLEXITY_TEMPERATURE", "0.7"))
 # API URLs
 PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
 
+# Client-side rate limiting (shared across workers when RATE_LIMIT_DB_PATH is set)
+perplexity_rate_limiter = get_rate_limiter("perplexity", requests_per_minute=60)
+
 def validate_perplexity_config() -> bool:
     """Validate Perplexity API configuration."""
     if not PERPLEXITY_API_KEY:
@@ -72,6 +80,10 @@ def perplexity_generate_response(messages: List[Dict], max_retries: int = 2) ->
     """Generate response using Perplexity AI API with real-time information."""
     if not validate_perplexity_config():
         return "Perplexity is not configured. Please add your Perplexity API key to use this feature."
+
+    allowed, rate_message, retry_after = perplexity_rate_limiter.try_acquire()
+    if not allowed:
+        raise ProviderRateLimitError("perplexity", rate_message, retry_after=retry_after or None)
     
     for attempt in range(max_retries + 1):
         try:
@@ -140,7 +152,7 @@ def perplexity_generate_response(messages: List[Dict], max_retries: int = 2) ->
                     continue
                 else:
                     logger.error("Max retries exceeded for Perplexity rate limit")
-                    raise Exception(f"PERPLEXITY_RATE_LIMITED: Perplexity is experiencing high demand. Retry in {retry_after} seconds.")
+                    raise ProviderRateLimitError("perplexity", f"Perplexity is experiencing high demand. Retry in {retry_after} seconds.", retry_after=retry_after, status_code=429)
                 
             elif response.status_code == 400:
                 logger.error(f"Bad request to Perplexity API: {response.text}")
@@ -153,7 +165,7 @@ def perplexity_generate_response(messages: List[Dict], max_retries: int = 2) ->
                     time.sleep(5)
                     continue
                 else:
-                    raise Exception("PERPLEXITY_API_ERROR: I'm having trouble connecting to Perplexity.")
+                    raise ProviderAPIError("perplexity", "I'm having trouble connecting to Perplexity.")
                     
         except requests.exceptions.Timeout:
             logger.warning(f"Perplexity API timeout, attempt {attempt + 1}/{max_retries + 1}")
@@ -161,7 +173,7 @@ def perplexity_generate_response(messages: List[Dict], max_retries: int = 2) ->
                 time.sleep(5)
                 continue
             else:
-                raise Exception("PERPLEXITY_TIMEOUT: The request took too long.")
+                raise ProviderTimeoutError("perplexity", "The request took too long.")
                 
         except requests.exceptions.ConnectionError:
             logger.warning(f"Perplexity connection error, attempt {attempt + 1}/{max_retries + 1}")
@@ -169,7 +181,7 @@ def perplexity_generate_response(messages: List[Dict], max_retries: int = 2) ->
                 time.sleep(5)
                 continue
             else:
-                raise Exception("PERPLEXITY_CONNECTION_ERROR: I can't connect to Perplexity right now.")
+                raise ProviderConnectionError("perplexity", "I can't connect to Perplexity right now.")
                 
         except json.JSONDecodeError:
             logger.error("Invalid JSON response from Perplexity API")
@@ -177,24 +189,23 @@ def perplexity_generate_response(messages: List[Dict], max_retries: int = 2) ->
                 time.sleep(2)
                 continue
             else:
-                raise Exception("PERPLEXITY_API_ERROR: I received an unexpected response.")
+                raise ProviderAPIError("perplexity", "I received an unexpected response.")
                 
+        except ProviderError:
+            # Re-raise typed provider errors to trigger fallback
+            raise
+
         except Exception as e:
-            error_str = str(e)
             logger.error(f"Unexpected error with Perplexity API: {e}")
             
-            # Re-raise specific Perplexity errors to trigger fallback
-            if any(error_type in error_str for error_type in ["PERPLEXITY_RATE_LIMITED", "PERPLEXITY_API_ERROR", "PERPLEXITY_CONNECTION_ERROR", "PERPLEXITY_TIMEOUT"]):
-                raise e
-            
             if attempt < max_retries:
                 time.sleep(2)
                 continue
             else:
-                raise Exception(f"PERPLEXITY_API_ERROR: I encountered an unexpected error: {str(e)}")
+                raise ProviderAPIError("perplexity", f"I encountered an unexpected error: {str(e)}")
     
     # If we get here, all retries failed
-    raise Exception("PERPLEXITY_API_ERROR: Perplexity is currently unavailable after all retries.")
+    raise ProviderAPIError("perplexity", "Perplexity is currently unavailable after all retries.")
 
 def test_perplexity_connection() -> Dict:
     """Test Perplexity API connection."""
@@ -0,0 +1,135 @@
+"""
+Prompt Assembler for Taxora
+Builds chat prompts within a token budget, folding older turns into a rolling summary.
+"""
+
+import os
+import re
+import logging
+from typing import Callable, Dict, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Budget configuration
+PROMPT_HISTORY_TOKEN_BUDGET = int(os.getenv("PROMPT_HISTORY_TOKEN_BUDGET", "1200"))
+PROMPT_SUMMARY_TOKEN_BUDGET = int(os.getenv("PROMPT_SUMMARY_TOKEN_BUDGET", "250"))
+PROMPT_SUMMARY_LINE_CHARS = 160
+
+# Average characters per token when no real tokenizer is registered for a provider
+CHARS_PER_TOKEN = {
+    "gemini": 4.0,
+    "huggingface": 4.0,
+    "granite": 3.6   # GPT-2 BPE splits more finely
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+_token_counters: Dict[str, Callable[[str], int]] = {}
+
+def register_token_counter(provider: str, counter: Callable[[str], int]):
+    """Use an exact tokenizer for a provider (e.g. the local model's) instead of the estimate."""
+    _token_counters[provider] = counter
+
+def count_tokens(text: str, provider: str = "") -> int:
+    """Count (or estimate) the tokens a provider will see for the text."""
+    if not text:
+        return 0
+
+    counter = _token_counters.get(provider)
+    if counter is not None:
+        try:
+            return counter(text)
+        except Exception as e:
+            logger.warning(f"Token counter for {provider} failed, estimating instead: {e}")
+
+    return int(len(text) / CHARS_PER_TOKEN.get(provider, DEFAULT_CHARS_PER_TOKEN)) + 1
+
+def count_message_tokens(messages: List[Dict], provider: str = "") -> int:
+    """Token count for a message list, with a small per-message overhead for role markers."""
+    return sum(count_tokens(message.get("content", ""), provider) + 4 for message in messages)
+
+def _summary_line(message: Dict) -> str:
+    """One extractive line for a dropped turn: its first sentence, trimmed."""
+    text = " ".join(message.get("content", "").split())
+    first_sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    if len(first_sentence) > PROMPT_SUMMARY_LINE_CHARS:
+        first_sentence = first_sentence[:PROMPT_SUMMARY_LINE_CHARS].rsplit(" ", 1)[0] + "..."
+
+    speaker = "User asked" if message.get("role") == "user" else "Advisor said"
+    return f"- {speaker}: {first_sentence}"
+
+class PromptAssembler:
+    """Fits a session's conversation into the history budget.
+
+    Per session it keeps "summary_lines" and "summarized_count" (how many history messages have
+    been folded in), so each turn only summarizes messages that newly fell out of the window.
+    """
+
+    def __init__(self, history_budget: int = PROMPT_HISTORY_TOKEN_BUDGET,
+                 summary_budget: int = PROMPT_SUMMARY_TOKEN_BUDGET):
+        self.history_budget = history_budget
+        self.summary_budget = summary_budget
+
+    def assemble(self, session: Dict, system_prompt: str, user_text: str, provider: str = "") -> List[Dict]:
+        """Build [system, recent turns..., user] for the provider.
+
+        The system message carries the session's stored system entries (the persona set at
+        session start) and the rolling summary, so providers with a native system field
+        (Gemini systemInstruction) receive everything in one place.
+        """
+        stored_system = [m["content"] for m in session.get("history", []) if m.get("role") == "system" and m.get("content")]
+        history = [m for m in session.get("history", []) if m.get("role") in ("user", "assistant")]
+
+        # Newest turns first until the budget is spent
+        budget = self.history_budget - count_message_tokens([{"role": "user", "content": user_text}], provider)
+        start = len(history)
+        used = 0
+        while start > 0:
+            cost = count_message_tokens([history[start - 1]], provider)
+            if used + cost > budget:
+                break
+            used += cost
+            start -= 1
+
+        # Conversations should resume on a user turn
+        while start < len(history) and history[start]["role"] != "user":
+            start += 1
+
+        self._update_summary(session, history, start, provider)
+
+        system_content = "\n\n".join([system_prompt] + [text for text in stored_system if text != system_prompt])
+        if session.get("summary_lines"):
+            system_content += "\n\nEarlier in this conversation:\n" + "\n".join(session["summary_lines"])
+
+        messages = [{"role": "system", "content": system_content}]
+        messages.extend(history[start:])
+        messages.append({"role": "user", "content": user_text})
+
+        session["last_prompt_stats"] = {
+            "estimated_tokens": count_message_tokens(messages, provider),
+            "history_messages_sent": len(history) - start,
+            "summarized_messages": session.get("summarized_count", 0)
+        }
+        return messages
+
+    def _update_summary(self, session: Dict, history: List[Dict], window_start: int, provider: str):
+        """Fold messages that dropped out of the window since the last turn into the summary."""
+        summarized = session.get("summarized_count", 0)
+        if window_start <= summarized:
+            return
+
+        lines = session.setdefault("summary_lines", [])
+        lines.extend(_summary_line(message) for message in history[summarized:window_start])
+        session["summarized_count"] = window_start
+
+        # Keep the summary itself bounded: oldest lines go first
+        while len(lines) > 1 and count_tokens("\n".join(lines), provider) > self.summary_budget:
+            lines.pop(0)
+
+# Global assembler instance
+prompt_assembler = PromptAssembler()
+
+def get_prompt_assembler() -> PromptAssembler:
+    """Get the global prompt assembler instance."""
+    return prompt_assembler
@@ -0,0 +1,74 @@
+"""
+Provider Errors for Taxora
+Typed exceptions raised by AI provider clients so fallback logic does not depend on message text.
+"""
+
+from typing import Optional
+
+class ProviderError(Exception):
+    """Base class for AI provider failures that should trigger fallback."""
+
+    error_code = "API_ERROR"
+    fallback_reason = "error"
+
+    def __init__(self, provider: str, message: str, retry_after: Optional[float] = None, status_code: Optional[int] = None):
+        self.provider = provider
+        self.message = message
+        self.retry_after = retry_after
+        self.status_code = status_code
+        # Keep the legacy "PROVIDER_CODE: message" text for logs and older callers
+        super().__init__(f"{provider.upper()}_{self.error_code}: {message}")
+
+class ProviderRateLimitError(ProviderError):
+    """Provider rejected the request because of rate limits (HTTP 429 or local limiter)."""
+
+    error_code = "RATE_LIMITED"
+    fallback_reason = "rate_limited"
+
+class ProviderQuotaExceededError(ProviderRateLimitError):
+    """Provider quota or credits are exhausted; retrying soon will not help."""
+
+    error_code = "QUOTA_EXCEEDED"
+    fallback_reason = "quota_exceeded"
+
+class ProviderTimeoutError(ProviderError):
+    """Provider did not answer in time."""
+
+    error_code = "TIMEOUT"
+    fallback_reason = "timeout"
+
+class ProviderQueueTimeoutError(ProviderTimeoutError):
+    """No provider slot freed up in time; the provider itself was never called."""
+
+    error_code = "QUEUE_TIMEOUT"
+    fallback_reason = "queue_timeout"
+
+class DeadlineExceededError(ProviderTimeoutError):
+    """The request's overall time budget ran out; no further provider should be tried."""
+
+    error_code = "DEADLINE_EXCEEDED"
+    fallback_reason = "deadline_exceeded"
+
+class ProviderConnectionError(ProviderError):
+    """Provider could not be reached."""
+
+    error_code = "CONNECTION_ERROR"
+    fallback_reason = "connection_error"
+
+class ProviderAuthError(ProviderError):
+    """Provider rejected our credentials."""
+
+    error_code = "AUTH_ERROR"
+    fallback_reason = "auth_error"
+
+class ProviderAPIError(ProviderError):
+    """Provider returned an unexpected error or response."""
+
+    error_code = "API_ERROR"
+    fallback_reason = "api_error"
+
+class ProviderUnavailableError(ProviderError):
+    """Provider was skipped because its circuit breaker is open."""
+
+    error_code = "CIRCUIT_OPEN"
+    fallback_reason = "circuit_open"
@@ -0,0 +1,129 @@
+"""
+Provider Metrics for Taxora
+Tracks per-provider response latencies, health and histograms for hedging, routing and monitoring.
+"""
+
+import bisect
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+class LatencyTracker:
+    """Keeps a sliding window of recent successful response times per provider."""
+
+    def __init__(self, window_size: int = 200):
+        self.window_size = window_size
+        self.samples: Dict[str, deque] = {}
+        self.lock = threading.Lock()
+
+    def record(self, provider: str, latency: float):
+        """Record a successful response latency in seconds."""
+        with self.lock:
+            if provider not in self.samples:
+                self.samples[provider] = deque(maxlen=self.window_size)
+            self.samples[provider].append(latency)
+
+    def sample_count(self, provider: str) -> int:
+        """Number of latency samples currently held for a provider."""
+        with self.lock:
+            return len(self.samples.get(provider, ()))
+
+    def percentile(self, provider: str, percentile: float) -> Optional[float]:
+        """Get the given latency percentile (0-100) for a provider, or None without samples."""
+        with self.lock:
+            values = sorted(self.samples.get(provider, ()))
+
+        if not values:
+            return None
+
+        rank = (percentile / 100.0) * (len(values) - 1)
+        lower = int(rank)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+    def get_summary(self) -> Dict:
+        """Get p50/p95 latency summary for all providers."""
+        with self.lock:
+            providers = list(self.samples.keys())
+
+        summary = {}
+        for provider in providers:
+            p50 = self.percentile(provider, 50)
+            p95 = self.percentile(provider, 95)
+            summary[provider] = {
+                "samples": self.sample_count(provider),
+                "p50_seconds": round(p50, 3) if p50 is not None else None,
+                "p95_seconds": round(p95, 3) if p95 is not None else None
+            }
+        return summary
+
+class ProviderHealthTracker:
+    """Exponentially weighted latency and error rate per provider, used for adaptive routing."""
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.health: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def _entry(self, provider: str) -> Dict:
+        """Get or create the health entry for a provider. Caller must hold the lock."""
+        if provider not in self.health:
+            self.health[provider] = {"ewma_latency": None, "ewma_error_rate": 0.0, "samples": 0}
+        return self.health[provider]
+
+    def record_success(self, provider: str, latency: float):
+        """Fold a successful call's latency into the provider's averages."""
+        with self.lock:
+            entry = self._entry(provider)
+            if entry["ewma_latency"] is None:
+                entry["ewma_latency"] = latency
+            else:
+                entry["ewma_latency"] = self.alpha * latency + (1 - self.alpha) * entry["ewma_latency"]
+            entry["ewma_error_rate"] = (1 - self.alpha) * entry["ewma_error_rate"]
+            entry["samples"] += 1
+
+    def record_failure(self, provider: str):
+        """Fold a failed call into the provider's error rate."""
+        with self.lock:
+            entry = self._entry(provider)
+            entry["ewma_error_rate"] = self.alpha + (1 - self.alpha) * entry["ewma_error_rate"]
+            entry["samples"] += 1
+
+    def get(self, provider: str) -> Dict:
+        """Get a copy of the provider's current health figures."""
+        with self.lock:
+            return dict(self._entry(provider))
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative "le" buckets, Prometheus style)."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Add one observation."""
+        with self.lock:
+            index = bisect.bisect_left(self.buckets, value)
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def get_summary(self) -> Dict:
+        """Get cumulative bucket counts, total count and mean."""
+        with self.lock:
+            cumulative = {}
+            running = 0
+            for bound, count in zip(self.buckets, self.counts):
+                running += count
+                cumulative[str(bound)] = running
+            cumulative["+Inf"] = running + self.counts[-1]
+
+            return {
+                "buckets": cumulative,
+                "count": self.count,
+                "mean": round(self.total / self.count, 3) if self.count else None
+            }
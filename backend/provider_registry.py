@@ -0,0 +1,167 @@
+"""
+Provider Registry for Taxora
+Declares every AI provider client by entry name and imports its module only on first use.
+"""
+
+import os
+import time
+import logging
+import importlib
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ProviderSpec:
+    """How to reach one provider client without importing it.
+
+    required_env lists variables that must be set for the provider to count as configured;
+    "A|B" means either A or B is enough.
+    """
+    name: str
+    display_name: str
+    description: str
+    module: str
+    generate: str
+    validate: str
+    test: str
+    required_env: Tuple[str, ...] = ()
+    features: List[str] = field(default_factory=list)
+
+    @property
+    def requires_api_key(self) -> bool:
+        return bool(self.required_env)
+
+PROVIDER_SPECS = [
+    ProviderSpec("granite", "IBM Granite", "Lightweight local AI model (fast, free, offline)",
+                 "granite_client", "granite_chat", "validate_config", "test_granite_connectivity",
+                 features=["Local processing", "No API costs", "Fast responses"]),
+    ProviderSpec("gemini", "Google Gemini", "Google's advanced Gemini AI with generous free quota",
+                 "gemini_client", "gemini_generate_response", "validate_gemini_config", "test_gemini_connection",
+                 required_env=("GEMINI_API_KEY|GEMINI_API_KEYS",),
+                 features=["Advanced reasoning", "Multimodal capabilities", "High quality responses", "Free quota"]),
+    ProviderSpec("huggingface", "Hugging Face (Multiple Models)", "Access to multiple AI models through Hugging Face Inference API",
+                 "huggingface_client", "huggingface_generate_response", "validate_huggingface_config", "test_huggingface_connectivity",
+                 required_env=("HUGGINGFACE_API_KEY",),
+                 features=["Multiple models", "DialoGPT", "BlenderBot", "Free tier available", "Open source models"]),
+    ProviderSpec("claude", "Anthropic Claude", "Claude models through the Anthropic Messages API",
+                 "claude_client", "claude_generate_response", "validate_claude_config", "test_claude_connection",
+                 required_env=("CLAUDE_API_KEY",),
+                 features=["Careful reasoning", "Long context", "High quality responses"]),
+    ProviderSpec("chatgpt", "OpenAI ChatGPT", "OpenAI chat models through the Chat Completions API",
+                 "chatgpt_client", "chatgpt_generate_response", "validate_chatgpt_config", "test_chatgpt_connection",
+                 required_env=("OPENAI_API_KEY",),
+                 features=["General knowledge", "Fast responses"]),
+    ProviderSpec("openrouter", "OpenRouter", "Many open and commercial models behind one API",
+                 "openrouter_client", "openrouter_generate_response", "validate_openrouter_config", "test_openrouter_connectivity",
+                 required_env=("OPENROUTER_API_KEY",),
+                 features=["Multiple models", "Pay per use"]),
+    ProviderSpec("grok", "xAI Grok", "Grok models through the xAI API",
+                 "grok_client", "grok_generate_response", "validate_grok_config", "test_grok_connection",
+                 required_env=("GROK_API_KEY",),
+                 features=["Up-to-date knowledge", "Conversational tone"]),
+    ProviderSpec("perplexity", "Perplexity", "Search-grounded answers from Perplexity's online models",
+                 "perplexity_client", "perplexity_generate_response", "validate_perplexity_config", "test_perplexity_connection",
+                 required_env=("PERPLEXITY_API_KEY",),
+                 features=["Web-grounded answers", "Current tax and rate information"]),
+    ProviderSpec("watsonx", "IBM watsonx.ai", "Granite instruct models hosted on IBM watsonx.ai",
+                 "ibm_clients", "watsonx_chat", "validate_config", "test_watson_connectivity",
+                 required_env=("WATSONX_APIKEY", "WATSONX_URL", "WATSONX_PROJECT_ID"),
+                 features=["Enterprise hosting", "Granite 3 instruct models"]),
+]
+
+class ProviderRegistry:
+    """Resolves provider entry names to client functions, importing each client module lazily.
+
+    Importing a client runs its load_dotenv() and config validation, so nothing is imported
+    until the provider is first selected, called or health-checked.
+    """
+
+    def __init__(self, specs: List[ProviderSpec]):
+        self.specs: Dict[str, ProviderSpec] = {spec.name: spec for spec in specs}
+        self.modules: Dict[str, object] = {}
+        self.generators: Dict[str, Callable] = {}
+        self.import_seconds: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        """Entry names in declaration order."""
+        return list(self.specs)
+
+    def is_configured(self, name: str) -> bool:
+        """Cheap check (environment only, no import) whether the provider has its credentials."""
+        spec = self.specs[name]
+        return all(
+            any(os.getenv(variable) for variable in requirement.split("|"))
+            for requirement in spec.required_env
+        )
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether the provider's client module has been imported."""
+        return name in self.modules
+
+    def load(self, name: str):
+        """Import the provider's client module (once) and return it."""
+        if name not in self.specs:
+            raise KeyError(f"Unknown AI provider: {name}")
+
+        with self.lock:
+            if name not in self.modules:
+                start_time = time.time()
+                self.modules[name] = importlib.import_module(self.specs[name].module)
+                self.import_seconds[name] = time.time() - start_time
+                logger.info(f"Loaded {name} provider client in {self.import_seconds[name]:.3f}s")
+            return self.modules[name]
+
+    def get_function(self, name: str, attribute: str) -> Callable:
+        """A function from the provider's client module."""
+        return getattr(self.load(name), attribute)
+
+    def get_generator(self, name: str) -> Callable:
+        """The provider's generate(messages) -> str function."""
+        generator = self.generators.get(name)
+        if generator is None:
+            generator = self.get_function(name, self.specs[name].generate)
+            self.generators[name] = generator
+        return generator
+
+    def generate(self, name: str, messages: List[Dict]) -> str:
+        """Generate a response with the named provider."""
+        return self.get_generator(name)(messages)
+
+    def validate(self, name: str) -> bool:
+        """Full configuration check by the client itself (imports the module)."""
+        return bool(self.get_function(name, self.specs[name].validate)())
+
+    def test_connection(self, name: str) -> Dict:
+        """Run the client's connectivity test (imports the module)."""
+        return self.get_function(name, self.specs[name].test)()
+
+    def call_if_loaded(self, name: str, attribute: str, default=None):
+        """Call a client function only if its module is already imported (for status pages)."""
+        if not self.is_loaded(name):
+            return default
+        return self.get_function(name, attribute)()
+
+    def get_status(self) -> Dict:
+        """Which providers are declared, configured and loaded."""
+        return {
+            name: {
+                "module": spec.module,
+                "configured": self.is_configured(name),
+                "loaded": self.is_loaded(name),
+                "import_seconds": round(self.import_seconds[name], 3) if name in self.import_seconds else None
+            }
+            for name, spec in self.specs.items()
+        }
+
+# Global registry instance
+provider_registry = ProviderRegistry(PROVIDER_SPECS)
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get the global provider registry instance."""
+    return provider_registry
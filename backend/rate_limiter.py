@@ -0,0 +1,220 @@
+"""
+Rate Limiter for Taxora
+GCRA (token bucket) rate limiting for AI provider clients, optionally shared across worker processes.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import logging
+import threading
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Shared state: when set, every worker process reads and updates the same SQLite file
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "")
+
+EMPTY_STATE = {"tat": 0.0, "day": "", "day_count": 0}
+
+class MemoryRateLimitStore:
+    """Keeps limiter state in this process only."""
+
+    def __init__(self):
+        self.states: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str) -> Dict:
+        """Read the limiter state without changing it."""
+        with self.lock:
+            return dict(self.states.get(name) or EMPTY_STATE)
+
+    def update(self, name: str, fn: Callable[[Dict], Tuple[object, Dict]]):
+        """Atomically apply fn to the limiter state and store the new state."""
+        with self.lock:
+            state = dict(self.states.get(name) or EMPTY_STATE)
+            result, new_state = fn(state)
+            self.states[name] = new_state
+            return result
+
+class SQLiteRateLimitStore:
+    """Keeps limiter state in a SQLite file so all uvicorn workers share one budget."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "name TEXT PRIMARY KEY, tat REAL NOT NULL, day TEXT NOT NULL, day_count INTEGER NOT NULL)"
+        )
+        self.lock = threading.Lock()
+
+    def get(self, name: str) -> Dict:
+        """Read the limiter state in a plain read; WAL readers never wait for other workers' writes."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT tat, day, day_count FROM rate_limits WHERE name = ?", (name,)
+            ).fetchone()
+        return {"tat": row[0], "day": row[1], "day_count": row[2]} if row else dict(EMPTY_STATE)
+
+    def update(self, name: str, fn: Callable[[Dict], Tuple[object, Dict]]):
+        """Atomically apply fn to the limiter state inside a write transaction."""
+        with self.lock:
+            # BEGIN IMMEDIATE takes the write lock up front so read-modify-write is atomic across processes
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT tat, day, day_count FROM rate_limits WHERE name = ?", (name,)
+                ).fetchone()
+                state = {"tat": row[0], "day": row[1], "day_count": row[2]} if row else dict(EMPTY_STATE)
+
+                result, new_state = fn(state)
+
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (name, tat, day, day_count) VALUES (?, ?, ?, ?)",
+                    (name, new_state["tat"], new_state["day"], new_state["day_count"])
+                )
+                self.conn.execute("COMMIT")
+                return result
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+class RateLimiter:
+    """GCRA limiter with a per-minute rate plus an optional daily cap.
+
+    State is a single theoretical arrival time and a daily counter, so every check is O(1)
+    regardless of how many requests were made.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, requests_per_day: Optional[int] = None,
+                 burst: Optional[int] = None, store=None):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.requests_per_day = requests_per_day
+        self.burst = burst or requests_per_minute
+        self.emission_interval = 60.0 / requests_per_minute
+        self.store = store or MemoryRateLimitStore()
+
+    def _evaluate(self, state: Dict, now: float, consume: bool) -> Tuple[Tuple[bool, str, float], Dict]:
+        """Decide whether a request fits and return (decision, new_state)."""
+        today = date.fromtimestamp(now).isoformat()
+        if state["day"] != today:
+            state = {"tat": state["tat"], "day": today, "day_count": 0}
+
+        if self.requests_per_day is not None and state["day_count"] >= self.requests_per_day:
+            return (False, f"Daily quota exceeded: {state['day_count']} requests today", 0.0), state
+
+        tat = max(state["tat"], now)
+        new_tat = tat + self.emission_interval
+        allow_at = new_tat - self.emission_interval * self.burst
+
+        if allow_at > now:
+            wait_time = allow_at - now
+            used = self.requests_per_minute - self._remaining(state["tat"], now)
+            return (False, f"Rate limit: {used} requests in last minute. Wait {math.ceil(wait_time)}s", wait_time), state
+
+        if consume:
+            state = {"tat": new_tat, "day": today, "day_count": state["day_count"] + 1}
+        return (True, "OK", 0.0), state
+
+    def _remaining(self, tat: float, now: float) -> int:
+        """Requests still available in the current burst window."""
+        backlog = max(0.0, tat - now)
+        return max(0, self.burst - math.ceil(backlog / self.emission_interval))
+
+    def try_acquire(self) -> Tuple[bool, str, float]:
+        """Check and consume one request atomically. Returns (allowed, message, retry_after_seconds)."""
+        now = time.time()
+        return self.store.update(self.name, lambda state: self._evaluate(state, now, consume=True))
+
+    def can_make_request(self) -> Tuple[bool, str]:
+        """Check if we can make a request without consuming it (a read, no write transaction)."""
+        now = time.time()
+        (allowed, message, _), _ = self._evaluate(self.store.get(self.name), now, consume=False)
+        return allowed, message
+
+    def record_request(self):
+        """Record a request made without try_acquire (consumes even when over the limit)."""
+        now = time.time()
+
+        def consume(state):
+            today = date.fromtimestamp(now).isoformat()
+            day_count = state["day_count"] if state["day"] == today else 0
+            return None, {"tat": max(state["tat"], now) + self.emission_interval, "day": today, "day_count": day_count + 1}
+
+        self.store.update(self.name, consume)
+
+    def reset(self):
+        """Clear the limiter state."""
+        self.store.update(self.name, lambda state: (None, dict(EMPTY_STATE)))
+
+    def get_status(self) -> Dict:
+        """Get current rate limiting status (a read, no write transaction)."""
+        now = time.time()
+        state = self.store.get(self.name)
+
+        today = date.fromtimestamp(now).isoformat()
+        requests_today = state["day_count"] if state["day"] == today else 0
+        minute_remaining = self._remaining(state["tat"], now)
+
+        return {
+            "requests_last_minute": self.requests_per_minute - minute_remaining,
+            "requests_today": requests_today,
+            "minute_limit": self.requests_per_minute,
+            "daily_limit": self.requests_per_day,
+            "minute_remaining": minute_remaining,
+            "daily_remaining": self.requests_per_day - requests_today if self.requests_per_day is not None else None,
+            "shared": isinstance(self.store, SQLiteRateLimitStore)
+        }
+
+_store = None
+_limiters: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+def _get_store():
+    """Shared store for all limiters: SQLite when RATE_LIMIT_DB_PATH is set, otherwise in-process."""
+    global _store
+    if _store is None:
+        if RATE_LIMIT_DB_PATH:
+            try:
+                _store = SQLiteRateLimitStore(RATE_LIMIT_DB_PATH)
+                logger.info(f"Rate limits shared across workers via {RATE_LIMIT_DB_PATH}")
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open rate limit database {RATE_LIMIT_DB_PATH}, using in-process limits: {e}")
+                _store = MemoryRateLimitStore()
+        else:
+            _store = MemoryRateLimitStore()
+    return _store
+
+def get_rate_limiter(name: str, requests_per_minute: int, requests_per_day: Optional[int] = None) -> RateLimiter:
+    """Get (or create) the named limiter. {NAME}_RATE_LIMIT_RPM / _RPD env vars override the defaults."""
+    with _registry_lock:
+        if name not in _limiters:
+            prefix = name.upper()
+            rpm = int(os.getenv(f"{prefix}_RATE_LIMIT_RPM", requests_per_minute))
+            rpd = os.getenv(f"{prefix}_RATE_LIMIT_RPD")
+            rpd = int(rpd) if rpd else requests_per_day
+            _limiters[name] = RateLimiter(name, rpm, rpd, store=_get_store())
+        return _limiters[name]
+
+def get_rate_limit_status(name: str) -> Optional[Dict]:
+    """Get status for a limiter if it has been created, without creating it."""
+    with _registry_lock:
+        limiter = _limiters.get(name)
+    return limiter.get_status() if limiter else None
+
+def get_all_rate_limit_status() -> Dict:
+    """Get status for every limiter created so far."""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.get_status() for limiter in limiters}
@@ -0,0 +1,110 @@
+"""
+Request Deadlines for Taxora
+Carries an end-to-end time budget from the API handler down to provider HTTP calls and retries.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from provider_errors import DeadlineExceededError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Deadline configuration
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "30"))
+AI_FALLBACK_RESERVE_SECONDS = float(os.getenv("AI_FALLBACK_RESERVE_SECONDS", "8"))
+RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", "0.5"))
+RETRY_BACKOFF_CAP = float(os.getenv("RETRY_BACKOFF_CAP", "8"))
+
+# Minimum time worth spending on an HTTP attempt; below this we give up instead of starting one
+MIN_ATTEMPT_SECONDS = 1.0
+
+# Absolute time.monotonic() deadline for the current request, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Limit everything inside the block to `seconds`. Nested scopes can only tighten the deadline."""
+    new_deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        new_deadline = min(new_deadline, current)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield new_deadline
+    finally:
+        _deadline.reset(token)
+
+def with_deadline(seconds: float = REQUEST_DEADLINE_SECONDS):
+    """Decorator running the whole function inside deadline_scope(seconds)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with deadline_scope(seconds):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None when no deadline is set."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def check_deadline(provider: str = "request"):
+    """Raise DeadlineExceededError if the current deadline has passed."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededError(provider, "Request deadline exceeded")
+
+def request_timeout(default: float, provider: str = "request") -> float:
+    """HTTP timeout for the next attempt: the default, capped by the remaining budget."""
+    remaining = remaining_time()
+    if remaining is None:
+        return default
+    if remaining < MIN_ATTEMPT_SECONDS:
+        raise DeadlineExceededError(provider, f"Only {max(remaining, 0):.1f}s left in the request deadline")
+    return min(default, remaining)
+
+def _on_event_loop_thread() -> bool:
+    """True when called from a thread that is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def backoff_sleep(attempt: int, provider: str, retry_after: Optional[float] = None) -> bool:
+    """Wait before retry number `attempt` + 1 with full-jitter exponential backoff.
+
+    A server retry-after is honoured when given. Returns False, without sleeping, when the wait
+    would not leave time for another attempt (so the caller fails fast and fallback starts) or
+    when called on an event-loop thread, where sleeping would stall every other request.
+    """
+    if retry_after is not None:
+        delay = min(retry_after, RETRY_BACKOFF_CAP)
+    else:
+        delay = random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+    remaining = remaining_time()
+    if remaining is not None and delay + MIN_ATTEMPT_SECONDS > remaining:
+        logger.info(f"{provider}: skipping retry, {delay:.1f}s backoff would exceed the {max(remaining, 0):.1f}s left")
+        return False
+
+    if _on_event_loop_thread():
+        logger.warning(f"{provider}: not retrying on the event loop thread")
+        return False
+
+    time.sleep(delay)
+    return True
@@ -0,0 +1,165 @@
+"""
+Request Recorder for Taxora
+Opt-in ASGI middleware that appends each API request (body, timing, status) to a JSONL trace for replay.
+"""
+
+import os
+import json
+import time
+import base64
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Recording configuration
+REQUEST_RECORDING_ENABLED = os.getenv("REQUEST_RECORDING_ENABLED", "false").lower() == "true"
+REQUEST_TRACE_PATH = os.getenv("REQUEST_TRACE_PATH", "data/traces/requests.jsonl")
+REQUEST_TRACE_MAX_BODY_BYTES = int(os.getenv("REQUEST_TRACE_MAX_BODY_BYTES", str(6 * 1024 * 1024)))
+REQUEST_TRACE_SCRUB_FIELDS = [field.strip() for field in os.getenv(
+    "REQUEST_TRACE_SCRUB_FIELDS", "phone,email,pan_number,bank_account,bank_ifsc,address,api_key"
+).split(",") if field.strip()]
+REQUEST_TRACE_EXCLUDE_PREFIXES = [prefix.strip() for prefix in os.getenv(
+    "REQUEST_TRACE_EXCLUDE_PREFIXES", "/static,/docs,/redoc,/openapi.json,/favicon.ico"
+).split(",") if prefix.strip()]
+
+# Ids created by one request and referenced by later ones; the replayer remaps them
+TRACKED_ID_FIELDS = ("session_id", "business_id", "goal_id", "tax_record_id")
+
+REDACTED = "[REDACTED]"
+
+def scrub_fields(record: Dict) -> Dict:
+    """Default scrubber: replace configured JSON fields, at any depth, with a placeholder."""
+    def scrub(value):
+        if isinstance(value, dict):
+            return {key: REDACTED if key in REQUEST_TRACE_SCRUB_FIELDS and item not in (None, "") else scrub(item)
+                    for key, item in value.items()}
+        if isinstance(value, list):
+            return [scrub(item) for item in value]
+        return value
+
+    if "json" in record:
+        record["json"] = scrub(record["json"])
+    return record
+
+_scrubbers: List[Callable[[Dict], Optional[Dict]]] = [scrub_fields]
+
+def register_scrubber(scrubber: Callable[[Dict], Optional[Dict]]):
+    """Add a hook run on every record before it is written; return None to drop the record."""
+    _scrubbers.append(scrubber)
+
+def _tracked_ids(body: bytes) -> Dict[str, str]:
+    """Ids found at the top level (or under "data") of a JSON response."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    ids = {}
+    for source in (data, data.get("data") if isinstance(data.get("data"), dict) else {}):
+        for field in TRACKED_ID_FIELDS:
+            if isinstance(source.get(field), str):
+                ids[field] = source[field]
+    return ids
+
+class TraceWriter:
+    """Appends records to a JSONL file; safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, record: Dict):
+        for scrubber in _scrubbers:
+            record = scrubber(record)
+            if record is None:
+                return
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+class RequestRecorderMiddleware:
+    """Pure ASGI middleware, so request bodies reach the endpoint untouched and streaming still works.
+
+    Each record holds the wall-clock start time, method, path, query string, content type and
+    body (parsed JSON, or base64 for anything else such as audio uploads), the response status,
+    the server-side duration and any ids the response created.
+    """
+
+    def __init__(self, app, trace_path: str = REQUEST_TRACE_PATH, max_body_bytes: int = REQUEST_TRACE_MAX_BODY_BYTES):
+        self.app = app
+        self.writer = TraceWriter(trace_path)
+        self.max_body_bytes = max_body_bytes
+        logger.info(f"Recording API requests to {trace_path}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or any(scope["path"].startswith(prefix) for prefix in REQUEST_TRACE_EXCLUDE_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.time()
+        start_time = time.perf_counter()
+        request_body = bytearray()
+        response_body = bytearray()
+        response = {"status": None, "json": False}
+
+        async def recording_receive():
+            message = await receive()
+            if message["type"] == "http.request" and len(request_body) <= self.max_body_bytes:
+                request_body.extend(message.get("body", b""))
+            return message
+
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = dict(message.get("headers", []))
+                response["json"] = headers.get(b"content-type", b"").startswith(b"application/json")
+            elif message["type"] == "http.response.body" and response["json"] and len(response_body) < 65536:
+                response_body.extend(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, recording_receive, recording_send)
+        finally:
+            headers = dict(scope.get("headers", []))
+            record = {
+                "ts": round(started_at, 3),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "content_type": headers.get(b"content-type", b"").decode("latin-1"),
+                "status": response["status"],
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 1)
+            }
+            self._add_body(record, bytes(request_body))
+            ids = _tracked_ids(bytes(response_body)) if response["json"] else {}
+            if ids:
+                record["response_ids"] = ids
+
+            try:
+                self.writer.write(record)
+            except Exception as e:
+                logger.warning(f"Could not write request trace record: {e}")
+
+    def _add_body(self, record: Dict, body: bytes):
+        if not body:
+            return
+        if len(body) > self.max_body_bytes:
+            record["body_truncated"] = True
+            return
+        if record["content_type"].startswith("application/json"):
+            try:
+                record["json"] = json.loads(body)
+                return
+            except ValueError:
+                pass
+        record["body_b64"] = base64.b64encode(body).decode("ascii")
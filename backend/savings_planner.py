@@ -272,6 +272,7 @@ class SavingsPlanner:
         try:
             # Import AI provider manager
             from ai_provider_manager import get_ai_manager
+            from llm_scheduler import PRIORITY_BACKGROUND
             
             ai_manager = get_ai_manager()
             
@@ -296,7 +297,7 @@ class SavingsPlanner:
             """
             
             messages = [{"role": "user", "content": prompt}]
-            response = ai_manager.generate_response(messages)
+            response = ai_manager.generate_response(messages, priority=PRIORITY_BACKGROUND)
             
             if response["success"]:
                 # Try to parse JSON response
@@ -374,12 +375,22 @@ class SavingsPlanner:
                 return [SavingsEntry(**entry) for entry in entries_data]
         return []
     
+    def get_user_ids(self) -> List[str]:
+        """All users that have at least one savings goal."""
+        user_ids = set()
+        for filename in os.listdir(self.data_dir):
+            if filename.startswith("goal_") and filename.endswith(".json"):
+                goal = self._load_goal(filename[len("goal_"):-len(".json")])
+                if goal:
+                    user_ids.add(goal.user_id)
+        return sorted(user_ids)
+
     def _load_user_goals(self, user_id: str) -> List[SavingsGoal]:
         """Load all goals for a user."""
         goals = []
         for filename in os.listdir(self.data_dir):
             if filename.startswith("goal_") and filename.endswith(".json"):
-                goal = self._load_goal(filename.replace("goal_", "").replace(".json", ""))
+                goal = self._load_goal(filename[len("goal_"):-len(".json")])
                 if goal and goal.user_id == user_id:
                     goals.append(goal)
         return goals
@@ -0,0 +1,87 @@
+"""
+Stage Graph for Taxora
+Runs a request pipeline as a small dependency graph so independent stages overlap on a thread pool.
+"""
+
+import time
+import logging
+import contextvars
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Stage:
+    """One pipeline step; func receives the results of finished stages keyed by stage name."""
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+
+def summarize_timings(timings: Dict[str, Dict[str, float]], total_ms: float) -> Dict:
+    """Per-stage timings plus how much wall time overlapping saved versus running them in sequence."""
+    sequential_ms = sum(timing["duration_ms"] for timing in timings.values())
+    return {
+        "stages": timings,
+        "total_ms": round(total_ms, 1),
+        "sequential_ms": round(sequential_ms, 1),
+        "overlap_saved_ms": round(max(0.0, sequential_ms - total_ms), 1)
+    }
+
+def run_stage_graph(stages: List[Stage], executor: Executor) -> Tuple[Dict[str, Any], Dict]:
+    """Run every stage as soon as its dependencies have finished; returns (results, timing summary).
+
+    Each stage runs in a copy of the caller's context, so request deadlines carry over. If a stage
+    raises, no further stages start, the ones already running are waited for, and the exception is
+    re-raised with the timing summary attached as `stage_timings`.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = set(stage.depends_on) - names
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {sorted(unknown)}")
+
+    start_time = time.perf_counter()
+    pending = {stage.name: stage for stage in stages}
+    running: Dict[Future, str] = {}
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+
+    def run_stage(stage: Stage, inputs: Dict[str, Any]):
+        stage_start = time.perf_counter()
+        try:
+            return stage.func(inputs)
+        finally:
+            stage_end = time.perf_counter()
+            timings[stage.name] = {
+                "start_ms": round((stage_start - start_time) * 1000, 1),
+                "duration_ms": round((stage_end - stage_start) * 1000, 1)
+            }
+
+    def elapsed_ms() -> float:
+        return (time.perf_counter() - start_time) * 1000
+
+    while pending or running:
+        ready = [stage for stage in pending.values() if all(name in results for name in stage.depends_on)]
+        for stage in ready:
+            del pending[stage.name]
+            inputs = {name: results[name] for name in stage.depends_on}
+            running[executor.submit(contextvars.copy_context().run, run_stage, stage, inputs)] = stage.name
+
+        if not running:
+            raise ValueError(f"Stage dependencies form a cycle: {sorted(pending)}")
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                wait(running)
+                e.stage_timings = summarize_timings(timings, elapsed_ms())
+                raise
+
+    return results, summarize_timings(timings, elapsed_ms())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Stub Provider Server for Taxora
+Local stand-in for the Gemini, Hugging Face, Ollama and watsonx APIs with latency and fault injection,
+so load tests and offline runs never spend real quota.
+
+Run:   python stub_provider_server.py --port 8090 --latency-ms 800 --jitter-ms 300 --rate-429 0.05
+Point the clients at it:
+    GEMINI_API_URL=http://localhost:8090/v1beta/models
+    HUGGINGFACE_API_URL=http://localhost:8090/models
+    OLLAMA_BASE_URL=http://localhost:8090
+    WATSONX_URL=http://localhost:8090   WATSONX_IAM_URL=http://localhost:8090/identity/token
+(API keys can be any non-empty value; Gemini keys must still start with "AIza".)
+
+Change behaviour at runtime with POST /__stub/config (JSON, same keys as DEFAULT_SETTINGS, plus
+"providers": {"gemini": {...}} for per-provider overrides); read counters from GET /__stub/stats.
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    "latency_distribution": "normal",   # fixed | uniform | normal | lognormal
+    "latency_ms": 500.0,                # mean (or fixed value)
+    "jitter_ms": 150.0,                 # spread: stddev for normal/lognormal, half-width for uniform
+    "rate_429": 0.0,                    # share of requests answered with 429
+    "rate_503": 0.0,                    # share of requests answered with 503
+    "retry_after": 5,                   # seconds, sent with every 429/503
+    "stream_chunks": 5,                 # chunks per streamed response
+    "stream_chunk_delay_ms": 100.0
+}
+
+STUB_ANSWER = (
+    "Start with the 50/30/20 rule: 50% of your income for needs, 30% for wants and 20% for savings. "
+    "Build an emergency fund covering six months of expenses before investing. "
+    "Use section 80C investments such as PPF or ELSS to reduce your taxable income. "
+    "Review your budget every month and adjust as your income changes."
+)
+
+STUB_TAMIL_ANSWER = (
+    "ஐம்பது முப்பது இருபது விதியுடன் தொடங்குங்கள். ஆறு மாத செலவுகளுக்கான அவசர நிதியை முதலில் உருவாக்குங்கள். "
+    "வரி சேமிக்க பிரிவு எண்பது சி முதலீடுகளைப் பயன்படுத்துங்கள்."
+)
+
+class StubState:
+    """Settings and counters shared by all request threads."""
+
+    def __init__(self, settings: Dict):
+        self.settings = dict(DEFAULT_SETTINGS, **settings)
+        self.provider_settings: Dict[str, Dict] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+
+    def settings_for(self, provider: str) -> Dict:
+        """Global settings with any per-provider overrides applied."""
+        with self.lock:
+            return dict(self.settings, **self.provider_settings.get(provider, {}))
+
+    def update(self, changes: Dict):
+        """Apply a /__stub/config update."""
+        with self.lock:
+            for provider, overrides in changes.pop("providers", {}).items():
+                self.provider_settings.setdefault(provider, {}).update(overrides)
+            self.settings.update({key: value for key, value in changes.items() if key in DEFAULT_SETTINGS})
+
+    def count(self, provider: str, outcome: str):
+        with self.lock:
+            counters = self.stats.setdefault(provider, {})
+            counters[outcome] = counters.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {"settings": dict(self.settings), "providers": dict(self.provider_settings),
+                    "stats": {provider: dict(counters) for provider, counters in self.stats.items()}}
+
+def sample_latency(settings: Dict) -> float:
+    """Latency in seconds drawn from the configured distribution."""
+    mean = settings["latency_ms"]
+    spread = settings["jitter_ms"]
+    distribution = settings["latency_distribution"]
+
+    if distribution == "fixed" or spread <= 0:
+        latency = mean
+    elif distribution == "uniform":
+        latency = random.uniform(mean - spread, mean + spread)
+    elif distribution == "lognormal":
+        # Parameterised by the desired mean and stddev of the resulting (long-tailed) distribution
+        variance = spread ** 2
+        sigma2 = math.log(1 + variance / (mean ** 2)) if mean > 0 else 0.0
+        mu = math.log(mean) - sigma2 / 2 if mean > 0 else 0.0
+        latency = random.lognormvariate(mu, sigma2 ** 0.5)
+    else:
+        latency = random.gauss(mean, spread)
+
+    return max(0.0, latency) / 1000
+
+def split_chunks(text: str, count: int) -> List[str]:
+    """Split text into roughly equal word-aligned chunks for streaming."""
+    words = text.split(" ")
+    size = max(1, -(-len(words) // max(1, count)))
+    return [" ".join(words[i:i + size]) + (" " if i + size < len(words) else "") for i in range(0, len(words), size)]
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Routes provider-shaped requests to canned responses after injected latency/faults."""
+
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    ROUTES = [
+        (re.compile(r"^/v1beta/models/(?P<model>[^/:]+):generateContent$"), "gemini", "_gemini"),
+        (re.compile(r"^/v1beta/models/(?P<model>[^/:]+):streamGenerateContent$"), "gemini", "_gemini_stream"),
+        (re.compile(r"^/models/(?P<model>.+)$"), "huggingface", "_huggingface"),
+        (re.compile(r"^/api/chat$"), "ollama", "_ollama_chat"),
+        (re.compile(r"^/api/generate$"), "ollama", "_ollama_generate"),
+        (re.compile(r"^/identity/token$"), "watsonx_iam", "_watsonx_token"),
+        (re.compile(r"^/ml/v1/chat/completions$"), "watsonx", "_watsonx_chat"),
+    ]
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # -- plumbing -------------------------------------------------------------
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        if "json" in self.headers.get("Content-Type", ""):
+            return json.loads(raw or b"{}")
+        return raw.decode("utf-8", "replace")
+
+    def _send_json(self, status: int, body, headers: Optional[Dict] = None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: str):
+        encoded = data.encode("utf-8")
+        self.wfile.write(f"{len(encoded):X}\r\n".encode("ascii") + encoded + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _stream(self, settings: Dict, content_type: str, pieces: List[str]):
+        """Send pieces as a chunked response with the configured inter-chunk delay."""
+        self._start_stream(content_type)
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(settings["stream_chunk_delay_ms"] / 1000)
+            self._write_chunk(piece)
+        self._end_stream()
+
+    def _inject_fault(self, provider: str, settings: Dict) -> bool:
+        """Maybe answer with 429/503 instead of a result. Returns True if a fault was sent."""
+        roll = random.random()
+        retry_headers = {"Retry-After": settings["retry_after"]}
+
+        if roll < settings["rate_429"]:
+            self.state.count(provider, "429")
+            self._send_json(429, {"error": {"code": 429, "message": "Resource has been exhausted (stub)",
+                                            "status": "RESOURCE_EXHAUSTED"}}, retry_headers)
+            return True
+
+        if roll < settings["rate_429"] + settings["rate_503"]:
+            self.state.count(provider, "503")
+            self._send_json(503, {"error": "Model is currently loading (stub)",
+                                  "estimated_time": settings["retry_after"]}, retry_headers)
+            return True
+
+        return False
+
+    # -- routing --------------------------------------------------------------
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/__stub/stats":
+            self._send_json(200, self.state.snapshot())
+        elif self.path.split("?")[0] in ("/", "/api/tags"):
+            self._send_json(200, {"status": "ok", "models": [{"name": "stub"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+
+        if path == "/__stub/config":
+            self.state.update(self._read_body())
+            self._send_json(200, self.state.snapshot())
+            return
+
+        for pattern, provider, handler_name in self.ROUTES:
+            match = pattern.match(path)
+            if not match:
+                continue
+
+            body = self._read_body()
+            settings = self.state.settings_for(provider)
+            time.sleep(sample_latency(settings))
+
+            if provider != "watsonx_iam" and self._inject_fault(provider, settings):
+                return
+
+            self.state.count(provider, "ok")
+            getattr(self, handler_name)(body, settings, query=query, **match.groupdict())
+            return
+
+        self._send_json(404, {"error": f"No stub for {path}"})
+
+    # -- provider shapes ------------------------------------------------------
+
+    @staticmethod
+    def _usage(prompt_text: str, answer: str) -> Tuple[int, int]:
+        return max(1, len(prompt_text) // 4), max(1, len(answer) // 4)
+
+    def _gemini(self, body, settings, query="", model=""):
+        prompt_text = json.dumps(body.get("contents", []), ensure_ascii=False)
+        # Batch translation prompts number their segments; answer every segment in the same format
+        markers = list(dict.fromkeys(re.findall(r"<<<SEG \d+>>>", prompt_text)))
+        answer = "\n".join(f"{marker}\n{STUB_ANSWER}" for marker in markers) if markers else STUB_ANSWER
+        # JSON mode: fill every string property of the requested schema (Tamil text for "tamil" fields)
+        generation_config = body.get("generationConfig", {})
+        if generation_config.get("responseMimeType") == "application/json":
+            properties = generation_config.get("responseSchema", {}).get("properties", {})
+            answer = json.dumps({name: STUB_TAMIL_ANSWER if "tamil" in name else STUB_ANSWER for name in properties},
+                                ensure_ascii=False)
+        prompt_tokens, answer_tokens = self._usage(prompt_text, answer)
+        self._send_json(200, {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": answer}]}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": answer_tokens,
+                              "totalTokenCount": prompt_tokens + answer_tokens},
+            "modelVersion": model
+        })
+
+    def _gemini_stream(self, body, settings, query="", model=""):
+        chunks = [{"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}}]}
+                  for piece in split_chunks(STUB_ANSWER, settings["stream_chunks"])]
+        chunks[-1]["candidates"][0]["finishReason"] = "STOP"
+
+        if "alt=sse" in query:
+            self._stream(settings, "text/event-stream", [f"data: {json.dumps(chunk)}\r\n\r\n" for chunk in chunks])
+        else:
+            # Without alt=sse Gemini streams one JSON array
+            pieces = [("[" if i == 0 else ",") + json.dumps(chunk) for i, chunk in enumerate(chunks)]
+            pieces[-1] += "]"
+            self._stream(settings, "application/json", pieces)
+
+    def _huggingface(self, body, settings, query="", model=""):
+        parameters = body.get("parameters", {}) if isinstance(body, dict) else {}
+        prompt = body.get("inputs", "") if isinstance(body, dict) else ""
+        text = STUB_ANSWER if parameters.get("return_full_text", True) is False else f"{prompt}{STUB_ANSWER}"
+        self._send_json(200, [{"generated_text": text}])
+
+    def _ollama_chat(self, body, settings, query=""):
+        model = body.get("model", "stub")
+        if body.get("stream", True):
+            pieces = [json.dumps({"model": model, "message": {"role": "assistant", "content": piece}, "done": False}) + "\n"
+                      for piece in split_chunks(STUB_ANSWER, settings["stream_chunks"])]
+            pieces.append(json.dumps({"model": model, "message": {"role": "assistant", "content": ""}, "done": True}) + "\n")
+            self._stream(settings, "application/x-ndjson", pieces)
+        else:
+            self._send_json(200, {"model": model, "message": {"role": "assistant", "content": STUB_ANSWER}, "done": True})
+
+    def _ollama_generate(self, body, settings, query=""):
+        model = body.get("model", "stub")
+        if body.get("stream", True):
+            pieces = [json.dumps({"model": model, "response": piece, "done": False}) + "\n"
+                      for piece in split_chunks(STUB_ANSWER, settings["stream_chunks"])]
+            pieces.append(json.dumps({"model": model, "response": "", "done": True}) + "\n")
+            self._stream(settings, "application/x-ndjson", pieces)
+        else:
+            self._send_json(200, {"model": model, "response": STUB_ANSWER, "done": True})
+
+    def _watsonx_token(self, body, settings, query=""):
+        self._send_json(200, {"access_token": "stub-token", "token_type": "Bearer", "expires_in": 3600,
+                              "expiration": int(time.time()) + 3600})
+
+    def _watsonx_chat(self, body, settings, query=""):
+        prompt_tokens, answer_tokens = self._usage(json.dumps(body.get("messages", [])), STUB_ANSWER)
+        self._send_json(200, {
+            "id": "chat-stub",
+            "model_id": body.get("model_id", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": STUB_ANSWER}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": answer_tokens,
+                      "total_tokens": prompt_tokens + answer_tokens}
+        })
+
+def create_server(host: str = "127.0.0.1", port: int = 8090, **settings) -> ThreadingHTTPServer:
+    """Build (but do not start) a stub server; each server gets its own settings and counters."""
+    handler = type("BoundStubRequestHandler", (StubRequestHandler,), {"state": StubState(settings)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Taxora provider stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", dest="latency_distribution", default=DEFAULT_SETTINGS["latency_distribution"],
+                        choices=["fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_SETTINGS["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=DEFAULT_SETTINGS["jitter_ms"])
+    parser.add_argument("--rate-429", type=float, default=DEFAULT_SETTINGS["rate_429"])
+    parser.add_argument("--rate-503", type=float, default=DEFAULT_SETTINGS["rate_503"])
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_SETTINGS["retry_after"])
+    parser.add_argument("--stream-chunks", type=int, default=DEFAULT_SETTINGS["stream_chunks"])
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=DEFAULT_SETTINGS["stream_chunk_delay_ms"])
+    args = vars(parser.parse_args())
+
+    host, port = args.pop("host"), args.pop("port")
+    server = create_server(host, port, **args)
+    logger.info(f"Stub provider server on http://{host}:{port} with {args}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test adaptive (auto) provider routing (runs offline with stubbed provider clients)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import gemini_key_pool
+from ai_provider_manager import AIProviderManager
+from gemini_key_pool import GeminiKeyPool
+from provider_registry import get_provider_registry
+from provider_errors import ProviderTimeoutError
+
+def make_manager():
+    """Manager with granite and gemini available and hedging off."""
+    manager = AIProviderManager()
+    manager.available_providers["gemini"]["status"] = "available"
+    manager.available_providers["huggingface"]["status"] = "not_configured"
+    manager.hedging_enabled = False
+    return manager
+
+def test_auto_prefers_faster_healthy_provider():
+    """Auto mode should route to the lowest EWMA latency provider."""
+    print("🧭 Testing auto routing by latency")
+    print("=" * 50)
+
+    get_provider_registry().generators["granite"] = lambda messages: "granite answer"
+    get_provider_registry().generators["gemini"] = lambda messages: "gemini answer"
+
+    manager = make_manager()
+    assert manager.set_provider("auto")["success"]
+
+    manager.health_tracker.record_success("granite", 3.0)
+    manager.health_tracker.record_success("gemini", 0.8)
+
+    result = manager.generate_response([{"role": "user", "content": "GST rate on rice?"}])
+    assert result["provider"] == "gemini" and result["auto_routed"]
+
+    routing = manager.get_provider_status()["routing"]
+    assert routing["mode"] == "auto" and routing["auto_choice"] == "gemini"
+    print(f"✅ Routed to {result['provider']}, scores: {routing['scores']}")
+
+def test_auto_skips_provider_below_success_floor():
+    """A fast provider that keeps failing should drop out of auto routing."""
+    print("\n📉 Testing success-rate floor")
+    print("=" * 50)
+
+    def failing_gemini(messages):
+        raise ProviderTimeoutError("gemini", "slow")
+
+    get_provider_registry().generators["granite"] = lambda messages: "granite answer"
+    get_provider_registry().generators["gemini"] = failing_gemini
+
+    manager = make_manager()
+    manager.set_provider("auto")
+    manager.health_tracker.record_success("granite", 3.0)
+    manager.health_tracker.record_success("gemini", 0.5)
+
+    for _ in range(2):
+        result = manager.generate_response([{"role": "user", "content": "Hi"}])
+        assert result["provider"] == "granite" and result["fallback_used"]
+
+    scores = manager.get_routing_scores()["scores"]
+    assert not scores["gemini"]["eligible"], scores["gemini"]
+    assert manager.select_auto_provider() == "granite"
+    print(f"✅ Gemini success rate {scores['gemini']['success_rate']} -> routed to granite")
+
+def test_auto_skips_gemini_with_exhausted_key_pool():
+    """Gemini's quota comes from the key pool; with every key used up it is not eligible."""
+    print("\n🔑 Testing pooled Gemini quota in routing")
+    print("=" * 50)
+
+    pool = GeminiKeyPool(["AIzaRoutingTestKeyOne00000", "AIzaRoutingTestKeyTwo00000"], requests_per_minute=2, requests_per_day=100)
+    for limiter in pool.limiters.values():
+        limiter.reset()
+    original_pool = gemini_key_pool._key_pool
+    gemini_key_pool._key_pool = pool
+    try:
+        manager = make_manager()
+        manager.set_provider("auto")
+        manager.health_tracker.record_success("granite", 3.0)
+        manager.health_tracker.record_success("gemini", 0.5)
+
+        assert manager.get_routing_scores()["scores"]["gemini"]["quota_remaining"] == 4
+        assert manager.select_auto_provider() == "gemini"
+
+        for _ in range(4):
+            pool.acquire()
+        scores = manager.get_routing_scores()["scores"]
+        assert scores["gemini"]["quota_remaining"] == 0 and not scores["gemini"]["eligible"], scores["gemini"]
+        assert manager.select_auto_provider() == "granite"
+        print("✅ Exhausted Gemini key pool -> routed to granite")
+    finally:
+        gemini_key_pool._key_pool = original_pool
+
+if __name__ == "__main__":
+    test_auto_prefers_faster_healthy_provider()
+    test_auto_skips_provider_below_success_floor()
+    test_auto_skips_gemini_with_exhausted_key_pool()
+    print("\n🎉 Auto routing tests passed")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test single-call bilingual (English + Tamil) voice replies and their two-call fallback (runs offline)
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+import gemini_client
+import gemini_key_pool
+import translation_cache
+from gemini_key_pool import GeminiKeyPool
+from translation_cache import TranslationCache
+from gemini_client import parse_bilingual_reply
+from stub_provider_server import create_server, STUB_ANSWER, STUB_TAMIL_ANSWER
+
+AUDIO = b"RIFF" + b"\x00" * 64
+
+class StubEnvironment:
+    """Stub provider server plus a throwaway translation cache for one test."""
+
+    def __enter__(self):
+        self.server = create_server("127.0.0.1", 0, latency_distribution="fixed", latency_ms=5)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.directory = tempfile.TemporaryDirectory()
+        gemini_client.GEMINI_API_URL = f"{self.base_url}/v1beta/models"
+        gemini_key_pool._key_pool = GeminiKeyPool(["AIzaStubKeyForOfflineTests000"])
+        translation_cache._translation_cache = TranslationCache(os.path.join(self.directory.name, "cache.db"))
+        return self
+
+    def gemini_calls(self) -> int:
+        counts = requests.get(f"{self.base_url}/__stub/stats").json()["stats"].get("gemini", {})
+        return sum(counts.values())
+
+    def __exit__(self, *exc):
+        translation_cache._translation_cache = None
+        self.server.shutdown()
+        self.directory.cleanup()
+
+def test_parse_bilingual_reply():
+    """Only complete replies with Tamil script in the tamil field are accepted."""
+    print("🧪 Testing bilingual replies")
+    print("=" * 50)
+
+    valid = json.dumps({"english": "Save 20%.", "tamil": "இருபது சதவீதம் சேமிக்கவும்."}, ensure_ascii=False)
+    assert parse_bilingual_reply(valid) == {"english": "Save 20%.", "tamil": "இருபது சதவீதம் சேமிக்கவும்."}
+    assert parse_bilingual_reply(f"```json\n{valid}\n```") is not None
+    assert parse_bilingual_reply('{"english": "Save 20%.", "tamil": "Save 20%."}') is None, "tamil must be Tamil script"
+    assert parse_bilingual_reply('{"english": "", "tamil": "சேமிப்பு"}') is None
+    assert parse_bilingual_reply('{"english": "Save 20%.", "tamil": "சேமி') is None, "truncated JSON"
+    assert parse_bilingual_reply("Save 20% of your income.") is None
+    print("✅ Bilingual reply validation works")
+
+def test_voice_turn_uses_one_generation():
+    """A Tamil voice turn costs STT + one generation, and the Tamil reply is cached."""
+    with StubEnvironment() as stub:
+        result = gemini_client.gemini_voice_chat(AUDIO, [], include_tamil=True)
+        assert result["success"] and result["bilingual_single_call"]
+        assert result["ai_response"] == STUB_ANSWER and result["tamil_response"] == STUB_TAMIL_ANSWER
+        assert stub.gemini_calls() == 2, "speech-to-text plus one bilingual generation"
+        assert translation_cache.get_translation_cache().get(STUB_ANSWER) == STUB_TAMIL_ANSWER
+
+        gemini_client.GEMINI_BILINGUAL_REPLIES = False
+        try:
+            two_call = gemini_client.gemini_voice_chat(AUDIO, [], include_tamil=True)
+        finally:
+            gemini_client.GEMINI_BILINGUAL_REPLIES = True
+        assert not two_call["bilingual_single_call"]
+        # The translation of STUB_ANSWER is now cached, so only STT + generate reach the stub
+        assert stub.gemini_calls() == 4
+        print("✅ Voice turn made one generation for both languages")
+
+def test_fallback_when_reply_does_not_validate():
+    """Plain text is kept as the English answer; malformed JSON is regenerated in English."""
+    original = gemini_client.gemini_generate_response
+    calls = []
+
+    def fake_generate(replies):
+        def generate(messages, **kwargs):
+            calls.append(kwargs.get("response_schema") is not None)
+            return replies.pop(0)
+        return generate
+
+    try:
+        gemini_client.gemini_generate_response = fake_generate(["Save 20% of your income."])
+        reply = gemini_client.gemini_generate_bilingual_response([{"role": "user", "content": "How much to save?"}])
+        assert reply == {"english": "Save 20% of your income.", "tamil": None, "single_call": False}
+        assert calls == [True]
+
+        calls.clear()
+        gemini_client.gemini_generate_response = fake_generate(['{"english": "Save 20', "Save 20% of your income."])
+        reply = gemini_client.gemini_generate_bilingual_response([{"role": "user", "content": "How much to save?"}])
+        assert reply["english"] == "Save 20% of your income." and reply["tamil"] is None
+        assert calls == [True, False]
+    finally:
+        gemini_client.gemini_generate_response = original
+
+    with StubEnvironment() as stub:
+        gemini_client.gemini_generate_response = fake_generate(["Save 20% of your income."])
+        try:
+            result = gemini_client.gemini_voice_chat(AUDIO, [], include_tamil=True)
+        finally:
+            gemini_client.gemini_generate_response = original
+        assert result["success"] and not result["bilingual_single_call"]
+        assert result["tamil_response"] == STUB_ANSWER, "translated by the separate call"
+        assert stub.gemini_calls() == 2, "speech-to-text plus the translation call"
+    print("✅ Invalid bilingual replies fall back to generate + translate")
+
+if __name__ == "__main__":
+    test_parse_bilingual_reply()
+    test_voice_turn_uses_one_generation()
+    test_fallback_when_reply_does_not_validate()
+    print("\n🎉 All bilingual reply tests passed!")
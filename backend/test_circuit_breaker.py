@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test provider circuit breakers and typed fallback (runs offline with stubbed provider clients)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_provider_manager import AIProviderManager
+from provider_registry import get_provider_registry
+from circuit_breaker import CircuitBreaker, CircuitState
+import requests
+import chatgpt_client
+from provider_errors import (
+    ProviderRateLimitError, ProviderQuotaExceededError, ProviderTimeoutError,
+    ProviderAuthError, ProviderAPIError
+)
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body or {}
+        self.headers = headers or {}
+        self.content = b"{}"
+        self.text = str(self.body)
+
+    def json(self):
+        return self.body
+
+def test_breaker_opens_and_recovers():
+    """Breaker should open on error rate, half-open after cooldown and close on a good trial."""
+    print("🔌 Testing circuit breaker state transitions")
+    print("=" * 50)
+
+    breaker = CircuitBreaker("stub", failure_rate_threshold=0.5, minimum_requests=4, cooldown_seconds=0.1)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure(ProviderTimeoutError("stub", "slow"))
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure(ProviderTimeoutError("stub", "slow"))
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.15)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request(), "only one trial request while half-open"
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    print("✅ closed -> open -> half-open -> closed")
+
+def test_open_circuit_routes_to_fallback():
+    """An open circuit should skip the provider without calling it."""
+    print("\n🔀 Testing fallback routing around open circuits")
+    print("=" * 50)
+
+    calls = []
+
+    def failing_gemini(messages):
+        calls.append("gemini")
+        raise ProviderRateLimitError("gemini", "Rate limit exceeded", retry_after=60)
+
+    def working_granite(messages):
+        calls.append("granite")
+        return "Granite answer"
+
+    get_provider_registry().generators["gemini"] = failing_gemini
+    get_provider_registry().generators["granite"] = working_granite
+
+    manager = AIProviderManager()
+    manager.available_providers["gemini"]["status"] = "available"
+    manager.hedging_enabled = False
+    manager.circuit_breakers["gemini"] = CircuitBreaker("gemini", minimum_requests=1, cooldown_seconds=30)
+
+    messages = [{"role": "user", "content": "What is GST?"}]
+    result = manager.generate_response(messages, provider="gemini")
+    assert result["success"] and result["fallback_used"]
+    assert result["fallback_reason"] == "rate_limited"
+    assert calls == ["gemini", "granite"]
+
+    calls.clear()
+    result = manager.generate_response(messages, provider="gemini")
+    assert result["success"] and result["fallback_reason"] == "circuit_open"
+    assert calls == ["granite"], "gemini must not be called while its circuit is open"
+    assert manager.get_provider_status()["circuit_breakers"]["gemini"]["state"] == "open"
+    print(f"✅ Second request skipped gemini: {result['provider_name']}")
+
+def test_chatgpt_raises_typed_errors():
+    """ChatGPT failures raise ProviderError subclasses instead of returning error text."""
+    print("\n🧾 Testing ChatGPT typed errors")
+    print("=" * 50)
+
+    messages = [{"role": "user", "content": "Hi"}]
+    original_key, original_post = chatgpt_client.OPENAI_API_KEY, chatgpt_client.requests.post
+
+    def expect(error_type, response=None, exception=None):
+        def post(*args, **kwargs):
+            if exception:
+                raise exception
+            return response
+        chatgpt_client.requests.post = post
+        try:
+            chatgpt_client.chatgpt_generate_response(messages, max_retries=0)
+            assert False, f"expected {error_type.__name__}"
+        except error_type as e:
+            return e
+
+    try:
+        chatgpt_client.OPENAI_API_KEY = ""
+        expect(ProviderAuthError)
+
+        chatgpt_client.OPENAI_API_KEY = "sk-test-key"
+        chatgpt_client.chatgpt_rate_limiter.reset()
+        assert expect(ProviderAuthError, FakeResponse(401)).status_code == 401
+        expect(ProviderQuotaExceededError, FakeResponse(429, {"error": {"message": "You exceeded your current quota"}}))
+        assert expect(ProviderRateLimitError, FakeResponse(429, headers={"retry-after": "7"})).retry_after == 7
+        assert expect(ProviderAPIError, FakeResponse(503)).status_code == 503
+        expect(ProviderAPIError, FakeResponse(200, {"choices": []}))
+        expect(ProviderTimeoutError, exception=requests.exceptions.Timeout())
+
+        # The client-side limiter rejects with a retry-after as well
+        limiter = chatgpt_client.chatgpt_rate_limiter
+        while limiter.try_acquire()[0]:
+            pass
+        error = expect(ProviderRateLimitError, FakeResponse(200, {"choices": [{"message": {"content": "ok"}}]}))
+        assert error.retry_after and error.retry_after > 0
+        print("✅ ChatGPT errors are typed")
+    finally:
+        chatgpt_client.OPENAI_API_KEY, chatgpt_client.requests.post = original_key, original_post
+        chatgpt_client.chatgpt_rate_limiter.reset()
+
+if __name__ == "__main__":
+    test_breaker_opens_and_recovers()
+    test_open_circuit_routes_to_fallback()
+    test_chatgpt_raises_typed_errors()
+    print("\n🎉 Circuit breaker tests passed")
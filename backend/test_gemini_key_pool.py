@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the Gemini key pool: least-loaded selection, cooldown recovery and pooled capacity (runs offline)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from unittest.mock import patch
+from gemini_key_pool import GeminiKeyPool, load_gemini_keys
+from provider_errors import ProviderRateLimitError
+
+KEYS = ["AIzaTestKeyNumberOne000000", "AIzaTestKeyNumberTwo000000", "AIzaTestKeyNumberThree0000"]
+
+def make_pool(rpm: int = 3) -> GeminiKeyPool:
+    pool = GeminiKeyPool(KEYS, requests_per_minute=rpm, requests_per_day=100)
+    for limiter in pool.limiters.values():
+        limiter.reset()
+    return pool
+
+def test_capacity_is_n_times_quota():
+    """Requests spread evenly and the pool admits N x per-key quota before rejecting."""
+    print("🔑 Testing Gemini key pool")
+    print("=" * 50)
+
+    pool = make_pool(rpm=3)
+    used = [pool.acquire(call_type) for call_type in ["generate", "translate", "stt"] * 3]
+    assert sorted(used.count(key) for key in KEYS) == [3, 3, 3]
+
+    try:
+        pool.acquire("generate")
+        assert False, "pool should be exhausted"
+    except ProviderRateLimitError as e:
+        assert e.retry_after and e.retry_after > 0
+
+    status = pool.get_status()
+    assert status["key_count"] == 3
+    assert status["minute_limit"] == 9
+    assert status["requests_today"] == 9
+    assert sum(key["usage"].get("stt", 0) for key in status["keys"]) == 3
+    print(f"✅ Pool admitted {status['requests_today']} requests across {status['key_count']} keys")
+
+def test_least_loaded_selection():
+    """The key with the most budget left is chosen next."""
+    pool = make_pool(rpm=5)
+    pool.limiters[KEYS[0]].record_request()
+    pool.limiters[KEYS[1]].record_request()
+    assert pool.acquire() == KEYS[2]
+    print("✅ Least-loaded key selected")
+
+def test_cooldown_recovers():
+    """A key rejected with 429 is skipped until its retry-after passes, then used again."""
+    pool = GeminiKeyPool(KEYS[:1], requests_per_minute=50, requests_per_day=100)
+    pool.limiters[KEYS[0]].reset()
+
+    pool.report_rate_limited(KEYS[0], 0.2)
+    assert pool.can_make_request()[0] is False
+    try:
+        pool.acquire()
+        assert False, "cooling key should not be used"
+    except ProviderRateLimitError:
+        pass
+
+    time.sleep(0.25)
+    assert pool.acquire() == KEYS[0]
+    print("✅ Key back in rotation after cooldown")
+
+def test_malformed_key_is_dropped():
+    """A bad entry in GEMINI_API_KEYS is skipped and the valid keys still make up the pool."""
+    env = {"GEMINI_API_KEYS": f"{KEYS[0]}, not-a-gemini-key ,{KEYS[1]}", "GEMINI_API_KEY": KEYS[0],
+           "GEMINI_API_KEY_BACKUP": ""}
+    with patch.dict(os.environ, env):
+        assert load_gemini_keys() == KEYS[:2]
+    print("✅ Malformed key dropped, valid keys kept")
+
+def test_load_order_only_reads():
+    """Picking the least-loaded key reads limiter state; only the chosen key takes a write."""
+    pool = make_pool(rpm=5)
+    store = pool.limiters[KEYS[0]].store
+    with patch.object(store, "update", wraps=store.update) as update:
+        pool.acquire()
+    assert update.call_count == 1, update.call_count
+    print("✅ Key selection took a single write")
+
+if __name__ == "__main__":
+    test_capacity_is_n_times_quota()
+    test_least_loaded_selection()
+    test_cooldown_recovers()
+    test_malformed_key_is_dropped()
+    test_load_order_only_reads()
+    print("\n🎉 All Gemini key pool tests passed!")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test the cached background connectivity probe (runs offline with a stub probe)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from health_monitor import ConnectivityMonitor
+
+def test_probe_waits_for_readiness_and_is_cached():
+    """No probe before the model is ready; afterwards status reads never re-run it."""
+    print("🩺 Testing cached connectivity probe")
+    print("=" * 50)
+
+    probes = []
+    ready = {"value": False}
+
+    def probe():
+        probes.append(time.time())
+        return {"granite_ai": True}
+
+    monitor = ConnectivityMonitor(probe, is_ready=lambda: ready["value"], interval=60)
+    monitor.start()
+
+    time.sleep(0.2)
+    assert not probes and monitor.get_results()["pending"]
+
+    ready["value"] = True
+    deadline = time.time() + 5
+    while not probes and time.time() < deadline:
+        time.sleep(0.05)
+
+    for _ in range(10):
+        results = monitor.get_results()
+    monitor.stop()
+
+    assert len(probes) == 1, probes
+    assert results["granite_ai"] and not results["pending"]
+    print(f"✅ One probe served {10} status reads: {results}")
+
+if __name__ == "__main__":
+    test_probe_waits_for_readiness_and_is_cached()
+    print("\n🎉 Health monitor tests passed")
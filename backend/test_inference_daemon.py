@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test the inference daemon socket protocol (runs offline with a stub model, Unix only)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import granite_client
+import inference_daemon
+from local_inference_worker import LocalInferenceWorker
+from inference_daemon import InferenceDaemonServer, InferenceDaemonClient, _InferenceRequestHandler
+
+def test_daemon_serves_concurrent_clients():
+    """Several clients share the daemon's model; unreachable daemon raises so callers can fall back."""
+    print("🔌 Testing inference daemon")
+    print("=" * 50)
+
+    batches = []
+    def stub_model(prompts):
+        batches.append(len(prompts))
+        return [f"{prompt} advice" for prompt in prompts]
+
+    originals = (granite_client.initialize_local_model, granite_client.get_model_state,
+                 granite_client.get_local_inference_worker)
+    granite_client.initialize_local_model = lambda: True
+    granite_client.get_model_state = lambda: {"state": "ready", "ready": True}
+    worker = LocalInferenceWorker(stub_model, window_ms=50)
+    granite_client.get_local_inference_worker = lambda: worker
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = os.path.join(tmp, "inference.sock")
+            server = InferenceDaemonServer(socket_path, _InferenceRequestHandler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+            client = InferenceDaemonClient(socket_path, timeout=5)
+            assert client.ping()["ready"]
+
+            results = {}
+            def ask(index):
+                results[index] = client.generate(f"Q{index}")
+
+            threads = [threading.Thread(target=ask, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            server.shutdown()
+            server.server_close()
+
+            assert results == {i: f"Q{i} advice" for i in range(4)}, results
+            assert sum(batches) == 4 and len(batches) < 4, batches
+
+            missing = InferenceDaemonClient(os.path.join(tmp, "missing.sock"), timeout=1)
+            assert missing.ping() is None
+            try:
+                missing.generate("Q")
+                raise AssertionError("expected connection failure")
+            except OSError:
+                pass
+    finally:
+        (granite_client.initialize_local_model, granite_client.get_model_state,
+         granite_client.get_local_inference_worker) = originals
+
+    print(f"✅ 4 requests from separate connections ran in batches {batches}")
+
+def sleeper() -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+
+def test_last_worker_stops_daemon():
+    """A worker shutting down leaves the daemon to the others; the last one stops it."""
+    daemon, other_worker = sleeper(), sleeper()
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "inference.sock")
+        with open(f"{socket_path}.pid", "w") as pid_file:
+            pid_file.write(str(daemon.pid))
+        users_dir = f"{socket_path}.users"
+        os.makedirs(users_dir)
+        try:
+            for pid in (os.getpid(), other_worker.pid):
+                open(os.path.join(users_dir, str(pid)), "w").close()
+
+            inference_daemon._registered_socket = socket_path
+            inference_daemon.stop_daemon()
+            assert daemon.poll() is None, "another worker still uses the daemon"
+            assert os.listdir(users_dir) == [str(other_worker.pid)]
+
+            # The other worker died without unregistering; our next shutdown is the last one
+            other_worker.kill()
+            other_worker.wait()
+            open(os.path.join(users_dir, str(os.getpid())), "w").close()
+            inference_daemon._registered_socket = socket_path
+            inference_daemon.stop_daemon()
+            assert daemon.poll() is not None, "last worker stops the daemon"
+            assert os.listdir(users_dir) == []
+        finally:
+            for process in (daemon, other_worker):
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+    print("✅ Daemon outlives all but the last worker")
+
+def test_second_daemon_and_restart():
+    """serve() leaves a live daemon's socket alone; a failed ping triggers a restart."""
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "inference.sock")
+        server = InferenceDaemonServer(socket_path, _InferenceRequestHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            inference_daemon.serve(socket_path)  # returns at once instead of stealing the path
+            assert InferenceDaemonClient(socket_path).ping() is not None
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        restarts = []
+        original = (inference_daemon.start_daemon, granite_client._daemon_client,
+                    granite_client.GRANITE_USE_LOCAL, granite_client.GRANITE_INFERENCE_DAEMON)
+        try:
+            inference_daemon.start_daemon = restarts.append
+            granite_client._daemon_client = InferenceDaemonClient(os.path.join(tmp, "missing.sock"))
+            granite_client.GRANITE_USE_LOCAL, granite_client.GRANITE_INFERENCE_DAEMON = True, True
+            assert granite_client.get_model_state()["state"] == "unavailable"
+            deadline = time.time() + 2
+            while not restarts and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            (inference_daemon.start_daemon, granite_client._daemon_client,
+             granite_client.GRANITE_USE_LOCAL, granite_client.GRANITE_INFERENCE_DAEMON) = original
+        assert restarts == [os.path.join(tmp, "missing.sock")], restarts
+    print("✅ Live daemon kept; unreachable daemon restarted")
+
+if __name__ == "__main__":
+    test_daemon_serves_concurrent_clients()
+    test_last_worker_stops_daemon()
+    test_second_daemon_and_restart()
+    print("\n🎉 Inference daemon tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test batched transaction insights (runs offline with a stub AI generator)
+"""
+
+import sys
+import os
+import re
+import json
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from insight_batcher import TransactionInsightBatcher, parse_json_array
+from business_tracker import BusinessTransaction
+
+def make_transaction(index: int) -> BusinessTransaction:
+    """Create a minimal transaction for testing."""
+    return BusinessTransaction(
+        transaction_id=f"txn_test_{index}", business_id="biz_test", transaction_type="credit",
+        amount=1000.0 + index, description=f"Sale {index}", category="Sales", date="2024-01-15",
+        gst_applicable=True, gst_rate=18.0, gst_amount=180.0, party_name="", party_gst_number="",
+        invoice_number="", created_at="2024-01-15T10:00:00"
+    )
+
+def stub_generator(calls: list):
+    """Stub AI generator that answers with one insight object per transaction in the prompt."""
+    def generate(messages):
+        calls.append(messages)
+        descriptions = re.findall(r"Description: (.+)", messages[0]["content"])
+        items = [{"index": i, "categorization": f"{d.strip()} categorized", "tax_tips": "Claim ITC", "cash_flow_impact": "Positive"} for i, d in enumerate(descriptions)]
+        return {"success": True, "response": f"```json\n{json.dumps(items)}\n```"}
+    return generate
+
+def test_bulk_insights_use_one_call_per_batch():
+    """Bulk submissions should be split into max-size batches."""
+    print("📦 Testing bulk insight batching")
+    print("=" * 50)
+
+    calls = []
+    batcher = TransactionInsightBatcher(generate_fn=stub_generator(calls), window_ms=50, max_batch_size=5)
+    results = batcher.get_insights_bulk("biz_test", [make_transaction(i) for i in range(12)])
+
+    print(f"✅ {len(results)} insights from {len(calls)} AI calls")
+    assert len(results) == 12
+    assert len(calls) == 3
+    assert results[6]["categorization"] == "Sale 6 categorized"
+
+def test_concurrent_requests_are_coalesced():
+    """Concurrent single-transaction requests within the window share one call."""
+    print("\n⏱️ Testing concurrent request coalescing")
+    print("=" * 50)
+
+    calls = []
+    batcher = TransactionInsightBatcher(generate_fn=stub_generator(calls), window_ms=100, max_batch_size=20)
+    results = {}
+
+    def worker(index):
+        results[index] = batcher.get_insights("biz_test", make_transaction(index))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"✅ {len(results)} callers resolved with {len(calls)} AI call(s)")
+    assert len(calls) == 1
+    assert all(results[i]["categorization"] == f"Sale {i} categorized" for i in range(4))
+
+def test_unparseable_response_falls_back():
+    """Callers still get default insights if the AI answer is not a JSON array."""
+    print("\n🛟 Testing fallback on unparseable responses")
+    print("=" * 50)
+
+    batcher = TransactionInsightBatcher(generate_fn=lambda messages: {"success": True, "response": "Sorry, no JSON"}, window_ms=10)
+    result = batcher.get_insights("biz_test", make_transaction(0))
+
+    print(f"✅ Fallback insight: {result['categorization']}")
+    assert result["categorization"] == "Transaction recorded successfully"
+    assert batcher.get_stats()["parse_failures"] == 1
+    assert parse_json_array('{"insights": [{"index": 0}]}') == [{"index": 0}]
+
+def test_all_invalid_rows_report_errors():
+    """A batch where every row fails validation returns the row errors and asks for no insights."""
+    import tempfile
+    import insight_batcher
+    from business_tracker import BusinessTracker
+
+    calls = []
+    original = insight_batcher.get_insight_batcher
+    insight_batcher.get_insight_batcher = lambda: calls.append("bulk")
+    try:
+        tracker = BusinessTracker()
+        with tempfile.TemporaryDirectory() as directory:
+            tracker.data_dir = directory
+            result = tracker.add_transactions("biz_1", [{"amount": 10}, {"transaction_type": "credit"}])
+    finally:
+        insight_batcher.get_insight_batcher = original
+
+    assert result["success"] is False and "error" in result, result
+    assert [error["index"] for error in result["errors"]] == [0, 1]
+    assert calls == []
+    print(f"✅ Invalid batch rejected: {result['error']}")
+
+if __name__ == "__main__":
+    test_bulk_insights_use_one_call_per_batch()
+    test_concurrent_requests_are_coalesced()
+    test_unparseable_response_falls_back()
+    test_all_invalid_rows_report_errors()
+    print("\n🎉 Insight batching tests complete!")
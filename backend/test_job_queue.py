@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Test the durable background job queue and the /jobs endpoints (runs offline)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+import main
+import job_queue
+import upload_store
+from job_queue import JobContext, JobQueue, JobQueueDisabledError, register_job_handler
+from upload_store import UploadStore
+
+release = threading.Event()
+
+@register_job_handler("test_sum")
+def sum_handler(params, job):
+    job.update_progress(0.5, "halfway")
+    return {"total": sum(params["numbers"])}
+
+@register_job_handler("test_fail")
+def fail_handler(params, job):
+    raise RuntimeError("bad input")
+
+@register_job_handler("test_wait")
+def wait_handler(params, job):
+    """Reports progress until released or cancelled."""
+    steps = 0
+    while not release.is_set():
+        steps += 1
+        job.update_progress(min(0.9, steps / 100))
+        time.sleep(0.02)
+    return {"steps": steps}
+
+def wait_for(queue, job_id, statuses=("succeeded", "failed", "cancelled"), timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {queue.get(job_id)['status']}")
+
+def make_queue(directory, **kwargs):
+    return JobQueue(os.path.join(directory, "jobs.db"), workers=2, **kwargs)
+
+def test_jobs_run_to_completion():
+    print("🧪 Testing job queue")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = make_queue(directory)
+        queue.start()
+        try:
+            done = wait_for(queue, queue.submit("test_sum", {"numbers": [1, 2, 3]})["job_id"])
+            assert done["status"] == "succeeded" and done["result"] == {"total": 6}
+            assert done["progress"] == 1.0 and done["message"] == "halfway" and done["attempts"] == 1
+
+            failed = wait_for(queue, queue.submit("test_fail")["job_id"])
+            assert failed["status"] == "failed" and failed["error"] == "bad input"
+
+            try:
+                queue.submit("no_such_job")
+                assert False, "expected ValueError"
+            except ValueError:
+                pass
+            print("✅ Jobs report result, progress and errors")
+        finally:
+            queue.stop()
+
+def test_cancellation():
+    """Queued jobs cancel at once; running jobs stop at their next progress update."""
+    release.clear()
+    with tempfile.TemporaryDirectory() as directory:
+        queue = make_queue(directory)
+        queued = queue.submit("test_wait")
+        assert queue.cancel(queued["job_id"])["status"] == "cancelled"
+
+        queue.start()
+        try:
+            running = queue.submit("test_wait")
+            wait_for(queue, running["job_id"], statuses=("running",))
+            time.sleep(0.1)
+            assert queue.cancel(running["job_id"])["cancel_requested"]
+            assert wait_for(queue, running["job_id"])["status"] == "cancelled"
+            assert queue.get(queued["job_id"])["attempts"] == 0, "cancelled before it ever ran"
+            print("✅ Queued and running jobs can be cancelled")
+        finally:
+            queue.stop()
+
+def test_jobs_survive_restart():
+    """Queued jobs persist across processes; a job whose worker died is resumed after its lease."""
+    release.set()
+    with tempfile.TemporaryDirectory() as directory:
+        crashed = make_queue(directory, lease_seconds=0.3)
+        waiting = crashed.submit("test_sum", {"numbers": [5, 5]})
+        orphan = crashed.submit("test_wait")
+        assert crashed._claim()["id"] == waiting["job_id"]  # claimed, then the "process" dies
+
+        restarted = make_queue(directory, lease_seconds=0.3)
+        restarted.start()
+        try:
+            assert wait_for(restarted, orphan["job_id"])["status"] == "succeeded"
+            resumed = wait_for(restarted, waiting["job_id"])
+            assert resumed["status"] == "succeeded" and resumed["result"] == {"total": 10}
+            assert resumed["attempts"] == 2
+            print("✅ Jobs resumed after a restart")
+        finally:
+            restarted.stop()
+
+def test_resumed_import_skips_committed_batches():
+    """A transaction import resumed after a crash continues from its checkpoint."""
+    calls = []
+    original = main.business_tracker.add_transactions
+
+    def add_transactions(business_id, batch, index_offset=0, id_prefix=None):
+        calls.append(index_offset)
+        if len(calls) == 2:
+            raise SystemExit("worker process died")  # after the first batch was checkpointed
+        return {"success": True, "errors": [],
+                "transactions": [{"transaction_id": f"txn_{index_offset + i}"} for i in range(len(batch))]}
+
+    transactions = [{"transaction_type": "credit", "amount": 10}] * 250
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            main.business_tracker.add_transactions = add_transactions
+            crashed = make_queue(directory, lease_seconds=0.3)
+            job = crashed.submit("business_transactions", {"business_id": "b1", "transactions": transactions})
+            row = crashed._claim()
+            try:
+                main.run_business_transactions({"business_id": "b1", "transactions": transactions}, JobContext(crashed, row["id"]))
+                assert False, "expected the simulated crash"
+            except SystemExit:
+                pass
+
+            restarted = make_queue(directory, lease_seconds=0.3)
+            restarted.start()
+            try:
+                done = wait_for(restarted, job["job_id"])
+            finally:
+                restarted.stop()
+        finally:
+            main.business_tracker.add_transactions = original
+
+    assert done["status"] == "succeeded" and done["attempts"] == 2, done
+    assert calls == [0, 100, 100, 200], calls
+    assert done["result"]["transaction_ids"] == [f"txn_{i}" for i in range(250)]
+    print("✅ Resumed import skipped the batch it had already committed")
+
+def test_crash_mid_batch_adds_no_duplicates():
+    """Rows a dead worker saved from an unfinished batch are recognized, not added again, on resume."""
+    import insight_batcher
+    tracker = main.business_tracker
+    original_dir, original_save = tracker.data_dir, tracker._save_transaction
+    original_bulk = insight_batcher.TransactionInsightBatcher.get_insights_bulk
+    saves = []
+
+    def save_transaction(transaction):
+        if len(saves) == 150:
+            raise SystemExit("worker process died")  # halfway through the second batch
+        saves.append(transaction.transaction_id)
+        original_save(transaction)
+
+    transactions = [{"transaction_type": "expense", "amount": 10, "description": f"row {i}"} for i in range(250)]
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            tracker.data_dir = directory
+            tracker._save_transaction = save_transaction
+            insight_batcher.TransactionInsightBatcher.get_insights_bulk = lambda self, business_id, items: [{} for _ in items]
+
+            crashed = make_queue(directory, lease_seconds=0.3)
+            job = crashed.submit("business_transactions", {"business_id": "b1", "transactions": transactions})
+            row = crashed._claim()
+            try:
+                main.run_business_transactions({"business_id": "b1", "transactions": transactions}, JobContext(crashed, row["id"]))
+                assert False, "expected the simulated crash"
+            except SystemExit:
+                pass
+            saves.append("restarted")
+
+            restarted = make_queue(directory, lease_seconds=0.3)
+            restarted.start()
+            try:
+                done = wait_for(restarted, job["job_id"])
+            finally:
+                restarted.stop()
+            stored = [t.transaction_id for t in tracker._load_business_transactions("b1")]
+        finally:
+            tracker.data_dir, tracker._save_transaction = original_dir, original_save
+            insight_batcher.TransactionInsightBatcher.get_insights_bulk = original_bulk
+
+    assert done["status"] == "succeeded", done
+    assert len(stored) == 250 and len(set(stored)) == 250, len(stored)
+    assert done["result"]["added_count"] == 250 and done["result"]["transaction_ids"] == stored
+    assert len(saves) == 251, "only the unsaved rows were written after the restart"
+    print("✅ Crash mid-batch left no duplicate transactions")
+
+def test_disabled_queue_rejects_jobs():
+    """With the queue off, POST /jobs answers 503 and background=true runs inline."""
+    original_queue, original_enabled = job_queue._job_queue, main.JOB_QUEUE_ENABLED
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            job_queue._job_queue = make_queue(directory, enabled=False)
+            main.JOB_QUEUE_ENABLED = False
+            try:
+                job_queue._job_queue.submit("test_sum", {"numbers": [1]})
+                assert False, "expected JobQueueDisabledError"
+            except JobQueueDisabledError:
+                pass
+
+            client = TestClient(main.app)
+            assert client.post("/jobs", json={"type": "test_sum", "params": {"numbers": [1]}}).status_code == 503
+            inline = client.get("/savings/notifications/nobody?background=true")
+            assert inline.status_code == 200 and inline.json()["count"] == 0
+            assert job_queue._job_queue.list_jobs() == []
+            print("✅ Disabled queue refuses jobs and background requests run inline")
+        finally:
+            job_queue._job_queue, main.JOB_QUEUE_ENABLED = original_queue, original_enabled
+
+def test_job_endpoints():
+    """POST /jobs, GET /jobs/{id}, cancel, and /upload opting into the queue."""
+    original_queue, original_store, original_manager = job_queue._job_queue, upload_store._upload_store, main.get_ai_manager
+
+    class FakeAIManager:
+        def generate_response(self, messages):
+            return {"success": True, "response": "Background analysis"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            job_queue._job_queue = make_queue(directory)
+            job_queue._job_queue.start()
+            upload_store._upload_store = UploadStore(os.path.join(directory, "uploads"))
+            main.get_ai_manager = lambda: FakeAIManager()
+            client = TestClient(main.app)
+
+            created = client.post("/jobs", json={"type": "test_sum", "params": {"numbers": [2, 3]}})
+            assert created.status_code == 202
+            job_id = created.json()["job"]["job_id"]
+            assert created.json()["status_url"] == f"/jobs/{job_id}"
+            wait_for(job_queue._job_queue, job_id)
+            status = client.get(f"/jobs/{job_id}").json()
+            assert status["job"]["status"] == "succeeded" and status["job"]["result"] == {"total": 5}
+
+            assert client.post("/jobs", json={"type": "rm -rf"}).status_code == 400
+            assert client.get("/jobs/missing").status_code == 404
+            assert client.post(f"/jobs/{job_id}/cancel").status_code == 409
+            assert client.get("/jobs").json()["stats"]["counts"]["succeeded"] == 1
+
+            uploaded = client.post("/upload?background=true", files={"file": ("statement.csv", b"a,b\n1,2\n", "text/csv")})
+            assert uploaded.status_code == 202
+            job = wait_for(job_queue._job_queue, uploaded.json()["job"]["job_id"])
+            assert job["result"]["message"] == "Background analysis"
+
+            # Once analysed, the same content is answered inline from the cache
+            again = client.post("/upload?background=true", files={"file": ("copy.csv", b"a,b\n1,2\n", "text/csv")})
+            assert again.status_code == 200 and again.json()["cached_analysis"]
+            print("✅ Job endpoints and background uploads work")
+        finally:
+            job_queue._job_queue.stop()
+            job_queue._job_queue, upload_store._upload_store, main.get_ai_manager = original_queue, original_store, original_manager
+
+if __name__ == "__main__":
+    test_jobs_run_to_completion()
+    test_cancellation()
+    test_jobs_survive_restart()
+    test_resumed_import_skips_committed_batches()
+    test_crash_mid_batch_adds_no_duplicates()
+    test_disabled_queue_rejects_jobs()
+    test_job_endpoints()
+    print("\n🎉 All job queue tests passed!")
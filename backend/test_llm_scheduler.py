@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test LLM request scheduling: priority order and per-provider bulkheads (runs offline)
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from llm_scheduler import LLMScheduler, ProviderBulkhead, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+from provider_errors import ProviderQueueTimeoutError
+
+def test_interactive_jumps_batch_queue():
+    """With the provider saturated, a queued interactive request is served before earlier batch ones."""
+    print("🚦 Testing priority ordering")
+    print("=" * 50)
+
+    scheduler = LLMScheduler(queue_timeout=5)
+    scheduler.bulkheads["stub"] = ProviderBulkhead("stub", max_concurrency=1, reserved_interactive=0)
+    order = []
+    release_first = threading.Event()
+
+    def hold():
+        with scheduler.slot("stub", PRIORITY_BATCH):
+            release_first.wait(5)
+
+    def run(name, priority):
+        with scheduler.slot("stub", priority):
+            order.append(name)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.05)
+
+    threads = [threading.Thread(target=run, args=(f"batch-{i}", PRIORITY_BATCH)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    interactive = threading.Thread(target=run, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.05)
+
+    release_first.set()
+    for thread in threads + [interactive, holder]:
+        thread.join()
+
+    assert order[0] == "interactive", order
+    assert order[1:] == ["batch-0", "batch-1", "batch-2"], order
+    print(f"✅ Served in order: {order}")
+
+def test_reserved_slot_and_queue_timeout():
+    """Batch work cannot take the reserved interactive slot and times out instead."""
+    print("\n🧱 Testing bulkhead reservation")
+    print("=" * 50)
+
+    scheduler = LLMScheduler(queue_timeout=0.1)
+    scheduler.bulkheads["stub"] = ProviderBulkhead("stub", max_concurrency=2, reserved_interactive=1)
+
+    with scheduler.slot("stub", PRIORITY_BATCH):
+        try:
+            with scheduler.slot("stub", PRIORITY_BATCH):
+                raise AssertionError("second batch request should not get the reserved slot")
+        except ProviderQueueTimeoutError:
+            pass
+
+        with scheduler.slot("stub", PRIORITY_INTERACTIVE):
+            status = scheduler.get_stats()["providers"]["stub"]
+            assert status["in_flight"] == 2
+
+    stats = scheduler.get_stats()
+    assert stats["priorities"]["batch"]["queue_timeouts"] == 1
+    assert "stub:batch" in stats["queue_time"]
+    print(f"✅ Queue stats: {stats['priorities']}")
+
+def test_ai_endpoints_wait_off_the_event_loop():
+    """Async endpoints whose handlers reach the AI manager run them in the threadpool,
+    so a bulkhead wait cannot stall the server."""
+    from fastapi.testclient import TestClient
+    import main
+
+    on_loop = []
+
+    def record(*args):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return {"success": True}
+
+    patched = [(main.business_tracker, "get_gst_summary"), (main.business_tracker, "get_business_analytics"),
+               (main.business_tracker, "get_tax_reminders"), (main.savings_planner, "get_savings_analysis")]
+    originals = [getattr(owner, name) for owner, name in patched]
+    try:
+        for owner, name in patched:
+            setattr(owner, name, record)
+        client = TestClient(main.app)
+        for path in ("/business/gst/b1/04/2024", "/business/analytics/b1", "/business/tax-reminders/b1", "/savings/analysis/g1"):
+            assert client.get(path).status_code == 200, path
+    finally:
+        for (owner, name), original in zip(patched, originals):
+            setattr(owner, name, original)
+
+    assert on_loop == [False] * 4, on_loop
+    print("✅ AI-backed endpoints run in the threadpool")
+
+if __name__ == "__main__":
+    test_interactive_jumps_batch_queue()
+    test_reserved_slot_and_queue_timeout()
+    test_ai_endpoints_wait_off_the_event_loop()
+    print("\n🎉 Scheduler tests passed")
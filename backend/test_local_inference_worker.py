@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test micro-batching in the local inference worker (runs offline with a stub model)
+"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from local_inference_worker import LocalInferenceWorker, GRANITE_BATCH_MAX_SIZE
+from ai_provider_manager import AIProviderManager
+from provider_registry import get_provider_registry
+from llm_scheduler import LLMScheduler, PRIORITY_BACKGROUND
+
+def test_concurrent_prompts_share_a_batch():
+    """Prompts submitted together should run in one batch and each caller gets its own output."""
+    print("🧮 Testing local micro-batching")
+    print("=" * 50)
+
+    batches = []
+
+    def stub_model(prompts):
+        batches.append(list(prompts))
+        return [f"{prompt} -> advice" for prompt in prompts]
+
+    worker = LocalInferenceWorker(stub_model, window_ms=50, max_batch_size=8)
+
+    results = {}
+    def ask(index):
+        results[index] = worker.generate(f"Question {index}", timeout=5)
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(results[i] == f"Question {i} -> advice" for i in range(6)), results
+    assert len(batches) < 6, f"expected batching, got {len(batches)} batches"
+
+    stats = worker.get_stats()
+    assert stats["batch_size"]["count"] == len(batches)
+    assert stats["queue_latency_ms"]["count"] == 6
+    print(f"✅ 6 prompts ran in {len(batches)} batch(es): {stats['batch_size']['buckets']}")
+
+def test_batch_failure_reaches_every_caller():
+    """If the model raises, every waiting caller sees the error."""
+    print("\n💥 Testing batch failure propagation")
+    print("=" * 50)
+
+    def broken_model(prompts):
+        raise RuntimeError("model crashed")
+
+    worker = LocalInferenceWorker(broken_model, window_ms=20)
+    futures = [worker.submit(f"Q{i}") for i in range(3)]
+    for future in futures:
+        try:
+            future.result(timeout=5)
+            raise AssertionError("expected failure")
+        except RuntimeError as e:
+            assert "model crashed" in str(e)
+    print("✅ All callers received the error")
+
+def test_timed_out_prompt_is_not_batched():
+    """A caller that timed out while queued is dropped from the next batch."""
+    print("\n⏱️ Testing timed-out prompts")
+    print("=" * 50)
+
+    batches = []
+    busy = threading.Event()
+
+    def slow_model(prompts):
+        batches.append(list(prompts))
+        busy.wait(5)
+        return [f"{prompt} -> advice" for prompt in prompts]
+
+    worker = LocalInferenceWorker(slow_model, window_ms=20)
+    first = worker.submit("first")
+    while not batches:
+        time.sleep(0.01)
+
+    # Queued behind the running batch until the caller gives up
+    try:
+        worker.generate("gave up", timeout=0.1)
+        raise AssertionError("expected a timeout")
+    except FutureTimeoutError:
+        pass
+    last = worker.submit("last")
+    busy.set()
+
+    assert first.result(timeout=5) == "first -> advice" and last.result(timeout=5) == "last -> advice"
+    assert batches == [["first"], ["last"]], batches
+    assert worker.get_stats()["skipped_cancelled"] == 1
+    print("✅ Timed-out prompt skipped")
+
+def test_manager_calls_fill_one_batch():
+    """Concurrent Granite calls through the manager all pass the bulkhead and land in one batch."""
+    print("\n📦 Testing batching behind the provider bulkhead")
+    print("=" * 50)
+
+    batches = []
+
+    def stub_model(prompts):
+        batches.append(list(prompts))
+        return [f"{prompt} -> advice" for prompt in prompts]
+
+    worker = LocalInferenceWorker(stub_model, window_ms=300, max_batch_size=GRANITE_BATCH_MAX_SIZE)
+    get_provider_registry().generators["granite"] = lambda messages: worker.generate(messages[-1]["content"], timeout=5)
+
+    manager = AIProviderManager()
+    manager.hedging_enabled = False
+    manager.scheduler = LLMScheduler(queue_timeout=5)
+
+    results = {}
+    def ask(index):
+        messages = [{"role": "user", "content": f"Question {index}"}]
+        results[index] = manager.generate_response(messages, provider="granite", priority=PRIORITY_BACKGROUND)
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(GRANITE_BATCH_MAX_SIZE)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result["provider"] == "granite" for result in results.values()), results
+    assert [len(batch) for batch in batches] == [GRANITE_BATCH_MAX_SIZE], batches
+    print(f"✅ {GRANITE_BATCH_MAX_SIZE} background calls ran as one batch")
+
+if __name__ == "__main__":
+    test_concurrent_prompts_share_a_batch()
+    test_batch_failure_reaches_every_caller()
+    test_timed_out_prompt_is_not_batched()
+    test_manager_calls_fill_one_batch()
+    print("\n🎉 Local inference worker tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test token-budgeted prompt assembly and rolling summaries (runs offline)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from prompt_assembler import PromptAssembler, count_message_tokens, register_token_counter, count_tokens
+from gemini_client import format_messages_for_gemini, build_system_instruction
+
+def make_session(turns: int) -> dict:
+    """A session with a persona message and the given number of user/assistant turns."""
+    history = [{"role": "system", "content": "You are Taxora."}]
+    for i in range(turns):
+        history.append({"role": "user", "content": f"Question {i} about saving tax. " + "detail " * 40})
+        history.append({"role": "assistant", "content": f"Answer {i} on section 80C. " + "advice " * 60})
+    return {"history": history}
+
+def test_history_stays_within_budget():
+    """Long conversations are trimmed to the budget and the dropped turns summarized."""
+    print("🧮 Testing prompt budget")
+    print("=" * 50)
+
+    assembler = PromptAssembler(history_budget=600, summary_budget=200)
+    session = make_session(12)
+    messages = assembler.assemble(session, "System prompt", "What about 80D?", "gemini")
+
+    assert messages[0]["role"] == "system"
+    assert sum(1 for m in messages if m["role"] == "system") == 1
+    assert messages[1]["role"] == "user"
+    assert messages[-1] == {"role": "user", "content": "What about 80D?"}
+    assert count_message_tokens(messages[1:], "gemini") <= 600
+    assert "Earlier in this conversation:" in messages[0]["content"]
+    assert "Advisor said: Answer 9 on section 80C." in messages[0]["content"]
+
+    stats = session["last_prompt_stats"]
+    print(f"  estimated tokens: {stats['estimated_tokens']}, sent: {stats['history_messages_sent']}, "
+          f"summarized: {stats['summarized_messages']}")
+    assert stats["summarized_messages"] + stats["history_messages_sent"] == 24
+    print("✅ History trimmed and summarized")
+
+def test_summary_is_incremental_and_bounded():
+    """Each turn only folds newly dropped messages; the summary never exceeds its budget."""
+    assembler = PromptAssembler(history_budget=400, summary_budget=60)
+    session = make_session(3)
+    assembler.assemble(session, "System prompt", "next", "gemini")
+    first_count = session["summarized_count"]
+
+    for i in range(10):
+        session["history"].append({"role": "user", "content": f"Follow-up {i}. " + "more " * 40})
+        session["history"].append({"role": "assistant", "content": f"Reply {i}. " + "words " * 60})
+        assembler.assemble(session, "System prompt", "next", "gemini")
+
+    assert session["summarized_count"] > first_count
+    assert count_tokens("\n".join(session["summary_lines"]), "gemini") <= 60
+    assert session["summary_lines"][-1].startswith("- ")
+    print("✅ Summary grows incrementally and stays bounded")
+
+def test_short_conversation_untouched():
+    """A short conversation is sent whole with no summary; the stored persona joins the system prompt."""
+    session = make_session(2)
+    messages = PromptAssembler().assemble(session, "System prompt", "Hi", "granite")
+    assert messages[0]["content"] == "System prompt\n\nYou are Taxora."
+    assert sum(1 for m in messages if m["role"] == "system") == 1
+    assert len(messages) == 6
+    assert "summary_lines" not in session
+    print("✅ Short conversation sent unchanged")
+
+def test_registered_token_counter():
+    """A registered tokenizer replaces the estimate for its provider."""
+    register_token_counter("test-provider", lambda text: len(text.split()))
+    assert count_tokens("one two three", "test-provider") == 3
+    print("✅ Provider token counter used")
+
+def test_local_model_registers_its_tokenizer():
+    """Loading the local model makes Granite budgets use its tokenizer."""
+    import granite_client
+    import prompt_assembler
+
+    class FakeTokenizer:
+        def encode(self, text):
+            return list(text)
+
+    class FakePipeline:
+        tokenizer = FakeTokenizer()
+
+    original = (granite_client._pipeline, granite_client.create_local_pipeline, granite_client._model_state)
+    try:
+        granite_client._pipeline = None
+        granite_client.create_local_pipeline = lambda runtime: FakePipeline()
+        assert granite_client.initialize_local_model()
+        assert count_tokens("abc de", "granite") == 6
+    finally:
+        granite_client._pipeline, granite_client.create_local_pipeline, granite_client._model_state = original
+        prompt_assembler._token_counters.pop("granite", None)
+    print("✅ Local tokenizer registered for Granite")
+
+def test_gemini_system_instruction():
+    """Gemini gets the system prompt in systemInstruction, not inside the first user turn."""
+    messages = [
+        {"role": "system", "content": "Persona prompt"},
+        {"role": "user", "content": "Hello"},
+        {"role": "assistant", "content": "Hi there"}
+    ]
+    contents = format_messages_for_gemini(messages)
+    assert [c["role"] for c in contents] == ["user", "model"]
+    assert contents[0]["parts"][0]["text"] == "Hello"
+    assert build_system_instruction(messages)["parts"][0]["text"] == "Persona prompt"
+    assert "financial advisor" in build_system_instruction(messages[1:])["parts"][0]["text"]
+    print("✅ Gemini system instruction separated")
+
+if __name__ == "__main__":
+    test_history_stays_within_budget()
+    test_summary_is_incremental_and_bounded()
+    test_short_conversation_untouched()
+    test_registered_token_counter()
+    test_local_model_registers_its_tokenizer()
+    test_gemini_system_instruction()
+    print("\n🎉 All prompt assembler tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test the lazy provider registry (runs offline; checks which client modules get imported)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import ibm_clients
+from ai_provider_manager import AIProviderManager
+from provider_registry import ProviderRegistry, ProviderSpec, PROVIDER_SPECS, get_provider_registry
+from provider_errors import ProviderAuthError, ProviderRateLimitError, ProviderConnectionError, ProviderAPIError
+from request_deadline import deadline_scope
+from stub_provider_server import create_server, STUB_ANSWER
+
+def test_every_client_is_registered():
+    """All client modules are reachable by entry name and their functions exist."""
+    print("🧩 Testing provider registry")
+    print("=" * 50)
+
+    names = [spec.name for spec in PROVIDER_SPECS]
+    for expected in ["granite", "gemini", "huggingface", "claude", "chatgpt", "openrouter", "grok", "perplexity", "watsonx"]:
+        assert expected in names, expected
+
+    registry = ProviderRegistry(PROVIDER_SPECS)
+    for spec in PROVIDER_SPECS:
+        module = registry.load(spec.name)
+        for attribute in (spec.generate, spec.validate, spec.test):
+            assert callable(getattr(module, attribute)), f"{spec.module}.{attribute}"
+    print(f"✅ {len(names)} providers resolve to real client functions")
+
+def test_modules_load_on_first_use():
+    """Nothing is imported until the provider is used; configuration is judged from env only."""
+    spec = ProviderSpec("stub", "Stub", "Stub provider", "json", "dumps", "dumps", "dumps",
+                        required_env=("TAXORA_STUB_KEY|TAXORA_STUB_KEYS",))
+    registry = ProviderRegistry([spec])
+
+    os.environ.pop("TAXORA_STUB_KEY", None)
+    os.environ.pop("TAXORA_STUB_KEYS", None)
+    assert not registry.is_configured("stub")
+    os.environ["TAXORA_STUB_KEYS"] = "a,b"
+    assert registry.is_configured("stub")
+
+    assert not registry.is_loaded("stub")
+    assert registry.call_if_loaded("stub", "dumps", default="not loaded") == "not loaded"
+    assert registry.generate("stub", ["hi"]) == '["hi"]'
+    assert registry.is_loaded("stub")
+    assert registry.get_status()["stub"]["import_seconds"] is not None
+    print("✅ Client module imported on first call only")
+
+def test_watsonx_raises_typed_errors():
+    """watsonx failures raise ProviderError subclasses, so the manager falls back instead of answering with them."""
+    server = create_server("127.0.0.1", 0, latency_distribution="fixed", latency_ms=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    original = (ibm_clients.WATSONX_APIKEY, ibm_clients.WATSONX_URL, ibm_clients.WATSONX_PROJECT_ID, ibm_clients.WATSONX_IAM_URL)
+    messages = [{"role": "user", "content": "What is GST?"}]
+
+    def expect(error_type):
+        try:
+            ibm_clients.watsonx_chat(messages)
+            assert False, f"expected {error_type.__name__}"
+        except error_type as e:
+            return e
+
+    try:
+        ibm_clients.WATSONX_APIKEY, ibm_clients.WATSONX_URL, ibm_clients.WATSONX_PROJECT_ID = None, None, None
+        expect(ProviderAuthError)
+
+        ibm_clients.WATSONX_APIKEY, ibm_clients.WATSONX_PROJECT_ID = "stub-key", "stub-project"
+        ibm_clients.WATSONX_IAM_URL = f"{base_url}/identity/token"
+        ibm_clients.WATSONX_URL = base_url
+        assert ibm_clients.watsonx_chat(messages) == STUB_ANSWER
+
+        # Faults only on the chat endpoint; the IAM token endpoint keeps working
+        state = server.RequestHandlerClass.state
+        state.update({"providers": {"watsonx": {"rate_429": 1.0, "retry_after": 30}}})
+        with deadline_scope(5):  # a 30s retry-after does not fit, so no retry wait
+            assert expect(ProviderRateLimitError).retry_after == 30
+        state.update({"providers": {"watsonx": {"rate_429": 0.0, "rate_503": 1.0, "retry_after": 0}}})
+        assert expect(ProviderAPIError).status_code == 503
+        state.update({"providers": {"watsonx": {"rate_503": 0.0}}})
+
+        ibm_clients.WATSONX_URL = "http://127.0.0.1:9"  # nothing listens here
+        expect(ProviderConnectionError)
+
+        get_provider_registry().generators["granite"] = lambda messages: "granite answer"
+        get_provider_registry().generators.pop("watsonx", None)
+        manager = AIProviderManager()
+        manager.available_providers["watsonx"]["status"] = "available"
+        manager.hedging_enabled = False
+        result = manager.generate_response(messages, provider="watsonx")
+        assert result["provider"] == "granite" and result["fallback_used"]
+        assert result["fallback_reason"] == "connection_error"
+        assert manager.health_tracker.get("watsonx")["ewma_error_rate"] > 0
+        print("✅ watsonx errors are typed and trigger fallback")
+    finally:
+        ibm_clients.WATSONX_APIKEY, ibm_clients.WATSONX_URL, ibm_clients.WATSONX_PROJECT_ID, ibm_clients.WATSONX_IAM_URL = original
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_modules_load_on_first_use()
+    test_every_client_is_registered()
+    test_watsonx_raises_typed_errors()
+    print("\n🎉 All provider registry tests passed!")
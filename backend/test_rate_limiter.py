@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the GCRA rate limiter (runs offline, uses a temporary SQLite file for the shared store)
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import tempfile
+import multiprocessing
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rate_limiter import RateLimiter, SQLiteRateLimitStore
+
+def test_minute_and_daily_limits():
+    """Burst up to the per-minute limit, then reject with a retry hint; daily cap applies too."""
+    print("⏱️ Testing GCRA limits")
+    print("=" * 50)
+
+    limiter = RateLimiter("test_minute", requests_per_minute=5, requests_per_day=100)
+    for _ in range(5):
+        allowed, _, _ = limiter.try_acquire()
+        assert allowed
+
+    allowed, message, retry_after = limiter.try_acquire()
+    assert not allowed and 0 < retry_after <= 12, (message, retry_after)
+    assert limiter.can_make_request()[0] is False
+
+    status = limiter.get_status()
+    assert status["requests_last_minute"] == 5 and status["minute_remaining"] == 0
+    assert status["requests_today"] == 5 and status["daily_remaining"] == 95
+
+    daily = RateLimiter("test_daily", requests_per_minute=100, requests_per_day=2)
+    assert daily.try_acquire()[0] and daily.try_acquire()[0]
+    allowed, message, _ = daily.try_acquire()
+    assert not allowed and "Daily quota" in message
+
+    daily.reset()
+    assert daily.try_acquire()[0]
+    print(f"✅ Rejected with: {message}")
+
+def _worker(db_path, attempts, results):
+    limiter = RateLimiter("shared", requests_per_minute=10, store=SQLiteRateLimitStore(db_path))
+    results.put(sum(1 for _ in range(attempts) if limiter.try_acquire()[0]))
+
+def test_sqlite_store_shared_across_processes():
+    """Several processes drawing from one SQLite-backed bucket must not exceed its burst."""
+    print("\n🗄️ Testing shared SQLite limiter state")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "rate_limits.db")
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_worker, args=(db_path, 10, results)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        granted = sum(results.get() for _ in processes)
+        assert granted == 10, granted
+        print(f"✅ 4 processes x 10 attempts -> {granted} granted")
+
+def test_status_reads_do_not_wait_for_writers():
+    """Status and can_make_request are plain reads: another worker's open write lock does not block them."""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "limits.db")
+        limiter = RateLimiter("stub", requests_per_minute=5, store=SQLiteRateLimitStore(db_path))
+        limiter.try_acquire()
+
+        other_worker = sqlite3.connect(db_path, isolation_level=None)
+        other_worker.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.monotonic()
+            assert limiter.get_status()["minute_remaining"] == 4
+            assert limiter.can_make_request()[0]
+            assert time.monotonic() - start < 1.0
+        finally:
+            other_worker.execute("ROLLBACK")
+            other_worker.close()
+        print("✅ Status reads skip the write lock")
+
+if __name__ == "__main__":
+    test_minute_and_daily_limits()
+    test_sqlite_store_shared_across_processes()
+    test_status_reads_do_not_wait_for_writers()
+    print("\n🎉 Rate limiter tests passed")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test single-flight coalescing of identical AI requests (runs offline with a stubbed provider)
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_provider_manager import AIProviderManager
+from provider_registry import get_provider_registry
+from llm_scheduler import PRIORITY_BACKGROUND
+
+def test_identical_requests_share_one_call():
+    """Concurrent identical prompts should hit the provider once; different prompts are not merged."""
+    print("🔗 Testing single-flight coalescing")
+    print("=" * 50)
+
+    calls = []
+
+    def slow_granite(messages):
+        calls.append(messages[-1]["content"])
+        time.sleep(0.2)
+        return f"Answer to {messages[-1]['content']}"
+
+    get_provider_registry().generators["granite"] = slow_granite
+    manager = AIProviderManager()
+    manager.hedging_enabled = False
+
+    results = []
+    def ask(question):
+        results.append(manager.generate_response([{"role": "user", "content": question}], provider="granite"))
+
+    threads = [threading.Thread(target=ask, args=("Dashboard summary",)) for _ in range(5)]
+    threads.append(threading.Thread(target=ask, args=("Different question",)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ["Dashboard summary", "Different question"], calls
+    assert all(result["success"] for result in results)
+    assert sum(1 for result in results if result.get("coalesced")) == 4
+
+    stats = manager.get_coalescing_stats()
+    assert stats["coalesced"] == 4 and stats["in_flight"] == 0
+    print(f"✅ 6 requests -> {len(calls)} provider calls, stats: {stats}")
+
+def test_interactive_request_does_not_follow_background_leader():
+    """A background leader stuck in the queue must not hold an identical interactive request."""
+    release = threading.Event()
+    callers = []
+
+    def granite(messages):
+        callers.append(threading.current_thread().name)
+        if threading.current_thread().name == "background":
+            release.wait(5)
+        return "Answer"
+
+    get_provider_registry().generators["granite"] = granite
+    manager = AIProviderManager()
+    manager.hedging_enabled = False
+    messages = [{"role": "user", "content": "Dashboard summary"}]
+
+    background = threading.Thread(target=manager.generate_response, args=(messages,),
+                                  kwargs={"provider": "granite", "priority": PRIORITY_BACKGROUND}, name="background")
+    background.start()
+    try:
+        time.sleep(0.1)
+        start = time.time()
+        result = manager.generate_response(messages, provider="granite")
+        assert result["success"] and not result.get("coalesced")
+        assert time.time() - start < 1.0
+    finally:
+        release.set()
+        background.join()
+
+    assert sorted(callers) == ["MainThread", "background"], callers
+    print("✅ Interactive request ran its own call instead of waiting on a background leader")
+
+if __name__ == "__main__":
+    test_identical_requests_share_one_call()
+    test_interactive_request_does_not_follow_background_leader()
+    print("\n🎉 Coalescing tests passed")
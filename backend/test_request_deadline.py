@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test request deadline propagation, bounded backoff and early fallback (runs offline with stubbed providers)
+"""
+
+import sys
+import os
+import time
+import asyncio
+from concurrent.futures import TimeoutError as FutureTimeoutError
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ai_provider_manager
+import granite_client
+from ai_provider_manager import AIProviderManager
+from provider_registry import get_provider_registry
+from provider_errors import ProviderTimeoutError, DeadlineExceededError
+from request_deadline import deadline_scope, remaining_time, request_timeout, backoff_sleep
+
+def test_scopes_only_tighten():
+    """Nested scopes cannot extend the outer deadline; timeouts are capped by what is left."""
+    print("⏱️ Testing request deadlines")
+    print("=" * 50)
+
+    assert remaining_time() is None
+    assert request_timeout(60) == 60
+
+    with deadline_scope(5):
+        with deadline_scope(100):
+            assert remaining_time() <= 5
+        assert request_timeout(60) <= 5
+
+    with deadline_scope(0.5):
+        try:
+            request_timeout(60, "stub")
+            assert False, "too little time left for another attempt"
+        except DeadlineExceededError:
+            pass
+    print("✅ Deadlines nest and cap timeouts")
+
+def test_backoff_respects_budget():
+    """Backoff refuses to sleep past the deadline or on an event loop thread."""
+    with deadline_scope(2):
+        start = time.monotonic()
+        assert backoff_sleep(0, "stub", retry_after=5) is False
+        assert time.monotonic() - start < 0.1
+
+    async def on_loop():
+        return backoff_sleep(0, "stub", retry_after=0.5)
+
+    assert asyncio.run(on_loop()) is False
+    assert backoff_sleep(0, "stub", retry_after=0.05) is True
+    print("✅ Backoff bounded by remaining budget and never blocks the loop")
+
+def test_fallback_starts_before_deadline():
+    """A provider that uses its whole budget still leaves the fallback time to answer."""
+    def slow_gemini(messages):
+        # Behaves like an HTTP call whose timeout is clamped to the attempt budget
+        time.sleep(request_timeout(60, "gemini"))
+        raise ProviderTimeoutError("gemini", "The request took too long.")
+
+    get_provider_registry().generators["gemini"] = slow_gemini
+    get_provider_registry().generators["granite"] = lambda messages: "Granite answer"
+    ai_provider_manager.AI_FALLBACK_RESERVE_SECONDS = 1.0
+
+    manager = AIProviderManager()
+    manager.available_providers["gemini"]["status"] = "available"
+    manager.hedging_enabled = False
+    manager.coalescing_enabled = False
+
+    start = time.monotonic()
+    with deadline_scope(2.5):
+        result = manager.generate_response([{"role": "user", "content": "Budget tips?"}], provider="gemini")
+    elapsed = time.monotonic() - start
+
+    print(f"  answered by {result['provider']} in {elapsed:.2f}s")
+    assert result["success"] and result["provider"] == "granite"
+    assert result["fallback_reason"] == "timeout"
+    assert elapsed < 2.5
+    print("✅ Fallback answered within the deadline")
+
+def test_granite_timeouts_are_errors_not_replies():
+    """A stalled local model raises typed timeouts, and a spent budget is not charged to the breaker."""
+    class StalledWorker:
+        def generate(self, prompt, timeout):
+            time.sleep(min(timeout, 0.1))
+            raise FutureTimeoutError()
+
+    original = (granite_client._pipeline, granite_client.get_local_inference_worker,
+                granite_client.GRANITE_USE_LOCAL, granite_client.GRANITE_INFERENCE_DAEMON)
+    messages = [{"role": "user", "content": "Budget tips?"}]
+    try:
+        granite_client._pipeline, granite_client.get_local_inference_worker = object(), StalledWorker
+        granite_client.GRANITE_USE_LOCAL, granite_client.GRANITE_INFERENCE_DAEMON = True, False
+
+        for scope, expected in ((None, ProviderTimeoutError), (1.5, DeadlineExceededError)):
+            try:
+                if scope is None:
+                    granite_client.granite_chat(messages)
+                else:
+                    with deadline_scope(scope):
+                        granite_client.granite_chat(messages)
+                assert False, f"expected {expected.__name__}"
+            except ProviderTimeoutError as e:
+                assert type(e) is expected, type(e)
+    finally:
+        (granite_client._pipeline, granite_client.get_local_inference_worker,
+         granite_client.GRANITE_USE_LOCAL, granite_client.GRANITE_INFERENCE_DAEMON) = original
+
+    get_provider_registry().generators["gemini"] = lambda messages: request_timeout(60, "gemini")
+    manager = AIProviderManager()
+    with deadline_scope(0.5):
+        try:
+            manager._call_provider("gemini", messages)
+            assert False, "expected DeadlineExceededError"
+        except DeadlineExceededError:
+            pass
+    assert len(manager.circuit_breakers["gemini"].outcomes) == 0
+    print("✅ Granite timeouts raise typed errors; deadlines leave the breaker alone")
+
+if __name__ == "__main__":
+    test_scopes_only_tighten()
+    test_backoff_respects_budget()
+    test_fallback_starts_before_deadline()
+    test_granite_timeouts_are_errors_not_replies()
+    print("\n🎉 All request deadline tests passed!")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test hedged requests: p95 hedge delay, first success wins, deadline while hedging, bounded hedge pool
+(runs offline with stubbed providers)
+"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_provider_manager import AIProviderManager, AI_HEDGE_MIN_SAMPLES
+from circuit_breaker import CircuitState
+from llm_scheduler import LLMScheduler, ProviderBulkhead
+from provider_registry import get_provider_registry
+from provider_errors import DeadlineExceededError
+from request_deadline import deadline_scope
+
+MESSAGES = [{"role": "user", "content": "How much can I save under 80C?"}]
+
+def make_manager(primary_seconds: float, hedge_seconds: float, p95: float = 0.6):
+    """Gemini as the primary with a p95 of p95 seconds, Granite as the hedge; both stubbed."""
+    calls = {"gemini": [], "granite": []}
+    release = threading.Event()
+
+    def stub(name, seconds):
+        def generate(messages):
+            calls[name].append(time.monotonic())
+            release.wait(seconds)
+            return f"{name} answer"
+        return generate
+
+    get_provider_registry().generators["gemini"] = stub("gemini", primary_seconds)
+    get_provider_registry().generators["granite"] = stub("granite", hedge_seconds)
+
+    manager = AIProviderManager()
+    manager.scheduler = LLMScheduler()
+    manager.available_providers["gemini"]["status"] = "available"
+    manager.hedging_enabled = True
+    manager.coalescing_enabled = False
+    manager.hedge_provider = "granite"
+    for _ in range(AI_HEDGE_MIN_SAMPLES):
+        manager.latency_tracker.record("gemini", p95)
+    return manager, calls, release
+
+def test_hedge_fires_after_p95_delay():
+    """A slow primary is hedged once its p95 has passed, and the fast hedge answers."""
+    print("🏁 Testing hedged requests")
+    print("=" * 50)
+
+    manager, calls, release = make_manager(primary_seconds=2.0, hedge_seconds=0.05)
+    assert abs(manager.get_hedge_delay("gemini") - 0.6) < 0.01
+
+    start = time.monotonic()
+    try:
+        result = manager.generate_response(MESSAGES, provider="gemini")
+    finally:
+        release.set()
+    elapsed = time.monotonic() - start
+
+    hedge_started = calls["granite"][0] - start
+    print(f"  hedge started after {hedge_started:.2f}s, answered in {elapsed:.2f}s")
+    assert 0.55 <= hedge_started < 1.0, hedge_started
+    assert result["success"] and result["provider"] == "granite" and result["hedged"]
+    assert result["original_provider"] == "gemini"
+    print("✅ Hedge fired after the p95 delay")
+
+def test_first_success_wins_and_loser_is_ignored():
+    """The slower side's later answer changes neither the result nor the win counts."""
+    manager, calls, release = make_manager(primary_seconds=1.2, hedge_seconds=0.05)
+
+    result = manager.generate_response(MESSAGES, provider="gemini")
+    assert result["response"] == "granite answer"
+
+    # Let the primary finish in the background; its answer is dropped
+    time.sleep(1.0)
+    release.set()
+    manager._hedge_executor.shutdown(wait=True)
+
+    stats = manager.get_hedging_stats()
+    assert stats["hedged_requests"] == 1 and stats["hedge_wins"] == 1 and stats["primary_wins"] == 0, stats
+    assert len(calls["gemini"]) == 1 and len(calls["granite"]) == 1
+
+    # A primary that beats its p95 is never hedged
+    fast, fast_calls, fast_release = make_manager(primary_seconds=0.05, hedge_seconds=0.05)
+    assert fast.generate_response(MESSAGES, provider="gemini")["provider"] == "gemini"
+    fast_release.set()
+    assert fast_calls["granite"] == []
+    print("✅ First success won; the loser was ignored")
+
+def test_deadline_during_hedge():
+    """When neither side answers before the deadline, hedging raises DeadlineExceededError."""
+    manager, calls, release = make_manager(primary_seconds=5.0, hedge_seconds=5.0)
+
+    start = time.monotonic()
+    try:
+        with deadline_scope(1.5):
+            manager._generate_hedged("gemini", MESSAGES)
+        assert False, "expected DeadlineExceededError"
+    except DeadlineExceededError:
+        pass
+    finally:
+        release.set()
+    elapsed = time.monotonic() - start
+
+    assert len(calls["granite"]) == 1, "the hedge was started before the deadline"
+    assert elapsed < 2.0, elapsed
+    print(f"✅ Deadline raised after {elapsed:.2f}s while hedging")
+
+class QueuedHedgeExecutor(ThreadPoolExecutor):
+    """Runs the first task; later ones stay queued, as if every worker were busy."""
+
+    def submit(self, fn, *args, **kwargs):
+        if getattr(self, "started_one", False):
+            return Future()
+        self.started_one = True
+        return super().submit(fn, *args, **kwargs)
+
+def test_cancelled_hedge_gives_back_half_open_slot():
+    """A hedge cancelled before it starts releases the trial slot its half-open breaker reserved."""
+    manager, calls, release = make_manager(primary_seconds=0.9, hedge_seconds=0.05)
+    breaker = manager.circuit_breakers["granite"]
+    breaker._state = CircuitState.HALF_OPEN
+    # The hedge stays queued behind the primary and is cancelled when the primary wins
+    manager._hedge_executor = QueuedHedgeExecutor(max_workers=1)
+
+    result = manager.generate_response(MESSAGES, provider="gemini")
+    release.set()
+
+    assert result["provider"] == "gemini" and calls["granite"] == []
+    assert manager.get_hedging_stats()["cancelled_before_start"] == 1
+    assert breaker.state == CircuitState.HALF_OPEN and breaker.allow_request(), "hedge provider still admitted"
+    print("✅ Cancelled hedge released its half-open trial slot")
+
+def test_hedge_delay_ignores_local_queueing():
+    """Waiting for a bulkhead slot does not count toward the delay, and a full pool runs unhedged."""
+    manager, calls, release = make_manager(primary_seconds=0.1, hedge_seconds=0.05)
+    manager.scheduler.bulkheads["gemini"] = ProviderBulkhead("gemini", 1, reserved_interactive=0)
+
+    holder_ready = threading.Event()
+    def hold_gemini_slot():
+        with manager.scheduler.slot("gemini"):
+            holder_ready.set()
+            time.sleep(1.0)
+
+    holder = threading.Thread(target=hold_gemini_slot)
+    holder.start()
+    holder_ready.wait()
+    result = manager.generate_response(MESSAGES, provider="gemini")
+    holder.join()
+    assert result["provider"] == "gemini" and calls["granite"] == [], "queued primary was hedged"
+
+    # Without a free pool thread the primary runs on the caller's thread, unhedged
+    manager._hedge_threads = threading.BoundedSemaphore(1)
+    manager._hedge_threads.acquire()
+    assert manager.generate_response(MESSAGES, provider="gemini")["provider"] == "gemini"
+    release.set()
+    assert calls["granite"] == [] and manager.get_hedging_stats()["unhedged_pool_full"] == 1
+    print("✅ Hedge delay counted from the provider slot; saturated pool adds no hedges")
+
+if __name__ == "__main__":
+    test_hedge_fires_after_p95_delay()
+    test_first_success_wins_and_loser_is_ignored()
+    test_deadline_during_hedge()
+    test_cancelled_hedge_gives_back_half_open_slot()
+    test_hedge_delay_ignores_local_queueing()
+    print("\n🎉 All hedging tests passed!")
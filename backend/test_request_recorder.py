@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the opt-in request recorder middleware (runs offline)
+"""
+
+import sys
+import os
+import json
+import base64
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+import request_recorder
+from request_recorder import RequestRecorderMiddleware, register_scrubber, REDACTED
+
+def make_app(trace_path: str) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestRecorderMiddleware, trace_path=trace_path)
+
+    @app.post("/business/profile")
+    def create_profile(profile: dict):
+        return {"success": True, "business_id": "biz_1", "name": profile["business_name"]}
+
+    @app.post("/voice/chat")
+    async def voice_chat(file: UploadFile = File(...)):
+        return {"success": True, "size": len(await file.read())}
+
+    @app.get("/static/app.js")
+    def static_file():
+        return {"ok": True}
+
+    return app
+
+def read_trace(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_records_scrubbed_json_and_ids():
+    """JSON bodies are recorded with sensitive fields redacted and created ids captured."""
+    print("🧪 Testing request recorder")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        trace_path = os.path.join(directory, "trace.jsonl")
+        client = TestClient(make_app(trace_path))
+
+        response = client.post("/business/profile", json={"business_name": "Kumar Stores", "phone": "9876543210"}, params={"source": "web"})
+        assert response.json()["name"] == "Kumar Stores"  # endpoint saw the original body
+        client.get("/static/app.js")
+
+        records = read_trace(trace_path)
+        assert len(records) == 1, "excluded prefixes are not recorded"
+        record = records[0]
+        assert record["method"] == "POST" and record["path"] == "/business/profile" and record["query"] == "source=web"
+        assert record["status"] == 200 and record["duration_ms"] >= 0
+        assert record["json"] == {"business_name": "Kumar Stores", "phone": REDACTED}
+        assert record["response_ids"] == {"business_id": "biz_1"}
+        print("✅ JSON body scrubbed, status, timing and response ids recorded")
+
+def test_records_multipart_body_for_replay():
+    """Non-JSON bodies (audio uploads) are kept as base64 with their content type."""
+    with tempfile.TemporaryDirectory() as directory:
+        trace_path = os.path.join(directory, "trace.jsonl")
+        client = TestClient(make_app(trace_path))
+
+        audio = b"RIFF" + b"\x00" * 100
+        assert client.post("/voice/chat", files={"file": ("a.wav", audio, "audio/wav")}).json()["size"] == len(audio)
+
+        record = read_trace(trace_path)[0]
+        assert record["content_type"].startswith("multipart/form-data; boundary=")
+        assert audio in base64.b64decode(record["body_b64"])
+        print("✅ Multipart body recorded as base64")
+
+def test_scrubber_hook_can_drop_records():
+    """A registered scrubber can rewrite or drop records."""
+    with tempfile.TemporaryDirectory() as directory:
+        trace_path = os.path.join(directory, "trace.jsonl")
+        client = TestClient(make_app(trace_path))
+
+        drop_voice = lambda record: None if record["path"] == "/voice/chat" else record
+        register_scrubber(drop_voice)
+        try:
+            client.post("/voice/chat", files={"file": ("a.wav", b"RIFF", "audio/wav")})
+            client.post("/business/profile", json={"business_name": "Kumar Stores"})
+        finally:
+            request_recorder._scrubbers.remove(drop_voice)
+
+        assert [record["path"] for record in read_trace(trace_path)] == ["/business/profile"]
+        print("✅ Scrubber hook dropped the voice request")
+
+if __name__ == "__main__":
+    test_records_scrubbed_json_and_ids()
+    test_records_multipart_body_for_replay()
+    test_scrubber_hook_can_drop_records()
+    print("\n🎉 All request recorder tests passed!")
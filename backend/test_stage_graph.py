@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the stage graph runner and the concurrent Gemini voice pipeline (runs offline)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import gemini_client
+import gemini_key_pool
+import translation_cache
+from gemini_key_pool import GeminiKeyPool
+from translation_cache import TranslationCache
+from request_deadline import deadline_scope, remaining_time
+from stage_graph import Stage, run_stage_graph
+from stub_provider_server import create_server, STUB_ANSWER
+
+executor = ThreadPoolExecutor(max_workers=4)
+
+def sleeper(seconds, value):
+    def run(_):
+        time.sleep(seconds)
+        return value
+    return run
+
+def test_independent_stages_overlap():
+    """Two stages depending on the same parent run at the same time."""
+    print("🧪 Testing stage graph")
+    print("=" * 50)
+
+    stages = [
+        Stage("root", sleeper(0.05, "reply")),
+        Stage("left", lambda results: results["root"] + " left", ("root",)),
+        Stage("slow_a", sleeper(0.2, "a"), ("root",)),
+        Stage("slow_b", sleeper(0.2, "b"), ("root",)),
+        Stage("join", lambda results: results["slow_a"] + results["slow_b"], ("slow_a", "slow_b"))
+    ]
+    results, timings = run_stage_graph(stages, executor)
+
+    assert results == {"root": "reply", "left": "reply left", "slow_a": "a", "slow_b": "b", "join": "ab"}
+    assert timings["total_ms"] < 400, f"slow stages should overlap, took {timings['total_ms']} ms"
+    assert timings["overlap_saved_ms"] > 100
+    assert timings["stages"]["join"]["start_ms"] >= timings["stages"]["slow_a"]["start_ms"] + 190
+    print(f"✅ Stages overlapped: {timings['total_ms']} ms wall vs {timings['sequential_ms']} ms sequential")
+
+def test_failure_stops_graph_with_timings():
+    """A failing stage stops dependants and carries the timings it collected."""
+    ran = []
+
+    def fail(_):
+        raise RuntimeError("stt failed")
+
+    try:
+        run_stage_graph([Stage("stt", fail), Stage("generate", lambda _: ran.append("generate"), ("stt",))], executor)
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert ran == []
+        assert "stt" in e.stage_timings["stages"]
+
+    try:
+        run_stage_graph([Stage("a", lambda _: 1, ("b",)), Stage("b", lambda _: 2, ("a",))], executor)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✅ Failures and cycles stop the graph")
+
+def test_stages_inherit_request_deadline():
+    """Worker threads see the caller's request deadline."""
+    with deadline_scope(5):
+        results, _ = run_stage_graph([Stage("check", lambda _: remaining_time())], executor)
+    assert results["check"] is not None and 0 < results["check"] <= 5
+    print("✅ Deadline propagated to stage threads")
+
+def test_voice_chat_reports_stage_timings():
+    """The Gemini voice pipeline runs against the stub and reports per-stage timings."""
+    server = create_server("127.0.0.1", 0, latency_distribution="fixed", latency_ms=100)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    original_mode = gemini_client.GEMINI_BILINGUAL_REPLIES
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            gemini_client.GEMINI_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models"
+            gemini_key_pool._key_pool = GeminiKeyPool(["AIzaStubKeyForOfflineTests000"])
+            translation_cache._translation_cache = TranslationCache(os.path.join(directory, "cache.db"))
+            gemini_client.GEMINI_BILINGUAL_REPLIES = False  # two-call path: translation is its own stage
+
+            result = gemini_client.gemini_voice_chat(b"RIFF" + b"\x00" * 64, [], include_tamil=True)
+            assert result["success"], result
+            assert result["ai_response"] == STUB_ANSWER and result["tamil_response"] == STUB_ANSWER
+            stages = result["stage_timings"]["stages"]
+            assert set(stages) == {"stt", "generate", "translate", "tts_english", "tts_tamil"}
+            # English speech prep does not wait for the translation
+            assert stages["tts_english"]["start_ms"] < stages["translate"]["start_ms"] + stages["translate"]["duration_ms"]
+            assert stages["tts_tamil"]["start_ms"] >= stages["translate"]["start_ms"] + stages["translate"]["duration_ms"] - 1
+
+            english_only = gemini_client.gemini_voice_chat(b"RIFF" + b"\x00" * 64, [], include_tamil=False)
+            assert set(english_only["stage_timings"]["stages"]) == {"stt", "generate", "tts_english"}
+            print("✅ Voice pipeline reports stage timings with English prep overlapping translation")
+        finally:
+            gemini_client.GEMINI_BILINGUAL_REPLIES = original_mode
+            translation_cache._translation_cache = None
+            server.shutdown()
+
+if __name__ == "__main__":
+    test_independent_stages_overlap()
+    test_failure_stops_graph_with_timings()
+    test_stages_inherit_request_deadline()
+    test_voice_chat_reports_stage_timings()
+    print("\n🎉 All stage graph tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the local provider stub server against the real client code (runs offline)
+"""
+
+import sys
+import os
+import json
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+import gemini_client
+import gemini_key_pool
+import granite_client
+from gemini_key_pool import GeminiKeyPool
+from stub_provider_server import create_server, STUB_ANSWER
+
+def start_stub(**settings):
+    server = create_server("127.0.0.1", 0, latency_distribution="fixed", latency_ms=10, **settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def test_gemini_client_against_stub():
+    """The Gemini client works unchanged when pointed at the stub via its base URL."""
+    print("🧪 Testing provider stub server")
+    print("=" * 50)
+
+    server, base_url = start_stub()
+    try:
+        gemini_client.GEMINI_API_URL = f"{base_url}/v1beta/models"
+        gemini_key_pool._key_pool = GeminiKeyPool(["AIzaStubKeyForOfflineTests000"])
+
+        response = gemini_client.gemini_generate_response([{"role": "user", "content": "How do I budget?"}])
+        assert response == STUB_ANSWER
+        print("✅ Gemini generateContent served by stub")
+    finally:
+        server.shutdown()
+
+def test_fault_injection_and_streaming():
+    """429s carry retry-after; streaming endpoints send several chunks."""
+    server, base_url = start_stub(rate_429=1.0, retry_after=7, stream_chunks=4, stream_chunk_delay_ms=5)
+    try:
+        response = requests.post(f"{base_url}/v1beta/models/gemini-2.0-flash:generateContent", json={"contents": []})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+
+        requests.post(f"{base_url}/__stub/config", json={"rate_429": 0.0, "providers": {"huggingface": {"rate_503": 1.0}}})
+        assert requests.post(f"{base_url}/models/gpt2", json={"inputs": "hi"}).status_code == 503
+
+        with requests.post(f"{base_url}/v1beta/models/gemini-2.0-flash:streamGenerateContent?alt=sse",
+                           json={"contents": []}, stream=True) as streamed:
+            events = [line for line in streamed.iter_lines(decode_unicode=True) if line.startswith("data: ")]
+        assert len(events) == 4
+        text = "".join(json.loads(event[6:])["candidates"][0]["content"]["parts"][0]["text"] for event in events)
+        assert text == STUB_ANSWER
+
+        stats = requests.get(f"{base_url}/__stub/stats").json()["stats"]
+        assert stats["gemini"]["429"] == 1 and stats["huggingface"]["503"] == 1
+        print("✅ 429/503 injection and SSE streaming work")
+    finally:
+        server.shutdown()
+
+def test_ollama_client_against_stub():
+    """The Granite Ollama backend gets a chat answer from the stub."""
+    server, base_url = start_stub()
+    try:
+        granite_client.OLLAMA_BASE_URL = base_url
+        answer = granite_client.granite_chat_ollama([{"role": "user", "content": "Savings tips?"}])
+        assert "emergency fund" in answer
+        print("✅ Ollama /api/chat served by stub")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_gemini_client_against_stub()
+    test_fault_injection_and_streaming()
+    test_ollama_client_against_stub()
+    print("\n🎉 All stub provider server tests passed!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the Tamil translation cache and batch translation against the stub provider (runs offline)
+"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+import gemini_client
+import gemini_key_pool
+import translation_cache
+from gemini_key_pool import GeminiKeyPool
+from translation_cache import TranslationCache, normalize_text
+from stub_provider_server import create_server, STUB_ANSWER
+
+def start_stub():
+    server = create_server("127.0.0.1", 0, latency_distribution="fixed", latency_ms=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def gemini_calls(base_url: str) -> int:
+    counts = requests.get(f"{base_url}/__stub/stats").json()["stats"].get("gemini", {})
+    return sum(counts.values())
+
+def test_cache_normalizes_and_evicts():
+    """Whitespace variants share an entry and the least recently used entries are evicted."""
+    print("🧪 Testing translation cache")
+    print("=" * 50)
+
+    assert normalize_text("  Save   20%\n of income ") == "Save 20% of income"
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TranslationCache(os.path.join(directory, "cache.db"), max_entries=2)
+        cache.put("Save 20% of income", "வருமானத்தில் இருபது சதவீதம் சேமிக்கவும்")
+        assert cache.get("  Save 20%   of income") == "வருமானத்தில் இருபது சதவீதம் சேமிக்கவும்"
+        assert cache.get("save 20% of income") is None, "case is part of the key"
+
+        cache.put("Budget monthly", "மாதந்தோறும் பட்ஜெட்")
+        cache.get("Save 20% of income")  # refresh so "Budget monthly" is least recently used
+        cache.put("Build an emergency fund", "அவசர நிதி உருவாக்குங்கள்")
+        assert cache.get("Budget monthly") is None
+        assert cache.get("Save 20% of income") is not None
+        assert cache.get_stats()["entries"] == 2
+
+        # A second instance on the same file (another worker) sees the entries
+        assert TranslationCache(os.path.join(directory, "cache.db")).get("Build an emergency fund") == "அவசர நிதி உருவாக்குங்கள்"
+        print("✅ Normalized keys, LRU eviction and cross-instance sharing work")
+
+def test_single_translation_uses_cache():
+    """The second translation of the same text makes no Gemini call."""
+    server, base_url = start_stub()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            gemini_client.GEMINI_API_URL = f"{base_url}/v1beta/models"
+            gemini_key_pool._key_pool = GeminiKeyPool(["AIzaStubKeyForOfflineTests000"])
+            translation_cache._translation_cache = TranslationCache(os.path.join(directory, "cache.db"))
+
+            first = gemini_client.gemini_translate_to_tamil("Keep six months of expenses aside.")
+            second = gemini_client.gemini_translate_to_tamil("Keep six months  of expenses aside. ")
+            assert first["success"] and not first["cached"]
+            assert second["cached"] and second["tamil_text"] == first["tamil_text"] == STUB_ANSWER
+            assert gemini_calls(base_url) == 1
+            print("✅ Repeated translation served from cache")
+        finally:
+            translation_cache._translation_cache = None
+            server.shutdown()
+
+def test_batch_translation_one_call():
+    """Many segments go out in one delimited call, duplicates and cached texts are not resent."""
+    server, base_url = start_stub()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            gemini_client.GEMINI_API_URL = f"{base_url}/v1beta/models"
+            gemini_key_pool._key_pool = GeminiKeyPool(["AIzaStubKeyForOfflineTests000"])
+            translation_cache._translation_cache = TranslationCache(os.path.join(directory, "cache.db"))
+
+            texts = [f"GST reminder number {i}: file GSTR-3B by the 20th." for i in range(25)]
+            result = gemini_client.gemini_translate_batch_to_tamil(texts + texts[:5])
+            assert result["success"] and result["api_calls"] == 1 and result["cached_count"] == 0
+            assert len(result["tamil_texts"]) == 30 and all(text == STUB_ANSWER for text in result["tamil_texts"])
+            assert gemini_calls(base_url) == 1
+
+            again = gemini_client.gemini_translate_batch_to_tamil(texts[:10] + ["A brand new sentence."])
+            assert again["cached_count"] == 10 and again["api_calls"] == 1
+            print("✅ 25 segments translated in one call, cached texts skipped on the next batch")
+        finally:
+            translation_cache._translation_cache = None
+            server.shutdown()
+
+def test_batch_splitting_and_missing_segments():
+    """Batches respect the segment limit and dropped segments are retried singly."""
+    original = gemini_client.TRANSLATION_BATCH_MAX_SEGMENTS
+    try:
+        gemini_client.TRANSLATION_BATCH_MAX_SEGMENTS = 3
+        batches = gemini_client._split_translation_batches([f"text {i}" for i in range(7)])
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+    finally:
+        gemini_client.TRANSLATION_BATCH_MAX_SEGMENTS = original
+
+    output = "<<<SEG 1>>>\nமுதல்\n<<<SEG 3>>>\nமூன்றாவது"
+    parsed = {int(number): text.strip() for number, text in gemini_client.SEGMENT_PATTERN.findall(output)}
+    assert parsed == {1: "முதல்", 3: "மூன்றாவது"}
+    print("✅ Batch splitting and segment parsing work")
+
+if __name__ == "__main__":
+    test_cache_normalizes_and_evicts()
+    test_single_translation_uses_cache()
+    test_batch_translation_one_call()
+    test_batch_splitting_and_missing_segments()
+    print("\n🎉 All translation cache tests passed!")
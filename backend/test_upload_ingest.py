@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test size-limited upload ingest, audio preprocessing and streamed base64 encoding (runs offline)
+"""
+
+import sys
+import os
+import io
+import json
+import math
+import wave
+import base64
+import asyncio
+import threading
+from array import array
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+import gemini_client
+import gemini_key_pool
+from gemini_key_pool import GeminiKeyPool
+from upload_ingest import UploadSizeLimitMiddleware, UploadTooLargeError, read_upload_limited
+from audio_preprocess import detect_audio_format, preprocess_audio
+from stub_provider_server import create_server, STUB_ANSWER
+
+def make_wav(seconds_silence: float, seconds_tone: float, rate: int = 44100, channels: int = 2) -> bytes:
+    """Silence, a 440 Hz tone, then silence again."""
+    samples = array("h")
+    for section, loud in ((seconds_silence, False), (seconds_tone, True), (seconds_silence, False)):
+        for i in range(int(section * rate)):
+            value = int(10000 * math.sin(2 * math.pi * 440 * i / rate)) if loud else 0
+            samples.extend([value] * channels)
+
+    output = io.BytesIO()
+    with wave.open(output, "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(samples.tobytes())
+    return output.getvalue()
+
+class FakeUpload:
+    """Counts how much of an upload is read."""
+
+    def __init__(self, size: int):
+        self.remaining = size
+        self.read_bytes = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = min(size, self.remaining)
+        self.remaining -= chunk
+        self.read_bytes += chunk
+        return b"x" * chunk
+
+def test_read_stops_at_limit():
+    """Reading stops at the first chunk past the limit instead of loading the whole file."""
+    print("🧪 Testing upload ingest")
+    print("=" * 50)
+
+    upload = FakeUpload(50 * 1024 * 1024)
+    try:
+        asyncio.run(read_upload_limited(upload, 1024 * 1024, chunk_size=64 * 1024))
+        assert False, "expected UploadTooLargeError"
+    except UploadTooLargeError:
+        pass
+    assert upload.read_bytes <= 1024 * 1024 + 64 * 1024
+
+    assert len(asyncio.run(read_upload_limited(FakeUpload(1000), 1024))) == 1000
+    print("✅ Oversized upload rejected after 1MB of 50MB was read")
+
+def test_middleware_rejects_large_bodies():
+    """Declared and streamed bodies over the route limit get 413; small ones reach the endpoint."""
+    calls = []
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, limits={"/voice/chat": 1024})
+
+    @app.post("/voice/chat")
+    async def voice_chat(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"success": True}
+
+    client = TestClient(app)
+    assert client.post("/voice/chat", files={"file": ("a.wav", b"x" * 100)}).status_code == 200
+
+    response = client.post("/voice/chat", files={"file": ("a.wav", b"x" * 5000)})
+    assert response.status_code == 413 and response.json()["success"] is False
+
+    def chunks():
+        # Multipart body without a Content-Length, sent in pieces
+        yield b'--bound\r\nContent-Disposition: form-data; name="file"; filename="b.wav"\r\n\r\n'
+        for _ in range(10):
+            yield b"y" * 500
+        yield b"\r\n--bound--\r\n"
+
+    streamed = client.post("/voice/chat", content=chunks(), headers={"content-type": "multipart/form-data; boundary=bound"})
+    assert streamed.status_code == 413
+    assert calls == ["a.wav"]
+    print("✅ Middleware returns 413 for declared and streamed oversized bodies")
+
+def test_wav_preprocessing():
+    """Stereo 44.1 kHz WAV with silence becomes trimmed 16 kHz mono; webm passes through."""
+    original = make_wav(seconds_silence=1.0, seconds_tone=1.0)
+    processed, audio_format, info = preprocess_audio(original)
+
+    assert audio_format == "wav" and info["processed"]
+    with wave.open(io.BytesIO(processed), "rb") as reader:
+        assert reader.getnchannels() == 1 and reader.getframerate() == 16000
+        duration = reader.getnframes() / reader.getframerate()
+    assert 1.0 <= duration <= 1.5, f"silence should be trimmed, got {duration:.2f}s"
+    assert len(processed) < len(original) / 8
+
+    webm = b"\x1a\x45\xdf\xa3" + b"\x00" * 100
+    assert preprocess_audio(webm) == (webm, "webm", {"format": "webm", "original_bytes": 104, "processed": False})
+    assert detect_audio_format(b"OggS" + b"\x00" * 8) == "ogg"
+    assert detect_audio_format(b"ID3" + b"\x00" * 8) == "mp3"
+    print(f"✅ WAV reduced {len(original)} -> {len(processed)} bytes, {duration:.2f}s kept")
+
+def test_streamed_base64_body():
+    """The streamed body is byte-identical to json.dumps of the full payload, with the right length."""
+    audio = os.urandom(200 * 1024 + 7)
+    payload = {"contents": [{"parts": [{"inline_data": {"mime_type": "audio/wav", "data": gemini_client.INLINE_DATA_PLACEHOLDER}}]}]}
+    body = gemini_client._InlineDataBody(payload, audio)
+
+    expected = json.loads(json.dumps(payload))
+    expected["contents"][0]["parts"][0]["inline_data"]["data"] = base64.b64encode(audio).decode("ascii")
+    streamed = b"".join(body)
+    assert json.loads(streamed) == expected
+    assert len(streamed) == len(body)
+    print("✅ Streamed base64 body matches the full JSON encoding")
+
+def test_speech_to_text_against_stub():
+    """STT sends preprocessed WAV with the detected MIME type."""
+    server = create_server("127.0.0.1", 0, latency_distribution="fixed", latency_ms=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        gemini_client.GEMINI_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models"
+        gemini_key_pool._key_pool = GeminiKeyPool(["AIzaStubKeyForOfflineTests000"])
+
+        result = gemini_client.gemini_speech_to_text(make_wav(0.5, 0.5))
+        assert result["success"] and result["text"] == STUB_ANSWER
+        assert result["audio"]["format"] == "wav" and result["audio"]["processed"]
+        print("✅ Speech-to-text works with streamed, preprocessed audio")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_read_stops_at_limit()
+    test_middleware_rejects_large_bodies()
+    test_wav_preprocessing()
+    test_streamed_base64_body()
+    test_speech_to_text_against_stub()
+    print("\n🎉 All upload ingest tests passed!")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test content-addressed upload storage and cached upload analysis (runs offline)
+"""
+
+import sys
+import os
+import asyncio
+import hashlib
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+import main
+import upload_store
+from upload_ingest import UploadTooLargeError
+from upload_store import UploadStore
+
+class FakeUpload:
+    """In-memory stand-in for an UploadFile."""
+
+    def __init__(self, data: bytes, filename: str = "statement.csv", content_type: str = "text/csv"):
+        self.data = data
+        self.filename = filename
+        self.content_type = content_type
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+class FakeAIManager:
+    def __init__(self):
+        self.calls = 0
+        self.prompts = []
+
+    def generate_response(self, messages):
+        self.calls += 1
+        self.prompts.append(messages[-1]["content"])
+        return {"success": True, "response": f"Analysis #{self.calls}"}
+
+def test_same_content_is_stored_once():
+    """Identical bytes map to one object; a different name is recorded, not stored again."""
+    print("🧪 Testing upload store")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = UploadStore(directory)
+        data = os.urandom(200 * 1024)
+
+        first = asyncio.run(store.store(FakeUpload(data), 1024 * 1024, chunk_size=4096))
+        second = asyncio.run(store.store(FakeUpload(data, filename="copy.csv"), 1024 * 1024))
+
+        assert first.sha256 == second.sha256 == hashlib.sha256(data).hexdigest()
+        assert not first.deduplicated and second.deduplicated
+        with open(first.path, "rb") as f:
+            assert f.read() == data
+        assert second.metadata["filenames"] == ["statement.csv", "copy.csv"]
+        assert second.metadata["upload_count"] == 2
+
+        objects = [name for _, _, files in os.walk(store.objects_dir) for name in files if not name.endswith(".json")]
+        assert objects == [first.sha256]
+        assert os.listdir(store.tmp_dir) == []
+        print("✅ Same content stored once")
+
+def test_oversized_upload_leaves_nothing_behind():
+    with tempfile.TemporaryDirectory() as directory:
+        store = UploadStore(directory)
+        try:
+            asyncio.run(store.store(FakeUpload(b"x" * 5000), 1000, chunk_size=512))
+            assert False, "expected UploadTooLargeError"
+        except UploadTooLargeError:
+            pass
+        assert os.listdir(store.tmp_dir) == []
+        assert os.listdir(store.objects_dir) == []
+        print("✅ Oversized upload removed")
+
+def test_reupload_returns_cached_analysis():
+    """/upload analyses new content once and answers re-uploads from the cache."""
+    original_store = upload_store._upload_store
+    original_manager = main.get_ai_manager
+    fake = FakeAIManager()
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            upload_store._upload_store = UploadStore(directory)
+            main.get_ai_manager = lambda: fake
+            client = TestClient(main.app)
+
+            data = b"date,amount\n2024-04-01,1500\n" * 100
+            first = client.post("/upload", files={"file": ("statement.csv", data, "text/csv")}).json()
+            again = client.post("/upload", files={"file": ("statement (1).csv", data, "text/csv")}).json()
+            other = client.post("/upload", files={"file": ("other.csv", data + b"x", "text/csv")}).json()
+
+            assert first["success"] and not first["deduplicated"] and not first["cached_analysis"]
+            assert first["file_id"] == hashlib.sha256(data).hexdigest()
+            assert again["deduplicated"] and again["cached_analysis"]
+            assert again["file_id"] == first["file_id"] and again["message"] == first["message"] == "Analysis #1"
+            assert other["message"] == "Analysis #2" and not other["deduplicated"]
+            assert fake.calls == 2
+            # The cached answer is reused under other names, so it must not mention one
+            assert not any("statement" in prompt or "other.csv" in prompt for prompt in fake.prompts), fake.prompts
+            print("✅ Re-upload answered from cache without a new AI call")
+        finally:
+            upload_store._upload_store = original_store
+            main.get_ai_manager = original_manager
+
+def test_store_writes_off_the_event_loop():
+    """Chunk writes and the commit run in the threadpool, not on the loop."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = UploadStore(directory)
+        on_loop = []
+        original_commit = store._commit
+
+        def commit(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return original_commit(*args)
+
+        store._commit = commit
+        stored = asyncio.run(store.store(FakeUpload(b"a,b\n1,2\n"), 1024))
+        assert on_loop == [False] and os.path.exists(stored.path)
+        print("✅ Upload commit ran in the threadpool")
+
+if __name__ == "__main__":
+    test_same_content_is_stored_once()
+    test_oversized_upload_leaves_nothing_behind()
+    test_reupload_returns_cached_analysis()
+    test_store_writes_off_the_event_loop()
+    print("\n🎉 All upload store tests passed!")
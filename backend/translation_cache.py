@@ -0,0 +1,142 @@
+"""
+Translation Cache for Taxora
+Persistent SQLite cache of Tamil translations keyed by normalized English text.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "data/translation_cache.db")
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "20000"))
+
+def normalize_text(text: str) -> str:
+    """Canonical form used as the cache key: NFC, whitespace collapsed, trimmed (case is kept)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+def _cache_key(text: str, language: str) -> str:
+    return hashlib.sha256(f"{language}:{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class TranslationCache:
+    """Shared by all uvicorn workers through one SQLite file; least recently used entries are evicted."""
+
+    def __init__(self, db_path: str = TRANSLATION_CACHE_PATH, max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, language TEXT NOT NULL, source TEXT NOT NULL, translation TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, texts: List[str], language: str = "ta") -> Dict[str, str]:
+        """Cached translations for the given texts, as {original text: translation}."""
+        keys = {_cache_key(text, language): text for text in texts}
+        if not keys:
+            return {}
+
+        found = {}
+        with self.lock:
+            key_list = list(keys)
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                self.conn.execute(
+                    f"UPDATE translations SET last_used = ?, hits = hits + 1 WHERE key IN ({','.join('?' * len(found))})",
+                    [time.time(), *found]
+                )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return {keys[key]: translation for key, translation in found.items()}
+
+    def get(self, text: str, language: str = "ta") -> Optional[str]:
+        """Cached translation of one text, or None."""
+        return self.get_many([text], language).get(text)
+
+    def put_many(self, translations: Dict[str, str], language: str = "ta"):
+        """Store {original text: translation} pairs, then evict down to max_entries."""
+        if not translations:
+            return
+        now = time.time()
+        rows = [(_cache_key(text, language), language, normalize_text(text), translation, now, now)
+                for text, translation in translations.items()]
+
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO translations (key, language, source, translation, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self.conn.execute(
+                    "DELETE FROM translations WHERE key IN ("
+                    "SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def put(self, text: str, translation: str, language: str = "ta"):
+        """Store one translation."""
+        self.put_many({text: translation}, language)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+# Global cache instance (created on first use so importing never touches the disk)
+_translation_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+def get_translation_cache() -> Optional[TranslationCache]:
+    """Get the global translation cache, or None when disabled or the database cannot be opened."""
+    global _translation_cache
+    if not TRANSLATION_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _translation_cache is None:
+            try:
+                _translation_cache = TranslationCache()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open translation cache {TRANSLATION_CACHE_PATH}, translating without it: {e}")
+                return None
+        return _translation_cache
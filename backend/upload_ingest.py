@@ -0,0 +1,107 @@
+"""
+Upload Ingest for Taxora
+Size-limited upload reading: requests over the limit are rejected as soon as the limit is crossed.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upload limits (bytes)
+MAX_UPLOAD_FILE_SIZE = int(os.getenv("MAX_UPLOAD_FILE_SIZE", str(10 * 1024 * 1024)))
+MAX_AUDIO_UPLOAD_SIZE = int(os.getenv("MAX_AUDIO_UPLOAD_SIZE", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+# Room for multipart boundaries and headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+class UploadTooLargeError(Exception):
+    """The uploaded file (or request body) is larger than allowed."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"Upload exceeds the {limit // (1024 * 1024)}MB limit")
+
+async def read_upload_limited(upload, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> bytes:
+    """Read an UploadFile chunk by chunk, raising UploadTooLargeError once max_bytes is exceeded."""
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+    return bytes(buffer)
+
+class UploadSizeLimitMiddleware:
+    """Rejects oversized request bodies for upload routes with 413 before the endpoint reads them.
+
+    A Content-Length over the limit is refused without reading the body. Bodies without one are
+    counted while they stream in; once the limit is crossed the rest is not read and whatever the
+    endpoint would have answered is replaced with the 413.
+    """
+
+    def __init__(self, app, limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.limits = limits or {
+            "/upload": MAX_UPLOAD_FILE_SIZE + MULTIPART_OVERHEAD_BYTES,
+            "/voice/chat": MAX_AUDIO_UPLOAD_SIZE + MULTIPART_OVERHEAD_BYTES
+        }
+
+    async def _reject(self, send, limit: int):
+        body = json.dumps({
+            "success": False,
+            "message": f"Request body exceeds the {limit // (1024 * 1024)}MB limit"
+        }).encode("utf-8")
+        await send({"type": "http.response.start", "status": 413,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope.get("headers", [])).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            logger.warning(f"Rejected {scope['path']} upload of {int(content_length)} bytes (limit {limit})")
+            await self._reject(send, limit)
+            return
+
+        state = {"received": 0, "exceeded": False, "rejected": False}
+
+        async def limited_receive():
+            if state["exceeded"]:
+                # Stop reading; the endpoint sees a disconnect instead of the rest of the body
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > limit:
+                    state["exceeded"] = True
+                    logger.warning(f"Rejected streamed {scope['path']} upload after {state['received']} bytes (limit {limit})")
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message):
+            if not state["exceeded"]:
+                await send(message)
+            elif not state["rejected"]:
+                state["rejected"] = True
+                await self._reject(send, limit)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            # Form parsing fails on the cut-off body; that is the rejection, not a server error
+            if not state["exceeded"]:
+                raise
+        if state["exceeded"] and not state["rejected"]:
+            await self._reject(send, limit)
@@ -0,0 +1,145 @@
+"""
+Upload Store for Taxora
+Content-addressed upload storage: files are kept once per SHA-256 and their AI analysis is cached with them.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from upload_ingest import UPLOAD_CHUNK_SIZE, UploadTooLargeError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Store configuration
+UPLOAD_STORE_DIR = os.getenv("UPLOAD_STORE_DIR", "uploads")
+
+@dataclass
+class StoredUpload:
+    """Result of storing one upload."""
+    sha256: str
+    size: int
+    path: str
+    deduplicated: bool
+    metadata: Dict
+
+    @property
+    def analysis(self) -> Optional[str]:
+        return self.metadata.get("analysis")
+
+class UploadStore:
+    """Objects live at objects/<first two hex digits>/<sha256>, each with a <sha256>.json
+    sidecar holding the original filenames, upload count and cached analysis.
+    """
+
+    def __init__(self, root: str = UPLOAD_STORE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def _metadata_path(self, sha256: str) -> str:
+        return self.object_path(sha256) + ".json"
+
+    def get_metadata(self, sha256: str) -> Optional[Dict]:
+        try:
+            with open(self._metadata_path(sha256), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_metadata(self, sha256: str, metadata: Dict):
+        path = self._metadata_path(sha256)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(temp_path, path)
+
+    async def store(self, upload, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_SIZE) -> StoredUpload:
+        """Stream an UploadFile to disk while hashing it, then file it under its hash.
+
+        Raises UploadTooLargeError once max_bytes is exceeded; the partial file is removed.
+        If the same content is already stored the new copy is discarded. Disk writes and the
+        locked commit run in the threadpool so they never block the event loop.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.tmp_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = await upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLargeError(max_bytes)
+                    digest.update(chunk)
+                    await run_in_threadpool(f.write, chunk)
+            return await run_in_threadpool(self._commit, temp_path, digest.hexdigest(), size, upload)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _commit(self, temp_path: str, sha256: str, size: int, upload) -> StoredUpload:
+        path = self.object_path(sha256)
+        filename = getattr(upload, "filename", None)
+        now = time.time()
+
+        with self._lock:
+            deduplicated = os.path.exists(path)
+            if not deduplicated:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+
+            metadata = self.get_metadata(sha256) or {
+                "sha256": sha256,
+                "size": size,
+                "content_type": getattr(upload, "content_type", None),
+                "filenames": [],
+                "upload_count": 0,
+                "first_uploaded": now
+            }
+            if filename and filename not in metadata["filenames"]:
+                metadata["filenames"].append(filename)
+            metadata["upload_count"] += 1
+            metadata["last_uploaded"] = now
+            self._write_metadata(sha256, metadata)
+
+        if deduplicated:
+            logger.info(f"Upload {filename} matches stored object {sha256[:12]} ({size} bytes)")
+        return StoredUpload(sha256=sha256, size=size, path=path, deduplicated=deduplicated, metadata=metadata)
+
+    def save_analysis(self, sha256: str, analysis: str):
+        """Cache the analysis for an object so re-uploads can skip the AI call."""
+        with self._lock:
+            metadata = self.get_metadata(sha256)
+            if metadata is None:
+                return
+            metadata["analysis"] = analysis
+            metadata["analyzed_at"] = time.time()
+            self._write_metadata(sha256, metadata)
+
+# Global upload store instance
+_upload_store = None
+
+def get_upload_store() -> UploadStore:
+    """Get or create the global upload store instance."""
+    global _upload_store
+    if _upload_store is None:
+        _upload_store = UploadStore()
+    return _upload_store